@@ -17,27 +17,11 @@ from pcs.cli.common import (
     routing,
 )
 from pcs.cli.reports import process_library_reports
-from pcs.cli.routing import (
-    acl,
-    alert,
-    booth,
-    client,
-    cluster,
-    config,
-    constraint,
-    dr,
-    host,
-    node,
-    pcsd,
-    prop,
-    qdevice,
-    quorum,
-    resource,
-    status,
-    stonith,
-    tag,
-)
+from pcs.lib.agent_metadata_cache import get_agent_metadata_cache
 from pcs.lib.errors import LibraryError
+from pcs.lib.pacemaker.capability_cache import get_capability_cache
+from pcs.lib.pacemaker.cib_snapshot import get_process_cib_snapshot_cache
+from pcs.lib.resource_agent_catalog import get_resource_agent_catalog
 
 
 def _non_root_run(argv_cmd):
@@ -122,15 +106,28 @@ def main(argv=None):
     # pylint: disable=too-many-locals
     # pylint: disable=too-many-statements
     if completion.has_applicable_environment(os.environ):
+        # entry points serve completion from the index before importing this
+        # module, get here only if the index is not available
         print(
             completion.make_suggestions(
-                os.environ, usage.generate_completion_tree_from_usage()
+                os.environ,
+                usage.generate_completion_tree_from_usage(),
+                completion.get_id_provider(os.environ),
             )
         )
         sys.exit()
 
     argv = argv if argv else sys.argv[1:]
     utils.subprocess_setup()
+    # one command per process, CIB readers may share the CIB
+    get_process_cib_snapshot_cache().enable()
+    get_agent_metadata_cache().enable(
+        settings.pcsd_agent_metadata_cache_location
+    )
+    get_resource_agent_catalog().enable(
+        settings.pcsd_resource_agent_catalog_location
+    )
+    get_capability_cache().enable(settings.pcsd_pacemaker_capabilities_location)
     global filename, usefile
     utils.pcs_options = {}
 
@@ -233,27 +230,31 @@ def main(argv=None):
 
     if (os.getuid() != 0) and (argv and argv[0] != "help") and not usefile:
         _non_root_run(argv)
+    # command modules are imported only when they are run
     cmd_map = {
-        "resource": resource.resource_cmd,
-        "cluster": cluster.cluster_cmd,
-        "stonith": stonith.stonith_cmd,
-        "property": prop.property_cmd,
-        "constraint": constraint.constraint_cmd,
-        "acl": acl.acl_cmd,
-        "status": status.status_cmd,
-        "config": config.config_cmd,
-        "pcsd": pcsd.pcsd_cmd,
-        "node": node.node_cmd,
-        "quorum": quorum.quorum_cmd,
-        "qdevice": qdevice.qdevice_cmd,
-        "alert": alert.alert_cmd,
-        "booth": booth.booth_cmd,
-        "host": host.host_cmd,
-        "client": client.client_cmd,
-        "dr": dr.dr_cmd,
-        "tag": tag.tag_cmd,
-        "help": lambda lib, argv, modifiers: usage.main(),
+        name: routing.create_lazy_cmd(f"pcs.cli.routing.{module}", cmd)
+        for name, module, cmd in (
+            ("resource", "resource", "resource_cmd"),
+            ("cluster", "cluster", "cluster_cmd"),
+            ("stonith", "stonith", "stonith_cmd"),
+            ("property", "prop", "property_cmd"),
+            ("constraint", "constraint", "constraint_cmd"),
+            ("acl", "acl", "acl_cmd"),
+            ("status", "status", "status_cmd"),
+            ("config", "config", "config_cmd"),
+            ("pcsd", "pcsd", "pcsd_cmd"),
+            ("node", "node", "node_cmd"),
+            ("quorum", "quorum", "quorum_cmd"),
+            ("qdevice", "qdevice", "qdevice_cmd"),
+            ("alert", "alert", "alert_cmd"),
+            ("booth", "booth", "booth_cmd"),
+            ("host", "host", "host_cmd"),
+            ("client", "client", "client_cmd"),
+            ("dr", "dr", "dr_cmd"),
+            ("tag", "tag", "tag_cmd"),
+        )
     }
+    cmd_map["help"] = lambda lib, argv, modifiers: usage.main()
     try:
         routing.create_router(cmd_map, [])(
             utils.get_library_wrapper(), argv, utils.get_input_modifiers()
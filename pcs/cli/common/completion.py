@@ -1,3 +1,84 @@
+"""
+Bash completion of pcs commands.
+
+Suggestions are made from a tree of pcs commands. Rendering the tree from the
+usage text requires importing all of pcs, which makes completion slow, so the
+tree is stored in an index file when pcs is built. Completion is served from
+the index without importing anything but this module and pcs settings. The
+tree is rendered from the usage only when the index is not available.
+
+Ids of resources, stonith devices, tags and nodes are suggested only when
+PCS_COMPLETE_IDS is set in the environment. They are read from the live CIB
+and stored in a per-user cache for a few seconds, so that pressing TAB
+repeatedly does not run cibadmin each time.
+"""
+import json
+import os
+import os.path
+import subprocess
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+
+from pcs import settings
+
+ID_RESOURCE = "resource"
+ID_STONITH = "stonith"
+ID_TAG = "tag"
+ID_NODE = "node"
+
+# commands which take an id as their first argument, each of them must be in
+# the completion tree generated from usage
+_ID_COMMANDS = {
+    ("resource", "ban"): ID_RESOURCE,
+    ("resource", "cleanup"): ID_RESOURCE,
+    ("resource", "clear"): ID_RESOURCE,
+    ("resource", "clone"): ID_RESOURCE,
+    ("resource", "config"): ID_RESOURCE,
+    ("resource", "debug-demote"): ID_RESOURCE,
+    ("resource", "debug-monitor"): ID_RESOURCE,
+    ("resource", "debug-promote"): ID_RESOURCE,
+    ("resource", "debug-start"): ID_RESOURCE,
+    ("resource", "debug-stop"): ID_RESOURCE,
+    ("resource", "delete"): ID_RESOURCE,
+    ("resource", "disable"): ID_RESOURCE,
+    ("resource", "enable"): ID_RESOURCE,
+    ("resource", "manage"): ID_RESOURCE,
+    ("resource", "meta"): ID_RESOURCE,
+    ("resource", "move"): ID_RESOURCE,
+    ("resource", "promotable"): ID_RESOURCE,
+    ("resource", "refresh"): ID_RESOURCE,
+    ("resource", "remove"): ID_RESOURCE,
+    ("resource", "restart"): ID_RESOURCE,
+    ("resource", "safe-disable"): ID_RESOURCE,
+    ("resource", "unclone"): ID_RESOURCE,
+    ("resource", "ungroup"): ID_RESOURCE,
+    ("resource", "unmanage"): ID_RESOURCE,
+    ("resource", "update"): ID_RESOURCE,
+    ("resource", "utilization"): ID_RESOURCE,
+    ("stonith", "cleanup"): ID_STONITH,
+    ("stonith", "config"): ID_STONITH,
+    ("stonith", "delete"): ID_STONITH,
+    ("stonith", "disable"): ID_STONITH,
+    ("stonith", "enable"): ID_STONITH,
+    ("stonith", "refresh"): ID_STONITH,
+    ("stonith", "remove"): ID_STONITH,
+    ("stonith", "update"): ID_STONITH,
+    ("tag", "delete"): ID_TAG,
+    ("tag", "remove"): ID_TAG,
+    ("tag", "update"): ID_TAG,
+    ("node", "attribute"): ID_NODE,
+    ("node", "maintenance"): ID_NODE,
+    ("node", "standby"): ID_NODE,
+    ("node", "unmaintenance"): ID_NODE,
+    ("node", "unstandby"): ID_NODE,
+    ("node", "utilization"): ID_NODE,
+}
+_RESOURCE_TAGS = frozenset(("primitive", "group", "clone", "master", "bundle"))
+# completion must stay responsive even if the cluster is not
+_CIBADMIN_TIMEOUT = 2
+
+
 def has_applicable_environment(environment):
     """
     dict environment - very likely os.environ
@@ -17,10 +98,12 @@ def has_applicable_environment(environment):
     )
 
 
-def make_suggestions(environment, suggestion_tree):
+def make_suggestions(environment, suggestion_tree, id_provider=None):
     """
     dict environment - very likely os.environ
     dict suggestion_tree - {'acl': {'role': {'create': ...}}}...
+    callable id_provider - gets an id type, returns a list of ids, None = do
+        not suggest ids
     """
     if not has_applicable_environment(environment):
         raise EnvironmentError("Environment is not completion read")
@@ -34,7 +117,10 @@ def make_suggestions(environment, suggestion_tree):
 
     return "\n".join(
         _find_suggestions(
-            suggestion_tree, typed_word_list, int(environment["COMP_CWORD"])
+            suggestion_tree,
+            typed_word_list,
+            int(environment["COMP_CWORD"]),
+            id_provider,
         )
     )
 
@@ -68,7 +154,9 @@ def _split_words(joined_words, word_lengths):
     return word_list
 
 
-def _find_suggestions(suggestion_tree, typed_word_list, word_under_cursor_idx):
+def _find_suggestions(
+    suggestion_tree, typed_word_list, word_under_cursor_idx, id_provider=None
+):
     if not 1 <= word_under_cursor_idx <= len(typed_word_list):
         return []
 
@@ -78,9 +166,15 @@ def _find_suggestions(suggestion_tree, typed_word_list, word_under_cursor_idx):
     else:
         word_under_cursor = typed_word_list[word_under_cursor_idx]
 
+    previous_subcommand_list = typed_word_list[1:word_under_cursor_idx]
     words_for_current_cursor_position = _get_subcommands(
-        suggestion_tree, typed_word_list[1:word_under_cursor_idx]
+        suggestion_tree, previous_subcommand_list
     )
+    id_type = _ID_COMMANDS.get(tuple(previous_subcommand_list))
+    if id_provider and id_type:
+        words_for_current_cursor_position = sorted(
+            set(words_for_current_cursor_position) | set(id_provider(id_type))
+        )
 
     return [
         word
@@ -96,3 +190,178 @@ def _get_subcommands(suggestion_tree, previous_subcommand_list):
             return []
         subcommand_tree = subcommand_tree[subcommand]
     return sorted(list(subcommand_tree.keys()))
+
+
+def complete_from_index(environment, index_path=None):
+    """
+    Return suggestions made from a stored index, None if it is not available
+
+    dict environment - very likely os.environ
+    string index_path - path to the index, defaults to the installed one
+    """
+    suggestion_tree = load_suggestion_tree(
+        index_path or settings.pcs_completion_index_location
+    )
+    if suggestion_tree is None:
+        return None
+    return make_suggestions(
+        environment, suggestion_tree, get_id_provider(environment)
+    )
+
+
+def load_suggestion_tree(index_path):
+    """
+    Return a suggestion tree stored in an index, None if it cannot be used
+
+    string index_path - path to the index
+    """
+    try:
+        with open(index_path, "r") as index_file:
+            data = json.load(index_file)
+        if data["pcs_version"] != settings.pcs_version or not isinstance(
+            data["tree"], dict
+        ):
+            return None
+        return data["tree"]
+    except (EnvironmentError, ValueError, TypeError, KeyError):
+        return None
+
+
+def save_suggestion_tree(index_path, suggestion_tree):
+    """
+    Store a suggestion tree in an index
+
+    string index_path - path to the index
+    dict suggestion_tree - {'acl': {'role': {'create': ...}}}...
+    """
+    with open(index_path, "w") as index_file:
+        json.dump(
+            dict(pcs_version=settings.pcs_version, tree=suggestion_tree),
+            index_file,
+            sort_keys=True,
+        )
+
+
+def get_id_provider(environment):
+    """
+    Return a callable providing ids from the CIB, None if ids are not wanted
+
+    dict environment - very likely os.environ
+    """
+    if environment.get("PCS_COMPLETE_IDS", "").strip() in ("0", ""):
+        return None
+    id_cache = CibIdCache(
+        os.path.expanduser(settings.pcs_completion_ids_cache_location),
+        settings.pcs_completion_ids_cache_ttl,
+    )
+    return lambda id_type: id_cache.get_ids(load_cib_ids).get(id_type, [])
+
+
+class CibIdCache:
+    def __init__(self, cache_file, ttl):
+        """
+        string cache_file -- file to store the ids in
+        int ttl -- number of seconds stored ids are valid for, 0 = no caching
+        """
+        self._cache_file = cache_file
+        self._ttl = ttl
+        self._ids = None
+
+    def get_ids(self, loader):
+        """
+        Return dict {id type: [id]}, load it if not cached
+
+        callable loader -- returns the dict
+        """
+        if self._ids is None:
+            self._ids = self._read()
+        if self._ids is None:
+            self._ids = loader()
+            # do not remember a failure, the cluster may be starting
+            if self._ids and self._ttl > 0:
+                self._write(self._ids)
+        return self._ids
+
+    def _read(self):
+        if self._ttl <= 0:
+            return None
+        try:
+            with open(self._cache_file, "r") as cache_file:
+                data = json.load(cache_file)
+            if abs(time.time() - data["created"]) > self._ttl or not (
+                isinstance(data["ids"], dict)
+            ):
+                return None
+            return data["ids"]
+        except (EnvironmentError, ValueError, TypeError, KeyError):
+            return None
+
+    def _write(self, ids):
+        # The cache is not essential, so it is fine to skip storing it if
+        # something goes wrong. A temporary file is used so that other
+        # processes never read partially written ids.
+        cache_dir = os.path.dirname(self._cache_file)
+        try:
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir)
+            try:
+                with os.fdopen(fd, "w") as tmp_file:
+                    json.dump(dict(created=time.time(), ids=ids), tmp_file)
+                os.replace(tmp_path, self._cache_file)
+            except (EnvironmentError, TypeError, ValueError):
+                os.remove(tmp_path)
+        except EnvironmentError:
+            pass
+
+
+def load_cib_ids():
+    """
+    Return dict {id type: [id]} read from the live CIB, empty dict on failure
+    """
+    try:
+        result = subprocess.run(
+            [settings.cibadmin, "--local", "--query"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=_CIBADMIN_TIMEOUT,
+            check=False,
+        )
+    except (EnvironmentError, subprocess.SubprocessError):
+        return {}
+    if result.returncode != 0:
+        return {}
+    try:
+        return get_cib_ids(ET.fromstring(result.stdout))
+    except ET.ParseError:
+        return {}
+
+
+def get_cib_ids(cib):
+    """
+    Return dict {id type: [id]} of ids which may be completed
+
+    xml.etree.ElementTree.Element cib -- CIB, lxml is not used to keep
+        completion fast
+    """
+    resource_ids = []
+    stonith_ids = []
+    for resources in cib.findall("./configuration/resources"):
+        for element in resources.iter():
+            if element.tag not in _RESOURCE_TAGS:
+                continue
+            if element.tag == "primitive" and element.get("class") == "stonith":
+                stonith_ids.append(element.get("id", ""))
+            else:
+                resource_ids.append(element.get("id", ""))
+    return {
+        ID_RESOURCE: sorted(resource_ids),
+        ID_STONITH: sorted(stonith_ids),
+        ID_TAG: sorted(
+            tag.get("id", "") for tag in cib.findall("./configuration/tags/tag")
+        ),
+        ID_NODE: sorted(
+            node.get("uname", "")
+            for node in cib.findall("./configuration/nodes/node")
+        ),
+    }
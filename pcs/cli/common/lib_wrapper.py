@@ -3,34 +3,11 @@ from collections import namedtuple
 from typing import Dict, Any
 
 from pcs.cli.common import middleware
-from pcs.lib.commands import (
-    acl,
-    alert,
-    booth,
-    cib_options,
-    cluster,
-    dr,
-    fencing_topology,
-    node,
-    pcsd,
-    qdevice,
-    quorum,
-    remote_node,
-    resource,
-    resource_agent,
-    sbd,
-    status,
-    stonith,
-    stonith_agent,
-    tag,
-)
-from pcs.lib.commands.constraint import (
-    colocation as constraint_colocation,
-    order as constraint_order,
-    ticket as constraint_ticket,
-)
-from pcs.lib.env import LibraryEnvironment
+from pcs.common.node_communicator import DebugCapture
 
+# Library command modules are imported when they are used for the first time.
+# Importing all of them takes a significant part of the run time of simple
+# commands.
 
 # Note: not properly typed
 _CACHE: Dict[Any, Any] = {}
@@ -41,6 +18,9 @@ def wrapper(dictionary):
 
 
 def cli_env_to_lib_env(cli_env):
+    # pylint: disable=import-outside-toplevel
+    from pcs.lib.env import LibraryEnvironment
+
     return LibraryEnvironment(
         logging.getLogger("pcs"),
         cli_env.report_processor,
@@ -51,6 +31,10 @@ def cli_env_to_lib_env(cli_env):
         booth_files_data=cli_env.booth,
         known_hosts_getter=cli_env.known_hosts_getter,
         request_timeout=cli_env.request_timeout,
+        request_debug_capture=(
+            DebugCapture.FULL if cli_env.debug else DebugCapture.NONE
+        ),
+        concurrent_queries=True,
     )
 
 
@@ -110,7 +94,10 @@ def get_module(env, middleware_factory, name):
 
 def load_module(env, middleware_factory, name):
     # pylint: disable=too-many-return-statements, too-many-branches
+    # pylint: disable=too-many-statements, import-outside-toplevel
     if name == "acl":
+        from pcs.lib.commands import acl
+
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -134,6 +121,8 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "alert":
+        from pcs.lib.commands import alert
+
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -149,6 +138,8 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "booth":
+        from pcs.lib.commands import booth
+
         return bind_all(
             env,
             middleware.build(
@@ -176,6 +167,8 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "cluster":
+        from pcs.lib.commands import cluster
+
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -194,6 +187,8 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "dr":
+        from pcs.lib.commands import dr
+
         return bind_all(
             env,
             middleware.build(middleware_factory.corosync_conf_existing),
@@ -206,6 +201,8 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "remote_node":
+        from pcs.lib.commands import remote_node
+
         return bind_all(
             env,
             middleware.build(
@@ -221,6 +218,10 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "constraint_colocation":
+        from pcs.lib.commands.constraint import (
+            colocation as constraint_colocation,
+        )
+
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -231,6 +232,8 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "constraint_order":
+        from pcs.lib.commands.constraint import order as constraint_order
+
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -241,6 +244,8 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "constraint_ticket":
+        from pcs.lib.commands.constraint import ticket as constraint_ticket
+
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -253,6 +258,8 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "fencing_topology":
+        from pcs.lib.commands import fencing_topology
+
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -268,6 +275,8 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "node":
+        from pcs.lib.commands import node
+
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -288,6 +297,8 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "pcsd":
+        from pcs.lib.commands import pcsd
+
         return bind_all(
             env,
             middleware.build(),
@@ -295,6 +306,8 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "qdevice":
+        from pcs.lib.commands import qdevice
+
         return bind_all(
             env,
             middleware.build(),
@@ -320,6 +333,8 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "quorum":
+        from pcs.lib.commands import quorum
+
         return bind_all(
             env,
             middleware.build(middleware_factory.corosync_conf_existing),
@@ -337,6 +352,8 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "resource_agent":
+        from pcs.lib.commands import resource_agent
+
         return bind_all(
             env,
             middleware.build(),
@@ -352,6 +369,8 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "resource":
+        from pcs.lib.commands import resource
+
         return bind_all(
             env,
             middleware.build(
@@ -384,6 +403,8 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "cib_options":
+        from pcs.lib.commands import cib_options
+
         return bind_all(
             env,
             middleware.build(middleware_factory.cib,),
@@ -400,6 +421,8 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "status":
+        from pcs.lib.commands import status
+
         return bind_all(
             env,
             middleware.build(
@@ -414,6 +437,8 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "stonith":
+        from pcs.lib.commands import stonith
+
         return bind_all(
             env,
             middleware.build(
@@ -430,6 +455,8 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "sbd":
+        from pcs.lib.commands import sbd
+
         return bind_all(
             env,
             middleware.build(),
@@ -450,6 +477,8 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "stonith_agent":
+        from pcs.lib.commands import stonith_agent
+
         return bind_all(
             env,
             middleware.build(),
@@ -460,6 +489,8 @@ def load_module(env, middleware_factory, name):
         )
 
     if name == "tag":
+        from pcs.lib.commands import tag
+
         return bind_all(
             env,
             middleware.build(middleware_factory.cib),
@@ -37,7 +37,10 @@ from pcs.common.node_communicator import (
     RequestData,
 )
 from pcs.common.str_tools import format_list
-from pcs.common.tools import Version
+from pcs.common.tools import (
+    Version,
+    get_backoff_intervals,
+)
 from pcs.lib import sbd as lib_sbd
 from pcs.lib.cib.tools import VERSION_FORMAT
 from pcs.lib.commands.remote_node import _destroy_pcmk_remote_env
@@ -60,6 +63,10 @@ import pcs.lib.pacemaker.live as lib_pacemaker
 
 # pylint: disable=too-many-branches, too-many-statements
 
+# Stopping pacemaker may take longer than the request timeout, stop requests
+# which timed out are sent again that many times.
+STOP_PACEMAKER_REPEAT_COUNT = 15
+
 
 def cluster_cib_upgrade_cmd(lib, argv, modifiers):
     """
@@ -265,9 +272,8 @@ def start_cluster_nodes(nodes):
     timeout = int(
         settings.default_request_timeout * math.ceil(len(nodes) / 8.0)
     )
-    utils.read_known_hosts_file()  # cache known hosts
     node_errors = parallel_for_nodes(
-        utils.startCluster, nodes, quiet=True, timeout=timeout
+        utils.start_cluster_request(timeout=timeout), nodes
     )
     if node_errors:
         utils.err(
@@ -287,13 +293,32 @@ def is_node_fully_started(node_status):
     )
 
 
-def wait_for_local_node_started(stop_at, interval):
+def _sleep_before_node_check(stop_at, interval_list):
+    """
+    Commandline options: no options
+    """
+    remaining = (stop_at - datetime.datetime.now()).total_seconds()
+    time.sleep(max(0, min(next(interval_list), remaining)))
+
+
+def _get_node_startup_intervals():
     """
     Commandline options: no options
     """
+    return get_backoff_intervals(
+        settings.wait_for_node_startup_interval_initial,
+        settings.wait_for_node_startup_interval_max,
+    )
+
+
+def wait_for_local_node_started(stop_at):
+    """
+    Commandline options: no options
+    """
+    interval_list = _get_node_startup_intervals()
     try:
         while True:
-            time.sleep(interval)
+            _sleep_before_node_check(stop_at, interval_list)
             node_status = lib_pacemaker.get_local_node_status(
                 utils.cmd_runner()
             )
@@ -316,28 +341,70 @@ def wait_for_local_node_started(stop_at, interval):
         )
 
 
-def wait_for_remote_node_started(node, stop_at, interval):
+def _get_remote_node_started_result(code, output):
+    """
+    Return a return code and a message if a node is done starting, else None
+
+    Commandline options: no options
     """
+    # HTTP error, permission denied or unable to auth
+    # there is no point in trying again as it won't get magically fixed
+    if code in [1, 3, 4]:
+        return 1, output
+    if code == 0:
+        try:
+            node_status = json.loads(output)
+            if is_node_fully_started(node_status):
+                return 0, "Started"
+        except (ValueError, KeyError):
+            # this won't get fixed either
+            return 1, "Unable to get node status"
+    return None
+
+
+def wait_for_remote_nodes_started(node_list, stop_at):
+    """
+    Wait for nodes to start, print results, return errors by nodes
+
     Commandline options:
       * --request-timeout - timeout for HTTP requests
     """
-    while True:
-        time.sleep(interval)
-        code, output = utils.getPacemakerNodeStatus(node)
-        # HTTP error, permission denied or unable to auth
-        # there is no point in trying again as it won't get magically fixed
-        if code in [1, 3, 4]:
-            return 1, output
-        if code == 0:
-            try:
-                node_status = json.loads(output)
-                if is_node_fully_started(node_status):
-                    return 0, "Started"
-            except (ValueError, KeyError):
-                # this won't get fixed either
-                return 1, "Unable to get node status"
-        if datetime.datetime.now() > stop_at:
-            return 1, "Waiting timeout"
+    node_errors = {}
+    waiting_nodes = list(node_list)
+    finished_nodes = []
+
+    def report(node, returncode, output):
+        result = _get_remote_node_started_result(returncode, output)
+        if result is None:
+            return
+        retval, message = result
+        message = "{0}: {1}".format(node, message)
+        print(message)
+        if retval != 0:
+            node_errors[node] = message
+        finished_nodes.append(node)
+
+    # All the waiting nodes are checked at once, so that only one set of
+    # requests is running at a time no matter how many nodes there are.
+    interval_list = _get_node_startup_intervals()
+    while waiting_nodes:
+        _sleep_before_node_check(stop_at, interval_list)
+        utils.send_node_requests(
+            utils.pacemaker_node_status_request(), waiting_nodes, report
+        )
+        if finished_nodes:
+            waiting_nodes = [
+                node for node in waiting_nodes if node not in finished_nodes
+            ]
+            finished_nodes = []
+            # some nodes have started, check the others more often again
+            interval_list = _get_node_startup_intervals()
+        if waiting_nodes and datetime.datetime.now() > stop_at:
+            for node in waiting_nodes:
+                node_errors[node] = "{0}: Waiting timeout".format(node)
+                print(node_errors[node])
+            break
+    return node_errors
 
 
 def wait_for_nodes_started(node_list, timeout=None):
@@ -347,20 +414,16 @@ def wait_for_nodes_started(node_list, timeout=None):
         node_list is not empty list
     """
     timeout = 60 * 15 if timeout is None else timeout
-    interval = 2
     stop_at = datetime.datetime.now() + datetime.timedelta(seconds=timeout)
     print("Waiting for node(s) to start...")
     if not node_list:
-        code, output = wait_for_local_node_started(stop_at, interval)
+        code, output = wait_for_local_node_started(stop_at)
         if code != 0:
             utils.err(output)
         else:
             print(output)
     else:
-        utils.read_known_hosts_file()  # cache known hosts
-        node_errors = parallel_for_nodes(
-            wait_for_remote_node_started, node_list, stop_at, interval
-        )
+        node_errors = wait_for_remote_nodes_started(node_list, stop_at)
         if node_errors:
             utils.err("unable to verify all nodes have started")
 
@@ -404,7 +467,6 @@ def stop_cluster_nodes(nodes):
             % "', '".join(sorted(unknown_nodes))
         )
 
-    utils.read_known_hosts_file()  # cache known hosts
     stopping_all = set(nodes) >= set(all_nodes)
     if "--force" not in utils.pcs_options and not stopping_all:
         error_list = []
@@ -443,7 +505,9 @@ def stop_cluster_nodes(nodes):
 
     was_error = False
     node_errors = parallel_for_nodes(
-        utils.repeat_if_timeout(utils.stopPacemaker), nodes, quiet=True
+        utils.stop_cluster_request(pacemaker=True, corosync=False),
+        nodes,
+        repeat_count=STOP_PACEMAKER_REPEAT_COUNT,
     )
     accessible_nodes = [
         node for node in nodes if node not in node_errors.keys()
@@ -459,7 +523,8 @@ def stop_cluster_nodes(nodes):
         print("{0}: Not stopping cluster - node is unreachable".format(node))
 
     node_errors = parallel_for_nodes(
-        utils.stopCorosync, accessible_nodes, quiet=True
+        utils.stop_cluster_request(pacemaker=False, corosync=True),
+        accessible_nodes,
     )
     if node_errors:
         utils.err(
@@ -546,7 +611,9 @@ def enable_cluster_nodes(nodes):
     Commandline options:
       * --request-timeout - timeout for HTTP requests
     """
-    error_list = utils.map_for_error_list(utils.enableCluster, nodes)
+    error_list = _send_enable_disable_requests(
+        utils.enable_cluster_request(), nodes
+    )
     if error_list:
         utils.err("unable to enable all nodes\n" + "\n".join(error_list))
 
@@ -556,28 +623,46 @@ def disable_cluster_nodes(nodes):
     Commandline options:
       * --request-timeout - timeout for HTTP requests
     """
-    error_list = utils.map_for_error_list(utils.disableCluster, nodes)
+    error_list = _send_enable_disable_requests(
+        utils.disable_cluster_request(), nodes
+    )
     if error_list:
         utils.err("unable to disable all nodes\n" + "\n".join(error_list))
 
 
+def _send_enable_disable_requests(node_request, nodes):
+    """
+    Commandline options:
+      * --request-timeout - timeout for HTTP requests
+    """
+    error_list = []
+
+    def report(node, returncode, output):
+        if returncode != 0:
+            error_list.append(output)
+        else:
+            print("{0}: {1}".format(node, output.strip()))
+
+    utils.send_node_requests(node_request, nodes, report)
+    return error_list
+
+
 def destroy_cluster(argv):
     """
     Commandline options:
       * --request-timeout - timeout for HTTP requests
     """
     if argv:
-        utils.read_known_hosts_file()  # cache known hosts
         # stop pacemaker and resources while cluster is still quorate
         nodes = argv
         node_errors = parallel_for_nodes(
-            utils.repeat_if_timeout(utils.stopPacemaker), nodes, quiet=True
+            utils.stop_cluster_request(pacemaker=True, corosync=False),
+            nodes,
+            repeat_count=STOP_PACEMAKER_REPEAT_COUNT,
         )
         # proceed with destroy regardless of errors
         # destroy will stop any remaining cluster daemons
-        node_errors = parallel_for_nodes(
-            utils.destroyCluster, nodes, quiet=True
-        )
+        node_errors = parallel_for_nodes(utils.destroy_cluster_request(), nodes)
         if node_errors:
             utils.err(
                 "unable to destroy cluster\n" + "\n".join(node_errors.values())
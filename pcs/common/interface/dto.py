@@ -1,15 +1,30 @@
+"""
+Conversion of data transfer objects to dicts and back.
+
+Converting a class is prepared once: types of its fields are resolved and
+a function converting each field is picked according to its type. Results are
+the same as of dataclasses.asdict, which converts everything it does not know
+about by copy.deepcopy, and dacite.from_dict, which inspects types of fields
+on each call.
+"""
+import collections.abc
+import copy
+from dataclasses import MISSING, fields, is_dataclass
+from enum import Enum
 from typing import (
     Any,
+    Callable,
     Iterable,
     Dict,
+    List,
+    Mapping,
+    Sequence,
+    Tuple,
     Type,
     TypeVar,
     Union,
+    get_type_hints,
 )
-from dataclasses import asdict, is_dataclass
-import dacite
-
-from pcs.common import types
 
 
 PrimitiveType = Union[str, int, float, bool, None]
@@ -30,27 +45,218 @@ class DataTransferObject:
 def to_dict(obj: DataTransferObject) -> DtoPayload:
     if not is_dataclass(obj):
         AssertionError()
-    return asdict(obj)
+    return _get_encoder(type(obj))(obj)
 
 
 DtoType = TypeVar("DtoType", bound=DataTransferObject)
 
 
 def from_dict(cls: Type[DtoType], data: DtoPayload) -> DtoType:
-    return dacite.from_dict(
-        data_class=cls,
-        data=data,
-        # NOTE: all enum types has to be listed here in key cast
-        # see: https://github.com/konradhalas/dacite#casting
-        config=dacite.Config(
-            cast=[
-                types.CibNvsetType,
-                types.CibRuleExpressionType,
-                types.DrRole,
-                types.ResourceRelationType,
-            ]
-        ),
-    )
+    """
+    Create a dto from a dict, raise KeyError, TypeError or ValueError if the
+    dict does not match the dto
+
+    cls -- dto class to create
+    data -- values of the dto fields, enums are created from their values
+    """
+    return _get_decoder(cls)(data)
+
+
+_Converter = Callable[[Any], Any]
+_IMMUTABLE_TYPES = frozenset((str, int, float, bool, type(None)))
+# python 3.6 reports typing classes as origins of generic types
+_SEQUENCE_ORIGINS = (collections.abc.Sequence, list, Sequence, List)
+_MAPPING_ORIGINS = (collections.abc.Mapping, dict, Mapping, Dict)
+_ENCODERS: Dict[type, _Converter] = {}
+_DECODERS: Dict[type, _Converter] = {}
+
+
+def _get_encoder(cls: type) -> _Converter:
+    try:
+        return _ENCODERS[cls]
+    except KeyError:
+        pass
+    field_encoders: List[Tuple[str, _Converter]] = []
+    field_names: List[str] = []
+
+    def encode(obj: Any) -> DtoPayload:
+        result = {name: getattr(obj, name) for name in field_names}
+        for name, encoder in field_encoders:
+            result[name] = encoder(result[name])
+        return result
+
+    # register the encoder first, dtos may contain themselves
+    _ENCODERS[cls] = encode
+    type_hints = get_type_hints(cls)
+    for field in fields(cls):
+        field_names.append(field.name)
+        encoder = _get_value_encoder(type_hints[field.name])
+        if encoder is not None:
+            field_encoders.append((field.name, encoder))
+    return encode
+
+
+def _get_value_encoder(value_type: Any) -> Union[_Converter, None]:
+    """
+    Return a function encoding a value of a type, None if it is kept as it is
+    """
+    value_type = _unwrap_new_type(value_type)
+    optional_type = _get_optional_type(value_type)
+    if optional_type is not None:
+        encoder = _get_value_encoder(optional_type)
+        if encoder is None:
+            return None
+        return lambda value: None if value is None else encoder(value)
+    if value_type in _IMMUTABLE_TYPES or _is_enum_type(value_type):
+        # deepcopy returns these as they are
+        return None
+    if _is_dataclass_type(value_type):
+        return _encode_any
+    origin = getattr(value_type, "__origin__", None)
+    if origin in _SEQUENCE_ORIGINS:
+        item_encoder = _get_value_encoder(value_type.__args__[0])
+        if item_encoder is None:
+            item_encoder = _encode_any
+        return lambda value: _encode_sequence(value, item_encoder)
+    if origin in _MAPPING_ORIGINS:
+        return _encode_mapping
+    return _encode_any
+
+
+def _encode_sequence(value: Any, item_encoder: _Converter) -> Any:
+    if type(value) in (list, tuple):
+        return type(value)(item_encoder(item) for item in value)
+    return _encode_any(value)
+
+
+def _encode_mapping(value: Any) -> Any:
+    if type(value) is dict:
+        return {
+            _encode_any(key): _encode_any(item) for key, item in value.items()
+        }
+    return _encode_any(value)
+
+
+def _encode_any(value: Any) -> Any:
+    # the same as dataclasses.asdict does with values of fields
+    if type(value) in _IMMUTABLE_TYPES:
+        return value
+    if is_dataclass(value) and not isinstance(value, type):
+        return _get_encoder(type(value))(value)
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        return type(value)(*[_encode_any(item) for item in value])
+    if isinstance(value, (list, tuple)):
+        return type(value)(_encode_any(item) for item in value)
+    if isinstance(value, dict):
+        return type(value)(
+            (_encode_any(key), _encode_any(item)) for key, item in value.items()
+        )
+    return copy.deepcopy(value)
+
+
+def _get_decoder(cls: type) -> _Converter:
+    try:
+        return _DECODERS[cls]
+    except KeyError:
+        pass
+    field_decoders: List[Tuple[str, _Converter]] = []
+    # fields with a default value may be missing in the data
+    optional_field_decoders: List[Tuple[str, _Converter]] = []
+
+    def decode(data: Any) -> Any:
+        if not isinstance(data, collections.abc.Mapping):
+            raise TypeError(
+                f"Expected a mapping to create '{cls.__name__}' from"
+            )
+        values = {name: decoder(data[name]) for name, decoder in field_decoders}
+        for name, decoder in optional_field_decoders:
+            if name in data:
+                values[name] = decoder(data[name])
+        return cls(**values)
+
+    # register the decoder first, dtos may contain themselves
+    _DECODERS[cls] = decode
+    type_hints = get_type_hints(cls)
+    for field in fields(cls):
+        if not field.init:
+            continue
+        decoder_list = (
+            field_decoders
+            if field.default is MISSING and field.default_factory is MISSING
+            else optional_field_decoders
+        )
+        decoder_list.append(
+            (field.name, _get_value_decoder(type_hints[field.name]))
+        )
+    return decode
+
+
+def _get_value_decoder(value_type: Any) -> _Converter:
+    # pylint: disable=too-many-return-statements
+    value_type = _unwrap_new_type(value_type)
+    optional_type = _get_optional_type(value_type)
+    if optional_type is not None:
+        decoder = _get_value_decoder(optional_type)
+        return lambda value: None if value is None else decoder(value)
+    if _is_enum_type(value_type):
+        return value_type
+    if _is_dataclass_type(value_type):
+        return _get_decoder(value_type)
+    if value_type in _IMMUTABLE_TYPES:
+        return lambda value: _check_type(value, value_type)
+    origin = getattr(value_type, "__origin__", None)
+    if origin in _SEQUENCE_ORIGINS:
+        item_decoder = _get_value_decoder(value_type.__args__[0])
+        return lambda value: _decode_sequence(value, item_decoder)
+    if origin in _MAPPING_ORIGINS:
+        item_decoder = _get_value_decoder(value_type.__args__[1])
+        return lambda value: _decode_mapping(value, item_decoder)
+    return lambda value: value
+
+
+def _decode_sequence(value: Any, item_decoder: _Converter) -> Any:
+    if isinstance(value, str) or not isinstance(
+        value, collections.abc.Sequence
+    ):
+        raise TypeError(f"Expected a sequence, got '{value!r}'")
+    return type(value)(item_decoder(item) for item in value)
+
+
+def _decode_mapping(value: Any, item_decoder: _Converter) -> Any:
+    if not isinstance(value, collections.abc.Mapping):
+        raise TypeError(f"Expected a mapping, got '{value!r}'")
+    return type(value)((key, item_decoder(item)) for key, item in value.items())
+
+
+def _check_type(value: Any, value_type: type) -> Any:
+    if not isinstance(value, value_type):
+        raise TypeError(
+            f"Expected a value of type '{value_type.__name__}', "
+            f"got '{value!r}'"
+        )
+    return value
+
+
+def _unwrap_new_type(value_type: Any) -> Any:
+    while hasattr(value_type, "__supertype__"):
+        value_type = value_type.__supertype__
+    return value_type
+
+
+def _get_optional_type(value_type: Any) -> Any:
+    if getattr(value_type, "__origin__", None) is Union:
+        arg_list = [arg for arg in value_type.__args__ if arg is not type(None)]
+        if len(arg_list) == 1 and len(value_type.__args__) == 2:
+            return arg_list[0]
+    return None
+
+
+def _is_enum_type(value_type: Any) -> bool:
+    return isinstance(value_type, type) and issubclass(value_type, Enum)
+
+
+def _is_dataclass_type(value_type: Any) -> bool:
+    return isinstance(value_type, type) and is_dataclass(value_type)
 
 
 class ImplementsToDto:
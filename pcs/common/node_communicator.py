@@ -1,7 +1,13 @@
 import base64
+import copy
+import heapq
 import io
+import itertools
+import math
 import re
-from collections import namedtuple
+import time
+from collections import deque, namedtuple
+from enum import IntEnum, auto
 from urllib.parse import urlencode
 
 # We should ignore SIGPIPE when using pycurl.NOSIGNAL - see the libcurl tutorial
@@ -16,6 +22,7 @@ except ImportError:
 from pcs import settings
 from pcs.common import pcs_pycurl as pycurl
 from pcs.common.host import Destination
+from pcs.common.tools import AutoNameEnum
 
 
 def _find_value_for_possible_keys(value_dict, possible_key_list):
@@ -95,21 +102,53 @@ class RequestTarget(
         return self.dest_list[0].addr
 
 
+class RequestPriority(IntEnum):
+    """
+    Priority classes of requests. Requests with a lower value are started
+    first when the number of parallel requests is limited.
+    """
+
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+class DebugCapture(AutoNameEnum):
+    """
+    What curl debug info is captured for requests. Capturing is done by a
+    python callback called for each chunk of transferred data, so it is not
+    enabled unless debug output has been requested.
+    """
+
+    # nothing is captured, responses have empty debug info
+    NONE = auto()
+    # curl info messages and HTTP headers
+    HEADERS = auto()
+    # curl info messages, HTTP headers and request and response bodies
+    FULL = auto()
+
+
 class Request:
     """
     This class represents request. With usage of RequestTarget it provides
     interface for getting next available host to make request on.
     """
 
-    def __init__(self, request_target, request_data):
+    def __init__(
+        self, request_target, request_data, priority=RequestPriority.NORMAL
+    ):
         """
         RequestTarget request_target
         RequestData request_data
+        RequestPriority priority -- order in which waiting requests are started
         """
         self._target = request_target
         self._data = request_data
+        self._priority = priority
         self._current_dest_iterator = iter(self._target.dest_list)
         self._current_dest = None
+        # RequestHedge the request is one of the alternatives of, if any
+        self.hedge = None
         self.next_dest()
 
     def next_dest(self):
@@ -119,6 +158,18 @@ class Request:
         """
         self._current_dest = next(self._current_dest_iterator)
 
+    def prefer_dest(self, dest):
+        """
+        Restart iterating host connections from the specified one. Other
+        connections of the target follow in their original order.
+
+        Destination dest -- one of the target's host connections
+        """
+        self._current_dest_iterator = iter(
+            [dest] + [item for item in self._target.dest_list if item != dest]
+        )
+        self.next_dest()
+
     @property
     def url(self):
         """
@@ -152,6 +203,10 @@ class Request:
     def action(self):
         return self._data.action
 
+    @property
+    def priority(self):
+        return self._priority
+
     @property
     def cookies(self):
         cookies = {}
@@ -163,6 +218,49 @@ class Request:
         return str("Request({0}, {1})").format(self._target, self._data)
 
 
+class RequestHedge:
+    """
+    Alternative requests of which only one needs to be answered, e.g. the same
+    read-only query sent to several nodes. The requests are run one by one and
+    a communicator also starts the next one if the running requests have not
+    answered in a hedge delay. Once the owner of the hedge has got the answer
+    it needs, it finishes the hedge and the requests still running are
+    cancelled.
+    """
+
+    def __init__(self, request_list):
+        """
+        list request_list -- Request objects in the order to be tried
+        """
+        self._waiting_list = list(request_list)
+        for request in self._waiting_list:
+            request.hedge = self
+        self._is_finished = False
+
+    @property
+    def is_finished(self):
+        return self._is_finished
+
+    @property
+    def has_waiting(self):
+        return not self._is_finished and bool(self._waiting_list)
+
+    def get_next_list(self):
+        """
+        Return a list containing the next request to try, an empty list if
+        there is none
+        """
+        if not self.has_waiting:
+            return []
+        return [self._waiting_list.pop(0)]
+
+    def finish(self):
+        """
+        Do not start other requests, cancel the running ones
+        """
+        self._is_finished = True
+
+
 class Response:
     """
     This class represents response for request which is available as instance
@@ -249,12 +347,307 @@ class Response:
         )
 
 
+class ConnectionReuseStats(
+    namedtuple("ConnectionReuseStats", ["request_count", "connect_count"])
+):
+    """
+    Connection usage of one host: how many requests have been finished and how
+    many new connections had to be established to perform them
+    """
+
+    @property
+    def reused_count(self):
+        return max(self.request_count - self.connect_count, 0)
+
+
+class ConnectionPool:
+    """
+    Transport state which outlives a single Communicator. It holds a curl share
+    handle, so all requests performed through the pool share DNS cache, TLS
+    sessions and open keep-alive connections. Several commands run in a row
+    against the same nodes therefore do not need a new TCP and TLS handshake
+    for each request.
+    """
+
+    _shared_data_list = (
+        pycurl.LOCK_DATA_DNS,
+        pycurl.LOCK_DATA_SSL_SESSION,
+        pycurl.LOCK_DATA_CONNECT,
+    )
+    # how many recent response times of each action are kept
+    _response_time_history_size = 100
+    # how many response times of an action are needed to compute percentiles
+    _response_time_min_count = 20
+
+    def __init__(self):
+        self._share_handle = None
+        self._stats = {}
+        self._preferred_dest = {}
+        self._response_times = {}
+
+    @property
+    def share_handle(self):
+        if self._share_handle is None:
+            self._share_handle = pycurl.CurlShare()
+            for shared_data in self._shared_data_list:
+                try:
+                    self._share_handle.setopt(pycurl.SH_SHARE, shared_data)
+                except pycurl.error:
+                    # Older libcurl does not support sharing some of the data
+                    # (e.g. connections are shareable since 7.57.0). Share
+                    # whatever is possible.
+                    pass
+        return self._share_handle
+
+    def setup_handle(self, handle):
+        """
+        Make an easy handle use the pool
+
+        pycurl.Curl handle -- curl easy handle to be set up
+        """
+        handle.setopt(pycurl.SHARE, self.share_handle)
+        handle.setopt(pycurl.TCP_KEEPALIVE, 1)
+
+    def record_response(self, response):
+        """
+        Update connection reuse statistics of the response's host
+
+        Response response -- finished response
+        """
+        connect_count = response.handle.getinfo(pycurl.NUM_CONNECTS)
+        stats = self._stats.get(
+            response.request.host_label, ConnectionReuseStats(0, 0)
+        )
+        self._stats[response.request.host_label] = ConnectionReuseStats(
+            stats.request_count + 1,
+            stats.connect_count + (connect_count if connect_count else 0),
+        )
+        total_time = response.handle.getinfo(pycurl.TOTAL_TIME)
+        if response.was_connected and total_time is not None:
+            self._response_times.setdefault(
+                response.request.action,
+                deque(maxlen=self._response_time_history_size),
+            ).append(total_time)
+
+    def get_response_time_percentile(self, action, percentile):
+        """
+        Return a percentile of recent response times of an action in seconds,
+        None if not enough requests have been finished yet
+
+        string action -- action of requests
+        int percentile -- percentile to compute, 1 - 100
+        """
+        time_list = sorted(self._response_times.get(action, ()))
+        if len(time_list) < self._response_time_min_count:
+            return None
+        index = math.ceil(len(time_list) * percentile / 100) - 1
+        return time_list[min(max(index, 0), len(time_list) - 1)]
+
+    def get_stats(self):
+        """
+        Return a dict: host label -> ConnectionReuseStats
+        """
+        return dict(self._stats)
+
+    def get_preferred_dest(self, host_label):
+        """
+        Return a host connection which worked last time or None
+        """
+        return self._preferred_dest.get(host_label)
+
+    def set_preferred_dest(self, host_label, dest):
+        """
+        Remember a host connection to be tried first next time
+
+        string host_label -- host identifier
+        Destination dest -- host connection which worked
+        """
+        self._preferred_dest[host_label] = dest
+
+    def close(self):
+        """
+        Drop all cached connections and sessions
+        """
+        if self._share_handle is not None:
+            self._share_handle.close()
+            self._share_handle = None
+
+
+_process_connection_pool = None
+
+
+def get_process_connection_pool():
+    """
+    Return a connection pool shared by all communicator factories in the
+    current process
+    """
+    global _process_connection_pool  # pylint: disable=global-statement
+    if _process_connection_pool is None:
+        _process_connection_pool = ConnectionPool()
+    return _process_connection_pool
+
+
+class RequestScheduler:
+    """
+    Decides when requests added to a Communicator are actually started. It
+    limits the number of requests running in parallel, both in total and per
+    host address. Requests over the limits wait until a running request
+    finishes.
+    Waiting requests are started in order of their priority, retried requests
+    go before new requests of the same priority.
+    """
+
+    def __init__(self, max_parallel=None, max_parallel_per_host=None):
+        """
+        int max_parallel -- max number of running requests, None = unlimited
+        int max_parallel_per_host -- max number of running requests to one
+            host address, None = unlimited
+        """
+        self._max_parallel = max_parallel
+        self._max_parallel_per_host = max_parallel_per_host
+        self._waiting = []
+        self._counter = itertools.count()
+        self._running_count = 0
+        self._running_per_host = {}
+
+    @property
+    def waiting_count(self):
+        return len(self._waiting)
+
+    @property
+    def running_count(self):
+        return self._running_count
+
+    def add(self, handle, is_retry=False):
+        """
+        Put a handle to the queue of requests waiting to be started
+
+        pycurl.Curl handle -- curl easy handle of the request
+        bool is_retry -- True if the request has already been tried before
+        """
+        heapq.heappush(
+            self._waiting,
+            (
+                handle.request_obj.priority,
+                0 if is_retry else 1,
+                next(self._counter),
+                handle,
+            ),
+        )
+
+    def cancel(self, handle):
+        """
+        Remove a waiting or running request. Return True if it was running.
+
+        pycurl.Curl handle -- curl easy handle of the request
+        """
+        for index, item in enumerate(self._waiting):
+            if item[-1] is handle:
+                del self._waiting[index]
+                heapq.heapify(self._waiting)
+                return False
+        self.finished(handle)
+        return True
+
+    def pop_startable(self):
+        """
+        Return a list of handles which can be started now and mark them as
+        running
+        """
+        startable_list = []
+        blocked_list = []
+        while self._waiting and not self._is_limit_reached(
+            self._max_parallel, self._running_count
+        ):
+            item = heapq.heappop(self._waiting)
+            host = item[-1].request_obj.dest
+            if self._is_limit_reached(
+                self._max_parallel_per_host,
+                self._running_per_host.get(host, 0),
+            ):
+                blocked_list.append(item)
+                continue
+            self._running_count += 1
+            self._running_per_host[host] = (
+                self._running_per_host.get(host, 0) + 1
+            )
+            startable_list.append(item[-1])
+        for item in blocked_list:
+            heapq.heappush(self._waiting, item)
+        return startable_list
+
+    def finished(self, handle):
+        """
+        Mark a running request as finished to free its slot
+
+        pycurl.Curl handle -- curl easy handle of the finished request
+        """
+        host = handle.request_obj.dest
+        self._running_count -= 1
+        self._running_per_host[host] -= 1
+        if not self._running_per_host[host]:
+            del self._running_per_host[host]
+
+    @staticmethod
+    def _is_limit_reached(limit, count):
+        return bool(limit) and count >= limit
+
+
 class NodeCommunicatorFactory:
-    def __init__(self, communicator_logger, user, groups, request_timeout):
+    def __init__(
+        self,
+        communicator_logger,
+        user,
+        groups,
+        request_timeout,
+        connection_pool=None,
+        max_parallel_requests=None,
+        max_parallel_requests_per_host=None,
+        address_race_delay=None,
+        debug_capture=DebugCapture.NONE,
+        hedge_delay=None,
+        hedge_delay_percentile=None,
+    ):
+        # pylint: disable=too-many-arguments
         self._logger = communicator_logger
         self._user = user
         self._groups = groups
         self._request_timeout = request_timeout
+        self._connection_pool = (
+            connection_pool
+            if connection_pool is not None
+            else get_process_connection_pool()
+        )
+        self._max_parallel_requests = (
+            max_parallel_requests
+            if max_parallel_requests is not None
+            else settings.node_communication_max_parallel_requests
+        )
+        self._max_parallel_requests_per_host = (
+            max_parallel_requests_per_host
+            if max_parallel_requests_per_host is not None
+            else settings.node_communication_max_parallel_requests_per_host
+        )
+        self._address_race_delay = (
+            address_race_delay
+            if address_race_delay is not None
+            else settings.node_communication_address_race_delay
+        )
+        self._debug_capture = debug_capture
+        self._hedge_delay = (
+            hedge_delay
+            if hedge_delay is not None
+            else settings.node_communication_hedge_delay
+        )
+        self._hedge_delay_percentile = (
+            hedge_delay_percentile
+            if hedge_delay_percentile is not None
+            else settings.node_communication_hedge_delay_percentile
+        )
+
+    @property
+    def connection_pool(self):
+        return self._connection_pool
 
     def get_communicator(self, request_timeout=None):
         return self.get_simple_communicator(request_timeout=request_timeout)
@@ -262,39 +655,99 @@ class NodeCommunicatorFactory:
     def get_simple_communicator(self, request_timeout=None):
         timeout = request_timeout if request_timeout else self._request_timeout
         return Communicator(
-            self._logger, self._user, self._groups, request_timeout=timeout
+            self._logger,
+            self._user,
+            self._groups,
+            request_timeout=timeout,
+            connection_pool=self._connection_pool,
+            max_parallel_requests=self._max_parallel_requests,
+            max_parallel_requests_per_host=(
+                self._max_parallel_requests_per_host
+            ),
+            debug_capture=self._debug_capture,
+            hedge_delay=self._hedge_delay,
+            hedge_delay_percentile=self._hedge_delay_percentile,
         )
 
     def get_multiaddress_communicator(self, request_timeout=None):
         timeout = request_timeout if request_timeout else self._request_timeout
         return MultiaddressCommunicator(
-            self._logger, self._user, self._groups, request_timeout=timeout
+            self._logger,
+            self._user,
+            self._groups,
+            request_timeout=timeout,
+            connection_pool=self._connection_pool,
+            max_parallel_requests=self._max_parallel_requests,
+            max_parallel_requests_per_host=(
+                self._max_parallel_requests_per_host
+            ),
+            address_race_delay=self._address_race_delay,
+            debug_capture=self._debug_capture,
+            hedge_delay=self._hedge_delay,
+            hedge_delay_percentile=self._hedge_delay_percentile,
         )
 
 
+class _HedgeState:
+    # pylint: disable=too-few-public-methods
+    def __init__(self, delay):
+        self.delay = delay
+        self.handle_list = []
+        self.next_start = None
+
+
 class Communicator:
     """
     This class provides simple interface for making parallel requests.
     The instances of this class are not thread-safe! It is intended to use it
     only in a single thread. Use an unique instance for each thread.
+
+    If hedge_delay is set, requests belonging to a RequestHedge which have not
+    answered in the delay are hedged by starting the next request of the
+    hedge. If hedge_delay_percentile is set as well, the delay is the
+    percentile of recent response times of the same action kept in the
+    connection pool, once there are enough of them.
     """
 
     curl_multi_select_timeout_default = 0.8  # in seconds
 
-    def __init__(self, communicator_logger, user, groups, request_timeout=None):
+    def __init__(
+        self,
+        communicator_logger,
+        user,
+        groups,
+        request_timeout=None,
+        connection_pool=None,
+        max_parallel_requests=None,
+        max_parallel_requests_per_host=None,
+        debug_capture=DebugCapture.NONE,
+        hedge_delay=None,
+        hedge_delay_percentile=None,
+    ):
+        # pylint: disable=too-many-arguments
         self._logger = communicator_logger
+        self._debug_capture = debug_capture
+        self._hedge_delay = hedge_delay
+        self._hedge_delay_percentile = hedge_delay_percentile
         self._auth_cookies = _get_auth_cookies(user, groups)
         self._request_timeout = (
             request_timeout
             if request_timeout is not None
             else settings.default_request_timeout
         )
+        self._connection_pool = connection_pool
+        self._scheduler = RequestScheduler(
+            max_parallel_requests, max_parallel_requests_per_host
+        )
         self._multi_handle = pycurl.CurlMulti()
         self._is_running = False
         # This is used just for storing references of curl easy handles.
         # We need to have references for all the handles, so they don't be
         # cleaned up by the garbage collector.
         self._easy_handle_list = []
+        self._cancelled_handle_set = set()
+        self._hedge_dict = {}
+        self._hedge_by_handle = {}
 
     def add_requests(self, request_list):
         """
@@ -303,18 +756,61 @@ class Communicator:
         getting responses from generator.  Requests are not performed after
         calling this method, but only when generator returned by start_loop
         method is in progress (returned at least one response and not raised
-        StopIteration exception).
+        StopIteration exception). Requests over the parallel requests limits
+        wait in the queue until running requests finish.
 
         list request_list -- Request objects to add to the queue
         """
+        self._add_requests(request_list)
+
+    def _add_requests(self, request_list, is_retry=False):
+        handle_list = []
         for request in request_list:
             handle = _create_request_handle(
                 request, self._auth_cookies, self._request_timeout,
             )
+            _setup_debug_capture(handle, self._debug_capture)
+            if self._connection_pool is not None:
+                self._connection_pool.setup_handle(handle)
             self._easy_handle_list.append(handle)
+            self._scheduler.add(handle, is_retry=is_retry)
+            if request.hedge is not None:
+                self.__add_hedge_handle(request.hedge, handle)
+            handle_list.append(handle)
+        if self._is_running:
+            self._start_waiting_requests()
+        return handle_list
+
+    def _start_waiting_requests(self):
+        for handle in self._scheduler.pop_startable():
             self._multi_handle.add_handle(handle)
-            if self._is_running:
-                self._logger.log_request_start(request)
+            self._logger.log_request_start(handle.request_obj)
+
+    def _cancel_handles(self, handle_list):
+        """
+        Stop waiting or running requests, no responses are returned for them
+
+        list handle_list -- curl easy handles of unfinished requests
+        """
+        for handle in handle_list:
+            if self._scheduler.cancel(handle):
+                self._multi_handle.remove_handle(handle)
+            self._easy_handle_list.remove(handle)
+            self._cancelled_handle_set.add(handle)
+            self.__remove_hedge_handle(handle)
+
+    def _get_timer_timeout(self):
+        """
+        Return number of seconds until _process_timers needs to be called or
+        None if there is no timer
+        """
+        # pylint: disable=no-self-use
+        return None
+
+    def _process_timers(self):
+        """
+        Do time dependent actions, called on each iteration of the loop
+        """
 
     def start_loop(self):
         """
@@ -342,27 +838,114 @@ class Communicator:
         if self._is_running:
             raise AssertionError("Method start_loop already running")
         self._is_running = True
-        for handle in self._easy_handle_list:
-            self._logger.log_request_start(handle.request_obj)
+        self._start_waiting_requests()
 
         finished_count = 0
         while finished_count < len(self._easy_handle_list):
+            self._process_timers()
+            self.__process_hedge_timers()
             self.__multi_perform()
-            self.__wait_for_multi_handle()
             response_list = self.__get_all_ready_responses()
+            if not response_list:
+                # Wait only if no request has finished yet. A request may have
+                # finished while the previous responses were being processed,
+                # waiting for a socket activity would delay its response.
+                self.__wait_for_multi_handle()
+                continue
             for response in response_list:
+                if response.handle in self._cancelled_handle_set:
+                    # the request has been cancelled while processing
+                    # a previous response, its handle is already removed
+                    continue
+                finished_count += 1
                 # free up memory for next usage of this Communicator instance
                 self._multi_handle.remove_handle(response.handle)
+                self._scheduler.finished(response.handle)
+                if self._connection_pool is not None:
+                    self._connection_pool.record_response(response)
+                    if self._debug_capture != DebugCapture.NONE:
+                        _write_connection_reuse_stats(
+                            response.handle, self._connection_pool.get_stats()
+                        )
                 self._logger.log_response(response)
+                self.__remove_hedge_handle(response.handle)
                 yield response
+                # the response may have been the answer a hedge was waiting for
+                self.__cancel_finished_hedges()
+                # A slot has been freed, start a waiting request if any. This
+                # is done after the response has been processed, so requests
+                # added in the meantime compete for the slot by their priority.
+                self._start_waiting_requests()
                 # if something was added to the queue in the meantime, run it
                 # immediately, so we don't need to wait until all responses will
                 # be processed
                 self.__multi_perform()
-            finished_count += len(response_list)
         self._easy_handle_list = []
+        self._cancelled_handle_set = set()
+        self._hedge_dict = {}
+        self._hedge_by_handle = {}
         self._is_running = False
 
+    def __add_hedge_handle(self, hedge, handle):
+        state = self._hedge_dict.get(hedge)
+        if state is None:
+            state = _HedgeState(self.__get_hedge_delay(handle.request_obj))
+            self._hedge_dict[hedge] = state
+        state.handle_list.append(handle)
+        self._hedge_by_handle[handle] = hedge
+        if state.delay is not None:
+            state.next_start = time.monotonic() + state.delay
+
+    def __remove_hedge_handle(self, handle):
+        hedge = self._hedge_by_handle.pop(handle, None)
+        if hedge is not None:
+            self._hedge_dict[hedge].handle_list.remove(handle)
+
+    def __get_hedge_delay(self, request):
+        if self._hedge_delay is None:
+            return None
+        if self._hedge_delay_percentile and self._connection_pool is not None:
+            delay = self._connection_pool.get_response_time_percentile(
+                request.action, self._hedge_delay_percentile
+            )
+            if delay is not None:
+                return delay
+        return self._hedge_delay
+
+    def __get_hedge_start_list(self):
+        # a hedge is only waiting for its running requests to answer, nothing
+        # is started when they have already failed
+        return [
+            (state.next_start, hedge)
+            for hedge, state in self._hedge_dict.items()
+            if state.next_start is not None
+            and state.handle_list
+            and hedge.has_waiting
+        ]
+
+    def __process_hedge_timers(self):
+        now = time.monotonic()
+        for next_start, hedge in self.__get_hedge_start_list():
+            if next_start <= now:
+                self._hedge_dict[hedge].next_start = None
+                self.add_requests(hedge.get_next_list())
+
+    def __cancel_finished_hedges(self):
+        for hedge, state in list(self._hedge_dict.items()):
+            if hedge.is_finished:
+                self._cancel_handles(list(state.handle_list))
+                del self._hedge_dict[hedge]
+
+    def __get_timer_timeout(self):
+        timeout_list = [
+            max(next_start - time.monotonic(), 0)
+            for next_start, _ in self.__get_hedge_start_list()
+        ]
+        timer_timeout = self._get_timer_timeout()
+        if timer_timeout is not None:
+            timeout_list.append(timer_timeout)
+        return min(timeout_list) if timeout_list else None
+
     def __get_all_ready_responses(self):
         response_list = []
         repeat = True
@@ -401,33 +984,181 @@ class Communicator:
                 # curl don't have timeout set, so we can use our default
                 else self.curl_multi_select_timeout_default
             )
+            timer_timeout = self.__get_timer_timeout()
+            if timer_timeout is not None and timer_timeout < timeout:
+                # wake up in time to run timers
+                self._multi_handle.select(timer_timeout)
+                return
             # when value returned from select is -1, it timed out, so we can
             # wait
             need_to_wait = self._multi_handle.select(timeout) == -1
 
 
+class _AddressRace:
+    # pylint: disable=too-few-public-methods
+    def __init__(self, request):
+        self.request = request
+        self.waiting_dest_list = [request.dest] + [
+            dest for dest in request.target.dest_list if dest != request.dest
+        ]
+        self.handle_list = []
+        self.next_start = None
+
+
 class MultiaddressCommunicator(Communicator):
     """
     Class with same interface as Communicator. In difference with Communicator,
     it takes advantage of multiple hosts in RequestTarget. So if it is not
     possible to connect to target using first hostname, it will use next one
     until connection will be successful or there is no host left.
+
+    If address_race_delay is set, the communicator does not wait for an address
+    to fail before trying the next one. It starts the next address if the
+    previous one has not answered in address_race_delay seconds. The first
+    address to answer is used, requests to the other addresses are cancelled.
+
+    The address which worked is remembered in the connection pool and it is
+    tried first next time.
     """
 
+    def __init__(
+        self,
+        communicator_logger,
+        user,
+        groups,
+        request_timeout=None,
+        connection_pool=None,
+        max_parallel_requests=None,
+        max_parallel_requests_per_host=None,
+        address_race_delay=None,
+        debug_capture=DebugCapture.NONE,
+        hedge_delay=None,
+        hedge_delay_percentile=None,
+    ):
+        # pylint: disable=too-many-arguments
+        super().__init__(
+            communicator_logger,
+            user,
+            groups,
+            request_timeout=request_timeout,
+            connection_pool=connection_pool,
+            max_parallel_requests=max_parallel_requests,
+            max_parallel_requests_per_host=max_parallel_requests_per_host,
+            debug_capture=debug_capture,
+            hedge_delay=hedge_delay,
+            hedge_delay_percentile=hedge_delay_percentile,
+        )
+        self._address_race_delay = address_race_delay
+        self._race_dict = {}
+        self._race_by_handle = {}
+
+    def add_requests(self, request_list):
+        if self._connection_pool is not None:
+            for request in request_list:
+                preferred_dest = self._connection_pool.get_preferred_dest(
+                    request.host_label
+                )
+                if (
+                    preferred_dest in request.target.dest_list
+                    and preferred_dest != request.dest
+                ):
+                    request.prefer_dest(preferred_dest)
+        if not self._address_race_delay:
+            super().add_requests(request_list)
+            return
+        for request in request_list:
+            race = _AddressRace(request)
+            self._race_dict[request] = race
+            self.__start_race_attempt(race)
+
     def start_loop(self):
         for response in super(MultiaddressCommunicator, self).start_loop():
+            race = self._race_by_handle.pop(response.handle, None)
+            if race is not None:
+                yield from self.__process_race_response(race, response)
+                continue
             if response.was_connected:
+                self.__remember_dest(response.request)
                 yield response
                 continue
             try:
                 previous_dest = response.request.dest
                 response.request.next_dest()
                 self._logger.log_retry(response, previous_dest)
-                self.add_requests([response.request])
+                self._add_requests([response.request], is_retry=True)
             except StopIteration:
                 self._logger.log_no_more_addresses(response)
                 yield response
 
+    def _cancel_handles(self, handle_list):
+        handle_list = list(handle_list)
+        super()._cancel_handles(handle_list)
+        # requests cancelled as a whole, e.g. by a hedge, end their races
+        for handle in handle_list:
+            race = self._race_by_handle.pop(handle, None)
+            if race is not None:
+                race.handle_list.remove(handle)
+                if not race.handle_list:
+                    self._race_dict.pop(race.request, None)
+
+    def _get_timer_timeout(self):
+        start_list = [
+            race.next_start
+            for race in self._race_dict.values()
+            if race.next_start is not None
+        ]
+        if not start_list:
+            return None
+        return max(min(start_list) - time.monotonic(), 0)
+
+    def _process_timers(self):
+        now = time.monotonic()
+        for race in list(self._race_dict.values()):
+            if race.next_start is not None and race.next_start <= now:
+                self.__start_race_attempt(race)
+
+    def __start_race_attempt(self, race, attempt=None, is_retry=False):
+        if attempt is None:
+            attempt = copy.copy(race.request)
+        attempt.prefer_dest(race.waiting_dest_list.pop(0))
+        race.next_start = (
+            time.monotonic() + self._address_race_delay
+            if race.waiting_dest_list
+            else None
+        )
+        handle = self._add_requests([attempt], is_retry=is_retry)[0]
+        race.handle_list.append(handle)
+        self._race_by_handle[handle] = race
+
+    def __process_race_response(self, race, response):
+        race.handle_list.remove(response.handle)
+        attempt = response.request
+        if not response.was_connected:
+            if race.waiting_dest_list:
+                # no need to wait for the delay, try the next address now
+                previous_dest = attempt.dest
+                self.__start_race_attempt(race, attempt, is_retry=True)
+                self._logger.log_retry(response, previous_dest)
+                return
+            if race.handle_list:
+                # other addresses are still being tried
+                return
+        self._cancel_handles(race.handle_list)
+        self._race_dict.pop(race.request, None)
+        race.request.prefer_dest(attempt.dest)
+        response.handle.request_obj = race.request
+        if response.was_connected:
+            self.__remember_dest(race.request)
+        else:
+            self._logger.log_no_more_addresses(response)
+        yield response
+
+    def __remember_dest(self, request):
+        if self._connection_pool is not None:
+            self._connection_pool.set_preferred_dest(
+                request.host_label, request.dest
+            )
+
 
 class CommunicatorLoggerInterface:
     def log_request_start(self, request):
@@ -469,38 +1200,19 @@ def _get_auth_cookies(user, group_list):
 def _create_request_handle(request, cookies, timeout):
     """
     Returns Curl object (easy handle) which is set up witc specified parameters.
+    No debug info is captured, use _setup_debug_capture to enable it.
 
     Request request -- request specification
     dict cookies -- cookies to add to request
     int timeot -- request timeout
     """
-    # it is not possible to take this callback out of this function, because of
-    # curl API
-    def __debug_callback(data_type, debug_data):
-        # pylint: disable=no-member
-        prefixes = {
-            pycurl.DEBUG_TEXT: b"* ",
-            pycurl.DEBUG_HEADER_IN: b"< ",
-            pycurl.DEBUG_HEADER_OUT: b"> ",
-            pycurl.DEBUG_DATA_IN: b"<< ",
-            pycurl.DEBUG_DATA_OUT: b">> ",
-        }
-        if data_type in prefixes:
-            debug_output.write(prefixes[data_type])
-            debug_output.write(debug_data)
-            if not debug_data.endswith(b"\n"):
-                debug_output.write(b"\n")
-
     output = io.BytesIO()
-    debug_output = io.BytesIO()
     cookies.update(request.cookies)
     handle = pycurl.Curl()
     handle.setopt(pycurl.PROTOCOLS, pycurl.PROTO_HTTPS)
     handle.setopt(pycurl.TIMEOUT, timeout)
     handle.setopt(pycurl.URL, request.url.encode("utf-8"))
     handle.setopt(pycurl.WRITEFUNCTION, output.write)
-    handle.setopt(pycurl.VERBOSE, 1)
-    handle.setopt(pycurl.DEBUGFUNCTION, __debug_callback)
     handle.setopt(pycurl.SSL_VERIFYHOST, 0)
     handle.setopt(pycurl.SSL_VERIFYPEER, 0)
     handle.setopt(pycurl.NOSIGNAL, 1)  # required for multi-threading
@@ -516,10 +1228,60 @@ def _create_request_handle(request, cookies, timeout):
     # https://github.com/pycurl/pycurl/blob/REL_7_19_0_3/examples/retriever-multi.py
     handle.request_obj = request
     handle.output_buffer = output
-    handle.debug_buffer = debug_output
+    handle.debug_buffer = io.BytesIO()
     return handle
 
 
+def _setup_debug_capture(handle, debug_capture):
+    """
+    Make curl write debug info of the request to the debug buffer of the handle
+
+    Curl handle -- easy handle created by _create_request_handle
+    DebugCapture debug_capture -- what debug info to capture
+    """
+    # pylint: disable=no-member
+    if debug_capture == DebugCapture.NONE:
+        return
+    prefixes = {
+        pycurl.DEBUG_TEXT: b"* ",
+        pycurl.DEBUG_HEADER_IN: b"< ",
+        pycurl.DEBUG_HEADER_OUT: b"> ",
+    }
+    if debug_capture == DebugCapture.FULL:
+        prefixes[pycurl.DEBUG_DATA_IN] = b"<< "
+        prefixes[pycurl.DEBUG_DATA_OUT] = b">> "
+    debug_output = handle.debug_buffer
+
+    # it is not possible to take this callback out of this function, because of
+    # curl API
+    def __debug_callback(data_type, debug_data):
+        if data_type in prefixes:
+            debug_output.write(prefixes[data_type])
+            debug_output.write(debug_data)
+            if not debug_data.endswith(b"\n"):
+                debug_output.write(b"\n")
+
+    handle.setopt(pycurl.VERBOSE, 1)
+    handle.setopt(pycurl.DEBUGFUNCTION, __debug_callback)
+
+
+def _write_connection_reuse_stats(handle, stats_dict):
+    """
+    Add connection reuse stats of the request's host to the handle's debug info
+
+    Curl handle -- easy handle created by _create_request_handle
+    dict stats_dict -- host label: ConnectionReuseStats
+    """
+    host_label = handle.request_obj.host_label
+    stats = stats_dict.get(host_label)
+    if stats is None:
+        return
+    message = "* Connections to {0}: {1} requests, {2} reused\n".format(
+        host_label, stats.request_count, stats.reused_count
+    )
+    handle.debug_buffer.write(message.encode("utf-8"))
+
+
 def _dict_to_cookies(cookies_dict):
     return ";".join(
         [
@@ -116,6 +116,7 @@ CIB_ALERT_RECIPIENT_ALREADY_EXISTS = M("CIB_ALERT_RECIPIENT_ALREADY_EXISTS")
 CIB_ALERT_RECIPIENT_VALUE_INVALID = M("CIB_ALERT_RECIPIENT_VALUE_INVALID")
 CIB_CANNOT_FIND_MANDATORY_SECTION = M("CIB_CANNOT_FIND_MANDATORY_SECTION")
 CIB_DIFF_ERROR = M("CIB_DIFF_ERROR")
+CIB_DIFF_MISMATCH = M("CIB_DIFF_MISMATCH")
 CIB_FENCING_LEVEL_ALREADY_EXISTS = M("CIB_FENCING_LEVEL_ALREADY_EXISTS")
 CIB_FENCING_LEVEL_DOES_NOT_EXIST = M("CIB_FENCING_LEVEL_DOES_NOT_EXIST")
 CIB_LOAD_ERROR_BAD_FORMAT = M("CIB_LOAD_ERROR_BAD_FORMAT")
@@ -509,6 +510,7 @@ USING_DEFAULT_WATCHDOG = M("USING_DEFAULT_WATCHDOG")
 WAIT_FOR_IDLE_ERROR = M("WAIT_FOR_IDLE_ERROR")
 WAIT_FOR_IDLE_NOT_LIVE_CLUSTER = M("WAIT_FOR_IDLE_NOT_LIVE_CLUSTER")
 WAIT_FOR_IDLE_NOT_SUPPORTED = M("WAIT_FOR_IDLE_NOT_SUPPORTED")
+WAIT_FOR_IDLE_PROGRESS = M("WAIT_FOR_IDLE_PROGRESS")
 WAIT_FOR_IDLE_TIMED_OUT = M("WAIT_FOR_IDLE_TIMED_OUT")
 WAIT_FOR_NODE_STARTUP_ERROR = M("WAIT_FOR_NODE_STARTUP_ERROR")
 WAIT_FOR_NODE_STARTUP_STARTED = M("WAIT_FOR_NODE_STARTUP_STARTED")
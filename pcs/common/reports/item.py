@@ -1,9 +1,11 @@
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import (
     Any,
     Dict,
     List,
     Optional,
+    Tuple,
 )
 
 from pcs.common.interface.dto import (
@@ -85,25 +87,33 @@ class ReportItemMessage(ImplementsToDto):
 
     def to_dto(self) -> ReportItemMessageDto:
         payload: Dict[str, Any] = {}
-        if hasattr(self.__class__, "__annotations__"):
-            try:
-                annotations = self.__class__.__annotations__
-            except AttributeError:
-                raise AssertionError()
-            for attr_name in annotations.keys():
-                if attr_name.startswith("_") or attr_name in ("message",):
-                    continue
-                attr_val = getattr(self, attr_name)
-                if hasattr(attr_val, "to_dto"):
-                    payload[attr_name] = attr_val.to_dto()
-                else:
-                    payload[attr_name] = attr_val
+        for attr_name in _get_payload_attr_names(self.__class__):
+            attr_val = getattr(self, attr_name)
+            if hasattr(attr_val, "to_dto"):
+                payload[attr_name] = attr_val.to_dto()
+            else:
+                payload[attr_name] = attr_val
 
         return ReportItemMessageDto(
             code=self.code, message=self.message, payload=payload,
         )
 
 
+@lru_cache(maxsize=None)
+def _get_payload_attr_names(message_class: type) -> Tuple[str, ...]:
+    if not hasattr(message_class, "__annotations__"):
+        return tuple()
+    try:
+        annotations = message_class.__annotations__
+    except AttributeError:
+        raise AssertionError()
+    return tuple(
+        attr_name
+        for attr_name in annotations.keys()
+        if not attr_name.startswith("_") and attr_name not in ("message",)
+    )
+
+
 @dataclass(frozen=True)
 class ReportItemContext(ImplementsToDto, ImplementsFromDto):
     node: str
@@ -2875,6 +2875,28 @@ class CibDiffError(ReportItemMessage):
         return f"Unable to diff CIB: {self.reason}\n{self.cib_new}"
 
 
+@dataclass(frozen=True)
+class CibDiffMismatch(ReportItemMessage):
+    """
+    Diffs of CIBs computed by pcs and by crm_diff differ
+
+    native_diff -- the diff computed by pcs
+    crm_diff -- the diff computed by crm_diff
+    """
+
+    native_diff: str
+    crm_diff: str
+    _code = codes.CIB_DIFF_MISMATCH
+
+    @property
+    def message(self) -> str:
+        return (
+            "CIB diff computed by pcs differs from the one computed by "
+            f"crm_diff, using crm_diff\npcs:\n{self.native_diff}\n"
+            f"crm_diff:\n{self.crm_diff}"
+        )
+
+
 @dataclass(frozen=True)
 class CibSimulateError(ReportItemMessage):
     """
@@ -2965,6 +2987,27 @@ class WaitForIdleNotSupported(ReportItemMessage):
         return "crm_resource does not support --wait, please upgrade pacemaker"
 
 
+@dataclass(frozen=True)
+class WaitForIdleProgress(ReportItemMessage):
+    """
+    Waiting for resources (crm_resource --wait) is still in progress
+
+    pending_action_list -- actions the cluster has not finished yet
+    """
+
+    pending_action_list: List[str]
+    _code = codes.WAIT_FOR_IDLE_PROGRESS
+
+    @property
+    def message(self) -> str:
+        if not self.pending_action_list:
+            return "Waiting for the cluster to settle..."
+        actions = "\n".join(
+            f"  {action}" for action in self.pending_action_list
+        )
+        return f"Waiting for the cluster to settle, pending actions:\n{actions}"
+
+
 @dataclass(frozen=True)
 class WaitForIdleTimedOut(ReportItemMessage):
     """
@@ -2,6 +2,7 @@ from collections import namedtuple
 from enum import Enum
 import threading
 from typing import (
+    Iterator,
     MutableSet,
     TypeVar,
 )
@@ -31,6 +32,22 @@ def run_parallel(worker, data_list):
         thread.join()
 
 
+def get_backoff_intervals(
+    initial: float, maximum: float, factor: float = 2
+) -> Iterator[float]:
+    """
+    Yield intervals growing exponentially from the initial one to the maximum
+
+    initial -- the first interval
+    maximum -- intervals never get longer than this
+    factor -- each interval is this many times longer than the previous one
+    """
+    interval = min(initial, maximum)
+    while True:
+        yield interval
+        interval = min(interval * factor, maximum)
+
+
 def format_environment_error(e):
     return format_os_error(e)
 
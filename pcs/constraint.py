@@ -1,13 +1,11 @@
 import sys
 from collections import defaultdict
-from os.path import isfile
+from functools import partial
 import xml.dom.minidom
 from xml.dom.minidom import parseString
-from enum import Enum
 
 from pcs import (
     rule as rule_utils,
-    settings,
     usage,
     utils,
 )
@@ -24,9 +22,13 @@ from pcs.common.reports.constraints import (
     colocation as colocation_format,
     order as order_format,
 )
+from pcs.common.tools import xml_fromstring
+from pcs.common.types import CibRuleInEffectStatus
 from pcs.lib.cib.constraint import resource_set
 from pcs.lib.cib.constraint.order import ATTRIB as order_attrib
+from pcs.lib.cib.rule import get_rules_in_effect_status
 from pcs.lib.node import get_existing_nodes_names
+from pcs.lib.pacemaker import live as lib_pacemaker
 from pcs.lib.pacemaker.values import (
     RESOURCE_ROLES,
     sanitize_id,
@@ -56,17 +58,6 @@ CRM_RULE_MISSING_MSG = (
 RESOURCE_TYPE_RESOURCE = "resource"
 RESOURCE_TYPE_REGEXP = "regexp"
 
-RULE_IN_EFFECT = "in effect"
-RULE_EXPIRED = "expired"
-RULE_NOT_IN_EFFECT = "not yet in effect"
-RULE_UNKNOWN_STATUS = "unknown status"
-
-
-class CrmRuleReturnCode(Enum):
-    IN_EFFECT = 0
-    EXPIRED = 110
-    TO_BE_IN_EFFECT = 111
-
 
 def constraint_location_cmd(lib, argv, modifiers):
     if not argv:
@@ -633,12 +624,13 @@ def location_lines(
     all_loc_constraints = constraintsElement.getElementsByTagName(
         "rsc_location"
     )
-    cib = utils.get_cib()
-
-    if not isfile(settings.crm_rule):
+    if not lib_pacemaker.has_rule_in_effect_status_tool():
         if verify_expiration:
             sys.stderr.write(CRM_RULE_MISSING_MSG)
         verify_expiration = False
+    rule_status_map = (
+        _get_rules_status(utils.get_cib()) if verify_expiration else {}
+    )
 
     all_lines.append("Location Constraints:")
     for rsc_loc in all_loc_constraints:
@@ -726,7 +718,7 @@ def location_lines(
             )
         all_lines += _show_location_rules(
             ruleshash,
-            cib,
+            rule_status_map,
             show_detail=showDetail,
             show_expired=show_expired,
             verify_expiration=verify_expiration,
@@ -749,7 +741,7 @@ def location_lines(
             miniruleshash[rsc] = ruleshash[rsc]
             rsc_lines += _show_location_rules(
                 miniruleshash,
-                cib,
+                rule_status_map,
                 show_detail=showDetail,
                 show_expired=show_expired,
                 verify_expiration=verify_expiration,
@@ -796,7 +788,7 @@ def _hashtable_to_lines(hash_label, hash_type, hash_key, show_detail):
 
 def _show_location_rules(
     ruleshash,
-    cib,
+    rule_status_map,
     show_detail,
     show_expired=False,
     verify_expiration=True,
@@ -844,16 +836,19 @@ def _show_location_rules(
             # to print the constraint
             is_constraint_expired = verify_expiration
             for rule in constrainthash[constraint_id]:
-                rule_status = RULE_UNKNOWN_STATUS
+                rule_status = CibRuleInEffectStatus.UNKNOWN
                 if verify_expiration:
-                    rule_status = _get_rule_status(rule.getAttribute("id"), cib)
-                    if rule_status != RULE_EXPIRED:
+                    rule_status = rule_status_map.get(
+                        rule.getAttribute("id"), CibRuleInEffectStatus.UNKNOWN
+                    )
+                    if rule_status != CibRuleInEffectStatus.EXPIRED:
                         is_constraint_expired = False
 
                 rule_lines.append(
                     rule_utils.ExportDetailed().get_string(
                         rule,
-                        rule_status == RULE_EXPIRED and show_expired,
+                        rule_status == CibRuleInEffectStatus.EXPIRED
+                        and show_expired,
                         show_detail,
                         indent="      ",
                     )
@@ -892,17 +887,16 @@ def _verify_score(score):
         )
 
 
-def _get_rule_status(rule_id, cib):
-    _, _, retval = utils.cmd_runner().run(
-        [settings.crm_rule, "--check", "--rule", rule_id, "--xml-text", "-"],
-        cib,
+def _get_rules_status(cib):
+    """
+    Commandline options: no options
+    """
+    return get_rules_in_effect_status(
+        xml_fromstring(cib).iterfind(".//constraints/rsc_location/rule"),
+        partial(
+            lib_pacemaker.get_rules_in_effect_status, utils.cmd_runner(), cib
+        ),
     )
-    translation_map = {
-        CrmRuleReturnCode.IN_EFFECT.value: RULE_IN_EFFECT,
-        CrmRuleReturnCode.EXPIRED.value: RULE_EXPIRED,
-        CrmRuleReturnCode.TO_BE_IN_EFFECT.value: RULE_NOT_IN_EFFECT,
-    }
-    return translation_map.get(retval, RULE_UNKNOWN_STATUS)
 
 
 def location_prefer(lib, argv, modifiers):
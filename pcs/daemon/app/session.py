@@ -1,4 +1,8 @@
-from pcs.daemon.session import Storage
+from tornado.ioloop import IOLoop
+from tornado.web import HTTPError
+
+from pcs.daemon import log
+from pcs.daemon.session import Storage, StorageError
 from pcs.daemon.auth import check_user_groups, authorize_user
 
 PCSD_SESSION = "pcsd.sid"
@@ -19,9 +23,11 @@ class Mixin:
         self.__storage = session_storage
 
     async def init_session(self):
-        self.__session = self.__storage.provide(self.__sid_from_client)
+        self.__session = await self.__call_storage(
+            self.__storage.provide, self.__sid_from_client
+        )
         if self.__session.is_authenticated:
-            self.__refresh_auth(
+            await self.__refresh_auth(
                 await check_user_groups(self.__session.username),
                 ajax_id=self.__session.ajax_id,
             )
@@ -37,8 +43,10 @@ class Mixin:
             reviewed.
         """
         # initialize session since it should be used without `init_session`
-        self.__session = self.__storage.provide(self.__sid_from_client)
-        self.__refresh_auth(
+        self.__session = await self.__call_storage(
+            self.__storage.provide, self.__sid_from_client
+        )
+        await self.__refresh_auth(
             await authorize_user(username, password),
             sign_rejection=sign_rejection,
         )
@@ -52,19 +60,23 @@ class Mixin:
             )
         return self.__session
 
-    def prepare(self):
+    async def prepare(self):
         """
         Expired sessions are removed before each request that uses sessions (it
         means before each request that is handled by descendant of this mixin).
         """
-        self.__storage.drop_expired()
+        await self.__call_storage(self.__storage.drop_expired)
 
-    def session_logout(self):
+    async def session_logout(self):
         if self.__session is not None:
-            self.__storage.destroy(self.__session.sid)
+            await self.__call_storage(
+                self.__storage.destroy, self.__session.sid
+            )
         elif self.__sid_from_client is not None:
-            self.__storage.destroy(self.__sid_from_client)
-        self.__session = self.__storage.provide()
+            await self.__call_storage(
+                self.__storage.destroy, self.__sid_from_client
+            )
+        self.__session = await self.__call_storage(self.__storage.provide)
 
     def sid_to_cookies(self):
         """
@@ -91,9 +103,12 @@ class Mixin:
     def __sid_from_client(self):
         return self.get_cookie(PCSD_SESSION, default=None)
 
-    def __refresh_auth(self, user_auth_info, sign_rejection=True, ajax_id=None):
+    async def __refresh_auth(
+        self, user_auth_info, sign_rejection=True, ajax_id=None
+    ):
         if user_auth_info.is_authorized:
-            self.__session = self.__storage.login(
+            self.__session = await self.__call_storage(
+                self.__storage.login,
                 self.__session.sid,
                 user_auth_info.name,
                 user_auth_info.groups,
@@ -101,7 +116,21 @@ class Mixin:
             )
             self.sid_to_cookies()
         elif sign_rejection:
-            self.__session = self.__storage.rejected_user(
-                self.__session.sid, user_auth_info.name,
+            self.__session = await self.__call_storage(
+                self.__storage.rejected_user,
+                self.__session.sid,
+                user_auth_info.name,
             )
             self.sid_to_cookies()
+
+    async def __call_storage(self, method, *args):
+        executor = self.__storage.executor
+        try:
+            if executor is None:
+                return method(*args)
+            return await IOLoop.current().run_in_executor(
+                executor, method, *args
+            )
+        except StorageError as e:
+            log.pcsd.error("Unable to access sessions: %s", e)
+            raise HTTPError(503)
@@ -2,6 +2,44 @@ from pcs.daemon import ruby_pcsd
 from pcs.daemon.app.common import BaseHandler
 
 
+def _ignore_result(future):
+    # A failed flush means the client has gone away. Tornado handles that when
+    # the request is finished, there is nothing to do about it here.
+    if not future.cancelled():
+        future.exception()
+
+
+class _HandlerResultStream(ruby_pcsd.ResultStream):
+    """
+    Pass a sinatra response to the client of a handler as it comes from ruby
+    """
+
+    def __init__(self, handler: BaseHandler):
+        self.__handler = handler
+        self.__is_sending = False
+
+    def start(self, status, headers):
+        for name, value in headers.items():
+            self.__handler.set_header(name, value)
+        self.__handler.set_status(status)
+
+    def write(self, chunk):
+        self.__is_sending = True
+        self.__handler.write(chunk)
+        future = self.__handler.flush()
+        future.add_done_callback(_ignore_result)
+        return future
+
+    def abort(self):
+        # Status and headers have not been sent yet, the handler is able to
+        # send an error response instead.
+        if not self.__is_sending:
+            return
+        # The response is sent chunked. Closing the connection without the
+        # terminating chunk tells the client the response is not complete.
+        self.__handler.request.connection.close()
+
+
 class Sinatra(BaseHandler):
     """
     Sinatra is base class for handlers which calls the Sinatra via wrapper.
@@ -19,6 +57,13 @@ class Sinatra(BaseHandler):
         self.set_status(result.status)
         self.write(result.body)
 
+    @property
+    def sinatra_result_stream(self) -> ruby_pcsd.ResultStream:
+        """
+        Receiver which sends a sinatra result to the client as it comes
+        """
+        return _HandlerResultStream(self)
+
     @property
     def ruby_pcsd_wrapper(self):
         return self.__ruby_pcsd_wrapper
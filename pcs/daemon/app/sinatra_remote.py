@@ -1,9 +1,10 @@
 from tornado.locks import Lock
 
-from pcs.daemon import ruby_pcsd
+from pcs.daemon import log, ruby_pcsd
 from pcs.daemon.app.sinatra_common import Sinatra
 from pcs.daemon.http_server import HttpsServerManage
 from pcs.daemon.auth import authorize_user
+from pcs.daemon.ssl import SSLCertKeyException
 
 
 class SinatraRemote(Sinatra):
@@ -13,8 +14,9 @@ class SinatraRemote(Sinatra):
     """
 
     async def handle_sinatra_request(self):
-        result = await self.ruby_pcsd_wrapper.request_remote(self.request)
-        self.send_sinatra_result(result)
+        await self.ruby_pcsd_wrapper.request_remote(
+            self.request, self.sinatra_result_stream
+        )
 
     async def get(self, *args, **kwargs):
         del args, kwargs
@@ -65,9 +67,17 @@ class SetCerts(SinatraRemote):
         self.__https_server_manage = https_server_manage
 
     async def handle_sinatra_request(self):
+        # The status must be known before the response is sent, the response
+        # is small, so it is not streamed.
         result = await self.ruby_pcsd_wrapper.request_remote(self.request)
         if result.status == 200:
-            self.__https_server_manage.reload_certs()
+            try:
+                self.__https_server_manage.reload_certs()
+            except SSLCertKeyException as e:
+                # the server keeps using the previous certificates
+                for error in e.args:
+                    log.pcsd.error(error)
+                log.pcsd.error("Invalid SSL certificate and/or key, not loaded")
         self.send_sinatra_result(result)
 
 
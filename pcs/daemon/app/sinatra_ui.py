@@ -30,13 +30,13 @@ class SinatraGui(app_session.Mixin, Sinatra):
         await self.init_session()
         self.before_sinatra_use()
         if self.can_use_sinatra:
-            result = await self.ruby_pcsd_wrapper.request_gui(
+            await self.ruby_pcsd_wrapper.request_gui(
                 self.request,
                 self.session.username,
                 self.session.groups,
                 self.session.is_authenticated,
+                self.sinatra_result_stream,
             )
-            self.send_sinatra_result(result)
 
     async def get(self, *args, **kwargs):
         del args, kwargs
@@ -134,7 +134,7 @@ class Logout(app_session.Mixin, AjaxMixin, BaseHandler):
     async def get(self, *args, **kwargs):
         del args, kwargs
         await self.init_session()
-        self.session_logout()
+        await self.session_logout()
         self.sid_to_cookies()
         self.enhance_headers()
         if self.is_ajax:
@@ -59,7 +59,7 @@ class Logout(app_session.Mixin, AjaxMixin, BaseHandler):
     async def get(self, *args, **kwargs):
         del args, kwargs
         await self.init_session()
-        self.session_logout()
+        await self.session_logout()
         self.sid_to_cookies()
         self.enhance_headers()
         self.write("OK")
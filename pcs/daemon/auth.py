@@ -1,13 +1,17 @@
 from collections import namedtuple
 from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from ctypes import byref, cast, CDLL, CFUNCTYPE, POINTER, sizeof, Structure
 from ctypes import c_char, c_char_p, c_int, c_uint, c_void_p
 from ctypes.util import find_library
 import grp
+import os
 import pwd
+from time import monotonic
 
 from tornado.gen import coroutine
 
+from pcs import settings
 from pcs.daemon import log
 
 # pylint: disable=invalid-name, too-few-public-methods
@@ -155,7 +159,10 @@ def check_user_groups_sync(username, logger) -> UserAuthInfo:
     except KeyError as e:
         logger.unable_determine_groups(username, e)
         return UserAuthInfo(username, [], is_authorized=False)
+    return _check_groups(username, groups, logger)
 
+
+def _check_groups(username, groups, logger) -> UserAuthInfo:
     if HA_ADM_GROUP not in groups:
         logger.not_ha_adm_member(username, HA_ADM_GROUP)
         return UserAuthInfo(username, groups, is_authorized=False)
@@ -176,6 +183,190 @@ def authorize_user_sync(username, password) -> UserAuthInfo:
     return check_user_groups_sync(username, LoginLogger())
 
 
+class AuthMetrics:
+    """
+    Load and latency of the authentication worker pool
+    """
+
+    # pylint: disable=too-few-public-methods
+    def __init__(self):
+        # requests submitted to the pool and not finished yet
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.request_count = 0
+        # seconds from submitting a request to getting its result
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self.total_latency = 0.0
+
+    def to_dict(self):
+        return dict(
+            queue_depth=self.queue_depth,
+            max_queue_depth=self.max_queue_depth,
+            request_count=self.request_count,
+            last_latency=self.last_latency,
+            max_latency=self.max_latency,
+            average_latency=(
+                self.total_latency / self.request_count
+                if self.request_count
+                else 0.0
+            ),
+        )
+
+
+class AuthWorkerPool:
+    """
+    Long-lived processes running PAM and NSS calls
+
+    PAM modules and NSS lookups block and may leak memory, so they are not run
+    in the daemon process. Starting a new process for each request is
+    expensive, so a bounded number of workers is kept running and requests
+    wait in a queue for a free worker.
+    """
+
+    def __init__(self, max_workers):
+        self._max_workers = max_workers
+        self._executor = None
+        self.metrics = AuthMetrics()
+        self._logged_request_count = 0
+
+    @coroutine
+    def run(self, sync_fn, *args):
+        metrics = self.metrics
+        metrics.queue_depth += 1
+        metrics.max_queue_depth = max(
+            metrics.max_queue_depth, metrics.queue_depth
+        )
+        start = monotonic()
+        try:
+            try:
+                result = yield self._get_executor().submit(sync_fn, *args)
+            except BrokenProcessPool:
+                # A worker has died (e.g. it has been killed), the pool is
+                # not usable anymore. Start a new one and try once again.
+                self._reset_executor()
+                result = yield self._get_executor().submit(sync_fn, *args)
+        finally:
+            latency = monotonic() - start
+            metrics.queue_depth -= 1
+            metrics.request_count += 1
+            metrics.last_latency = latency
+            metrics.max_latency = max(metrics.max_latency, latency)
+            metrics.total_latency += latency
+            log.pcsd.debug(
+                "Authentication request processed in %.3f s, queue depth %d",
+                latency,
+                metrics.queue_depth,
+            )
+        return result
+
+    def log_metrics(self):
+        """
+        Write the metrics to the log if a request has been processed since the
+        metrics were written last time
+        """
+        if self.metrics.request_count == self._logged_request_count:
+            return
+        self._logged_request_count = self.metrics.request_count
+        log.pcsd.info(
+            "Authentication requests: %(request_count)d processed, "
+            "queue depth %(queue_depth)d (max %(max_queue_depth)d), "
+            "latency %(average_latency).3f s on average "
+            "(max %(max_latency).3f s)",
+            self.metrics.to_dict(),
+        )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+        return self._executor
+
+    def _reset_executor(self):
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+class UserGroupsCache:
+    """
+    Groups of users valid for a limited time or until a group database changes
+    """
+
+    def __init__(self, ttl, watched_files):
+        """
+        int ttl -- seconds for which cached groups of a user are valid
+        iterable watched_files -- drop all groups when any of the files changes
+        """
+        self._ttl = ttl
+        self._watched_files = tuple(watched_files)
+        self._stamp = None
+        self._user_groups = {}
+
+    def get(self, username):
+        """
+        Return cached groups of a user or None if they are not known
+        """
+        self._check_files()
+        entry = self._user_groups.get(username)
+        if entry is None:
+            return None
+        expires, groups = entry
+        if expires <= monotonic():
+            del self._user_groups[username]
+            return None
+        return groups
+
+    def set(self, username, groups):
+        if self._ttl <= 0:
+            return
+        self._check_files()
+        self._user_groups[username] = (monotonic() + self._ttl, tuple(groups))
+
+    def invalidate(self):
+        self._user_groups = {}
+
+    def _check_files(self):
+        stamp = tuple(_get_mtime(path) for path in self._watched_files)
+        if stamp != self._stamp:
+            self._stamp = stamp
+            self.invalidate()
+
+
+def _get_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+_process_auth_worker_pool = None
+_process_user_groups_cache = None
+
+
+def get_auth_worker_pool() -> AuthWorkerPool:
+    # pylint: disable=global-statement
+    global _process_auth_worker_pool
+    if _process_auth_worker_pool is None:
+        _process_auth_worker_pool = AuthWorkerPool(settings.pcsd_auth_workers)
+    return _process_auth_worker_pool
+
+
+def get_user_groups_cache() -> UserGroupsCache:
+    # pylint: disable=global-statement
+    global _process_user_groups_cache
+    if _process_user_groups_cache is None:
+        _process_user_groups_cache = UserGroupsCache(
+            settings.pcsd_user_groups_cache_ttl,
+            settings.pcsd_user_groups_cache_watched_files,
+        )
+    return _process_user_groups_cache
+
+
 # TODO async/await version - how to do it?
 # When async/await is used then the problem is:
 # "TypeError: object Future can't be used in 'await' expression" is raised even
@@ -183,19 +374,29 @@ def authorize_user_sync(username, password) -> UserAuthInfo:
 # http://www.tornadoweb.org/en/stable/guide/coroutines.html#python-3-5-async-and-await
 @coroutine
 def run_in_process(sync_fn, *args):
-    pool = ProcessPoolExecutor(max_workers=1)
-    result = yield pool.submit(sync_fn, *args)
-    pool.shutdown()
+    result = yield get_auth_worker_pool().run(sync_fn, *args)
     return result
 
 
 @coroutine
 def authorize_user(username, password) -> UserAuthInfo:
     user = yield run_in_process(authorize_user_sync, username, password)
+    if user.is_authorized:
+        get_user_groups_cache().set(username, user.groups)
     return user
 
 
 @coroutine
 def check_user_groups(username) -> UserAuthInfo:
-    user = yield run_in_process(check_user_groups_sync, username, PlainLogger())
-    return user
+    # Groups are checked on each authenticated request, do not look them up
+    # in the group database each time.
+    logger = PlainLogger()
+    groups = get_user_groups_cache().get(username)
+    if groups is None:
+        try:
+            groups = yield run_in_process(get_user_groups_sync, username)
+        except KeyError as e:
+            logger.unable_determine_groups(username, e)
+            return UserAuthInfo(username, [], is_authorized=False)
+        get_user_groups_cache().set(username, groups)
+    return _check_groups(username, groups, logger)
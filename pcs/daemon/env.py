@@ -27,6 +27,7 @@ PCSD_DISABLE_GUI = "PCSD_DISABLE_GUI"
 PCSD_SESSION_LIFETIME = "PCSD_SESSION_LIFETIME"
 PCSD_DEV = "PCSD_DEV"
 PCSD_STATIC_FILES_DIR = "PCSD_STATIC_FILES_DIR"
+PCSD_WORKERS = "PCSD_WORKERS"
 
 Env = namedtuple(
     "Env",
@@ -41,6 +42,7 @@ Env = namedtuple(
         PCSD_SESSION_LIFETIME,
         PCSD_STATIC_FILES_DIR,
         PCSD_DEV,
+        PCSD_WORKERS,
         "has_errors",
     ],
 )
@@ -59,6 +61,7 @@ def prepare_env(environ, logger=None):
         loader.session_lifetime(),
         loader.pcsd_static_files_dir(),
         loader.pcsd_dev(),
+        loader.workers(),
         loader.has_errors(),
     )
     if logger:
@@ -160,6 +163,19 @@ class EnvLoader:
             )
             return session_lifetime
 
+    def workers(self):
+        workers = self.environ.get(PCSD_WORKERS, "1")
+        try:
+            if int(workers) >= 1:
+                return int(workers)
+        except ValueError:
+            pass
+        self.errors.append(
+            f"Invalid PCSD_WORKERS value '{workers}'"
+            " (it must be a positive integer)"
+        )
+        return workers
+
     def pcsd_debug(self):
         return self.__has_true_in_environ(PCSD_DEBUG)
 
@@ -1,7 +1,7 @@
 from tornado.httpserver import HTTPServer
 from tornado.netutil import bind_sockets
 
-from pcs.daemon.ssl import PcsdSSL
+from pcs.daemon.ssl import PcsdSSL, SSLCertKeyException
 from pcs.daemon import log
 
 
@@ -21,13 +21,22 @@ class HttpsServerManage:
     # For this purpose an application, which handles http requests, gets
     # a reference to the HttpsServerManage instance. When new certificates
     # arrive via a request the application asks the HttpsServerManage instance
-    # for necessary steps (it stops listening of the current HTTPServer and
-    # starts a new one with updated certificates).
-
-    def __init__(self, make_app, port, bind_addresses, ssl: PcsdSSL):
+    # to reload them. A new ssl context is created and used for new
+    # connections, the server keeps listening and established connections are
+    # not interrupted.
+
+    def __init__(
+        self, make_app, port, bind_addresses, ssl: PcsdSSL, reuse_port=False
+    ):
+        """
+        bool reuse_port -- allow several worker processes to listen on the
+            same port, the kernel distributes connections among them
+        """
+        # pylint: disable=too-many-arguments
         self.__make_app = make_app
         self.__port = port
         self.__bind_addresses = bind_addresses
+        self.__reuse_port = reuse_port
 
         self.__server = None
         self.__ssl = ssl
@@ -59,7 +68,9 @@ class HttpsServerManage:
                 address if address is not None else "*",
                 self.__port,
             )
-            sockets.extend(bind_sockets(self.__port, address))
+            sockets.extend(
+                bind_sockets(self.__port, address, reuse_port=self.__reuse_port)
+            )
 
         self.__server.add_sockets(sockets)
 
@@ -72,6 +83,34 @@ class HttpsServerManage:
             raise HttpsServerManageException(
                 "Could not reload certificates, server is not running"
             )
-        log.pcsd.info("Stopping server to reload ssl certificates...")
-        self.stop()
-        self.start()
+        log.pcsd.info("Reloading ssl certificates...")
+        # If the new certificates are not valid, the current context is kept.
+        self.__ssl.guarantee_valid_certs()
+        self.__ssl.create_context()
+        log.pcsd.info("SSL certificates reloaded")
+
+    def reload_certs_if_changed(self):
+        """
+        Reload certificates changed by another pcsd worker process
+
+        Unlike reload_certs, missing certificates are not generated. All
+        workers would generate them at once and the files could end up with
+        a certificate of one worker and a key of another one.
+        """
+        if not self.server_is_running or not self.__ssl.files_changed():
+            return
+        if not self.__ssl.certs_exist():
+            # not written completely yet
+            return
+        try:
+            self.__ssl.check_certs()
+        except SSLCertKeyException as e:
+            for error in e.args:
+                log.pcsd.error(error)
+            log.pcsd.error("Invalid SSL certificate and/or key, not loaded")
+            # report the files once, not on each check until they are fixed
+            self.__ssl.mark_files_checked()
+            return
+        log.pcsd.info("Reloading ssl certificates...")
+        self.__ssl.create_context()
+        log.pcsd.info("SSL certificates reloaded")
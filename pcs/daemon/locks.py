@@ -0,0 +1,56 @@
+import fcntl
+import os
+
+from tornado.gen import sleep
+from tornado.locks import Lock
+
+
+class InterProcessLock:
+    """
+    Lock shared by pcsd worker processes, it is used as tornado.locks.Lock
+
+    Coroutines of one process wait for a local lock. The process holding it
+    waits for an exclusive flock of a file, so at most one coroutine of all
+    processes holds the lock.
+    """
+
+    def __init__(self, path, poll_interval=0.1):
+        """
+        string path -- lock file, it is created if it does not exist
+        float poll_interval -- seconds between attempts to lock the file
+        """
+        self.__path = path
+        self.__poll_interval = poll_interval
+        self.__local_lock = Lock()
+        self.__fd = None
+
+    async def acquire(self):
+        await self.__local_lock.acquire()
+        fd = None
+        try:
+            fd = os.open(self.__path, os.O_CREAT | os.O_RDWR, 0o600)
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    # do not block the event loop
+                    await sleep(self.__poll_interval)
+        except BaseException:
+            if fd is not None:
+                os.close(fd)
+            self.__local_lock.release()
+            raise
+        self.__fd = fd
+
+    def release(self):
+        fd, self.__fd = self.__fd, None
+        # closing the file releases the flock
+        os.close(fd)
+        self.__local_lock.release()
+
+    async def __aenter__(self):
+        await self.acquire()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.release()
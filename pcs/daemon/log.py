@@ -1,4 +1,8 @@
+from collections import deque
 import logging
+import logging.handlers
+import os
+import threading
 
 LOGGER_NAMES = [
     "pcs.daemon",
@@ -61,14 +65,203 @@ class Formatter(logging.Formatter):
         return super().format(record)
 
 
-def setup(log_file):
-    handler = logging.handlers.WatchedFileHandler(log_file, encoding="utf8")
-    handler.setFormatter(Formatter())
+class _RecordBuffer:
+    """
+    Bounded buffer of log records waiting to be written to a file
+    """
+
+    def __init__(self, capacity):
+        self._capacity = capacity
+        self._records = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._dropped = 0
+
+    def put(self, record):
+        with self._condition:
+            if len(self._records) >= self._capacity and not self._make_room(
+                record
+            ):
+                self._dropped += 1
+                return
+            self._records.append(record)
+            self._condition.notify()
+
+    def get_batch(self, max_size):
+        """
+        Wait for records, return them and a number of dropped records
+
+        int max_size -- return at most this number of records
+        """
+        with self._condition:
+            while not self._records and not self._closed:
+                self._condition.wait()
+            batch = [
+                self._records.popleft()
+                for _ in range(min(max_size, len(self._records)))
+            ]
+            dropped, self._dropped = self._dropped, 0
+            return batch, dropped
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def _make_room(self, record):
+        # Debug records are dropped first. A record of a higher level replaces
+        # the oldest waiting debug record if there is any.
+        if record.levelno <= logging.DEBUG:
+            return False
+        for index, queued_record in enumerate(self._records):
+            if queued_record.levelno <= logging.DEBUG:
+                del self._records[index]
+                self._dropped += 1
+                return True
+        return False
+
+
+class _BatchFileHandler(logging.handlers.WatchedFileHandler):
+    def emit_batch(self, record_list):
+        self.acquire()
+        try:
+            # The file is checked for being rotated once per batch, not once
+            # per record.
+            self.reopenIfNeeded()
+            if self.stream is None:
+                self.stream = self._open()
+            for record in record_list:
+                try:
+                    self.stream.write(self.format(record) + self.terminator)
+                except Exception:  # pylint: disable=broad-except
+                    self.handleError(record)
+            self.flush()
+        except Exception:  # pylint: disable=broad-except
+            self.handleError(record_list[0])
+        finally:
+            self.release()
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    Put log records to a buffer, write them to a file in a separate thread
+
+    Writing to the log file blocks on disk I/O. The event loop only puts
+    records to a buffer, so a slow disk does not delay processing of requests.
+    """
+
+    _BATCH_SIZE = 256
+
+    def __init__(self, buffer_size, file_handler: _BatchFileHandler):
+        super().__init__(_RecordBuffer(buffer_size))
+        self._buffer_size = buffer_size
+        self._file_handler = file_handler
+        self._writer_pid = None
+        self._writer = self._start_writer()
+
+    def restart_after_fork(self):
+        # Only the forking thread exists in a child process, the writer thread
+        # does not. Records waiting in the parent are written by the parent.
+        if self._writer_pid == os.getpid():
+            return
+        self.queue = _RecordBuffer(self._buffer_size)
+        self._writer = self._start_writer()
+
+    def _start_writer(self):
+        self._writer_pid = os.getpid()
+        writer = threading.Thread(
+            target=self._write_records, name="pcsd-log-writer", daemon=True
+        )
+        writer.start()
+        return writer
+
+    def enqueue(self, record):
+        self.queue.put(record)
+
+    def close(self):
+        # Called by logging.shutdown at exit as well. Waiting records are
+        # written before the file is closed.
+        self.queue.close()
+        if self._writer.is_alive():
+            self._writer.join(timeout=5)
+        self._file_handler.close()
+        super().close()
+
+    def _write_records(self):
+        while True:
+            record_list, dropped = self.queue.get_batch(self._BATCH_SIZE)
+            if dropped:
+                record_list.append(
+                    pcsd.makeRecord(
+                        pcsd.name,
+                        logging.WARNING,
+                        "(logging)",
+                        0,
+                        "%d log records dropped, logging is too slow",
+                        (dropped,),
+                        None,
+                    )
+                )
+            if not record_list:
+                return
+            self._file_handler.emit_batch(record_list)
+
+
+_log_handler = None
+_restart_registered = False
+
+
+def setup(log_file, queue_size=0):
+    """
+    Write logs of pcsd and tornado to a file
+
+    string log_file -- path to the log file
+    int queue_size -- if not 0, the file is written by a separate thread and at
+        most this number of records wait to be written
+    """
+    # pylint: disable=global-statement
+    global _log_handler, _restart_registered
+    if not hasattr(os, "register_at_fork"):
+        # Forked processes could not log, os.register_at_fork is new in
+        # python 3.7.
+        queue_size = 0
+    file_handler = _BatchFileHandler(log_file, encoding="utf8")
+    file_handler.setFormatter(Formatter())
+    _log_handler = (
+        _QueueHandler(queue_size, file_handler) if queue_size else file_handler
+    )
 
     for logger_name in LOGGER_NAMES:
         pcsd_log = logging.getLogger(logger_name)
-        pcsd_log.addHandler(handler)
+        pcsd_log.addHandler(_log_handler)
         pcsd_log.setLevel(logging.INFO)
+    if queue_size and not _restart_registered:
+        # Pcsd forks workers, processes of pools and so on. They must be able
+        # to log as well.
+        os.register_at_fork(after_in_child=_restart_after_fork)
+        _restart_registered = True
+
+
+def _restart_after_fork():
+    if isinstance(_log_handler, _QueueHandler):
+        _log_handler.restart_after_fork()
+
+
+def shutdown():
+    """
+    Write all waiting log records and stop logging to the file
+    """
+    # pylint: disable=global-statement
+    global _log_handler, _restart_registered
+    if _log_handler is None:
+        return
+    for logger_name in LOGGER_NAMES:
+        logging.getLogger(logger_name).removeHandler(_log_handler)
+    _log_handler.close()
+    _log_handler = None
+    # A hook registered by os.register_at_fork cannot be removed. The next
+    # setup registers a new one, _QueueHandler ignores the repeated call.
+    _restart_registered = False
 
 
 def enable_debug():
@@ -1,6 +1,7 @@
 import json
 import logging
-from base64 import b64decode, b64encode, binascii
+import struct
+from base64 import b64encode
 from collections import namedtuple
 from time import time as now
 
@@ -29,6 +30,22 @@ RUBY_LOG_LEVEL_MAP = {
     "DEBUG": logging.DEBUG,
 }
 
+# Ruby sends a response as a stream of frames. Each frame starts with a header
+# consisting of a one-byte frame type and a four-byte big-endian length of the
+# frame payload. A response starts with a RESULT frame, log records and body
+# chunks follow and an END frame terminates the response. The body is sent
+# as raw bytes, it does not need to be encoded or buffered as a whole.
+FRAME_HEADER = struct.Struct(">cI")
+# json: status and headers of a sinatra response, "next" of config sync or
+# "error" if the request failed
+FRAME_RESULT = b"R"
+# json: one log record
+FRAME_LOG = b"L"
+# raw bytes: a chunk of a response body
+FRAME_BODY = b"B"
+# no payload: the response is complete
+FRAME_END = b"E"
+
 __id_dict = {"id": 0}
 
 
@@ -40,7 +57,94 @@ def get_request_id():
 class SinatraResult(namedtuple("SinatraResult", "headers, status, body")):
     @classmethod
     def from_response(cls, response):
-        return cls(response["headers"], response["status"], response["body"])
+        return cls(
+            response["headers"], response["status"], response.get("body")
+        )
+
+
+class ResultStream:
+    """
+    Receiver of a sinatra response passed on while it is coming from ruby
+    """
+
+    def start(self, status, headers):
+        """
+        Process status and headers, called once before any body chunk
+
+        int status -- http status of the response
+        dict headers -- http headers of the response
+        """
+        raise NotImplementedError()
+
+    def write(self, chunk):
+        """
+        Process a chunk of a response body, return a future resolved when the
+        chunk has been passed on or None if it has been passed on already.
+        The rest of the response is not read from ruby until then.
+
+        bytes chunk -- next part of the body
+        """
+        raise NotImplementedError()
+
+    def abort(self):
+        """
+        Stop passing the response on, it cannot be completed
+        """
+        raise NotImplementedError()
+
+
+class FrameDecodeError(Exception):
+    pass
+
+
+class FrameReader:
+    """
+    Split a stream of bytes coming from ruby to frames
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+
+    def feed(self, data):
+        """
+        Add received data, return a list of frames completed by them
+
+        bytes data -- next part of the stream
+        """
+        self._buffer += data
+        frame_list = []
+        while True:
+            header_end = self._position + FRAME_HEADER.size
+            if len(self._buffer) < header_end:
+                break
+            frame_type, length = FRAME_HEADER.unpack_from(
+                self._buffer, self._position
+            )
+            if frame_type not in (
+                FRAME_RESULT,
+                FRAME_LOG,
+                FRAME_BODY,
+                FRAME_END,
+            ):
+                raise FrameDecodeError(f"Unknown frame type {frame_type!r}")
+            if len(self._buffer) < header_end + length:
+                break
+            frame_end = header_end + length
+            frame_list.append(
+                (frame_type, bytes(self._buffer[header_end:frame_end]))
+            )
+            self._position = frame_end
+        # Drop processed data. Body chunks are not copied back and forth
+        # while a large frame is being received.
+        if self._position:
+            del self._buffer[: self._position]
+            self._position = 0
+        return frame_list
+
+    @property
+    def has_pending_data(self):
+        return len(self._buffer) > 0
 
 
 def log_group_id_generator():
@@ -121,6 +225,125 @@ def log_ruby_daemon_request(label, request: RubyDaemonRequest):
             log.pcsd.debug("%s body: '%s'", label, request.body)
 
 
+class _RubyResponse:
+    """
+    Response from ruby being assembled from frames
+    """
+
+    def __init__(self, result_stream: ResultStream = None):
+        self.__reader = FrameReader()
+        self.__result_stream = result_stream
+        self.__error = None
+        self.__is_complete = False
+        self.result = None
+        self.logs = []
+        self.body_chunks = []
+        self.body_size = 0
+
+    @property
+    def is_streamed(self):
+        return self.__result_stream is not None
+
+    def feed(self, data):
+        # Called by the http client as data come. Errors are only recorded,
+        # they are reported when the whole response has been received.
+        # Returns a future of the last body chunk passed to the result stream
+        # if the chunk has not been sent yet.
+        if self.__error is not None:
+            return None
+        pending_write = None
+        try:
+            for frame_type, payload in self.__reader.feed(data):
+                written = self.__process_frame(frame_type, payload)
+                if written is not None:
+                    pending_write = written
+        except Exception as e:  # pylint: disable=broad-except
+            self.__error = e
+        return pending_write
+
+    def get_result(self):
+        """
+        Return the result of the response, raise if it is not valid
+        """
+        if self.__error is not None:
+            raise self.__error
+        if not self.__is_complete or self.__reader.has_pending_data:
+            raise FrameDecodeError("Incomplete response")
+        return self.result
+
+    def __process_frame(self, frame_type, payload):
+        if self.__is_complete:
+            raise FrameDecodeError("Data after the end of the response")
+        if frame_type == FRAME_END:
+            self.__is_complete = True
+        elif frame_type == FRAME_LOG:
+            self.logs.append(json.loads(payload))
+        elif frame_type == FRAME_RESULT:
+            if self.result is not None:
+                raise FrameDecodeError("Duplicate result frame")
+            self.result = json.loads(payload)
+            if self.__result_stream and "status" in self.result:
+                self.__result_stream.start(
+                    self.result["status"], self.result["headers"]
+                )
+        else:
+            if self.result is None:
+                raise FrameDecodeError("Body received before the result")
+            self.body_size += len(payload)
+            if self.__result_stream:
+                return self.__result_stream.write(payload)
+            self.body_chunks.append(payload)
+        return None
+
+
+class _ThrottledTransfer:
+    """
+    Pause receiving a response from ruby while its previous part is waiting
+    to be sent to a client, so a slow client does not make the whole response
+    pile up in memory
+    """
+
+    def __init__(self, streaming_callback, prepare_curl_callback):
+        """
+        callable streaming_callback -- gets chunks of the response body,
+            returns a future if the rest of the response should wait for it
+        callable prepare_curl_callback -- sets up the curl handle
+        """
+        self.__streaming_callback = streaming_callback
+        self.__prepare_curl_callback = prepare_curl_callback
+        self.__curl = None
+        self.__waiting_for = None
+
+    def prepare_curl(self, curl):
+        self.__prepare_curl_callback(curl)
+        self.__curl = curl
+
+    def receive(self, data):
+        future = self.__streaming_callback(data)
+        if future is None or future.done() or self.__curl is None:
+            return
+        # Tornado calls the streaming callback from the IOLoop, not from
+        # inside libcurl, so the transfer can be paused here.
+        self.__waiting_for = future
+        self.__curl.pause(pycurl.PAUSE_RECV)
+        future.add_done_callback(self.__resume)
+
+    def finish(self):
+        # The curl handle is reused by the http client for other requests.
+        self.__curl = None
+        self.__waiting_for = None
+
+    def __resume(self, future):
+        if future is not self.__waiting_for or self.__curl is None:
+            return
+        self.__waiting_for = None
+        try:
+            self.__curl.pause(pycurl.PAUSE_CONT)
+        except pycurl.error:
+            # The transfer has failed meanwhile, the http client reports it.
+            pass
+
+
 class Wrapper:
     def __init__(self, pcsd_ruby_socket, debug=False):
         self.__debug = debug
@@ -132,23 +355,34 @@ class Wrapper:
         curl.setopt(pycurl.UNIX_SOCKET_PATH, self.__pcsd_ruby_socket)
         curl.setopt(pycurl.TIMEOUT, 0)
 
-    async def send_to_ruby(self, request: RubyDaemonRequest):
+    async def send_to_ruby(
+        self, request: RubyDaemonRequest, streaming_callback
+    ):
+        """
+        Send a request to ruby, pass the response to a callback as it comes
+
+        RubyDaemonRequest request -- request to be sent
+        callable streaming_callback -- gets chunks of the response body,
+            returns a future if the rest of the response should wait for it
+        """
+        transfer = _ThrottledTransfer(
+            streaming_callback, self.prepare_curl_callback
+        )
         try:
-            return (
-                await self.__client.fetch(
-                    request.url,
-                    headers=request.headers,
-                    method=request.method,
-                    # Tornado enforces body=None for GET method:
-                    # Even with `allow_nonstandard_methods` we disallow GET
-                    # with a body (because libcurl doesn't allow it unless we
-                    # use CUSTOMREQUEST).  While the spec doesn't forbid
-                    # clients from sending a body, it arguably disallows the
-                    # server from doing anything with them.
-                    body=(request.body if not request.is_get else None),
-                    prepare_curl_callback=self.prepare_curl_callback,
-                )
-            ).body
+            await self.__client.fetch(
+                request.url,
+                headers=request.headers,
+                method=request.method,
+                # Tornado enforces body=None for GET method:
+                # Even with `allow_nonstandard_methods` we disallow GET
+                # with a body (because libcurl doesn't allow it unless we
+                # use CUSTOMREQUEST).  While the spec doesn't forbid
+                # clients from sending a body, it arguably disallows the
+                # server from doing anything with them.
+                body=(request.body if not request.is_get else None),
+                prepare_curl_callback=transfer.prepare_curl,
+                streaming_callback=transfer.receive,
+            )
         except CurlError as e:
             # This error we can get e.g. when ruby daemon is down.
             log.pcsd.error(
@@ -167,13 +401,22 @@ class Wrapper:
                 e,
             )
             raise HTTPError(500)
+        finally:
+            transfer.finish()
 
     async def run_ruby(
         self,
         request_type,
         http_request: HTTPServerRequest = None,
         payload=None,
+        result_stream: ResultStream = None,
     ):
+        """
+        Run a request in ruby, return its result
+
+        ResultStream result_stream -- if specified, a sinatra response is
+            passed to it as it comes and the result does not contain its body
+        """
         request = RubyDaemonRequest(request_type, http_request, payload)
         request_id = get_request_id()
 
@@ -185,13 +428,24 @@ class Wrapper:
         if self.__debug:
             log_request()
 
-        return self.process_ruby_response(
-            f"Ruby daemon response (id: {request_id})",
-            log_request,
-            await self.send_to_ruby(request),
-        )
-
-    def process_ruby_response(self, label, log_request, ruby_response):
+        ruby_response = _RubyResponse(result_stream)
+        try:
+            await self.send_to_ruby(request, ruby_response.feed)
+            return self.process_ruby_response(
+                f"Ruby daemon response (id: {request_id})",
+                log_request,
+                ruby_response,
+            )
+        except HTTPError:
+            if result_stream is not None:
+                # A part of the response may have been sent to the client
+                # already. It must not look like a complete response.
+                result_stream.abort()
+            raise
+
+    def process_ruby_response(
+        self, label, log_request, ruby_response: _RubyResponse
+    ):
         """
         Return relevant part of unpacked ruby response. As a side effect
         relevant logs are writen.
@@ -199,48 +453,46 @@ class Wrapper:
         string label -- is used as a log prefix
         callable log_request -- is used to log request when some errors happen;
             we want to log request before error even if there is not debug mode
-        string ruby_response -- body of response from ruby; it should contain
-            json with dictionary with response specific keys
+        _RubyResponse ruby_response -- response received from ruby
         """
         try:
-            response = json.loads(ruby_response)
-            if "error" in response:
-                if not self.__debug:
-                    log_request()
-                log.pcsd.error(
-                    "%s contains an error: '%s'", label, json.dumps(response)
-                )
-                raise HTTPError(500)
-
-            logs = response.pop("logs", [])
-            if "body" in response:
-                body = b64decode(response.pop("body"))
-                if self.__debug:
-                    log.pcsd.debug(
-                        "%s (without logs and body): '%s'",
-                        label,
-                        json.dumps(response),
-                    )
-                    log.pcsd.debug("%s body: '%s'", label, body)
-                response["body"] = body
-
-            elif self.__debug:
-                log.pcsd.debug(
-                    "%s (without logs): '%s'", label, json.dumps(response)
-                )
-            process_response_logs(logs)
-            return response
-        except (json.JSONDecodeError, binascii.Error) as e:
-            if self.__debug:
-                log.pcsd.debug("%s: '%s'", label, ruby_response)
-            else:
-                log_request()
+            response = ruby_response.get_result()
+        except (FrameDecodeError, ValueError) as e:
+            log_request()
+            log.pcsd.error("Cannot decode response from ruby pcsd: '%s'", e)
+            raise HTTPError(500)
 
-            log.pcsd.error("Cannot decode json from ruby pcsd wrapper: '%s'", e)
+        if "error" in response:
+            if not self.__debug:
+                log_request()
+            log.pcsd.error(
+                "%s contains an error: '%s'", label, json.dumps(response)
+            )
             raise HTTPError(500)
 
+        if self.__debug:
+            log.pcsd.debug(
+                "%s (without logs and body): '%s'", label, json.dumps(response)
+            )
+        if "status" in response and not ruby_response.is_streamed:
+            body = b"".join(ruby_response.body_chunks)
+            if self.__debug:
+                log.pcsd.debug("%s body: '%s'", label, body)
+            response = dict(response, body=body)
+        elif self.__debug and ruby_response.body_size:
+            log.pcsd.debug(
+                "%s body: %d bytes streamed", label, ruby_response.body_size
+            )
+        process_response_logs(ruby_response.logs)
+        return response
+
     async def request_gui(
-        self, request: HTTPServerRequest, user, groups, is_authenticated
+        self,
+        request: HTTPServerRequest,
+        user,
+        groups,
+        is_authenticated,
+        result_stream: ResultStream = None,
     ) -> SinatraResult:
         # Sessions handling was removed from ruby. However, some session
         # information is needed for ruby code (e.g. rendering some parts of
@@ -255,13 +507,20 @@ class Wrapper:
                         "groups": groups,
                         "is_authenticated": is_authenticated,
                     },
+                    result_stream,
                 )
             )
         )
 
-    async def request_remote(self, request: HTTPServerRequest) -> SinatraResult:
+    async def request_remote(
+        self, request: HTTPServerRequest, result_stream: ResultStream = None,
+    ) -> SinatraResult:
         return SinatraResult.from_response(
-            await convert_yielded(self.run_ruby(SINATRA_REMOTE, request))
+            await convert_yielded(
+                self.run_ruby(
+                    SINATRA_REMOTE, request, result_stream=result_stream
+                )
+            )
         )
 
     async def sync_configs(self):
@@ -1,25 +1,40 @@
 import os
 import signal
 import socket
+import time
 from pathlib import Path
 
-from tornado.ioloop import IOLoop
+from tornado.ioloop import IOLoop, PeriodicCallback
 from tornado.locks import Lock
 from tornado.web import Application
 
 from pcs import settings
 from pcs.common.system import is_systemd
-from pcs.daemon import log, ruby_pcsd, session, ssl, systemd
+from pcs.daemon import auth, log, ruby_pcsd, session, ssl, systemd
 from pcs.daemon.app import sinatra_ui, sinatra_remote, ui
 from pcs.daemon.app.common import RedirectHandler
 from pcs.daemon.env import prepare_env
 from pcs.daemon.http_server import HttpsServerManage
+from pcs.daemon.locks import InterProcessLock
+
+# exit code of a worker which has not been able to start, differs from 1 used
+# for an uncaught exception in a running worker
+WORKER_START_FAILED = 3
+# milliseconds between checks for certificates changed by other workers
+CERTS_CHECK_INTERVAL = 5000
+# milliseconds between checks that the pcs_internal worker pool is running
+PCS_INTERNAL_POOL_CHECK_INTERVAL = 5000
+# milliseconds between writing metrics of authentication to the log
+AUTH_METRICS_LOG_INTERVAL = 600000
 
 
 class SignalInfo:
     # pylint: disable=too-few-public-methods
     server_manage = None
     ioloop_started = False
+    pcs_internal_pool_pid = None
+    # pid: index of a worker process, only in the master process
+    worker_pids = {}
 
 
 def handle_signal(incomming_signal, frame):
@@ -29,9 +44,156 @@ def handle_signal(incomming_signal, frame):
         SignalInfo.server_manage.stop()
     if SignalInfo.ioloop_started:
         IOLoop.current().stop()
+    stop_workers()
+    stop_pcs_internal_pool()
+    auth.get_auth_worker_pool().shutdown()
+    log.shutdown()
     raise SystemExit(0)
 
 
+def start_pcs_internal_pool():
+    """
+    Start a pool of pcs_internal workers in a child process, return its pid
+    """
+    pid = os.fork()
+    if pid:
+        return pid
+    exit_code = 0
+    try:
+        # Imported in the child only, the daemon itself does not run library
+        # commands.
+        # pylint: disable=import-outside-toplevel
+        from pcs.pcs_internal import run_worker_pool
+
+        run_worker_pool(settings.pcs_internal_socket)
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else 1
+    except BaseException as e:  # pylint: disable=broad-except
+        log.pcsd.error("pcs_internal worker pool failed: %s", e)
+        exit_code = 1
+    finally:
+        # do not run any cleanup of the daemon
+        os._exit(exit_code)  # pylint: disable=protected-access
+
+
+def restart_pcs_internal_pool(status):
+    log.pcsd.warning(
+        "pcs_internal worker pool exited with status %s, restarting", status
+    )
+    SignalInfo.pcs_internal_pool_pid = start_pcs_internal_pool()
+
+
+def check_pcs_internal_pool():
+    """
+    Restart the pool of pcs_internal workers if it has exited
+
+    Used when pcsd runs without workers, the master process of workers
+    restarts the pool itself.
+    """
+    pid = SignalInfo.pcs_internal_pool_pid
+    if not pid:
+        return
+    try:
+        exited_pid, status = os.waitpid(pid, os.WNOHANG)
+    except ChildProcessError:
+        exited_pid, status = pid, None
+    if exited_pid:
+        restart_pcs_internal_pool(status)
+
+
+def stop_pcs_internal_pool():
+    if SignalInfo.pcs_internal_pool_pid:
+        try:
+            os.kill(SignalInfo.pcs_internal_pool_pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        SignalInfo.pcs_internal_pool_pid = None
+
+
+def run_workers(count):
+    """
+    Fork worker processes and keep them running
+
+    Return the index of a worker in the worker process. In the master process,
+    return None when all workers have finished. A worker killed by a signal or
+    crashed is replaced by a new one, so is the pool of pcs_internal workers.
+    If a worker is not able to start, all workers are stopped and SystemExit is
+    raised.
+
+    int count -- number of worker processes
+    """
+    for index in range(count):
+        if _start_worker(index):
+            return index
+    while SignalInfo.worker_pids:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        if pid == SignalInfo.pcs_internal_pool_pid:
+            # do not keep restarting a pool which keeps crashing
+            time.sleep(1)
+            restart_pcs_internal_pool(status)
+            continue
+        index = SignalInfo.worker_pids.pop(pid, None)
+        if index is None:
+            continue
+        if os.WIFEXITED(status):
+            if os.WEXITSTATUS(status) == WORKER_START_FAILED:
+                log.pcsd.error("Worker %s failed to start, exiting", index)
+                stop_workers()
+                stop_pcs_internal_pool()
+                raise SystemExit(1)
+            if os.WEXITSTATUS(status) == 0:
+                # the worker has finished, e.g. it got SIGTERM
+                continue
+        log.pcsd.warning(
+            "Worker %s exited with status %s, restarting", index, status
+        )
+        # do not keep restarting a worker which keeps crashing
+        time.sleep(1)
+        if _start_worker(index):
+            return index
+    return None
+
+
+def _start_worker(index):
+    pid = os.fork()
+    if pid:
+        SignalInfo.worker_pids[pid] = index
+        return False
+    # Processes started by the master belong to the master.
+    SignalInfo.worker_pids = {}
+    SignalInfo.pcs_internal_pool_pid = None
+    return True
+
+
+def stop_workers():
+    for pid in list(SignalInfo.worker_pids):
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    SignalInfo.worker_pids = {}
+
+
+def remove_shared_session_store(path):
+    # Sessions do not survive a restart of pcsd, the same as in-memory ones.
+    for store_path in (path, f"{path}-wal", f"{path}-shm"):
+        try:
+            os.unlink(store_path)
+        except FileNotFoundError:
+            pass
+
+
+def exit_on_invalid_certs(e: ssl.SSLCertKeyException):
+    stop_pcs_internal_pool()
+    for error in e.args:
+        log.pcsd.error(error)
+    log.pcsd.error("Invalid SSL certificate and/or key, exiting")
+    raise SystemExit(WORKER_START_FAILED)
+
+
 def sign_ioloop_started():
     SignalInfo.ioloop_started = True
 
@@ -91,7 +253,7 @@ def main():
     signal.signal(signal.SIGINT, handle_signal)
 
     Path(settings.pcsd_log_location).touch(mode=0o600, exist_ok=True)
-    log.setup(settings.pcsd_log_location)
+    log.setup(settings.pcsd_log_location, settings.pcsd_log_queue_size)
 
     env = prepare_env(os.environ, log.pcsd)
     if env.has_errors:
@@ -100,49 +262,91 @@ def main():
     if env.PCSD_DEBUG:
         log.enable_debug()
 
-    sync_config_lock = Lock()
+    # Pcsd runs pcs_internal commands via the pool, so that a python
+    # interpreter does not have to be started for each of them.
+    SignalInfo.pcs_internal_pool_pid = start_pcs_internal_pool()
+
+    pcsd_ssl = ssl.PcsdSSL(
+        server_name=socket.gethostname(),
+        cert_location=settings.pcsd_cert_location,
+        key_location=settings.pcsd_key_location,
+        ssl_options=env.PCSD_SSL_OPTIONS,
+        ssl_ciphers=env.PCSD_SSL_CIPHERS,
+    )
+    use_workers = env.PCSD_WORKERS > 1
+    worker_index = 0
+    if use_workers:
+        # Generate missing certificates once, not in each worker.
+        try:
+            pcsd_ssl.guarantee_valid_certs()
+        except ssl.SSLCertKeyException as e:
+            exit_on_invalid_certs(e)
+        remove_shared_session_store(settings.pcsd_session_store_location)
+        log.pcsd.info("Starting %s worker processes", env.PCSD_WORKERS)
+        worker_index = run_workers(env.PCSD_WORKERS)
+        if worker_index is None:
+            stop_pcs_internal_pool()
+            raise SystemExit(0)
+        session_storage = session.SharedStorage(
+            env.PCSD_SESSION_LIFETIME, settings.pcsd_session_store_location
+        )
+        sync_config_lock = InterProcessLock(
+            settings.pcsd_sync_config_lock_location
+        )
+    else:
+        session_storage = session.Storage(env.PCSD_SESSION_LIFETIME)
+        sync_config_lock = Lock()
+
     ruby_pcsd_wrapper = ruby_pcsd.Wrapper(
         settings.pcsd_ruby_socket, debug=env.PCSD_DEBUG,
     )
     make_app = configure_app(
-        session.Storage(env.PCSD_SESSION_LIFETIME),
+        session_storage,
         ruby_pcsd_wrapper,
         sync_config_lock,
         env.PCSD_STATIC_FILES_DIR,
         disable_gui=env.PCSD_DISABLE_GUI,
         debug=env.PCSD_DEV,
     )
-    pcsd_ssl = ssl.PcsdSSL(
-        server_name=socket.gethostname(),
-        cert_location=settings.pcsd_cert_location,
-        key_location=settings.pcsd_key_location,
-        ssl_options=env.PCSD_SSL_OPTIONS,
-        ssl_ciphers=env.PCSD_SSL_CIPHERS,
-    )
     try:
         SignalInfo.server_manage = HttpsServerManage(
             make_app,
             port=env.PCSD_PORT,
             bind_addresses=env.PCSD_BIND_ADDR,
             ssl=pcsd_ssl,
+            reuse_port=use_workers,
         ).start()
     except socket.gaierror as e:
+        stop_pcs_internal_pool()
         log.pcsd.error(
             "Unable to bind to specific address(es), exiting: %s ", e
         )
-        raise SystemExit(1)
+        raise SystemExit(WORKER_START_FAILED)
     except OSError as e:
+        stop_pcs_internal_pool()
         log.pcsd.error("Unable to start pcsd daemon, exiting: %s ", e)
-        raise SystemExit(1)
+        raise SystemExit(WORKER_START_FAILED)
     except ssl.SSLCertKeyException as e:
-        for error in e.args:
-            log.pcsd.error(error)
-        log.pcsd.error("Invalid SSL certificate and/or key, exiting")
-        raise SystemExit(1)
+        exit_on_invalid_certs(e)
 
     ioloop = IOLoop.current()
     ioloop.add_callback(sign_ioloop_started)
-    if is_systemd() and env.NOTIFY_SOCKET:
-        ioloop.add_callback(systemd.notify, env.NOTIFY_SOCKET)
-    ioloop.add_callback(config_sync(sync_config_lock, ruby_pcsd_wrapper))
+    # Only one process notifies systemd and synchronizes config files.
+    if worker_index == 0:
+        if is_systemd() and env.NOTIFY_SOCKET:
+            ioloop.add_callback(systemd.notify, env.NOTIFY_SOCKET)
+        ioloop.add_callback(config_sync(sync_config_lock, ruby_pcsd_wrapper))
+    if use_workers:
+        # certificates may be set by a request processed by another worker
+        PeriodicCallback(
+            SignalInfo.server_manage.reload_certs_if_changed,
+            CERTS_CHECK_INTERVAL,
+        ).start()
+    else:
+        PeriodicCallback(
+            check_pcs_internal_pool, PCS_INTERNAL_POOL_CHECK_INTERVAL
+        ).start()
+    PeriodicCallback(
+        auth.get_auth_worker_pool().log_metrics, AUTH_METRICS_LOG_INTERVAL
+    ).start()
     ioloop.start()
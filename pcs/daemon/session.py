@@ -1,4 +1,10 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+import json
+import os
 import random
+import sqlite3
 import string
 from time import time as now
 
@@ -69,23 +75,37 @@ class Session:
         return now() > self.__last_access + seconds
 
 
+class StorageError(Exception):
+    pass
+
+
 class Storage:
+    """
+    Sessions kept in the memory of a pcsd process
+    """
+
+    # executor to run calls of the storage in, None if the calls do not block
+    executor = None
+
     def __init__(self, lifetime_seconds):
-        self.__sessions = {}
+        # Sessions are ordered by the time they were last provided, so the
+        # expired ones are at the beginning. A session may be refreshed after
+        # it has been provided, so it may be dropped a bit later than it has
+        # expired. It is never used after it has expired, though.
+        self.__sessions = OrderedDict()
         self.__lifetime_seconds = lifetime_seconds
 
     def provide(self, sid=None) -> Session:
         if self.__is_valid_sid(sid):
+            self.__sessions.move_to_end(sid)
             return self.__sessions[sid].refresh()
         return self.__register(self.__generate_sid())
 
     def drop_expired(self):
-        obsolete_sid_list = [
-            sid
-            for sid, session in self.__sessions.items()
-            if session.was_unused_last(self.__lifetime_seconds)
-        ]
-        for sid in obsolete_sid_list:
+        while self.__sessions:
+            sid, session = next(iter(self.__sessions.items()))
+            if not session.was_unused_last(self.__lifetime_seconds):
+                break
             del self.__sessions[sid]
 
     def destroy(self, sid):
@@ -120,14 +140,193 @@ class Storage:
     def __register(self, *args, **kwargs) -> Session:
         session = Session(*args, **kwargs)
         self.__sessions[session.sid] = session
+        self.__sessions.move_to_end(session.sid)
         return session
 
     def __generate_sid(self):
-        for _ in range(10):
-            sid = "".join(
-                random.choices(string.ascii_lowercase + string.digits, k=64)
+        return generate_sid(lambda sid: sid in self.__sessions)
+
+
+def _raise_storage_error(method):
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        try:
+            return method(*args, **kwargs)
+        except sqlite3.Error as e:
+            raise StorageError(str(e)) from e
+
+    return wrapper
+
+
+class SharedStorage:
+    """
+    Sessions shared by pcsd worker processes in an sqlite database
+
+    The database is opened when it is used for the first time, so each worker
+    process opens its own connection. Calls of the storage block while another
+    worker holds a write lock, so tornado handlers run them in the executor.
+    It has a single thread, which is the only one using the connection.
+    """
+
+    # The statements are tiny, a lock is never held for long. If it is, fail
+    # rather than pile up requests waiting for it.
+    busy_timeout_seconds = 5
+
+    def __init__(self, lifetime_seconds, path):
+        self.__lifetime_seconds = lifetime_seconds
+        self.__path = path
+        self.__connection = None
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    @_raise_storage_error
+    def provide(self, sid=None) -> Session:
+        session = self.__load_valid(sid)
+        if session is not None:
+            self.__db().execute(
+                "UPDATE sessions SET last_access = ? WHERE sid = ?",
+                (now(), sid),
             )
-            if sid not in self.__sessions:
-                return sid
-        # TODO what to do?
-        raise Exception("Cannot generate unique sid")
+            return session
+        return self.__register(self.__generate_sid())
+
+    @_raise_storage_error
+    def drop_expired(self):
+        # The index of last access times is used, sessions are not scanned.
+        self.__db().execute(
+            "DELETE FROM sessions WHERE last_access < ?",
+            (now() - self.__lifetime_seconds,),
+        )
+
+    @_raise_storage_error
+    def destroy(self, sid):
+        self.__db().execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+        return self
+
+    @_raise_storage_error
+    def login(self, sid, username, groups, ajax_id=None) -> Session:
+        return self.__register(
+            self.__valid_sid(sid),
+            username=username,
+            groups=groups,
+            is_authenticated=True,
+            ajax_id=ajax_id,
+        )
+
+    @_raise_storage_error
+    def rejected_user(self, sid, username) -> Session:
+        return self.__register(self.__valid_sid(sid), username=username)
+
+    def __db(self):
+        if self.__connection is None:
+            _create_private_file(self.__path)
+            connection = sqlite3.connect(
+                self.__path,
+                timeout=self.busy_timeout_seconds,
+                isolation_level=None,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            # Sessions do not need to survive a power loss, do not wait for
+            # a disk sync on each write.
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " sid TEXT PRIMARY KEY,"
+                " username TEXT,"
+                " groups TEXT NOT NULL,"
+                " is_authenticated INTEGER NOT NULL,"
+                " ajax_id TEXT,"
+                " last_access REAL NOT NULL"
+                ")"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS sessions_last_access"
+                " ON sessions (last_access)"
+            )
+            self.__connection = connection
+        return self.__connection
+
+    def __load_valid(self, sid):
+        if sid is None:
+            return None
+        row = (
+            self.__db()
+            .execute(
+                "SELECT username, groups, is_authenticated, ajax_id"
+                " FROM sessions WHERE sid = ? AND last_access >= ?",
+                (sid, now() - self.__lifetime_seconds),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        username, groups, is_authenticated, ajax_id = row
+        return Session(
+            sid,
+            username=username,
+            groups=json.loads(groups),
+            is_authenticated=bool(is_authenticated),
+            ajax_id=ajax_id,
+        )
+
+    def __valid_sid(self, sid):
+        # Do not let a user (an attacker?) to force us to use their sid.
+        if self.__load_valid(sid) is not None:
+            return sid
+        return self.__generate_sid()
+
+    def __register(self, *args, **kwargs) -> Session:
+        session = Session(*args, **kwargs)
+        self.__db().execute(
+            "INSERT OR REPLACE INTO sessions"
+            " (sid, username, groups, is_authenticated, ajax_id, last_access)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                session.sid,
+                session.username,
+                json.dumps(session.groups),
+                int(session.is_authenticated),
+                session.ajax_id,
+                now(),
+            ),
+        )
+        return session
+
+    def __generate_sid(self):
+        return generate_sid(
+            lambda sid: self.__db()
+            .execute("SELECT 1 FROM sessions WHERE sid = ?", (sid,))
+            .fetchone()
+            is not None
+        )
+
+
+def _create_private_file(path):
+    """
+    Make sure a database file is only accessible by its owner
+
+    The database holds ids of live sessions, anyone able to read them can take
+    the sessions over. Sqlite creates the -wal and -shm files with the same
+    permissions as the database file.
+    """
+    os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+    for file_path in (path, f"{path}-wal", f"{path}-shm"):
+        try:
+            os.chmod(file_path, 0o600)
+        except FileNotFoundError:
+            pass
+
+
+def generate_sid(is_used):
+    """
+    Generate a random session id
+
+    callable is_used -- tells whether a session id is already used
+    """
+    for _ in range(10):
+        sid = "".join(
+            random.choices(string.ascii_lowercase + string.digits, k=64)
+        )
+        if not is_used(sid):
+            return sid
+    # TODO what to do?
+    raise Exception("Cannot generate unique sid")
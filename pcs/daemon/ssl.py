@@ -93,6 +93,12 @@ class SSLCertKeyException(Exception):
 
 
 class PcsdSSL:
+    # All contexts created by an instance select the most recently created
+    # context for new connections in their SNI callback (it is called even if
+    # a client does not send a server name). So a server keeps the context
+    # it has been started with and new certificates are used without
+    # restarting the server.
+
     def __init__(
         self, server_name, cert_location, key_location, ssl_options, ssl_ciphers
     ):
@@ -100,22 +106,68 @@ class PcsdSSL:
         self.__ssl_options = ssl_options
         self.__ssl_ciphers = ssl_ciphers
         self.__ck_pair = CertKeyPair(cert_location, key_location)
+        self.__current_context = None
+        self.__files_stamp = None
 
     def create_context(self) -> ssl.SSLContext:
+        """
+        Create a context from current certificate files and use it for new
+        connections of all servers using contexts of this instance
+        """
         # pylint: disable=no-member
+        files_stamp = self.__get_files_stamp()
         ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
         ssl_context.set_ciphers(self.__ssl_ciphers)
         ssl_context.options = self.__ssl_options
         ssl_context.load_cert_chain(
             self.__ck_pair.cert_location, self.__ck_pair.key_location
         )
+        ssl_context.sni_callback = self.__select_context
+        self.__current_context = ssl_context
+        self.__files_stamp = files_stamp
         return ssl_context
 
-    def guarantee_valid_certs(self):
-        if not self.__ck_pair.exists():
-            self.__ck_pair.regenerate(self.__server_name)
-            return
+    def files_changed(self):
+        """
+        Tell whether certificate files changed since the last context creation
+        """
+        return (
+            self.__files_stamp is not None
+            and self.__files_stamp != self.__get_files_stamp()
+        )
 
+    def mark_files_checked(self):
+        """
+        Do not tell current certificate files as changed, e.g. when they have
+        been found invalid and a context has not been created from them
+        """
+        self.__files_stamp = self.__get_files_stamp()
+
+    def __get_files_stamp(self):
+        stamp = []
+        for path in (self.__ck_pair.cert_location, self.__ck_pair.key_location):
+            try:
+                stamp.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                stamp.append(None)
+        return stamp
+
+    def __select_context(self, ssl_socket, server_name, ssl_context):
+        # pylint: disable=unused-argument
+        current_context = self.__current_context
+        if current_context is not None and current_context is not ssl_context:
+            ssl_socket.context = current_context
+
+    def certs_exist(self):
+        return self.__ck_pair.exists()
+
+    def check_certs(self):
         error_list = self.__ck_pair.check()
         if error_list:
             raise SSLCertKeyException(*error_list)
+
+    def guarantee_valid_certs(self):
+        if not self.__ck_pair.exists():
+            self.__ck_pair.regenerate(self.__server_name)
+            return
+        self.check_certs()
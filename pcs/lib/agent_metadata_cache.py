@@ -0,0 +1,156 @@
+"""
+Cache of parsed resource and stonith agents' metadata.
+
+Getting metadata of an agent means running the agent via crm_resource and
+parsing its xml output. The cache keeps the parsed metadata in memory and, if
+a cache directory is set, in files so that other pcs processes can use them.
+
+A stored entry, in memory or in a file, is only used if the files it has been
+created from (the agent itself, crm_resource or pacemaker-fenced) have not
+changed since. This is checked every time an entry is used, so long running
+processes notice upgraded agents. Entries of agents whose files cannot be
+found are only kept in memory and never revalidated.
+"""
+import hashlib
+import json
+import os
+import os.path
+import tempfile
+
+
+class AgentMetadataCache:
+    def __init__(self):
+        self._enabled = False
+        self._cache_dir = None
+        self._memory = {}
+
+    @property
+    def enabled(self):
+        return self._enabled
+
+    def enable(self, cache_dir=None):
+        """
+        Start caching metadata of all agents
+
+        string cache_dir -- directory to store metadata in, None = memory only
+        """
+        self._enabled = True
+        self._cache_dir = cache_dir
+
+    def disable(self):
+        self._enabled = False
+        self._cache_dir = None
+        self._memory = {}
+
+    def get(self, agent_name, source_file_list, loader, always_in_memory=False):
+        """
+        Return metadata of an agent, load them by the loader if not cached
+
+        string agent_name -- unique name of the agent
+        iterable source_file_list -- files the metadata are generated from
+        callable loader -- returns metadata as a json serializable dict, may
+            raise an exception which is passed to the caller
+        bool always_in_memory -- keep the metadata in memory even if the cache
+            is disabled
+        """
+        key = _get_key(agent_name, source_file_list)
+        if agent_name in self._memory:
+            memory_key, metadata = self._memory[agent_name]
+            if memory_key == key:
+                return metadata
+            del self._memory[agent_name]
+        use_file = key and self._enabled and self._cache_dir
+        metadata = self._read(key) if use_file else None
+        if metadata is None:
+            metadata = loader()
+            if use_file:
+                self._write(key, metadata)
+        if self._enabled or always_in_memory:
+            self._memory[agent_name] = (key, metadata)
+        return metadata
+
+    def invalidate(self, agent_name=None):
+        """
+        Drop cached metadata of an agent or of all agents
+
+        string agent_name -- agent to drop metadata of, None = all agents
+        """
+        if agent_name is None:
+            self._memory = {}
+            if self._cache_dir:
+                for file_name in _list_dir(self._cache_dir):
+                    _remove_file(os.path.join(self._cache_dir, file_name))
+            return
+        self._memory.pop(agent_name, None)
+        if self._cache_dir:
+            _remove_file(self._get_path(agent_name))
+
+    def _get_path(self, agent_name):
+        return os.path.join(
+            self._cache_dir,
+            "{0}.json".format(
+                hashlib.sha256(agent_name.encode("utf-8")).hexdigest()
+            ),
+        )
+
+    def _read(self, key):
+        try:
+            with open(self._get_path(key["name"]), "r") as cache_file:
+                data = json.load(cache_file)
+        except (EnvironmentError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("key") != key:
+            return None
+        return data.get("metadata")
+
+    def _write(self, key, metadata):
+        # The cache is not essential, so it is fine to skip storing metadata if
+        # something goes wrong. A temporary file is used so that other
+        # processes never read a partially written entry.
+        try:
+            os.makedirs(self._cache_dir, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir)
+            try:
+                with os.fdopen(fd, "w") as tmp_file:
+                    json.dump({"key": key, "metadata": metadata}, tmp_file)
+                os.replace(tmp_path, self._get_path(key["name"]))
+            except (EnvironmentError, TypeError, ValueError):
+                _remove_file(tmp_path)
+        except EnvironmentError:
+            pass
+
+
+def _get_key(agent_name, source_file_list):
+    if not source_file_list:
+        return None
+    file_list = []
+    for path in source_file_list:
+        if not path:
+            return None
+        try:
+            stat = os.stat(path)
+        except EnvironmentError:
+            return None
+        file_list.append([path, stat.st_mtime_ns, stat.st_size])
+    return {"name": agent_name, "files": file_list}
+
+
+def _list_dir(path):
+    try:
+        return os.listdir(path)
+    except EnvironmentError:
+        return []
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except EnvironmentError:
+        pass
+
+
+_process_agent_metadata_cache = AgentMetadataCache()
+
+
+def get_agent_metadata_cache():
+    return _process_agent_metadata_cache
@@ -17,7 +17,10 @@ from pcs.common.pacemaker.nvset import (
     CibNvsetDto,
 )
 from pcs.common.reports import ReportItemList
-from pcs.common.types import CibNvsetType
+from pcs.common.types import (
+    CibNvsetType,
+    CibRuleInEffectStatus,
+)
 from pcs.lib import validate
 from pcs.lib.cib.rule import (
     RuleParseError,
@@ -59,16 +62,29 @@ def nvpair_element_to_dto(nvpair_el: _Element) -> CibNvpairDto:
     )
 
 
-def nvset_element_to_dto(nvset_el: _Element) -> CibNvsetDto:
+def nvset_element_to_dto(
+    nvset_el: _Element,
+    rule_in_effect_status: Optional[Mapping[str, CibRuleInEffectStatus]] = None,
+) -> CibNvsetDto:
     """
     Export an nvset xml element to its DTO
+
+    rule_in_effect_status -- status of rules by their ids
     """
     rule_el = nvset_el.find("./rule")
+    rule_dto = None
+    if rule_el is not None:
+        rule_status = (rule_in_effect_status or {}).get(
+            str(rule_el.get("id", ""))
+        )
+        rule_dto = rule_element_to_dto(
+            rule_el, rule_status == CibRuleInEffectStatus.EXPIRED
+        )
     return CibNvsetDto(
         str(nvset_el.get("id", "")),
         _tag_to_type[str(nvset_el.tag)],
         export_attributes(nvset_el, with_id=False),
-        None if rule_el is None else rule_element_to_dto(rule_el),
+        rule_dto,
         [
             nvpair_element_to_dto(nvpair_el)
             for nvpair_el in nvset_el.iterfind("./nvpair")
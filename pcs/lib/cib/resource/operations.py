@@ -11,10 +11,7 @@ from pcs.common.reports.item import ReportItem
 from pcs.lib import validate
 from pcs.lib.resource_agent import get_default_interval, complete_all_intervals
 from pcs.lib.cib.nvpair import append_new_instance_attributes
-from pcs.lib.cib.tools import (
-    create_subelement_id,
-    does_id_exist,
-)
+from pcs.lib.cib.tools import create_subelement_id
 from pcs.lib.errors import LibraryError
 from pcs.lib.pacemaker.values import is_true, timeout_to_seconds, RESOURCE_ROLES
 
@@ -298,12 +295,9 @@ def append_new_operation(operations_element, id_provider, options):
         if key not in OPERATION_NVPAIR_ATTRIBUTES
     )
     if "id" in attribute_map:
-        if does_id_exist(operations_element, attribute_map["id"]):
-            raise LibraryError(
-                ReportItem.error(
-                    reports.messages.IdAlreadyExists(attribute_map["id"])
-                )
-            )
+        report_list = id_provider.book_ids(attribute_map["id"])
+        if report_list:
+            raise LibraryError(*report_list)
     else:
         attribute_map.update(
             {
@@ -16,7 +16,7 @@ from pcs.lib.cib.resource.operations import (
     prepare as prepare_operations,
     create_operations,
 )
-from pcs.lib.cib.tools import does_id_exist, find_element_by_tag_and_id
+from pcs.lib.cib.tools import find_element_by_tag_and_id
 from pcs.lib.errors import LibraryError
 from pcs.lib.pacemaker.values import validate_id
 
@@ -91,10 +91,9 @@ def create(
     if instance_attributes is None:
         instance_attributes = {}
 
-    if does_id_exist(resources_section, resource_id):
-        raise LibraryError(
-            ReportItem.error(reports.messages.IdAlreadyExists(resource_id))
-        )
+    report_list = id_provider.book_ids(resource_id)
+    if report_list:
+        raise LibraryError(*report_list)
     validate_id(resource_id, "{0} name".format(resource_type))
 
     operation_list = prepare_operations(
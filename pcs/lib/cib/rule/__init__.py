@@ -1,5 +1,6 @@
 from .cib_to_dto import rule_element_to_dto
 from .expression_part import BoolExpr as RuleRoot
+from .in_effect import get_rules_in_effect_status
 from .parser import (
     parse_rule,
     RuleParseError,
@@ -14,10 +14,16 @@ from pcs.common.types import CibRuleExpressionType
 from pcs.lib.xml_tools import export_attributes
 
 
-def rule_element_to_dto(rule_el: _Element) -> CibRuleExpressionDto:
+def rule_element_to_dto(
+    rule_el: _Element, is_expired: bool = False
+) -> CibRuleExpressionDto:
     """
     Export a rule xml element including its children to their DTOs
+
+    is_expired -- is the rule expired?
     """
+    if str(rule_el.tag) == "rule":
+        return _rule_to_dto(rule_el, is_expired)
     return _tag_to_export[str(rule_el.tag)](rule_el)
 
 
@@ -29,7 +35,9 @@ def _attrs_to_str(el: _Element) -> str:
     )
 
 
-def _rule_to_dto(rule_el: _Element) -> CibRuleExpressionDto:
+def _rule_to_dto(
+    rule_el: _Element, is_expired: bool = False
+) -> CibRuleExpressionDto:
     children_dto_list = [
         _tag_to_export[str(child.tag)](child)
         # The xpath method has a complicated return value, but we know our xpath
@@ -48,7 +56,7 @@ def _rule_to_dto(rule_el: _Element) -> CibRuleExpressionDto:
     return CibRuleExpressionDto(
         str(rule_el.get("id", "")),
         _tag_to_type[str(rule_el.tag)],
-        False,  # TODO implement is_expired
+        is_expired,
         export_attributes(rule_el, with_id=False),
         None,
         None,
@@ -0,0 +1,290 @@
+"""
+Evaluation of rules' expiration: is a rule in effect, expired or not yet in
+effect?
+
+Rules are evaluated the same way pacemaker's crm_rule evaluates them. Only
+rules with exactly one date_expression can be evaluated. A date_spec must
+specify years and must not specify moon, otherwise it cannot tell whether
+a rule is expired. Rules are evaluated natively, pacemaker is only asked about
+rules which cannot be evaluated natively, e.g. due to a date format pcs does
+not understand.
+"""
+import calendar
+import datetime
+import re
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from lxml.etree import _Element
+
+from pcs.common.types import CibRuleInEffectStatus
+
+PacemakerRuleChecker = Callable[
+    [Iterable[str]], Mapping[str, CibRuleInEffectStatus]
+]
+
+_DATE_RE = re.compile(
+    r"""
+    ^\s*
+    (?P<year>\d{4})-
+    (?:
+        (?P<month>\d{1,2})-(?P<monthday>\d{1,2})
+        |W(?P<week>\d{1,2})-(?P<weekday>\d)
+        |(?P<yearday>\d{1,3})
+    )
+    (?:
+        [T\s]+(?P<hour>\d{1,2})
+        (?::(?P<minute>\d{1,2})(?::(?P<second>\d{1,2}))?)?
+    )?
+    \s*
+    (?P<offset>Z|[+-]\d{2}(?::?\d{2})?)?
+    \s*$
+    """,
+    re.VERBOSE,
+)
+_RANGE_RE = re.compile(
+    r"^\s*(?P<low>\d*)\s*(?:(?P<dash>-)\s*(?P<high>\d*))?\s*$"
+)
+
+_DURATION_TIMEDELTA_ATTRS = ("weeks", "days", "hours", "minutes", "seconds")
+
+
+class _Undetermined(Exception):
+    """
+    A rule cannot be evaluated natively, pacemaker must evaluate it
+    """
+
+
+def get_rules_in_effect_status(
+    rule_el_list: Iterable[_Element],
+    pacemaker_checker: Optional[PacemakerRuleChecker] = None,
+    now: Optional[datetime.datetime] = None,
+) -> Dict[str, CibRuleInEffectStatus]:
+    """
+    Get status of all specified rules at once
+
+    rule_el_list -- rules to be evaluated
+    pacemaker_checker -- gets ids of rules which cannot be evaluated natively,
+        returns their status, if not specified their status is UNKNOWN
+    now -- moment to evaluate the rules for, timezone aware, defaults to now
+    """
+    status_map = evaluate_rules_in_effect(rule_el_list, now)
+    undetermined_list = [
+        rule_id for rule_id, status in status_map.items() if status is None
+    ]
+    if undetermined_list and pacemaker_checker:
+        status_map.update(pacemaker_checker(undetermined_list))
+    return {
+        rule_id: (CibRuleInEffectStatus.UNKNOWN if status is None else status)
+        for rule_id, status in status_map.items()
+    }
+
+
+def evaluate_rules_in_effect(
+    rule_el_list: Iterable[_Element], now: Optional[datetime.datetime] = None,
+) -> Dict[str, Optional[CibRuleInEffectStatus]]:
+    """
+    Evaluate rules natively, return None for rules which cannot be evaluated
+
+    rule_el_list -- rules to be evaluated
+    now -- moment to evaluate the rules for, timezone aware, defaults to now
+    """
+    if now is None:
+        now = datetime.datetime.now(datetime.timezone.utc)
+    # pacemaker compares times with a precision of seconds
+    now = now.replace(microsecond=0)
+    status_map: Dict[str, Optional[CibRuleInEffectStatus]] = {}
+    for rule_el in rule_el_list:
+        try:
+            status: Optional[CibRuleInEffectStatus] = _evaluate_rule(
+                rule_el, now
+            )
+        except _Undetermined:
+            status = None
+        status_map[str(rule_el.get("id", ""))] = status
+    return status_map
+
+
+def _evaluate_rule(
+    rule_el: _Element, now: datetime.datetime
+) -> CibRuleInEffectStatus:
+    date_expr_list = rule_el.findall("./date_expression")
+    if len(date_expr_list) != 1:
+        return CibRuleInEffectStatus.UNKNOWN
+    expr_el = date_expr_list[0]
+    operation = expr_el.get("operation")
+    if operation is None:
+        # Pacemaker defaults the operation to in_range when evaluating rules.
+        # Crm_rule, however, does not find such an expression and reports the
+        # rule as unsupported.
+        return CibRuleInEffectStatus.UNKNOWN
+
+    if operation == "date_spec":
+        date_spec_el = expr_el.find("./date_spec")
+        if (
+            date_spec_el is None
+            or "years" not in date_spec_el.attrib
+            or "moon" in date_spec_el.attrib
+        ):
+            return CibRuleInEffectStatus.UNKNOWN
+        return _evaluate_date_spec(date_spec_el, now)
+
+    start = _parse_date(expr_el.get("start"))
+    end = _parse_date(expr_el.get("end"))
+    if operation == "in_range":
+        if end is None and start is not None:
+            duration_el = expr_el.find("./duration")
+            if duration_el is not None:
+                end = _add_duration(start, duration_el)
+        if start is None and end is None:
+            raise _Undetermined()
+        if start is not None and start > now:
+            return CibRuleInEffectStatus.NOT_YET_IN_EFFECT
+        if end is not None and end < now:
+            return CibRuleInEffectStatus.EXPIRED
+        return CibRuleInEffectStatus.IN_EFFECT
+    if operation == "gt" and start is not None:
+        return (
+            CibRuleInEffectStatus.IN_EFFECT
+            if now > start
+            else CibRuleInEffectStatus.NOT_YET_IN_EFFECT
+        )
+    if operation == "lt" and end is not None:
+        return (
+            CibRuleInEffectStatus.IN_EFFECT
+            if now < end
+            else CibRuleInEffectStatus.EXPIRED
+        )
+    raise _Undetermined()
+
+
+def _evaluate_date_spec(
+    date_spec_el: _Element, now: datetime.datetime
+) -> CibRuleInEffectStatus:
+    # date_spec is evaluated in the local time, the same as in pacemaker
+    local_now = now.astimezone()
+    iso_year, iso_week, iso_weekday = local_now.isocalendar()
+    # The order of the checks matters, the first failing one determines the
+    # result.
+    checks = (
+        ("years", local_now.year),
+        ("months", local_now.month),
+        ("monthdays", local_now.day),
+        ("hours", local_now.hour),
+        ("minutes", local_now.minute),
+        ("seconds", local_now.second),
+        ("yeardays", local_now.timetuple().tm_yday),
+        ("weekyears", iso_year),
+        ("weeks", iso_week),
+        ("weekdays", iso_weekday),
+    )
+    for attr_name, value in checks:
+        if attr_name not in date_spec_el.attrib:
+            continue
+        low, high = _parse_range(str(date_spec_el.get(attr_name)))
+        if low is not None and value < low:
+            return CibRuleInEffectStatus.NOT_YET_IN_EFFECT
+        if high is not None and value > high:
+            return CibRuleInEffectStatus.EXPIRED
+    return CibRuleInEffectStatus.IN_EFFECT
+
+
+def _parse_range(value: str) -> Tuple[Optional[int], Optional[int]]:
+    match = _RANGE_RE.match(value)
+    if not match or not (match.group("low") or match.group("high")):
+        raise _Undetermined()
+    low = int(match.group("low")) if match.group("low") else None
+    if not match.group("dash"):
+        return low, low
+    high = int(match.group("high")) if match.group("high") else None
+    return low, high
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime.datetime]:
+    """
+    Parse an ISO 8601 date the way pacemaker does, None if not specified
+    """
+    if value is None:
+        return None
+    match = _DATE_RE.match(value)
+    if not match:
+        raise _Undetermined()
+    parts = match.groupdict()
+    try:
+        year = int(parts["year"])
+        if parts["month"]:
+            date = datetime.date(
+                year, int(parts["month"]), int(parts["monthday"])
+            )
+        elif parts["week"]:
+            week, weekday = int(parts["week"]), int(parts["weekday"])
+            if not 1 <= week <= 53 or not 1 <= weekday <= 7:
+                raise _Undetermined()
+            jan_4 = datetime.date(year, 1, 4)
+            date = jan_4 + datetime.timedelta(
+                weeks=week - 1, days=weekday - jan_4.isoweekday()
+            )
+            if date.isocalendar()[0] != year:
+                raise _Undetermined()
+        else:
+            yearday = int(parts["yearday"])
+            if not 1 <= yearday <= (366 if calendar.isleap(year) else 365):
+                raise _Undetermined()
+            date = datetime.date(year, 1, 1) + datetime.timedelta(
+                days=yearday - 1
+            )
+        result = datetime.datetime.combine(
+            date,
+            datetime.time(
+                int(parts["hour"] or 0),
+                int(parts["minute"] or 0),
+                int(parts["second"] or 0),
+            ),
+        )
+    except ValueError as e:
+        raise _Undetermined() from e
+    if not parts["offset"]:
+        # dates without an offset are in the local time
+        return result.astimezone()
+    return result.replace(tzinfo=_parse_offset(parts["offset"]))
+
+
+def _parse_offset(value: str) -> datetime.timezone:
+    if value == "Z":
+        return datetime.timezone.utc
+    digits = value[1:].replace(":", "")
+    offset = datetime.timedelta(
+        hours=int(digits[:2]), minutes=int(digits[2:] or 0)
+    )
+    return datetime.timezone(-offset if value[0] == "-" else offset)
+
+
+def _add_duration(
+    start: datetime.datetime, duration_el: _Element
+) -> datetime.datetime:
+    try:
+        months = 12 * int(duration_el.get("years", 0)) + int(
+            duration_el.get("months", 0)
+        )
+        month_index = start.month - 1 + months
+        year = start.year + month_index // 12
+        month = month_index % 12 + 1
+        end = start.replace(
+            year=year,
+            month=month,
+            day=min(start.day, calendar.monthrange(year, month)[1]),
+        )
+        return end + datetime.timedelta(
+            **{
+                attr: int(duration_el.get(attr, 0))
+                for attr in _DURATION_TIMEDELTA_ATTRS
+            }
+        )
+    except (ValueError, OverflowError) as e:
+        raise _Undetermined() from e
@@ -1,7 +1,10 @@
 import re
 from typing import (
+    Callable,
     cast,
+    Dict,
     List,
+    Optional,
     Set,
 )
 
@@ -25,6 +28,10 @@ VERSION_FORMAT = r"(?P<major>\d+)\.(?P<minor>\d+)(\.(?P<rev>\d+))?$"
 class IdProvider:
     """
     Book ids for future use in the CIB and generate new ids accordingly
+
+    Ids existing in the CIB are read once, when an id is checked for the first
+    time. Elements added to the CIB after that must use ids allocated or booked
+    by the provider.
     """
 
     def __init__(self, cib_element: _Element):
@@ -33,6 +40,16 @@ class IdProvider:
         """
         self._cib = get_root(cib_element)
         self._booked_ids: Set[str] = set()
+        self._existing_ids: Optional[Set[str]] = None
+        # id prefix -> first counter which may not be used yet
+        self._next_counters: Dict[str, int] = {}
+
+    def _is_id_used(self, _id: str) -> bool:
+        if _id in self._booked_ids:
+            return True
+        if self._existing_ids is None:
+            self._existing_ids = get_configuration_ids(self._cib)
+        return _id in self._existing_ids
 
     def allocate_id(self, proposed_id: str) -> str:
         """
@@ -40,7 +57,9 @@ class IdProvider:
 
         string proposed_id -- requested id
         """
-        final_id = find_unique_id(self._cib, proposed_id, self._booked_ids)
+        final_id = _find_unused_id(
+            proposed_id, self._is_id_used, self._next_counters
+        )
         self._booked_ids.add(final_id)
         return final_id
 
@@ -53,7 +72,7 @@ class IdProvider:
         for _id in id_list:
             if _id in reported_ids:
                 continue
-            if _id in self._booked_ids or does_id_exist(self._cib, _id):
+            if self._is_id_used(_id):
                 report_list.append(
                     ReportItem.error(reports.messages.IdAlreadyExists(_id))
                 )
@@ -191,6 +210,46 @@ class ElementSearcher:
                 return
 
 
+def get_configuration_ids(tree: _Element) -> Set[str]:
+    """
+    Return all ids used in configuration elements, see
+    get_configuration_elements_by_id for details on what is considered an id
+
+    tree -- any element in xml tree, whole tree (not only its subtree) will be
+        searched
+    """
+    return set(
+        cast(
+            List[str],
+            get_root(tree).xpath(
+                """
+                (
+                    /cib/*[name()!="status"]
+                    |
+                    /*[name()!="cib"]
+                )
+                //*[
+                    name()!="acl_target"
+                    and
+                    name()!="role"
+                    and
+                    name()!="obj_ref"
+                    and
+                    name()!="resource_ref"
+                ]/@id
+                |
+                (
+                    /cib/*[name()!="status"]
+                    |
+                    /*[name()!="cib"]
+                )
+                //primitive/meta_attributes/nvpair[@name="remote-node"]/@value
+                """
+            ),
+        )
+    )
+
+
 def get_configuration_elements_by_id(
     tree: _Element, check_id: str
 ) -> List[_Element]:
@@ -278,13 +337,36 @@ def find_unique_id(tree, check_id, reserved_ids=None):
     string check_id -- id to check
     iterable reserved_ids -- ids to think about as already used
     """
-    if not reserved_ids:
-        reserved_ids = set()
-    counter = 1
-    temp_id = check_id
-    while temp_id in reserved_ids or does_id_exist(tree, temp_id):
-        temp_id = "{0}-{1}".format(check_id, counter)
+    reserved_ids = set(reserved_ids) if reserved_ids else set()
+    if check_id not in reserved_ids and not does_id_exist(tree, check_id):
+        return check_id
+    used_ids = reserved_ids | get_configuration_ids(tree)
+    return _find_unused_id(check_id, lambda _id: _id in used_ids)
+
+
+def _find_unused_id(
+    check_id: str,
+    is_id_used: Callable[[str], bool],
+    next_counters: Optional[Dict[str, int]] = None,
+) -> str:
+    """
+    Return check_id if it is not used, otherwise add the lowest possible
+    integer to its end to make it unused
+
+    check_id -- id to check
+    is_id_used -- tells if an id is used
+    next_counters -- id prefix -> counter to start with, counters lower than
+        that are known to be used, updated by this function
+    """
+    if not is_id_used(check_id):
+        return check_id
+    counter = next_counters.get(check_id, 1) if next_counters is not None else 1
+    temp_id = "{0}-{1}".format(check_id, counter)
+    while is_id_used(temp_id):
         counter += 1
+        temp_id = "{0}-{1}".format(check_id, counter)
+    if next_counters is not None:
+        next_counters[check_id] = counter + 1
     return temp_id
 
 
@@ -15,9 +15,15 @@ from pcs.lib.cib import (
     nvpair_multi,
     sections,
 )
+from pcs.lib.cib.rule import get_rules_in_effect_status
 from pcs.lib.cib.tools import IdProvider
 from pcs.lib.env import LibraryEnvironment
 from pcs.lib.errors import LibraryError
+from pcs.lib.pacemaker.live import (
+    get_rules_in_effect_status as get_pacemaker_rules_in_effect_status,
+    has_rule_in_effect_status_tool,
+)
+from pcs.lib.xml_tools import etree_to_str
 
 
 def resource_defaults_create(
@@ -139,11 +145,29 @@ def operation_defaults_config(env: LibraryEnvironment) -> List[CibNvsetDto]:
 def _defaults_config(
     env: LibraryEnvironment, cib_section_name: str,
 ) -> List[CibNvsetDto]:
-    return [
-        nvpair_multi.nvset_element_to_dto(nvset_el)
-        for nvset_el in nvpair_multi.find_nvsets(
-            sections.get(env.get_cib(), cib_section_name)
+    cib = env.get_cib()
+    nvset_el_list = nvpair_multi.find_nvsets(
+        sections.get(cib, cib_section_name)
+    )
+
+    def pacemaker_checker(rule_id_list):
+        # Rules which cannot be evaluated natively are evaluated by pacemaker,
+        # all of them at once.
+        return get_pacemaker_rules_in_effect_status(
+            env.cmd_runner(), etree_to_str(cib), rule_id_list
         )
+
+    rule_in_effect_status = get_rules_in_effect_status(
+        [
+            rule_el
+            for nvset_el in nvset_el_list
+            for rule_el in nvset_el.iterfind("./rule")
+        ],
+        pacemaker_checker if has_rule_in_effect_status_tool() else None,
+    )
+    return [
+        nvpair_multi.nvset_element_to_dto(nvset_el, rule_in_effect_status)
+        for nvset_el in nvset_el_list
     ]
 
 
@@ -24,7 +24,10 @@ from pcs.common.reports import (
     ReportProcessor,
 )
 from pcs.common.reports.item import ReportItem
-from pcs.common.tools import format_environment_error
+from pcs.common.tools import (
+    format_environment_error,
+    get_backoff_intervals,
+)
 from pcs.common.str_tools import join_multilines
 from pcs.lib import node_communication_format, sbd, validate
 from pcs.lib.booth import sync as booth_sync
@@ -1241,7 +1244,7 @@ def _wait_for_pacemaker_to_start(
     timeout=None,
 ):
     timeout = 60 * 15 if timeout is None else timeout
-    interval = 2
+    interval_list = _get_node_startup_intervals()
     stop_at = time.time() + timeout
     report_processor.report(
         ReportItem.info(
@@ -1253,16 +1256,22 @@ def _wait_for_pacemaker_to_start(
     error_report_list = []
     has_errors = False
     while target_list:
-        if time.time() > stop_at:
+        now = time.time()
+        if now > stop_at:
             error_report_list.append(
                 ReportItem.error(reports.messages.WaitForNodeStartupTimedOut())
             )
             break
-        time.sleep(interval)
+        time.sleep(min(next(interval_list), stop_at - now))
         com_cmd = CheckPacemakerStarted(report_processor)
         com_cmd.set_targets(target_list)
-        target_list = run_com(node_communicator, com_cmd)
+        not_started_target_list = run_com(node_communicator, com_cmd)
         has_errors = has_errors or com_cmd.has_errors
+        if len(not_started_target_list) < len(target_list):
+            # Nodes usually start shortly after each other, check the rest of
+            # them soon.
+            interval_list = _get_node_startup_intervals()
+        target_list = not_started_target_list
 
     if error_report_list or has_errors:
         error_report_list.append(
@@ -1271,6 +1280,13 @@ def _wait_for_pacemaker_to_start(
     return error_report_list
 
 
+def _get_node_startup_intervals():
+    return get_backoff_intervals(
+        settings.wait_for_node_startup_interval_initial,
+        settings.wait_for_node_startup_interval_max,
+    )
+
+
 def _host_check_cluster_setup(
     host_info_dict, force, check_services_versions=True
 ):
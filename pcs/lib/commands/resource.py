@@ -1453,7 +1453,11 @@ class _MoveBanTemplate:
 
         # process wait
         if wait is not False:
-            wait_for_idle(env.cmd_runner(), env.get_wait_timeout(wait))
+            wait_for_idle(
+                env.cmd_runner(),
+                env.get_wait_timeout(wait),
+                env.report_processor,
+            )
             resource_running_on_after = get_resource_state(
                 env.get_cluster_state(), resource_id
             )
@@ -1639,7 +1643,9 @@ def unmove_unban(
 
     # process wait
     if wait is not False:
-        wait_for_idle(env.cmd_runner(), env.get_wait_timeout(wait))
+        wait_for_idle(
+            env.cmd_runner(), env.get_wait_timeout(wait), env.report_processor
+        )
         if env.report_processor.report(
             info_resource_state(env.get_cluster_state(), resource_id)
         ).has_errors:
@@ -48,14 +48,13 @@ def list_agents(lib_env, describe=True, search=None):
     runner = lib_env.cmd_runner()
 
     # list agents for all standards and providers
-    agent_names = []
-    for std in resource_agent.list_resource_agents_standards_and_providers(
-        runner
-    ):
-        agent_names += [
-            "{0}:{1}".format(std, agent)
-            for agent in resource_agent.list_resource_agents(runner, std)
-        ]
+    agent_names = [
+        "{0}:{1}".format(std, agent)
+        for std, agent_list in resource_agent.list_all_resource_agents(
+            runner
+        ).items()
+        for agent in agent_list
+    ]
     agent_names.sort(
         # works with both str and unicode in both python 2 and 3
         key=lambda x: x.lower()
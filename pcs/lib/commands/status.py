@@ -1,9 +1,14 @@
+from functools import partial
 import os.path
 from typing import (
+    Any,
+    Callable,
+    Dict,
     Iterable,
     List,
     Mapping,
     NamedTuple,
+    Sequence,
 )
 
 from lxml.etree import _Element
@@ -20,6 +25,7 @@ from pcs.common.str_tools import (
     format_list,
     indent,
 )
+from pcs.common.tools import run_parallel
 from pcs.lib.cib import nvpair, stonith
 from pcs.lib.cib.tools import get_crm_config, get_resources
 from pcs.lib.communication.nodes import CheckReachability
@@ -28,8 +34,7 @@ from pcs.lib.env import LibraryEnvironment
 from pcs.lib.errors import LibraryError
 from pcs.lib.external import (
     CommandRunner,
-    is_service_enabled,
-    is_service_running,
+    get_services_status,
 )
 from pcs.lib.node import get_existing_nodes_names
 from pcs.lib.node_communication import NodeTargetLibFactory
@@ -87,41 +92,80 @@ def full_cluster_status_plaintext(
     report_processor = env.report_processor
     live = env.is_cib_live and env.is_corosync_conf_live
     is_sbd_running = False
+    loaded: Dict[str, Any] = {}
 
-    # load status, cib, corosync.conf
-    status_text, warning_list = get_cluster_status_text(
-        runner, hide_inactive_resources, verbose
-    )
-    corosync_conf = None
-    # If we are live on a remote node, we have no corosync.conf.
-    # TODO Use the new file framework so the path is not exposed.
-    if not live or os.path.exists(settings.corosync_conf_file):
-        corosync_conf = env.get_corosync_conf()
-    cib = env.get_cib()
+    def load(key, loader, *args):
+        loaded[key] = loader(*args)
+
+    def load_corosync_conf():
+        loaded["corosync_conf"] = None
+        # If we are live on a remote node, we have no corosync.conf.
+        # TODO Use the new file framework so the path is not exposed.
+        if not live or os.path.exists(settings.corosync_conf_file):
+            loaded["corosync_conf"] = env.get_corosync_conf()
+
+    def load_node_reachability():
+        if not loaded["corosync_conf"]:
+            return
+        node_name_list, node_names_report_list = get_existing_nodes_names(
+            loaded["corosync_conf"]
+        )
+        report_processor.report_list(node_names_report_list)
+        loaded["node_name_list"] = node_name_list
+        loaded["node_reachability"] = _get_node_reachability(
+            env.get_node_target_factory(),
+            env.get_node_communicator(),
+            report_processor,
+            node_name_list,
+        )
+
+    # load status, cib, corosync.conf, tickets and extra info if live
+    loader_chain_list = [
+        [
+            partial(
+                load,
+                "status",
+                get_cluster_status_text,
+                runner,
+                hide_inactive_resources,
+                verbose,
+            )
+        ],
+        [load_corosync_conf],
+        [partial(load, "cib", env.get_cib)],
+    ]
+    if verbose:
+        loader_chain_list.append(
+            [partial(load, "tickets", get_ticket_status_text, runner)]
+        )
+    if live:
+        loader_chain_list.append(
+            [partial(load, "services", _get_local_services_status, runner)]
+        )
+        if verbose:
+            # node names are read from corosync.conf
+            loader_chain_list[1].append(load_node_reachability)
+    _run_loaders(loader_chain_list, env.concurrent_queries)
+
+    status_text, warning_list = loaded["status"]
+    corosync_conf = loaded["corosync_conf"]
+    cib = loaded["cib"]
     if verbose:
         (
             ticket_status_text,
             ticket_status_stderr,
             ticket_status_retval,
-        ) = get_ticket_status_text(runner)
-    # get extra info if live
+        ) = loaded["tickets"]
     if live:
-        try:
-            is_sbd_running = is_service_running(runner, get_sbd_service_name())
-        except LibraryError:
-            pass
-        local_services_status = _get_local_services_status(runner)
+        local_services_status = loaded["services"]
+        is_sbd_running = any(
+            status.running
+            for status in local_services_status
+            if status.service == get_sbd_service_name()
+        )
         if verbose and corosync_conf:
-            node_name_list, node_names_report_list = get_existing_nodes_names(
-                corosync_conf
-            )
-            report_processor.report_list(node_names_report_list)
-            node_reachability = _get_node_reachability(
-                env.get_node_target_factory(),
-                env.get_node_communicator(),
-                report_processor,
-                node_name_list,
-            )
+            node_name_list = loaded["node_name_list"]
+            node_reachability = loaded["node_reachability"]
 
     # check stonith configuration
     warning_list = list(warning_list)
@@ -171,6 +215,41 @@ def full_cluster_status_plaintext(
     return "\n".join(parts)
 
 
+def _run_loaders(
+    loader_chain_list: Sequence[Sequence[Callable[[], Any]]], concurrent: bool
+) -> None:
+    """
+    Run independent chains of loaders, each chain runs its loaders in order
+
+    loader_chain_list -- chains of functions loading data
+    concurrent -- if True, run the chains concurrently, otherwise run first
+        loaders of all chains, then second loaders of all chains and so on
+    """
+    if not concurrent:
+        for step in range(max(len(chain) for chain in loader_chain_list)):
+            for chain in loader_chain_list:
+                if step < len(chain):
+                    chain[step]()
+        return
+
+    error_list: List[Any] = [None] * len(loader_chain_list)
+
+    def worker(index, chain):
+        try:
+            for loader in chain:
+                loader()
+        except Exception as e:  # pylint: disable=broad-except
+            error_list[index] = e
+
+    run_parallel(
+        worker,
+        [((index, chain), {}) for index, chain in enumerate(loader_chain_list)],
+    )
+    for error in error_list:
+        if error is not None:
+            raise error
+
+
 def _stonith_warnings(cib: _Element, is_sbd_running: bool) -> List[str]:
     warning_list = []
 
@@ -222,20 +301,27 @@ def _get_local_services_status(runner: CommandRunner) -> List[_ServiceStatus]:
         ("pcsd", True),
         (get_sbd_service_name(), False),
     ]
-    service_status_list = []
-    for service, display_always in service_def:
-        try:
-            service_status_list.append(
-                _ServiceStatus(
-                    service,
-                    display_always,
-                    is_service_enabled(runner, service),
-                    is_service_running(runner, service),
-                )
-            )
-        except LibraryError:
-            pass
-    return service_status_list
+    service_list = [service for service, dummy_display in service_def]
+    try:
+        status_dict = dict(get_services_status(runner, service_list))
+    except LibraryError:
+        # skip only the services which cannot be queried
+        status_dict = {}
+        for service in service_list:
+            try:
+                status_dict.update(get_services_status(runner, [service]))
+            except LibraryError:
+                pass
+    return [
+        _ServiceStatus(
+            service,
+            display_always,
+            status_dict[service].enabled,
+            status_dict[service].running,
+        )
+        for service, display_always in service_def
+        if service in status_dict
+    ]
 
 
 def _format_local_services_status(
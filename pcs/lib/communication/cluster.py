@@ -1,11 +1,11 @@
 from pcs.common import reports
-from pcs.common.node_communicator import RequestData
+from pcs.common.node_communicator import RequestData, RequestPriority
 from pcs.common.reports.item import ReportItem
 from pcs.lib.corosync import live as corosync_live
 from pcs.lib.communication.tools import (
     AllAtOnceStrategyMixin,
     AllSameDataMixin,
-    OneByOneStrategyMixin,
+    HedgedStrategyMixin,
     RunRemotelyBase,
     SkipOfflineMixin,
     SimpleResponseProcessingMixin,
@@ -83,7 +83,8 @@ class DestroyWarnOnFailure(
             )
 
 
-class GetQuorumStatus(AllSameDataMixin, OneByOneStrategyMixin, RunRemotelyBase):
+class GetQuorumStatus(AllSameDataMixin, HedgedStrategyMixin, RunRemotelyBase):
+    _request_priority = RequestPriority.HIGH
     _quorum_status = None
     _has_failure = False
 
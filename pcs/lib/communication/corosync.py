@@ -1,12 +1,13 @@
 import json
 
-from pcs.common.node_communicator import RequestData
+from pcs.common.node_communicator import RequestData, RequestPriority
 from pcs.common import reports
 from pcs.common.reports import ReportItemSeverity
 from pcs.common.reports.item import ReportItem
 from pcs.lib.communication.tools import (
     AllAtOnceStrategyMixin,
     AllSameDataMixin,
+    HedgedStrategyMixin,
     OneByOneStrategyMixin,
     RunRemotelyBase,
     SkipOfflineMixin,
@@ -17,6 +18,8 @@ from pcs.lib.node_communication import response_to_report_item
 class CheckCorosyncOffline(
     SkipOfflineMixin, AllSameDataMixin, AllAtOnceStrategyMixin, RunRemotelyBase
 ):
+    _request_priority = RequestPriority.HIGH
+
     def __init__(
         self,
         report_processor,
@@ -80,6 +83,8 @@ class CheckCorosyncOffline(
 class DistributeCorosyncConf(
     SkipOfflineMixin, AllSameDataMixin, AllAtOnceStrategyMixin, RunRemotelyBase
 ):
+    _request_priority = RequestPriority.LOW
+
     def __init__(
         self,
         report_processor,
@@ -191,7 +196,8 @@ class ReloadCorosyncConf(
             )
 
 
-class GetCorosyncConf(AllSameDataMixin, OneByOneStrategyMixin, RunRemotelyBase):
+class GetCorosyncConf(AllSameDataMixin, HedgedStrategyMixin, RunRemotelyBase):
+    _request_priority = RequestPriority.HIGH
     __was_successful = False
     __has_failures = False
     __corosync_conf = None
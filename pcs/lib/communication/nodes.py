@@ -6,7 +6,7 @@ from pcs.common.reports import (
     ReportItemSeverity,
 )
 from pcs.common.reports.item import ReportItem
-from pcs.common.node_communicator import RequestData
+from pcs.common.node_communicator import RequestData, RequestPriority
 from pcs.lib import node_communication_format
 from pcs.lib.communication.tools import (
     AllAtOnceStrategyMixin,
@@ -22,6 +22,8 @@ from pcs.lib.node_communication import response_to_report_item
 class GetOnlineTargets(
     AllSameDataMixin, AllAtOnceStrategyMixin, RunRemotelyBase
 ):
+    _request_priority = RequestPriority.HIGH
+
     def __init__(self, report_processor, ignore_offline_targets=False):
         super(GetOnlineTargets, self).__init__(report_processor)
         self._ignore_offline_targets = ignore_offline_targets
@@ -54,6 +56,7 @@ class GetOnlineTargets(
 class CheckReachability(
     AllSameDataMixin, AllAtOnceStrategyMixin, RunRemotelyBase
 ):
+    _request_priority = RequestPriority.HIGH
     REACHABLE = "REACHABLE"
     UNREACHABLE = "UNREACHABLE"
     UNAUTH = "UNAUTH"
@@ -80,6 +83,8 @@ class CheckReachability(
 
 
 class CheckAuth(AllSameDataMixin, AllAtOnceStrategyMixin, RunRemotelyBase):
+    _request_priority = RequestPriority.HIGH
+
     def __init__(self, report_processor):
         super(CheckAuth, self).__init__(report_processor)
         self._not_authorized_host_name_list = []
@@ -113,6 +118,7 @@ class CheckAuth(AllSameDataMixin, AllAtOnceStrategyMixin, RunRemotelyBase):
 
 
 class GetHostInfo(AllSameDataMixin, AllAtOnceStrategyMixin, RunRemotelyBase):
+    _request_priority = RequestPriority.HIGH
     _responses = None
     _report_pcsd_too_old_on_404 = True
 
@@ -281,6 +287,8 @@ class ServiceAction(RunActionBase):
 
 class FileActionBase(RunActionBase):
     # pylint: disable=abstract-method, too-many-ancestors
+    _request_priority = RequestPriority.LOW
+
     def _init_properties(self):
         self._response_key = "files"
         self._force_code = report_codes.SKIP_FILE_DISTRIBUTION_ERRORS
@@ -420,6 +428,7 @@ class EnableCluster(
 class CheckPacemakerStarted(
     AllSameDataMixin, AllAtOnceStrategyMixin, RunRemotelyBase
 ):
+    _request_priority = RequestPriority.HIGH
     _not_yet_started_target_list = None
 
     def _get_request_data(self):
@@ -534,6 +543,8 @@ class SendPcsdSslCertAndKey(
     AllAtOnceStrategyMixin,
     RunRemotelyBase,
 ):
+    _request_priority = RequestPriority.LOW
+
     def __init__(self, report_processor, ssl_cert, ssl_key):
         super().__init__(report_processor)
         self._ssl_cert = ssl_cert
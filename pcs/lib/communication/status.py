@@ -2,20 +2,22 @@ import json
 from typing import Tuple
 
 from pcs.common import reports
-from pcs.common.node_communicator import RequestData
+from pcs.common.node_communicator import RequestData, RequestPriority
 from pcs.common.reports import ReportItemSeverity
 from pcs.common.reports.item import ReportItem
 from pcs.lib.communication.tools import (
     AllSameDataMixin,
-    OneByOneStrategyMixin,
+    HedgedStrategyMixin,
     RunRemotelyBase,
 )
 from pcs.lib.node_communication import response_to_report_item
 
 
 class GetFullClusterStatusPlaintext(
-    AllSameDataMixin, OneByOneStrategyMixin, RunRemotelyBase
+    AllSameDataMixin, HedgedStrategyMixin, RunRemotelyBase
 ):
+    _request_priority = RequestPriority.HIGH
+
     def __init__(
         self, report_processor, hide_inactive_resources=False, verbose=False
     ):
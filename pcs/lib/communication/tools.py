@@ -1,6 +1,10 @@
 from pcs.common import reports
 from pcs.common.reports.item import ReportItem
-from pcs.common.node_communicator import Request
+from pcs.common.node_communicator import (
+    Request,
+    RequestHedge,
+    RequestPriority,
+)
 from pcs.common.reports import ReportItemSeverity
 from pcs.lib.node_communication import response_to_report_item
 from pcs.lib.errors import LibraryError
@@ -203,6 +207,48 @@ class OneByOneStrategyMixin(StrategyBase):
             return []
 
 
+class HedgedStrategyMixin(StrategyBase):
+    """
+    Communication strategy for read-only commands which need an answer from
+    any one target. It can replace OneByOneStrategyMixin: requests are executed
+    one by one and another request is available by calling _get_next_list.
+    Additionally, the communicator starts the next request if the running ones
+    have not answered in a hedge delay. A command is done once it processes a
+    response without calling _get_next_list, requests still running are then
+    cancelled.
+    """
+
+    # pylint: disable=abstract-method
+    __hedge = None
+    __next_requested = False
+
+    def get_initial_request_list(self):
+        """
+        Returns only first request from _prepare_initial_requests.
+        """
+        self.__hedge = RequestHedge(self._prepare_initial_requests())
+        return self.__hedge.get_next_list()
+
+    def _get_next_list(self):
+        """
+        Returns a list which contains another Request object from
+        _prepare_initial_requests. Returns an empty list when there is no
+        other request left.
+        """
+        self.__next_requested = True
+        return self.__hedge.get_next_list()
+
+    def on_response(self, response):
+        if self.__hedge.is_finished:
+            # the response came before the request could have been cancelled
+            return []
+        self.__next_requested = False
+        request_list = super().on_response(response)
+        if not self.__next_requested:
+            self.__hedge.finish()
+        return request_list
+
+
 class AllAtOnceStrategyMixin(StrategyBase):
     """
     Communication strategy in which all requests are executed at once in
@@ -236,6 +282,9 @@ class AllSameDataMixin:
     """
 
     __targets = None
+    # order in which requests of different commands are started when the
+    # number of parallel requests is limited
+    _request_priority = RequestPriority.NORMAL
 
     def _get_request_data(self):
         """
@@ -245,7 +294,11 @@ class AllSameDataMixin:
 
     def _prepare_initial_requests(self):
         return [
-            Request(target, self._get_request_data())
+            Request(
+                target,
+                self._get_request_data(),
+                priority=self._request_priority,
+            )
             for target in self.__target_list
         ]
 
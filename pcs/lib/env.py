@@ -4,7 +4,11 @@ from lxml.etree import _Element
 
 from pcs.common import file_type_codes
 from pcs.common import reports
-from pcs.common.node_communicator import Communicator, NodeCommunicatorFactory
+from pcs.common.node_communicator import (
+    Communicator,
+    DebugCapture,
+    NodeCommunicatorFactory,
+)
 from pcs.common.reports import ReportProcessor
 from pcs.common.reports.item import ReportItem
 from pcs.common.tools import Version
@@ -34,7 +38,7 @@ from pcs.lib.node_communication import (
     NodeTargetLibFactory,
 )
 from pcs.lib.pacemaker.live import (
-    diff_cibs_xml,
+    diff_cibs,
     ensure_cib_version,
     ensure_wait_for_idle_support,
     get_cib,
@@ -66,6 +70,10 @@ class LibraryEnvironment:
         booth_files_data=None,
         known_hosts_getter=None,
         request_timeout=None,
+        max_parallel_requests=None,
+        max_parallel_requests_per_host=None,
+        request_debug_capture=DebugCapture.NONE,
+        concurrent_queries=False,
     ):
         # pylint: disable=too-many-arguments
         self._logger = logger
@@ -76,6 +84,7 @@ class LibraryEnvironment:
         self._corosync_conf_data = corosync_conf_data
         self._booth_files_data = booth_files_data or {}
         self._request_timeout = request_timeout
+        self._concurrent_queries = concurrent_queries
         # TODO tokens probably should not be inserted from outside, but we're
         # postponing dealing with them, because it's not that easy to move
         # related code currently - it's in pcsd
@@ -91,6 +100,9 @@ class LibraryEnvironment:
             self.user_login,
             self.user_groups,
             self._request_timeout,
+            max_parallel_requests=max_parallel_requests,
+            max_parallel_requests_per_host=max_parallel_requests_per_host,
+            debug_capture=request_debug_capture,
         )
         self.__loaded_booth_env = None
         self.__loaded_dr_env = None
@@ -105,6 +117,14 @@ class LibraryEnvironment:
     def report_processor(self) -> ReportProcessor:
         return self._report_processor
 
+    @property
+    def concurrent_queries(self) -> bool:
+        """
+        True if commands may run independent queries of the local system and
+        nodes at the same time
+        """
+        return self._concurrent_queries
+
     @property
     def user_login(self):
         return self._user_login
@@ -232,11 +252,11 @@ class LibraryEnvironment:
         )
 
     def __main_push_cib_diff(self, cmd_runner):
-        cib_diff_xml = diff_cibs_xml(
+        cib_diff_xml = diff_cibs(
             cmd_runner,
             self.report_processor,
             self.__loaded_cib_diff_source,
-            etree_to_str(self.__loaded_cib_to_modify),
+            self.__loaded_cib_to_modify,
         )
         if cib_diff_xml:
             push_cib_diff_xml(cmd_runner, cib_diff_xml)
@@ -249,7 +269,7 @@ class LibraryEnvironment:
         self.__loaded_cib_diff_source_feature_set = None
         self.__loaded_cib_to_modify = None
         if self.is_cib_live and timeout is not False:
-            wait_for_idle(cmd_runner, timeout)
+            wait_for_idle(cmd_runner, timeout, self.report_processor)
 
     @property
     def is_cib_live(self):
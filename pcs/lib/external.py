@@ -2,7 +2,12 @@ import re
 from shlex import quote as shell_quote
 import signal
 import subprocess
-from typing import Optional
+from typing import (
+    Iterable,
+    Mapping,
+    NamedTuple,
+    Optional,
+)
 
 from pcs import settings
 from pcs.common import reports
@@ -11,6 +16,7 @@ from pcs.common.reports.item import ReportItem
 from pcs.common.system import is_systemd as is_systemctl
 from pcs.common.str_tools import join_multilines
 from pcs.lib.errors import LibraryError
+from pcs.lib.pacemaker.cib_snapshot import get_process_cib_snapshot_cache
 
 
 _chkconfig = settings.chkconfig_binary
@@ -46,6 +52,27 @@ class KillServicesError(ManageServiceError):
     pass
 
 
+class ServiceStatus(NamedTuple):
+    enabled: bool
+    running: bool
+
+
+# unit file states for which 'systemctl is-enabled' succeeds
+_SYSTEMD_ENABLED_STATES = frozenset(
+    (
+        "alias",
+        "enabled",
+        "enabled-runtime",
+        "generated",
+        "indirect",
+        "static",
+        "transient",
+    )
+)
+# active states for which 'systemctl is-active' succeeds
+_SYSTEMD_RUNNING_STATES = frozenset(("active", "reloading"))
+
+
 class CommandRunner:
     def __init__(self, logger, reporter: ReportProcessor, env_vars=None):
         self._logger = logger
@@ -154,6 +181,7 @@ class CommandRunner:
                 )
             )
         )
+        get_process_cib_snapshot_cache().invalidate_on_command(args, env_vars)
         return out_std, out_err, retval
 
 
@@ -322,6 +350,57 @@ def is_service_running(
     return retval == 0
 
 
+def get_services_status(
+    runner: CommandRunner, service_list: Iterable[str]
+) -> Mapping[str, ServiceStatus]:
+    """
+    Check if the specified services are enabled and running on the local system
+
+    runner -- CommandRunner
+    service_list -- names of the services
+    """
+    service_list = list(service_list)
+    if not service_list:
+        return {}
+    if is_systemctl():
+        # one systemctl call instead of two calls per service
+        stdout, dummy_stderr, retval = runner.run(
+            [_systemctl, "show", "--property=ActiveState,UnitFileState", "--"]
+            + [_get_service_name(service) for service in service_list]
+        )
+        if retval == 0:
+            unit_list = _parse_systemctl_show(stdout)
+            if len(unit_list) == len(service_list):
+                return {
+                    service: ServiceStatus(
+                        unit.get("UnitFileState") in _SYSTEMD_ENABLED_STATES,
+                        unit.get("ActiveState") in _SYSTEMD_RUNNING_STATES,
+                    )
+                    for service, unit in zip(service_list, unit_list)
+                }
+    return {
+        service: ServiceStatus(
+            is_service_enabled(runner, service),
+            is_service_running(runner, service),
+        )
+        for service in service_list
+    }
+
+
+def _parse_systemctl_show(output):
+    # properties of units are separated by an empty line
+    unit_list = []
+    for block in re.split(r"\n\s*\n", output.strip()):
+        if not block:
+            continue
+        properties = {}
+        for line in block.splitlines():
+            name, dummy_sep, value = line.partition("=")
+            properties[name.strip()] = value.strip()
+        unit_list.append(properties)
+    return unit_list
+
+
 def is_service_installed(runner, service, instance=None):
     """
     Check if specified service is installed on local system.
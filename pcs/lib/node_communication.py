@@ -91,6 +91,9 @@ class LibCommunicatorLogger(CommunicatorLoggerInterface):
     def _log_debug(self, response):
         url = response.request.url
         debug_data = response.debug
+        if not debug_data:
+            # debug info capturing has not been enabled for the request
+            return
         self._logger.debug(
             (
                 "Communication debug info for calling: {url}\n"
@@ -0,0 +1,139 @@
+"""
+Cache of capabilities of pacemaker tools.
+
+Pcs finds out whether pacemaker supports a feature by running a pacemaker tool
+with a help option and looking for an option in its output. The cache keeps
+the results in memory and, if a cache file is set, in the file so that other
+pcs processes, pcs_internal workers and pcsd, can use them.
+
+Results of a tool are only used while the tool's binary has not changed since
+they have been probed, so a pacemaker upgrade drops them. Results of tools
+which cannot be found and results of probes which have not been able to find
+out anything are not cached.
+"""
+import json
+import os
+import os.path
+import tempfile
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+)
+
+
+class CapabilityCache:
+    def __init__(self) -> None:
+        self._enabled = False
+        self._cache_file: Optional[str] = None
+        self._memory: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def enable(self, cache_file: Optional[str] = None) -> None:
+        """
+        Start caching capabilities of pacemaker tools
+
+        cache_file -- file to store the capabilities in, None = memory only
+        """
+        self._enabled = True
+        self._cache_file = cache_file
+
+    def disable(self) -> None:
+        self._enabled = False
+        self._cache_file = None
+        self._memory = {}
+
+    def get(
+        self,
+        tool_path: str,
+        capability: str,
+        probe: Callable[[], Optional[bool]],
+    ) -> bool:
+        """
+        Return whether a tool has a capability, run the probe if not cached
+
+        tool_path -- full path to the tool's binary
+        capability -- unique name of the capability within the tool
+        probe -- finds out whether the tool has the capability, returns None
+            if it has not been able to find out, e.g. the tool failed to run
+        """
+        if not self._enabled:
+            return bool(probe())
+        key = _get_key(tool_path)
+        if key is None:
+            return bool(probe())
+        entry = self._memory.get(tool_path)
+        if entry is None or entry["key"] != key:
+            entry = self._read().get(tool_path)
+            if not isinstance(entry, dict) or entry.get("key") != key:
+                entry = {"key": key, "capabilities": {}}
+            self._memory[tool_path] = entry
+        capabilities = entry["capabilities"]
+        if not isinstance(capabilities.get(capability), bool):
+            result = probe()
+            if result is None:
+                # try again next time, the tool may work then
+                return False
+            capabilities[capability] = bool(result)
+            self._write(tool_path, entry)
+        return capabilities[capability]
+
+    def _read(self) -> Dict[str, Any]:
+        if not self._cache_file:
+            return {}
+        try:
+            with open(self._cache_file, "r") as cache_file:
+                data = json.load(cache_file)
+        except (EnvironmentError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write(self, tool_path: str, entry: Dict[str, Any]) -> None:
+        if not self._cache_file:
+            return
+        # Merge with the file content, other processes may have stored
+        # capabilities of other tools meanwhile.
+        data = self._read()
+        data[tool_path] = entry
+        # The cache is not essential, so it is fine to skip storing the
+        # capabilities if something goes wrong. A temporary file is used so
+        # that other processes never read a partially written file.
+        cache_dir = os.path.dirname(self._cache_file)
+        try:
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir)
+            try:
+                with os.fdopen(fd, "w") as tmp_file:
+                    json.dump(data, tmp_file)
+                os.replace(tmp_path, self._cache_file)
+            except EnvironmentError:
+                _remove_file(tmp_path)
+        except EnvironmentError:
+            pass
+
+
+def _get_key(path: str) -> Optional[List[int]]:
+    try:
+        stat = os.stat(path)
+    except EnvironmentError:
+        return None
+    return [stat.st_ino, stat.st_mtime_ns, stat.st_size]
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except EnvironmentError:
+        pass
+
+
+_process_capability_cache = CapabilityCache()
+
+
+def get_capability_cache() -> CapabilityCache:
+    return _process_capability_cache
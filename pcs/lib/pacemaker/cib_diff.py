@@ -0,0 +1,249 @@
+"""
+Native diff of two CIBs producing a pacemaker patchset.
+
+The patchset has the same format as the one produced by
+'crm_diff --no-version' (format 2) and is meant to be pushed by
+'cibadmin --patch'. Elements are matched by their tag and id. A patchset
+consists of changes:
+* delete -- remove an element specified by its path
+* create -- add an element with all its children to a parent specified by its
+    path at a position among the parent's children
+* modify -- set attributes of an element, pacemaker applies the element in
+    change-result, change-list only describes the change
+
+All delete changes come first, the other changes follow in the document order
+of the new CIB, so that each element is created at its final position. That is
+how pacemaker orders changes in the patchsets it creates.
+
+Only changes which can be expressed this way unambiguously are supported.
+Moving elements, elements without an id whose tag is not unique among their
+siblings, changes of text and comments and changes of the cib element itself
+raise DiffNotSupported. Callers are expected to run crm_diff in that case.
+"""
+from typing import (
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Tuple,
+)
+
+from lxml import etree
+from lxml.etree import _Element
+
+from pcs.lib.xml_tools import etree_to_str
+
+# crm_diff --no-version leaves versions of CIBs out of patchsets
+_CIB_VERSION_ATTRS = frozenset(("admin_epoch", "epoch", "num_updates"))
+
+_ChildKey = Tuple[str, Optional[str]]
+
+
+class DiffNotSupported(Exception):
+    """
+    The CIBs differ in a way the native diff cannot express
+    """
+
+
+def diff_cibs(cib_old: _Element, cib_new: _Element) -> str:
+    """
+    Return a patchset transforming an old CIB to a new one, "" if they match
+
+    cib_old -- original CIB
+    cib_new -- modified CIB
+    """
+    if cib_old.tag != "cib" or cib_new.tag != "cib":
+        raise DiffNotSupported("Root elements are not cib elements")
+    if _get_attrs(cib_old, _CIB_VERSION_ATTRS) != _get_attrs(
+        cib_new, _CIB_VERSION_ATTRS
+    ):
+        raise DiffNotSupported("Attributes of the cib element differ")
+    builder = _PatchsetBuilder()
+    builder.diff_children(cib_old, cib_new, "/cib")
+    return builder.get_patchset()
+
+
+def are_patchsets_equivalent(patchset_a: str, patchset_b: str) -> bool:
+    """
+    Check whether two patchsets make the same changes
+
+    patchset_a -- a patchset, "" for no changes
+    patchset_b -- another patchset, "" for no changes
+    """
+    return _get_patchset_changes(patchset_a) == _get_patchset_changes(
+        patchset_b
+    )
+
+
+def _get_patchset_changes(patchset: str) -> List[Tuple[str, ...]]:
+    if not patchset.strip():
+        return []
+    change_list = []
+    for change in etree.fromstring(patchset).iterfind("./change"):
+        operation = str(change.get("operation"))
+        path = str(change.get("path"))
+        if operation == "delete":
+            change_list.append((operation, path))
+        elif operation == "modify":
+            # pacemaker only applies change-result, change-list is a comment
+            for result in change.iterfind("./change-result/*"):
+                change_list.append(
+                    (
+                        operation,
+                        path,
+                        result.tag,
+                        str(sorted(_get_attrs(result).items())),
+                    )
+                )
+        else:
+            content = [
+                etree_to_str(_copy_without_whitespace(child))
+                for child in change
+            ]
+            change_list.append(
+                (operation, path, str(change.get("position")), *content)
+            )
+    # the order of changes of different elements may differ
+    return sorted(change_list)
+
+
+class _PatchsetBuilder:
+    def __init__(self):
+        self._delete_list: List[_Element] = []
+        self._change_list: List[_Element] = []
+
+    def get_patchset(self) -> str:
+        if not self._delete_list and not self._change_list:
+            return ""
+        patchset = etree.Element("diff", format="2")
+        patchset.extend(self._delete_list)
+        patchset.extend(self._change_list)
+        return etree_to_str(patchset)
+
+    def diff_element(self, old: _Element, new: _Element, path: str) -> None:
+        if _get_attrs(old) != _get_attrs(new):
+            self._add_modify(old, new, path)
+        self.diff_children(old, new, path)
+
+    def diff_children(
+        self, old_parent: _Element, new_parent: _Element, path: str
+    ) -> None:
+        if _get_text(old_parent) != _get_text(new_parent):
+            raise DiffNotSupported(f"Text of '{path}' differs")
+        old_children = _get_child_map(old_parent, path)
+        new_children = _get_child_map(new_parent, path)
+        old_order = [key for key in old_children if key in new_children]
+        new_order = [key for key in new_children if key in old_children]
+        if old_order != new_order:
+            raise DiffNotSupported(f"Children of '{path}' have been moved")
+        for key in old_children:
+            if key not in new_children:
+                self._add_delete(_get_path(path, key))
+        for position, (key, new_child) in enumerate(new_children.items()):
+            if key in old_children:
+                old_child = old_children[key]
+                # Most of the CIB is not changed. Comparing serialized
+                # subtrees is much faster than walking them element by element.
+                if _serialize(old_child) != _serialize(new_child):
+                    self.diff_element(
+                        old_child, new_child, _get_path(path, key)
+                    )
+            else:
+                self._add_create(new_child, path, position)
+
+    def _add_delete(self, path: str) -> None:
+        self._delete_list.append(
+            etree.Element("change", operation="delete", path=path)
+        )
+
+    def _add_create(self, element: _Element, path: str, position: int):
+        change = etree.Element(
+            "change", operation="create", path=path, position=str(position)
+        )
+        change.append(_copy_without_whitespace(element))
+        self._change_list.append(change)
+
+    def _add_modify(self, old: _Element, new: _Element, path: str) -> None:
+        change = etree.Element("change", operation="modify", path=path)
+        change_list = etree.SubElement(change, "change-list")
+        old_attrs = _get_attrs(old)
+        for name, value in new.attrib.items():
+            if old_attrs.get(name) != value:
+                etree.SubElement(
+                    change_list,
+                    "change-attr",
+                    name=name,
+                    operation="set",
+                    value=value,
+                )
+        for name in old.attrib.keys():
+            if name not in new.attrib:
+                etree.SubElement(
+                    change_list, "change-attr", name=name, operation="unset"
+                )
+        etree.SubElement(
+            etree.SubElement(change, "change-result"),
+            new.tag,
+            dict(new.attrib),
+        )
+        self._change_list.append(change)
+
+
+def _get_child_map(parent: _Element, path: str) -> Dict[_ChildKey, _Element]:
+    child_map: Dict[_ChildKey, _Element] = {}
+    for child in parent:
+        if not isinstance(child.tag, str):
+            raise DiffNotSupported(f"'{path}' contains comments")
+        if not _is_blank(child.tail):
+            raise DiffNotSupported(f"'{path}' contains text")
+        key = (child.tag, child.get("id"))
+        if key in child_map:
+            raise DiffNotSupported(
+                f"'{path}' contains elements which cannot be told apart"
+            )
+        if key[1] is not None and "'" in key[1]:
+            raise DiffNotSupported(f"Id '{key[1]}' cannot be used in a path")
+        child_map[key] = child
+    return child_map
+
+
+def _get_path(parent_path: str, key: _ChildKey) -> str:
+    tag, element_id = key
+    if element_id is None:
+        return f"{parent_path}/{tag}"
+    return f"{parent_path}/{tag}[@id='{element_id}']"
+
+
+def _get_attrs(
+    element: _Element, ignore: FrozenSet[str] = frozenset()
+) -> Dict[str, str]:
+    return {
+        name: value
+        for name, value in element.attrib.items()
+        if name not in ignore
+    }
+
+
+def _serialize(element: _Element) -> bytes:
+    return etree.tostring(element, with_tail=False)
+
+
+def _get_text(element: _Element) -> str:
+    return (element.text or "").strip()
+
+
+def _is_blank(text: Optional[str]) -> bool:
+    return not text or text.isspace()
+
+
+def _copy_without_whitespace(element: _Element) -> _Element:
+    copy = etree.Element(element.tag, dict(element.attrib))
+    if not _is_blank(element.text):
+        raise DiffNotSupported(f"Element '{element.tag}' contains text")
+    for child in element:
+        if not isinstance(child.tag, str):
+            raise DiffNotSupported(f"Element '{element.tag}' contains comments")
+        if not _is_blank(child.tail):
+            raise DiffNotSupported(f"Element '{element.tag}' contains text")
+        copy.append(_copy_without_whitespace(child))
+    return copy
@@ -0,0 +1,196 @@
+"""
+Read-only snapshots of the live CIB shared by all CIB readers in one process.
+
+One pcs command often reads the CIB several times, both in pcs.utils and in
+the library. When enabled, the first read stores the CIB and following reads
+get it without running cibadmin again. Parsed CIB is stored as well, readers
+get its copies so they are free to modify them. Running any external command
+which may modify the CIB makes the snapshots stale. A stale snapshot is only
+reused if a new read finds the CIB unchanged according to its version
+(admin_epoch, epoch, num_updates), in which case it is not parsed again.
+
+The cache is disabled by default and is meant to be enabled only by entry
+points which run one command per process.
+"""
+from collections import namedtuple
+import copy
+import os.path
+import re
+
+
+CibVersion = namedtuple("CibVersion", "admin_epoch epoch num_updates")
+
+_CIB_START_TAG_RE = re.compile(r"<cib\s[^>]*>")
+
+# pacemaker tools which never modify the CIB
+_READ_ONLY_TOOLS = frozenset(
+    (
+        "crm_error",
+        "crm_mon",
+        "crm_rule",
+        "crm_simulate",
+        "crm_verify",
+        "iso8601",
+    )
+)
+# pacemaker tools which do not modify the CIB when run with any of the options
+_READ_ONLY_OPTIONS = {
+    "cibadmin": frozenset(("-Q", "--query")),
+    "crm_node": frozenset(
+        ("-n", "--name", "-l", "--list", "-q", "--quorum", "-i", "--cluster-id")
+    ),
+    "crm_resource": frozenset(
+        (
+            "-?",
+            "--help-all",
+            "--list-agents",
+            "--list-ocf-alternatives",
+            "--list-ocf-providers",
+            "--list-standards",
+            "--show-metadata",
+        )
+    ),
+    "stonith_admin": frozenset(
+        ("-?", "--help-all", "-I", "--list-installed", "-M", "--metadata")
+    ),
+}
+
+
+def get_cib_version(cib_xml):
+    """
+    Return CibVersion of a CIB or None if it cannot be found
+
+    string cib_xml -- CIB
+    """
+    match = _CIB_START_TAG_RE.search(cib_xml)
+    if not match:
+        return None
+    version = []
+    for name in CibVersion._fields:
+        attr_match = re.search(
+            r"\s{0}=[\"'](\d+)[\"']".format(name), match.group(0)
+        )
+        if not attr_match:
+            return None
+        version.append(int(attr_match.group(1)))
+    return CibVersion(*version)
+
+
+def is_cib_read_only_command(args):
+    """
+    Check if a command is known not to modify the CIB
+
+    list args -- command and its arguments
+    """
+    if not args:
+        return True
+    tool = os.path.basename(args[0])
+    if tool in _READ_ONLY_TOOLS:
+        return True
+    if tool in _READ_ONLY_OPTIONS:
+        return bool(_READ_ONLY_OPTIONS[tool].intersection(args[1:]))
+    return False
+
+
+class _CibSnapshot:
+    def __init__(self, cib_xml, version):
+        self.cib_xml = cib_xml
+        self.version = version
+        self.cib_tree = None
+        self.is_stale = False
+
+
+class CibSnapshotCache:
+    """
+    Snapshots of the live CIB, one for each CIB user as ACLs may filter the CIB
+    """
+
+    def __init__(self):
+        self._enabled = False
+        self._snapshots = {}
+
+    @property
+    def enabled(self):
+        return self._enabled
+
+    def enable(self):
+        self._enabled = True
+
+    def disable(self):
+        self._enabled = False
+        self._snapshots = {}
+
+    def get_xml(self, cib_user=None):
+        """
+        Return stored up-to-date CIB or None if there is no such CIB
+
+        string cib_user -- user the CIB has been read as
+        """
+        if not self._enabled:
+            return None
+        snapshot = self._snapshots.get(cib_user)
+        if snapshot is None or snapshot.is_stale:
+            return None
+        return snapshot.cib_xml
+
+    def store_xml(self, cib_xml, cib_user=None):
+        """
+        Store a CIB read from the live cluster, return the CIB to be used
+
+        string cib_xml -- CIB read from the cluster
+        string cib_user -- user the CIB has been read as
+        """
+        if not self._enabled:
+            return cib_xml
+        version = get_cib_version(cib_xml)
+        snapshot = self._snapshots.get(cib_user)
+        if (
+            snapshot is not None
+            and version is not None
+            and snapshot.version == version
+        ):
+            # the CIB has not changed, keep the already parsed CIB
+            snapshot.is_stale = False
+            return snapshot.cib_xml
+        self._snapshots[cib_user] = _CibSnapshot(cib_xml, version)
+        return cib_xml
+
+    def parse(self, cib_xml, parser):
+        """
+        Return a parsed CIB, parse a stored CIB only once
+
+        string cib_xml -- CIB to be parsed
+        callable parser -- function to parse the CIB with
+        """
+        for snapshot in self._snapshots.values():
+            if snapshot.cib_xml is cib_xml:
+                if snapshot.cib_tree is None:
+                    snapshot.cib_tree = parser(cib_xml)
+                return copy.deepcopy(snapshot.cib_tree)
+        return parser(cib_xml)
+
+    def invalidate(self):
+        for snapshot in self._snapshots.values():
+            snapshot.is_stale = True
+
+    def invalidate_on_command(self, args, env_vars):
+        """
+        Make the snapshots stale if a command may modify the live CIB
+
+        list args -- command and its arguments
+        dict env_vars -- environment of the command
+        """
+        if not self._snapshots:
+            return
+        if env_vars and env_vars.get("CIB_file"):
+            # the command does not work with the live CIB
+            return
+        if not is_cib_read_only_command(args):
+            self.invalidate()
+
+
+_process_cib_snapshot_cache = CibSnapshotCache()
+
+
+def get_process_cib_snapshot_cache():
+    return _process_cib_snapshot_cache
@@ -1,6 +1,7 @@
 import os.path
 import re
 from typing import (
+    Dict,
     Iterable,
     List,
     Optional,
@@ -8,24 +9,41 @@ from typing import (
 )
 
 from lxml import etree
+from lxml.etree import _Element
 
 from pcs import settings
 from pcs.common import reports
 from pcs.common.reports import ReportProcessor
 from pcs.common.reports.item import ReportItem
-from pcs.common.tools import format_os_error, xml_fromstring
+from pcs.common.tools import (
+    format_os_error,
+    get_backoff_intervals,
+    xml_fromstring,
+)
 from pcs.common.str_tools import join_multilines
+from pcs.common.types import CibRuleInEffectStatus
 from pcs.lib.cib.tools import get_pacemaker_version_by_which_cib_was_validated
 from pcs.lib.errors import LibraryError
 from pcs.lib.external import CommandRunner
+from pcs.lib.pacemaker import cib_diff
+from pcs.lib.pacemaker.capability_cache import get_capability_cache
+from pcs.lib.pacemaker.cib_snapshot import get_process_cib_snapshot_cache
 from pcs.lib.pacemaker.state import ClusterState
 from pcs.lib.tools import write_tmpfile
 from pcs.lib.xml_tools import etree_to_str
 
 
 __EXITCODE_WAIT_TIMEOUT = 124
+# crm_resource --wait waits for an hour unless a timeout is specified
+__WAIT_FOR_IDLE_DEFAULT_TIMEOUT = 60 * 60
+__PENDING_ACTION_RE = re.compile(r"^\s*Action \d+:")
 __EXITCODE_CIB_SCOPE_VALID_BUT_NOT_PRESENT = 105
 __RESOURCE_REFRESH_OPERATION_COUNT_THRESHOLD = 100
+__CRM_RULE_RETURN_CODES = {
+    0: CibRuleInEffectStatus.IN_EFFECT,
+    110: CibRuleInEffectStatus.EXPIRED,
+    111: CibRuleInEffectStatus.NOT_YET_IN_EFFECT,
+}
 
 
 class CrmMonErrorException(LibraryError):
@@ -100,6 +118,17 @@ def get_cib_xml_cmd_results(runner, scope=None):
 
 
 def get_cib_xml(runner, scope=None):
+    snapshot_cache = get_process_cib_snapshot_cache()
+    use_snapshot = (
+        snapshot_cache.enabled
+        and not scope
+        and not runner.env_vars.get("CIB_file")
+    )
+    if use_snapshot:
+        cib_user = runner.env_vars.get("CIB_user")
+        cib_xml = snapshot_cache.get_xml(cib_user)
+        if cib_xml is not None:
+            return cib_xml
     stdout, stderr, retval = get_cib_xml_cmd_results(runner, scope)
     if retval != 0:
         if retval == __EXITCODE_CIB_SCOPE_VALID_BUT_NOT_PRESENT and scope:
@@ -115,6 +144,8 @@ def get_cib_xml(runner, scope=None):
                 reports.messages.CibLoadError(join_multilines([stderr, stdout]))
             )
         )
+    if use_snapshot:
+        return snapshot_cache.store_xml(stdout, cib_user)
     return stdout
 
 
@@ -124,7 +155,7 @@ def parse_cib_xml(xml):
 
 def get_cib(xml):
     try:
-        return parse_cib_xml(xml)
+        return get_process_cib_snapshot_cache().parse(xml, parse_cib_xml)
     except (etree.XMLSyntaxError, etree.DocumentInvalid) as e:
         raise LibraryError(
             ReportItem.error(reports.messages.CibLoadErrorBadFormat(str(e)))
@@ -201,6 +232,50 @@ def push_cib_diff_xml(runner, cib_diff_xml):
         )
 
 
+def diff_cibs(
+    runner: CommandRunner,
+    reporter: ReportProcessor,
+    cib_old_xml: str,
+    cib_new: _Element,
+    engine: Optional[str] = None,
+) -> str:
+    """
+    Return xml diff of two CIBs, compute it natively if possible
+
+    runner
+    reporter
+    cib_old_xml -- original CIB
+    cib_new -- modified CIB
+    engine -- "native", "crm_diff" or "verify", defaults to the configured one
+    """
+    if engine is None:
+        engine = settings.cib_diff_engine
+    if engine == "crm_diff":
+        return diff_cibs_xml(
+            runner, reporter, cib_old_xml, etree_to_str(cib_new)
+        )
+    try:
+        native_diff: Optional[str] = cib_diff.diff_cibs(
+            xml_fromstring(cib_old_xml), cib_new
+        )
+    except cib_diff.DiffNotSupported:
+        native_diff = None
+    if native_diff is not None and engine != "verify":
+        return native_diff
+    crm_diff = diff_cibs_xml(
+        runner, reporter, cib_old_xml, etree_to_str(cib_new)
+    )
+    if native_diff is not None and not cib_diff.are_patchsets_equivalent(
+        native_diff, crm_diff
+    ):
+        reporter.report(
+            ReportItem.warning(
+                reports.messages.CibDiffMismatch(native_diff, crm_diff)
+            )
+        )
+    return crm_diff
+
+
 def diff_cibs_xml(
     runner: CommandRunner, reporter: ReportProcessor, cib_old_xml, cib_new_xml,
 ):
@@ -404,36 +479,76 @@ def ensure_wait_for_idle_support(runner):
         )
 
 
-def wait_for_idle(runner, timeout=None):
+def wait_for_idle(
+    runner: CommandRunner,
+    timeout: Optional[int] = None,
+    reporter: Optional[ReportProcessor] = None,
+) -> None:
     """
     Run waiting command. Raise LibraryError if command failed.
 
     runner is preconfigured object for running external programs
-    string timeout is waiting timeout
+    timeout -- waiting timeout in seconds, None or 0 = pacemaker's default
+    reporter -- if specified, wait in steps and report pending actions after
+        each step
+    """
+    if reporter is None:
+        _run_wait_for_idle(runner, timeout)
+        return
+    remaining = timeout if timeout else __WAIT_FOR_IDLE_DEFAULT_TIMEOUT
+    for step in get_backoff_intervals(
+        settings.wait_for_idle_step_initial, settings.wait_for_idle_step_max
+    ):
+        step = min(step, remaining)
+        remaining -= step
+        pending_action_list = _run_wait_for_idle(
+            runner, step, raise_on_timeout=(remaining <= 0)
+        )
+        if pending_action_list is None:
+            return
+        reporter.report(
+            ReportItem.info(
+                reports.messages.WaitForIdleProgress(pending_action_list)
+            )
+        )
+
+
+def _run_wait_for_idle(
+    runner: CommandRunner,
+    timeout: Optional[int],
+    raise_on_timeout: bool = True,
+) -> Optional[List[str]]:
+    """
+    Return None once the cluster is idle, pending actions on timeout
     """
     args = [__exec("crm_resource"), "--wait"]
     if timeout is not None:
         args.append("--timeout={0}".format(timeout))
     stdout, stderr, retval = runner.run(args)
-    if retval != 0:
-        # Usefull info goes to stderr - not only error messages, a list of
-        # pending actions in case of timeout goes there as well.
-        # We use stdout just to be sure if that's get changed.
-        if retval == __EXITCODE_WAIT_TIMEOUT:
-            raise LibraryError(
-                ReportItem.error(
-                    reports.messages.WaitForIdleTimedOut(
-                        join_multilines([stderr, stdout])
-                    )
-                )
-            )
+    if retval == 0:
+        return None
+    # Usefull info goes to stderr - not only error messages, a list of
+    # pending actions in case of timeout goes there as well.
+    # We use stdout just to be sure if that's get changed.
+    if retval == __EXITCODE_WAIT_TIMEOUT:
+        if not raise_on_timeout:
+            return [
+                " ".join(line.split())
+                for line in join_multilines([stderr, stdout]).splitlines()
+                if __PENDING_ACTION_RE.match(line)
+            ]
         raise LibraryError(
             ReportItem.error(
-                reports.messages.WaitForIdleError(
+                reports.messages.WaitForIdleTimedOut(
                     join_multilines([stderr, stdout])
                 )
             )
         )
+    raise LibraryError(
+        ReportItem.error(
+            reports.messages.WaitForIdleError(join_multilines([stderr, stdout]))
+        )
+    )
 
 
 ### nodes
@@ -458,31 +573,31 @@ def get_local_node_status(runner):
     except CrmMonErrorException:
         return {"offline": True}
     node_name = get_local_node_name(runner)
-    for node_status in cluster_status.node_section.nodes:
-        if node_status.attrs.name == node_name:
-            result = {
-                "offline": False,
-            }
-            for attr in (
-                "id",
-                "name",
-                "type",
-                "online",
-                "standby",
-                "standby_onfail",
-                "maintenance",
-                "pending",
-                "unclean",
-                "shutdown",
-                "expected_up",
-                "is_dc",
-                "resources_running",
-            ):
-                result[attr] = getattr(node_status.attrs, attr)
-            return result
-    raise LibraryError(
-        ReportItem.error(reports.messages.NodeNotFound(node_name))
-    )
+    node_status = cluster_status.get_node_by_name(node_name)
+    if node_status is None:
+        raise LibraryError(
+            ReportItem.error(reports.messages.NodeNotFound(node_name))
+        )
+    result = {
+        "offline": False,
+    }
+    for attr in (
+        "id",
+        "name",
+        "type",
+        "online",
+        "standby",
+        "standby_onfail",
+        "maintenance",
+        "pending",
+        "unclean",
+        "shutdown",
+        "expected_up",
+        "is_dc",
+        "resources_running",
+    ):
+        result[attr] = getattr(node_status.attrs, attr)
+    return result
 
 
 def remove_node(runner, node_name):
@@ -686,6 +801,78 @@ def _run_fence_history_command(runner, command, node=None):
     return stdout.strip()
 
 
+### rules
+
+
+def has_rule_in_effect_status_tool() -> bool:
+    return os.path.isfile(settings.crm_rule)
+
+
+def get_rules_in_effect_status(
+    runner: CommandRunner, cib_xml: str, rule_id_list: Iterable[str]
+) -> Dict[str, CibRuleInEffectStatus]:
+    """
+    Let pacemaker evaluate if rules are in effect, expired or not yet in effect
+
+    cib_xml -- CIB containing the rules
+    rule_id_list -- ids of rules to be evaluated
+    """
+    rule_id_list = list(rule_id_list)
+    status_map: Dict[str, CibRuleInEffectStatus] = {}
+    if len(rule_id_list) > 1:
+        # Pacemaker checking several rules at once in one run provides xml
+        # output. Older pacemaker checks one rule at a time.
+        cmd = [settings.crm_rule, "--check", "--output-as=xml"]
+        for rule_id in rule_id_list:
+            cmd.extend(["--rule", rule_id])
+        stdout, dummy_stderr, dummy_retval = runner.run(
+            cmd + ["--xml-text", "-"], stdin_string=cib_xml
+        )
+        status_map = _parse_crm_rule_xml(stdout, rule_id_list)
+    for rule_id in rule_id_list:
+        if rule_id in status_map:
+            continue
+        dummy_stdout, dummy_stderr, retval = runner.run(
+            [
+                settings.crm_rule,
+                "--check",
+                "--rule",
+                rule_id,
+                "--xml-text",
+                "-",
+            ],
+            stdin_string=cib_xml,
+        )
+        status_map[rule_id] = __CRM_RULE_RETURN_CODES.get(
+            retval, CibRuleInEffectStatus.UNKNOWN
+        )
+    return status_map
+
+
+def _parse_crm_rule_xml(
+    xml: str, rule_id_list: Iterable[str]
+) -> Dict[str, CibRuleInEffectStatus]:
+    try:
+        dom = xml_fromstring(xml)
+    except (etree.XMLSyntaxError, ValueError):
+        return {}
+    status_map = {}
+    for rule_check_el in dom.iterfind(".//rule-check"):
+        rule_id = str(rule_check_el.get("rule-id", ""))
+        try:
+            return_code = int(rule_check_el.get("rc", ""))
+        except ValueError:
+            continue
+        status_map[rule_id] = __CRM_RULE_RETURN_CODES.get(
+            return_code, CibRuleInEffectStatus.UNKNOWN
+        )
+    return {
+        rule_id: status_map[rule_id]
+        for rule_id in rule_id_list
+        if rule_id in status_map
+    }
+
+
 ### tools
 
 # shortcut for getting a full path to a pacemaker executable
@@ -694,18 +881,31 @@ def __exec(name):
 
 
 def __is_in_crm_resource_help(runner, text):
-    # returns 1 on success so we don't care about retval
-    stdout, stderr, dummy_retval = runner.run([__exec("crm_resource"), "-?"])
-    # help goes to stderr but we check stdout as well if that gets changed
-    return text in stderr or text in stdout
+    return _is_in_pcmk_tool_help(runner, "crm_resource", [text], "-?")
 
 
 def _is_in_pcmk_tool_help(
-    runner: CommandRunner, tool: str, text_list: Iterable[str]
+    runner: CommandRunner,
+    tool: str,
+    text_list: Iterable[str],
+    help_option: str = "--help-all",
 ) -> bool:
-    stdout, stderr, dummy_retval = runner.run([__exec(tool), "--help-all"])
-    # Help goes to stderr but we check stdout as well if that gets changed. Use
-    # generators in all to return early.
-    return all(text in stderr for text in text_list) or all(
-        text in stdout for text in text_list
+    text_list = list(text_list)
+
+    def probe() -> Optional[bool]:
+        # returns 1 on success for some options so we don't care about retval
+        stdout, stderr, dummy_retval = runner.run([__exec(tool), help_option])
+        if not stdout.strip() and not stderr.strip():
+            # The tool has not printed its help, e.g. it has been killed. Do
+            # not let the cache remember the capability is missing.
+            return None
+        # Help goes to stderr but we check stdout as well if that gets
+        # changed. Use generators in all to return early.
+        return all(text in stderr for text in text_list) or all(
+            text in stdout for text in text_list
+        )
+
+    # the help is the same until pacemaker is upgraded
+    return get_capability_cache().get(
+        __exec(tool), " ".join([help_option] + text_list), probe
     )
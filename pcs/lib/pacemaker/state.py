@@ -2,9 +2,18 @@
 The intention is put there knowledge about cluster state structure.
 Hide information about underlaying xml is desired too.
 """
+import os
 import os.path
+import threading
 from collections import defaultdict
-from typing import Dict, Any
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
 
 from lxml import etree
 
@@ -17,7 +26,6 @@ from pcs.lib.pacemaker.values import (
     is_false,
     is_true,
 )
-from pcs.lib.xml_tools import find_parent
 
 
 class ResourceNotFound(Exception):
@@ -64,16 +72,22 @@ class _Children:
         self.sections = sections
 
     def __getattr__(self, name):
+        # Wrappers are created on the first access and stored as attributes of
+        # the instance, so __getattr__ is not called for them again.
         if name in self.children.keys():
             element_name, wrapper = self.children[name]
-            return [
+            value = [
                 wrapper(element)
-                for element in self.dom_part.findall(".//" + element_name)
+                for element in self.dom_part.iterfind(".//" + element_name)
             ]
+            setattr(self, name, value)
+            return value
 
         if name in self.sections.keys():
             element_name, wrapper = self.sections[name]
-            return wrapper(self.dom_part.findall(".//" + element_name)[0])
+            value = wrapper(self.dom_part.findall(".//" + element_name)[0])
+            setattr(self, name, value)
+            return value
 
         raise AttributeError(
             "'{0}' does not declare child or section '{1}'".format(
@@ -149,9 +163,28 @@ class _NodeSection(_Element):
     }
 
 
+_cluster_state_schema_cache: Dict[Tuple[str, int], etree.RelaxNG] = {}
+_cluster_state_schema_lock = threading.Lock()
+
+
+def _get_cluster_state_schema() -> Optional[etree.RelaxNG]:
+    # Compiling the schema takes more time than validating a document, so the
+    # schema is compiled only once unless it changes.
+    schema_path = settings.crm_mon_schema
+    if not os.path.isfile(schema_path):
+        return None
+    key = (schema_path, os.stat(schema_path).st_mtime_ns)
+    with _cluster_state_schema_lock:
+        if key not in _cluster_state_schema_cache:
+            _cluster_state_schema_cache.clear()
+            _cluster_state_schema_cache[key] = etree.RelaxNG(file=schema_path)
+        return _cluster_state_schema_cache[key]
+
+
 def _validate_cluster_state_dom(dom):
-    if os.path.isfile(settings.crm_mon_schema):
-        etree.RelaxNG(file=settings.crm_mon_schema).assertValid(dom)
+    schema = _get_cluster_state_schema()
+    if schema is not None:
+        schema.assertValid(dom)
 
 
 def get_cluster_state_dom(xml):
@@ -174,50 +207,257 @@ class ClusterState(_Element):
     def __init__(self, xml):
         self.dom = get_cluster_state_dom(xml)
         super(ClusterState, self).__init__(self.dom)
+        self._nodes_by_name = None
+
+    def get_node_by_name(self, node_name):
+        """
+        Return a node with the specified name, None if there is no such node
+
+        string node_name -- name of the node
+        """
+        if self._nodes_by_name is None:
+            self._nodes_by_name = {}
+            for node in self.node_section.nodes:
+                self._nodes_by_name.setdefault(node.attrs.name, node)
+        return self._nodes_by_name.get(node_name)
+
+
+class _PrimitiveState:
+    """
+    State of a primitive resource or of an instance of a cloned primitive
+    """
+
+    __slots__ = (
+        "id",
+        "role",
+        "failed",
+        "managed",
+        "container_managed",
+        "node_names",
+        "position",
+    )
+
+    def __init__(
+        self,
+        primitive_id: str,
+        role: str,
+        failed: bool,
+        managed: bool,
+        container_managed: bool,
+        node_names: List[str],
+        position: int,
+    ):
+        # pylint: disable=too-many-arguments
+        self.id = primitive_id
+        self.role = role
+        self.failed = failed
+        self.managed = managed
+        # is the closest clone or bundle containing the primitive managed
+        self.container_managed = container_managed
+        self.node_names = node_names
+        # position in the status document, keeps the document order
+        self.position = position
+
+    @classmethod
+    def from_element(
+        cls, element: etree._Element, position=0, container_managed=True
+    ) -> "_PrimitiveState":
+        return cls(
+            str(element.get("id", "")),
+            str(element.get("role", "")),
+            is_true(element.get("failed", "")),
+            not is_false(element.get("managed", "")),
+            container_managed,
+            [str(node.get("name", "")) for node in element.iterfind(".//node")],
+            position,
+        )
+
+
+class _ContainerState:
+    """
+    State of a clone or a bundle
+    """
+
+    __slots__ = ("tag", "managed", "primitives", "groups", "all_primitives")
+
+    def __init__(self, tag: str, managed: bool):
+        self.tag = tag
+        self.managed = managed
+        # clone: primitive children, bundle: primitives in replicas
+        self.primitives: List[_PrimitiveState] = []
+        # clone: members of each group child
+        self.groups: List[List[_PrimitiveState]] = []
+        # all primitives in the container no matter how deep
+        self.all_primitives: List[_PrimitiveState] = []
+
+
+class _ResourcesState:
+    """
+    Resources of a cluster status indexed by their ids, built in one pass
+
+    Primitives and groups are indexed by their ids as well as by their ids
+    without clone instance suffixes, i.e. "A:1" can be found as "A" as well.
+    """
+
+    __slots__ = ("_primitives", "_groups", "_containers", "_position")
+
+    def __init__(self, dom: etree._Element):
+        self._primitives: Dict[str, List[_PrimitiveState]] = defaultdict(list)
+        self._groups: Dict[str, List[List[_PrimitiveState]]] = defaultdict(list)
+        self._containers: Dict[str, List[_ContainerState]] = defaultdict(list)
+        self._position = 0
+        self._walk(dom, [])
+
+    def _walk(
+        self, parent_el: etree._Element, container_stack: List[_ContainerState]
+    ) -> Tuple[List[_PrimitiveState], List[List[_PrimitiveState]]]:
+        primitive_list: List[_PrimitiveState] = []
+        group_list: List[List[_PrimitiveState]] = []
+        for element in parent_el:
+            if not isinstance(element.tag, str):
+                # comments and processing instructions
+                continue
+            if element.tag == "resource":
+                primitive_list.append(
+                    self._add_primitive(element, container_stack)
+                )
+            elif element.tag == "group":
+                member_list, dummy_group_list = self._walk(
+                    element, container_stack
+                )
+                for key in _get_id_keys(str(element.get("id", ""))):
+                    self._groups[key].append(member_list)
+                group_list.append(member_list)
+            elif element.tag in ("clone", "bundle"):
+                container = _ContainerState(
+                    element.tag, not is_false(element.get("managed", ""))
+                )
+                self._containers[str(element.get("id", ""))].append(container)
+                (container.primitives, container.groups) = self._walk(
+                    element, container_stack + [container]
+                )
+            elif element.tag == "replica":
+                # bundle replicas' primitives belong to the bundle
+                replica_primitive_list, dummy_group_list = self._walk(
+                    element, container_stack
+                )
+                primitive_list.extend(replica_primitive_list)
+            else:
+                self._walk(element, container_stack)
+        return primitive_list, group_list
+
+    def _add_primitive(
+        self, element: etree._Element, container_stack: List[_ContainerState]
+    ) -> _PrimitiveState:
+        primitive = _PrimitiveState.from_element(
+            element,
+            self._position,
+            container_stack[-1].managed if container_stack else True,
+        )
+        self._position += 1
+        for key in _get_id_keys(primitive.id):
+            self._primitives[key].append(primitive)
+        for container in container_stack:
+            container.all_primitives.append(primitive)
+        return primitive
+
+    def get_primitives_for_state_check(
+        self, resource_id: str, expected_running: bool
+    ) -> List[_PrimitiveState]:
+        """
+        Return not failed primitives a state of a resource is determined by
+
+        resource_id -- id of a primitive, group, clone or bundle
+        expected_running -- True: check the last member of groups, False: check
+            the first member of groups
+        """
+        found: Dict[int, _PrimitiveState] = {}
+
+        def add(primitive_list: Iterable[_PrimitiveState]) -> None:
+            for primitive in primitive_list:
+                found[primitive.position] = primitive
+
+        def add_group_members(group_list: List[List[_PrimitiveState]]):
+            add(
+                members[-1 if expected_running else 0]
+                for members in group_list
+                if members
+            )
+
+        add(self._primitives.get(resource_id, []))
+        add_group_members(self._groups.get(resource_id, []))
+        for container in self._containers.get(resource_id, []):
+            add(container.primitives)
+            add_group_members(container.groups)
+        return [
+            primitive
+            for dummy_position, primitive in sorted(found.items())
+            if not primitive.failed
+        ]
+
+    def is_managed(self, resource_id: str) -> bool:
+        """
+        Check if a resource is managed, raise ResourceNotFound if it is missing
+
+        resource_id -- id of a primitive, group, clone or bundle
+        """
+        primitive_list = list(self._primitives.get(resource_id, []))
+        for member_list in self._groups.get(resource_id, []):
+            primitive_list.extend(member_list)
+        if primitive_list:
+            return all(
+                primitive.managed and primitive.container_managed
+                for primitive in primitive_list
+            )
+        container_list = self._containers.get(resource_id)
+        if container_list:
+            container = container_list[0]
+            return container.managed and all(
+                primitive.managed for primitive in container.all_primitives
+            )
+        raise ResourceNotFound(resource_id)
+
+
+def _get_id_keys(element_id: str) -> List[str]:
+    # An id of a clone instance "A:1" is reachable by the id "A". Generally,
+    # the id is reachable by all of its parts preceding a colon.
+    key_list = [element_id]
+    position = element_id.find(":")
+    while position != -1:
+        key_list.append(element_id[:position])
+        position = element_id.find(":", position + 1)
+    return key_list
 
 
-def _id_xpath_predicate(resource_id):
-    return """(@id="{0}" or starts-with(@id, "{0}:"))""".format(resource_id)
+# Several resources are usually checked in one cluster status. Keep the index
+# of the last status so that it is built only once for all of them. Cluster
+# status documents are not modified once loaded.
+_resources_state_cache: List[Any] = [None, None]
+_resources_state_cache_lock = threading.Lock()
+
+
+def _get_resources_state(cluster_state: etree._Element) -> _ResourcesState:
+    with _resources_state_cache_lock:
+        if _resources_state_cache[0] is not cluster_state:
+            _resources_state_cache[1] = _ResourcesState(cluster_state)
+            _resources_state_cache[0] = cluster_state
+        return _resources_state_cache[1]
 
 
 def _get_primitives_for_state_check(
     cluster_state, resource_id, expected_running
 ):
-    primitives = cluster_state.xpath(
-        """
-        .//resource[{predicate_id}]
-        |
-        .//group[{predicate_id}]/resource[{predicate_position}]
-        |
-        .//clone[@id="{id}"]/resource
-        |
-        .//clone[@id="{id}"]/group/resource[{predicate_position}]
-        |
-        .//bundle[@id="{id}"]/replica/resource
-    """.format(
-            id=resource_id,
-            predicate_id=_id_xpath_predicate(resource_id),
-            predicate_position=("last()" if expected_running else "1"),
-        )
+    return _get_resources_state(cluster_state).get_primitives_for_state_check(
+        resource_id, expected_running
     )
-    return [
-        element
-        for element in primitives
-        if not is_true(element.attrib.get("failed", ""))
-    ]
 
 
-def _get_primitive_roles_with_nodes(primitive_el_list):
-    # Clone resources are represented by multiple primitive elements.
+def _get_primitive_roles_with_nodes(primitive_list):
+    # Clone resources are represented by multiple primitives.
     roles_with_nodes = defaultdict(set)
-    for resource_element in primitive_el_list:
-        if resource_element.attrib["role"] in ["Started", "Master", "Slave"]:
-            roles_with_nodes[resource_element.attrib["role"]].update(
-                [
-                    node.attrib["name"]
-                    for node in resource_element.findall(".//node")
-                ]
-            )
+    for primitive in primitive_list:
+        if primitive.role in ["Started", "Master", "Slave"]:
+            roles_with_nodes[primitive.role].update(primitive.node_names)
     return {role: sorted(nodes) for role, nodes in roles_with_nodes.items()}
 
 
@@ -278,41 +518,4 @@ def is_resource_managed(cluster_state, resource_id):
     etree cluster_state -- status of the cluster
     string resource_id -- id of the resource
     """
-    primitive_list = cluster_state.xpath(
-        """
-        .//resource[{predicate_id}]
-        |
-        .//group[{predicate_id}]/resource
-        """.format(
-            predicate_id=_id_xpath_predicate(resource_id)
-        )
-    )
-    if primitive_list:
-        for primitive in primitive_list:
-            if is_false(primitive.attrib.get("managed", "")):
-                return False
-            parent = find_parent(primitive, ["clone", "bundle"])
-            if parent is not None and is_false(
-                parent.attrib.get("managed", "")
-            ):
-                return False
-        return True
-
-    parent_list = cluster_state.xpath(
-        """
-        .//clone[@id="{0}"]
-        |
-        .//bundle[@id="{0}"]
-        """.format(
-            resource_id
-        )
-    )
-    for parent in parent_list:
-        if is_false(parent.attrib.get("managed", "")):
-            return False
-        for primitive in parent.xpath(".//resource"):
-            if is_false(primitive.attrib.get("managed", "")):
-                return False
-        return True
-
-    raise ResourceNotFound(resource_id)
+    return _get_resources_state(cluster_state).is_managed(resource_id)
@@ -1,3 +1,5 @@
+import copy
+import os.path
 import re
 from collections import namedtuple
 from typing import cast
@@ -10,11 +12,13 @@ from pcs.common.reports import (
     ReportItemSeverity,
     ReportProcessor,
 )
-from pcs.common.tools import xml_fromstring
+from pcs.common.tools import run_parallel, xml_fromstring
 from pcs.lib import validate
+from pcs.lib.agent_metadata_cache import get_agent_metadata_cache
 from pcs.lib.errors import LibraryError
 from pcs.lib.external import CommandRunner
 from pcs.lib.pacemaker.values import is_true
+from pcs.lib.resource_agent_catalog import get_resource_agent_catalog
 
 # TODO: fix
 # pylint: disable=no-self-use
@@ -41,6 +45,8 @@ DEFAULT_INTERVALS = {"monitor": "60s"}
 
 STONITH_ACTION_REPLACED_BY = ("pcmk_off_action", "pcmk_reboot_action")
 
+FENCED_METADATA_NAME = "pacemaker-fenced"
+
 
 def get_default_interval(operation_name):
     """
@@ -163,9 +169,15 @@ def list_resource_agents_standards_and_providers(runner):
     Return list of all standard[:provider] on the local host
     CommandRunner runner
     """
-    standards = list_resource_agents_standards(runner) + [
-        "ocf:{0}".format(provider)
-        for provider in list_resource_agents_ocf_providers(runner)
+    return _merge_standards_and_providers(
+        list_resource_agents_standards(runner),
+        list_resource_agents_ocf_providers(runner),
+    )
+
+
+def _merge_standards_and_providers(standard_list, provider_list):
+    standards = standard_list + [
+        "ocf:{0}".format(provider) for provider in provider_list
     ]
     # do not list ocf resources twice
     try:
@@ -185,6 +197,9 @@ def list_resource_agents(runner, standard_provider):
     CommandRunner runner
     string standard_provider standard[:provider], e.g. lsb, ocf, ocf:pacemaker
     """
+    stored_agents = get_resource_agent_catalog().get_stored_agents()
+    if stored_agents and standard_provider in stored_agents:
+        return list(stored_agents[standard_provider])
     # retval is 0 on success, anything else when no agents found
     stdout, dummy_stderr, retval = runner.run(
         [settings.crm_resource_binary, "--list-agents", standard_provider]
@@ -194,6 +209,54 @@ def list_resource_agents(runner, standard_provider):
     return _prepare_agent_list(stdout)
 
 
+def list_all_resource_agents(runner):
+    """
+    Return dict {standard[:provider]: [agent name]} of all resource agents on
+        the local host
+    CommandRunner runner
+    """
+    catalog = get_resource_agent_catalog()
+    return catalog.get_agents(
+        lambda: _scan_resource_agents(runner, parallel=catalog.enabled)
+    )
+
+
+def _scan_resource_agents(runner, parallel=False):
+    if not parallel:
+        return {
+            std: list_resource_agents(runner, std)
+            for std in list_resource_agents_standards_and_providers(runner)
+        }
+
+    result = {}
+    error_list = []
+
+    def worker(key, list_function, *args):
+        try:
+            result[key] = list_function(runner, *args)
+        except Exception as e:  # pylint: disable=broad-except
+            error_list.append(e)
+
+    def run_workers(data_list):
+        # run_parallel does not propagate exceptions raised in the workers,
+        # raise them the same way the serial scan does
+        run_parallel(worker, data_list)
+        if error_list:
+            raise error_list[0]
+
+    run_workers(
+        [
+            (("standards", list_resource_agents_standards), {}),
+            (("providers", list_resource_agents_ocf_providers), {}),
+        ]
+    )
+    std_list = _merge_standards_and_providers(
+        result.pop("standards"), result.pop("providers")
+    )
+    run_workers([((std, list_resource_agents, std), {}) for std in std_list])
+    return result
+
+
 def list_stonith_agents(runner):
     """
     Return list of fence agents on the local host
@@ -243,18 +306,25 @@ def guess_resource_agent_full_name(runner, search_agent_name):
     List resource agents matching specified search term
     string search_agent_name part of full agent name
     """
-    search_lower = search_agent_name.lower()
+    catalog = get_resource_agent_catalog()
     # list all possible names
-    possible_names = []
-    for std in list_resource_agents_standards_and_providers(runner):
-        for agent in list_resource_agents(runner, std):
-            if search_lower == agent.lower():
-                possible_names.append("{0}:{1}".format(std, agent))
+    possible_names = catalog.get_index(
+        lambda: _scan_resource_agents(runner, parallel=catalog.enabled)
+    ).get(search_agent_name.lower(), [])
     # construct agent wrappers
     agent_candidates = [
         ResourceAgent(runner, agent) for agent in possible_names
     ]
     # check if the agent is valid
+    if catalog.enabled and len(agent_candidates) > 1:
+        valid_agents = set()
+
+        def worker(agent):
+            if agent.is_valid_metadata():
+                valid_agents.add(agent)
+
+        run_parallel(worker, [((agent,), {}) for agent in agent_candidates])
+        return [agent for agent in agent_candidates if agent in valid_agents]
     return [agent for agent in agent_candidates if agent.is_valid_metadata()]
 
 
@@ -371,6 +441,8 @@ class Agent:
     """
 
     _agent_type_label = "agent"
+    # keep processed metadata in memory even if the metadata cache is disabled
+    _keep_metadata_in_memory = False
 
     def __init__(self, runner):
         """
@@ -379,6 +451,7 @@ class Agent:
         """
         self._runner = runner
         self._metadata = None
+        self._processed_metadata = None
 
     def get_name(self):
         raise NotImplementedError()
@@ -418,17 +491,13 @@ class Agent:
         """
         Get a short description of agent's purpose
         """
-        return self._get_text_from_dom_element(
-            self._get_metadata().find("shortdesc")
-        ) or self._get_metadata().get("shortdesc", "")
+        return self._get_processed_metadata()["shortdesc"]
 
     def get_longdesc(self):
         """
         Get a long description of agent's purpose
         """
-        return self._get_text_from_dom_element(
-            self._get_metadata().find("longdesc")
-        )
+        return self._get_processed_metadata()["longdesc"]
 
     def get_parameters(self):
         """
@@ -449,6 +518,9 @@ class Agent:
             pcs_deprecated_warning: pcs originated warning
         }
         """
+        return copy.deepcopy(self._get_processed_metadata()["parameters"])
+
+    def _get_parameters_from_metadata(self):
         params_element = self._get_metadata().find("parameters")
         if params_element is None:
             return []
@@ -708,6 +780,9 @@ class Agent:
         return missing_parameters
 
     def _get_raw_actions(self):
+        return copy.deepcopy(self._get_processed_metadata()["actions"])
+
+    def _get_raw_actions_from_metadata(self):
         actions_element = self._get_metadata().find("actions")
         if actions_element is None:
             return []
@@ -770,6 +845,51 @@ class Agent:
             self._metadata = self._parse_metadata(self._load_metadata())
         return self._metadata
 
+    def _get_processed_metadata(self):
+        """
+        Return metadata processed to a dict, use the metadata cache if possible
+        Raise UnableToGetAgentMetadata if agent doesn't exist or unable to get
+            or parse its metadata
+        """
+        if self._processed_metadata is None:
+            cache_name = self._get_metadata_cache_name()
+            if cache_name is None:
+                self._processed_metadata = self._process_metadata()
+            else:
+                self._processed_metadata = get_agent_metadata_cache().get(
+                    cache_name,
+                    self._get_metadata_source_files(),
+                    self._process_metadata,
+                    always_in_memory=self._keep_metadata_in_memory,
+                )
+        return self._processed_metadata
+
+    def _process_metadata(self):
+        metadata = self._get_metadata()
+        return {
+            "shortdesc": (
+                self._get_text_from_dom_element(metadata.find("shortdesc"))
+                or metadata.get("shortdesc", "")
+            ),
+            "longdesc": self._get_text_from_dom_element(
+                metadata.find("longdesc")
+            ),
+            "parameters": self._get_parameters_from_metadata(),
+            "actions": self._get_raw_actions_from_metadata(),
+        }
+
+    def _get_metadata_cache_name(self):
+        """
+        Return a name to cache metadata under, None means do not cache them
+        """
+        return None
+
+    def _get_metadata_source_files(self):
+        """
+        Return files metadata are generated from, empty means cache in memory
+        """
+        return []
+
     def _load_metadata(self):
         raise NotImplementedError()
 
@@ -816,8 +936,12 @@ class FakeAgentMetadata(Agent):
 
 
 class FencedMetadata(FakeAgentMetadata):
+    # Fenced metadata are the same for all stonith agents. Before the metadata
+    # cache was introduced, they were kept in memory for the whole process.
+    _keep_metadata_in_memory = True
+
     def get_name(self):
-        return "pacemaker-fenced"
+        return FENCED_METADATA_NAME
 
     def _get_parameter(self, parameter_element):
         parameter = super(FencedMetadata, self)._get_parameter(
@@ -842,6 +966,13 @@ class FencedMetadata(FakeAgentMetadata):
             raise UnableToGetAgentMetadata(self.get_name(), stderr.strip())
         return metadata
 
+    def _get_metadata_cache_name(self):
+        return self.get_name()
+
+    def _get_metadata_source_files(self):
+        # metadata change only when pacemaker is upgraded
+        return [settings.pacemaker_fenced]
+
 
 class CrmAgent(Agent):
     # pylint:disable=abstract-method
@@ -874,7 +1005,7 @@ class CrmAgent(Agent):
         """
         # if the agent is valid, we do not need to load its metadata again
         try:
-            self._get_metadata()
+            self._get_processed_metadata()
         except UnableToGetAgentMetadata:
             return False
         return True
@@ -883,9 +1014,25 @@ class CrmAgent(Agent):
         """
         Validate metadata by attepmt to retrieve it.
         """
-        self._get_metadata()
+        self._get_processed_metadata()
         return self
 
+    def _get_metadata_cache_name(self):
+        return self._get_full_name()
+
+    def _get_metadata_source_files(self):
+        agent_file = self._get_agent_file()
+        if not agent_file:
+            return []
+        # crm_resource adds its own metadata to some agents
+        return [agent_file, settings.crm_resource_binary]
+
+    def _get_agent_file(self):
+        """
+        Return path to the agent's executable, None if it is not known
+        """
+        return None
+
     def _load_metadata(self):
         env_path = ":".join(
             [
@@ -924,6 +1071,13 @@ class ResourceAgent(CrmAgent):
     def get_name(self):
         return self._get_full_name()
 
+    def _get_agent_file(self):
+        if self.get_standard() != "ocf" or not self.get_provider():
+            return None
+        return os.path.join(
+            settings.ocf_resource_agents, self.get_provider(), self.get_type()
+        )
+
     def get_parameters(self):
         parameters = super(ResourceAgent, self).get_parameters()
         if self.get_standard() == "ocf" and (
@@ -1002,6 +1156,10 @@ class AbsentAgentMixin:
     def _load_metadata(self):
         return "<resource-agent/>"
 
+    def _get_metadata_cache_name(self):
+        # do not replace metadata of the agent if it is installed later
+        return None
+
     def validate_parameters_create(
         self,
         parameters,
@@ -1032,12 +1190,11 @@ class StonithAgent(CrmAgent):
     Provides convinient access to a stonith agent's metadata
     """
 
-    _fenced_metadata = None
     _agent_type_label = "stonith"
 
     @classmethod
     def clear_fenced_metadata_cache(cls):
-        cls._fenced_metadata = None
+        get_agent_metadata_cache().invalidate(FENCED_METADATA_NAME)
 
     def _prepare_name_parts(self, name):
         # pacemaker doesn't support stonith (nor resource) agents with : in type
@@ -1048,6 +1205,9 @@ class StonithAgent(CrmAgent):
     def get_name(self):
         return self.get_type()
 
+    def _get_agent_file(self):
+        return os.path.join(settings.fence_agent_binaries, self.get_type())
+
     def get_parameters(self):
         return (
             self._filter_parameters(super(StonithAgent, self).get_parameters())
@@ -1149,10 +1309,8 @@ class StonithAgent(CrmAgent):
         return filtered
 
     def _get_fenced_metadata(self):
-        # pylint: disable=protected-access
-        if not self.__class__._fenced_metadata:
-            self.__class__._fenced_metadata = FencedMetadata(self._runner)
-        return self.__class__._fenced_metadata
+        # fenced metadata are cached by the metadata cache
+        return FencedMetadata(self._runner)
 
     def get_provides_unfencing(self):
         # self.get_actions returns an empty list
@@ -0,0 +1,175 @@
+"""
+Catalog of resource agents installed on the local host.
+
+Listing all resource agents means running crm_resource for each standard and
+ocf provider. When enabled, the catalog stores the lists in memory and, if a
+cache file is set, in a file so that other pcs processes can use them.
+
+A stored catalog, in memory or in the file, is only used if it is not older
+than its time to live and none of the directories resource agents are
+installed to (and crm_resource itself) has changed since the catalog has been
+created. This is checked every time the catalog is used, so long running
+processes notice agents installed or removed in the meantime.
+"""
+import json
+import os
+import os.path
+import tempfile
+import time
+
+from pcs import settings
+
+
+class ResourceAgentCatalog:
+    def __init__(self):
+        self._enabled = False
+        self._cache_file = None
+        self._ttl = 0
+        # dict created, stamp, agents - the same as stored in the file
+        self._data = None
+
+    @property
+    def enabled(self):
+        return self._enabled
+
+    def enable(self, cache_file=None, ttl=None):
+        """
+        Start caching lists of resource agents
+
+        string cache_file -- file to store the catalog in, None = memory only
+        int ttl -- number of seconds a stored catalog is valid for
+        """
+        self._enabled = True
+        self._cache_file = cache_file
+        self._ttl = settings.resource_agent_catalog_ttl if ttl is None else ttl
+
+    def disable(self):
+        self._enabled = False
+        self._cache_file = None
+        self._data = None
+
+    def get_agents(self, scanner):
+        """
+        Return dict {standard[:provider]: [agent name]}, scan it if not cached
+
+        callable scanner -- returns the dict, must not use the catalog
+        """
+        if not self._enabled:
+            return scanner()
+        stamp = _get_stamp()
+        agents = self._get_valid_agents(stamp)
+        if agents is None:
+            agents = scanner()
+            self._data = dict(created=time.time(), stamp=stamp, agents=agents)
+            if self._cache_file:
+                self._write(self._data)
+        return agents
+
+    def get_stored_agents(self):
+        """
+        Return dict {standard[:provider]: [agent name]}, None if not cached
+        """
+        if not self._enabled:
+            return None
+        return self._get_valid_agents(_get_stamp())
+
+    def get_index(self, scanner):
+        """
+        Return dict {lowercase agent name: [full agent name]}
+
+        callable scanner -- returns the catalog, must not use the catalog
+        """
+        index = {}
+        for standard, agent_list in sorted(
+            self.get_agents(scanner).items(),
+            # works with both str and unicode in both python 2 and 3
+            key=lambda item: item[0].lower(),
+        ):
+            for agent in agent_list:
+                index.setdefault(agent.lower(), []).append(
+                    "{0}:{1}".format(standard, agent)
+                )
+        return index
+
+    def invalidate(self):
+        self._data = None
+        if self._cache_file:
+            _remove_file(self._cache_file)
+
+    def _get_valid_agents(self, stamp):
+        if not self._is_valid(self._data, stamp):
+            # Another process may have stored a newer catalog.
+            self._data = self._read() if self._cache_file else None
+            if not self._is_valid(self._data, stamp):
+                self._data = None
+                return None
+        return self._data["agents"]
+
+    def _is_valid(self, data, stamp):
+        try:
+            return (
+                abs(time.time() - data["created"]) <= self._ttl
+                and data["stamp"] == stamp
+                and isinstance(data["agents"], dict)
+            )
+        except (TypeError, KeyError):
+            return False
+
+    def _read(self):
+        try:
+            with open(self._cache_file, "r") as cache_file:
+                return json.load(cache_file)
+        except (EnvironmentError, ValueError):
+            return None
+
+    def _write(self, data):
+        # The catalog is not essential, so it is fine to skip storing it if
+        # something goes wrong. A temporary file is used so that other
+        # processes never read a partially written catalog.
+        cache_dir = os.path.dirname(self._cache_file)
+        try:
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir)
+            try:
+                with os.fdopen(fd, "w") as tmp_file:
+                    json.dump(data, tmp_file)
+                os.replace(tmp_path, self._cache_file)
+            except (EnvironmentError, TypeError, ValueError):
+                _remove_file(tmp_path)
+        except EnvironmentError:
+            pass
+
+
+def _get_stamp():
+    # Installing or removing an agent changes the modification time of the
+    # directory the agent lives in. Ocf agents live in provider directories.
+    path_list = [settings.crm_resource_binary, settings.ocf_resource_agents]
+    path_list.extend(settings.resource_agent_dirs)
+    try:
+        path_list.extend(
+            os.path.join(settings.ocf_resource_agents, provider)
+            for provider in sorted(os.listdir(settings.ocf_resource_agents))
+        )
+    except EnvironmentError:
+        pass
+    stamp = []
+    for path in path_list:
+        try:
+            stamp.append([path, os.stat(path).st_mtime_ns])
+        except EnvironmentError:
+            stamp.append([path, None])
+    return stamp
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except EnvironmentError:
+        pass
+
+
+_process_resource_agent_catalog = ResourceAgentCatalog()
+
+
+def get_resource_agent_catalog():
+    return _process_resource_agent_catalog
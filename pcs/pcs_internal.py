@@ -11,7 +11,12 @@ from pcs.common.reports import (
     ReportItemList,
     ReportProcessor,
 )
+from pcs.lib.agent_metadata_cache import get_agent_metadata_cache
 from pcs.lib.errors import LibraryError
+from pcs.lib.pacemaker.capability_cache import get_capability_cache
+from pcs.lib.pacemaker.cib_snapshot import get_process_cib_snapshot_cache
+from pcs.lib.resource_agent_catalog import get_resource_agent_catalog
+from pcs.pcs_internal_pool import WorkerPool
 
 
 SUPPORTED_COMMANDS = {
@@ -22,22 +27,23 @@ SUPPORTED_COMMANDS = {
 }
 
 
-def _exit(status, status_msg=None, report_list=None, data=None):
-    json.dump(
-        dict(
-            status=status,
-            status_msg=status_msg,
-            report_list=report_list or [],
-            data=data,
-        ),
-        sys.stdout,
+def _output(status, status_msg=None, report_list=None, data=None):
+    return dict(
+        status=status,
+        status_msg=status_msg,
+        report_list=report_list or [],
+        data=data,
     )
+
+
+def _exit(status, status_msg=None, report_list=None, data=None):
+    json.dump(_output(status, status_msg, report_list, data), sys.stdout)
     sys.exit(0)
 
 
-def get_cli_env(options):
+def get_cli_env(options, user=None, groups=None):
     env = Env()
-    env.user, env.groups = utils.get_cib_user_groups()
+    env.user, env.groups = user, groups
     env.known_hosts_getter = utils.read_known_hosts_file
     # Debug messages always go to the processor. The parameter only affects if
     # they will be printed to stdout. We are not printing the messages. Instead
@@ -51,7 +57,9 @@ def get_cli_env(options):
 
 
 class LibraryReportProcessor(ReportProcessor):
-    processed_items: ReportItemList = []
+    def __init__(self):
+        super().__init__()
+        self.processed_items: ReportItemList = []
 
     def _do_report(self, report_item: ReportItem) -> None:
         self.processed_items.append(report_item)
@@ -72,26 +80,26 @@ def report_item_to_dict(report_item: ReportItem):
     )
 
 
-def main():
-    # pylint: disable=broad-except
-    argv = sys.argv[1:]
-    if argv:
-        _exit("input_error", status_msg="No arguments allowed")
-
-    utils.subprocess_setup()
-    logging.basicConfig()
+def process_request(input_data, user=None, groups=None):
+    """
+    Run a library command, return a response to be sent back to the caller
 
+    dict input_data -- parsed request
+    string user -- user to run the command as
+    list groups -- groups of the user
+    """
+    # pylint: disable=broad-except
+    cli_env = None
     try:
-        input_data = json.load(sys.stdin)
-        cli_env = get_cli_env(input_data.get("options", {}))
+        cli_env = get_cli_env(input_data.get("options", {}), user, groups)
         lib = Library(cli_env, utils.get_middleware_factory())
         cmd = input_data["cmd"]
         if cmd not in SUPPORTED_COMMANDS:
-            _exit("unknown_cmd", status_msg=f"Unknown command '{cmd}'")
+            return _output("unknown_cmd", status_msg=f"Unknown command '{cmd}'")
         for sub_cmd in cmd.split("."):
             lib = getattr(lib, sub_cmd)
         output_data = lib(**input_data["cmd_data"])
-        _exit(
+        return _output(
             "success",
             report_list=export_reports(
                 cli_env.report_processor.processed_items
@@ -99,16 +107,81 @@ def main():
             data=output_data,
         )
     except LibraryError as e:
-        _exit(
+        return _output(
             "error",
             report_list=export_reports(
                 cli_env.report_processor.processed_items + list(e.args)
             ),
         )
-    except json.JSONDecodeError as e:
-        _exit("input_error", status_msg=f"Unable to parse input data: {e.msg}")
     except KeyError as e:
-        _exit("input_error", status_msg=f"Missing key {e}")
+        return _output("input_error", status_msg=f"Missing key {e}")
     except Exception as e:
         # TODO: maybe add traceback?
-        _exit("exception", status_msg=str(e))
+        return _output("exception", status_msg=str(e))
+
+
+def process_pool_request(input_data):
+    """
+    Run a request received by a worker of the pcs_internal worker pool
+
+    dict input_data -- parsed request, the user to run the command as is
+        specified in it as the process environment does not hold it
+    """
+    if not isinstance(input_data, dict):
+        return _output("input_error", status_msg="Input data must be an object")
+    user = input_data.get("cib_user") or None
+    groups = (input_data.get("cib_user_groups") or "").split() or None
+    # A worker runs many commands, each of them may be run by a different user
+    # and must read the current CIB. The other process-wide caches (agent
+    # metadata, agent catalog, pacemaker capabilities) check on every use that
+    # the files they have been created from have not changed, they are kept.
+    get_process_cib_snapshot_cache().invalidate()
+    return process_request(input_data, user, groups)
+
+
+def _setup_process():
+    utils.subprocess_setup()
+    logging.basicConfig()
+    # one command at a time, CIB readers may share the CIB
+    get_process_cib_snapshot_cache().enable()
+    get_agent_metadata_cache().enable(
+        settings.pcsd_agent_metadata_cache_location
+    )
+    get_resource_agent_catalog().enable(
+        settings.pcsd_resource_agent_catalog_location
+    )
+    get_capability_cache().enable(settings.pcsd_pacemaker_capabilities_location)
+
+
+def run_worker_pool(socket_path=None):
+    """
+    Process requests received on a unix socket by a pool of worker processes
+
+    string socket_path -- socket to listen on, defaults to settings
+    """
+    _setup_process()
+    WorkerPool(
+        socket_path or settings.pcs_internal_socket,
+        process_pool_request,
+        settings.pcs_internal_workers,
+        settings.pcs_internal_worker_max_requests,
+        settings.pcs_internal_request_timeout,
+    ).run()
+
+
+def main():
+    argv = sys.argv[1:]
+    if argv:
+        _exit("input_error", status_msg="No arguments allowed")
+
+    _setup_process()
+    try:
+        input_data = json.load(sys.stdin)
+    except json.JSONDecodeError as e:
+        _exit("input_error", status_msg=f"Unable to parse input data: {e.msg}")
+    if not isinstance(input_data, dict):
+        _exit("input_error", status_msg="Input data must be an object")
+    json.dump(
+        process_request(input_data, *utils.get_cib_user_groups()), sys.stdout
+    )
+    sys.exit(0)
@@ -0,0 +1,255 @@
+"""
+Pool of long-lived pcs_internal worker processes listening on a unix socket.
+
+Starting pcs_internal for each request means starting a python interpreter and
+importing all library commands. The pool does that once. The master process
+creates the socket and forks workers which accept connections on it. Each
+connection carries one request: a json envelope terminated by closing the
+writing side of the connection. The worker sends back a json response and
+closes the connection.
+
+A worker exits after it has processed a configured number of requests or when
+processing of a request has timed out. The master replaces it with a new one.
+"""
+import errno
+import json
+import os
+import signal
+import socket
+import sys
+import time
+
+from pcs.common.tools import format_os_error
+
+# requests are small json documents, do not let a client exhaust memory
+MAX_REQUEST_SIZE = 16 * 1024 * 1024
+# seconds to wait for a client to send its request
+RECEIVE_TIMEOUT = 30
+
+
+class RequestTimeout(BaseException):
+    # Not derived from Exception so that request handlers catching all errors
+    # do not hide it.
+    pass
+
+
+class RequestTooLarge(Exception):
+    pass
+
+
+class WorkerPool:
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self,
+        socket_path,
+        request_handler,
+        worker_count,
+        max_requests_per_worker,
+        request_timeout,
+        on_worker_start=None,
+    ):
+        """
+        string socket_path -- path of the unix socket to listen on
+        callable request_handler -- gets a request (parsed json), returns
+            a json serializable response
+        int worker_count -- number of worker processes
+        int max_requests_per_worker -- recycle a worker after so many requests
+        int request_timeout -- seconds to process a request, 0 = no limit
+        callable on_worker_start -- called in a new worker process
+        """
+        # pylint: disable=too-many-arguments
+        self._socket_path = socket_path
+        self._request_handler = request_handler
+        self._worker_count = worker_count
+        self._max_requests_per_worker = max_requests_per_worker
+        self._request_timeout = request_timeout
+        self._on_worker_start = on_worker_start
+        self._listen_socket = None
+        self._worker_pids = set()
+        self._stopping = False
+
+    def run(self):
+        """
+        Run the master process until it gets SIGTERM or SIGINT
+        """
+        self._listen_socket = _create_listen_socket(self._socket_path)
+        signal.signal(signal.SIGTERM, self._handle_stop_signal)
+        signal.signal(signal.SIGINT, self._handle_stop_signal)
+        try:
+            self._start_missing_workers()
+            while not self._stopping:
+                try:
+                    pid, status = os.wait()
+                except ChildProcessError:
+                    # all the workers are gone, even though we have not seen
+                    # them exit
+                    self._worker_pids.clear()
+                    pid, status = None, 1
+                if self._stopping:
+                    break
+                if pid is not None:
+                    if pid not in self._worker_pids:
+                        continue
+                    self._worker_pids.discard(pid)
+                if status != 0:
+                    # do not keep restarting a worker which cannot start
+                    time.sleep(1)
+                self._start_missing_workers()
+        finally:
+            self._stop_workers()
+            for pid in list(self._worker_pids):
+                try:
+                    os.waitpid(pid, 0)
+                except ChildProcessError:
+                    pass
+            self._listen_socket.close()
+            _remove_socket_file(self._socket_path)
+
+    def _handle_stop_signal(self, incomming_signal, frame):
+        # pylint: disable=unused-argument
+        self._stopping = True
+        self._stop_workers()
+
+    def _start_missing_workers(self):
+        while len(self._worker_pids) < self._worker_count:
+            self._spawn_worker()
+
+    def _spawn_worker(self):
+        pid = os.fork()
+        if pid:
+            self._worker_pids.add(pid)
+            return
+        # worker process
+        exit_code = 0
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            if self._on_worker_start:
+                self._on_worker_start()
+            for _ in range(self._max_requests_per_worker):
+                connection, dummy_address = self._listen_socket.accept()
+                with connection:
+                    if not handle_connection(
+                        connection, self._request_handler, self._request_timeout
+                    ):
+                        # the worker may be in an inconsistent state
+                        break
+        except BaseException:  # pylint: disable=broad-except
+            exit_code = 1
+        finally:
+            # do not run any cleanup of the master process
+            os._exit(exit_code)  # pylint: disable=protected-access
+
+    def _stop_workers(self):
+        for pid in list(self._worker_pids):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self._worker_pids.discard(pid)
+
+
+def handle_connection(connection, request_handler, request_timeout):
+    """
+    Process one request received on a connection, return False on timeout
+
+    socket connection -- connection to a client
+    callable request_handler -- gets a request, returns a response
+    int request_timeout -- seconds to process the request, 0 = no limit
+    """
+    timed_out = False
+    try:
+        connection.settimeout(RECEIVE_TIMEOUT)
+        try:
+            raw_request = _receive(connection)
+        finally:
+            connection.settimeout(None)
+        request = json.loads(raw_request.decode("utf-8"))
+    except RequestTooLarge:
+        response = dict(
+            status="input_error",
+            status_msg="Request is too large",
+            report_list=[],
+            data=None,
+        )
+    except OSError:
+        # the client has not sent its request, there is no one to respond to
+        return True
+    except (UnicodeDecodeError, ValueError) as e:
+        response = dict(
+            status="input_error",
+            status_msg=f"Unable to parse input data: {e}",
+            report_list=[],
+            data=None,
+        )
+    else:
+        previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.alarm(request_timeout)
+        try:
+            response = request_handler(request)
+        except RequestTimeout:
+            timed_out = True
+            response = dict(
+                status="exception",
+                status_msg=(
+                    f"Request timed out after {request_timeout} seconds"
+                ),
+                report_list=[],
+                data=None,
+            )
+        finally:
+            signal.alarm(0)
+            signal.signal(signal.SIGALRM, previous_handler)
+    try:
+        connection.sendall(json.dumps(response).encode("utf-8"))
+    except OSError:
+        # the client has gone away, there is no one to report it to
+        pass
+    return not timed_out
+
+
+def _receive(connection):
+    chunk_list = []
+    size = 0
+    while True:
+        chunk = connection.recv(64 * 1024)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > MAX_REQUEST_SIZE:
+            raise RequestTooLarge()
+        chunk_list.append(chunk)
+    return b"".join(chunk_list)
+
+
+def _raise_timeout(incomming_signal, frame):
+    # pylint: disable=unused-argument
+    raise RequestTimeout()
+
+
+def _create_listen_socket(socket_path):
+    _remove_socket_file(socket_path)
+    listen_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # only root is allowed to run commands as any user
+    old_umask = os.umask(0o177)
+    try:
+        listen_socket.bind(socket_path)
+    except OSError as e:
+        listen_socket.close()
+        sys.stderr.write(
+            "Unable to listen on '{0}': {1}\n".format(
+                socket_path, format_os_error(e)
+            )
+        )
+        raise SystemExit(1)
+    finally:
+        os.umask(old_umask)
+    listen_socket.listen(socket.SOMAXCONN)
+    return listen_socket
+
+
+def _remove_socket_file(socket_path):
+    try:
+        os.unlink(socket_path)
+    except OSError as e:
+        if e.errno != errno.ENOENT:
+            raise
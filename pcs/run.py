@@ -4,8 +4,10 @@ created by setuptools (see setup.py).
 
 This module deals with some bundled python dependencies that are installed in
 a pcs-specific location rather than in a standard system location for the python
-packages.
+packages. Entry points import only what they need, so that pcs bash completion
+does not import all of pcs.
 """
+import os
 import sys
 
 from pcs import settings
@@ -13,15 +15,39 @@ from pcs import settings
 if settings.pcs_bundled_pacakges_dir not in sys.path:
     sys.path.insert(0, settings.pcs_bundled_pacakges_dir)
 
-# pylint: disable=unused-import, wrong-import-position
-from pcs.daemon.run import main as daemon
-from pcs.app import main as cli
-from pcs.pcs_internal import main as pcs_internal
+# pylint: disable=wrong-import-position, import-outside-toplevel
+from pcs.cli.common import completion
 
-try:
+
+def cli():
+    # Bash completion runs pcs on each TAB press. Serve it without importing
+    # all of pcs if possible.
+    if completion.has_applicable_environment(os.environ):
+        suggestions = completion.complete_from_index(os.environ)
+        if suggestions is not None:
+            print(suggestions)
+            sys.exit()
+    from pcs.app import main
+
+    return main()
+
+
+def daemon():
+    from pcs.daemon.run import main
+
+    return main()
+
+
+def pcs_internal():
+    from pcs.pcs_internal import main
+
+    return main()
+
+
+def pcs_snmp_agent():
     # It is possible the package `pcs.snmp` is not installed. `pcsd` does not
     # require on pcs.snmp. `pcs.snmp` should be installed when `pcs_snmp_agent`
     # is called.
-    from pcs.snmp.pcs_snmp_agent import main as pcs_snmp_agent
-except ImportError:
-    pass
+    from pcs.snmp.pcs_snmp_agent import main
+
+    return main()
@@ -29,11 +29,29 @@ booth_authkey_file_mode = 0o600
 booth_authkey_bytes = 64
 cluster_conf_file = "/etc/cluster/cluster.conf"
 fence_agent_binaries = "/usr/sbin/"
+ocf_resource_agents = "/usr/lib/ocf/resource.d/"
+# directories resource agents of other standards than ocf are installed to
+resource_agent_dirs = [
+    "/etc/init.d/",
+    "/etc/systemd/system/",
+    "/usr/lib/systemd/system/",
+    "/usr/lib/nagios/plugins/",
+]
+# number of seconds a stored list of resource agents is valid for
+resource_agent_catalog_ttl = 300
 pacemaker_schedulerd = "/usr/libexec/pacemaker/pacemaker-schedulerd"
 pacemaker_controld = "/usr/libexec/pacemaker/pacemaker-controld"
 pacemaker_based = "/usr/libexec/pacemaker/pacemaker-based"
 pacemaker_fenced = "/usr/libexec/pacemaker/pacemaker-fenced"
 pcs_version = "0.10.6"
+# tree of pcs commands for bash completion, generated when pcs is built
+pcs_completion_index_location = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "completion_index.json"
+)
+# ids completed when PCS_COMPLETE_IDS is set are stored per user for a number
+# of seconds, 0 = do not store them
+pcs_completion_ids_cache_location = "~/.cache/pcs/completion-ids"
+pcs_completion_ids_cache_ttl = 10
 crm_report = os.path.join(pacemaker_binaries, "crm_report")
 crm_rule = os.path.join(pacemaker_binaries, "crm_rule")
 crm_verify = os.path.join(pacemaker_binaries, "crm_verify")
@@ -42,6 +60,21 @@ crm_mon_schema = "/usr/share/pacemaker/crm_mon.rng"
 agent_metadata_schema = "/usr/share/resource-agents/ra-api-1.dtd"
 pcsd_var_location = "/var/lib/pcsd/"
 pcsd_ruby_socket = "/run/pcsd-ruby.socket"
+# used when pcsd runs several worker processes
+pcsd_session_store_location = "/run/pcsd-sessions.sqlite"
+pcsd_sync_config_lock_location = "/run/pcsd-sync-config.lock"
+pcs_internal_socket = "/run/pcs_internal.socket"
+pcs_internal_workers = 2
+# a worker is replaced by a new one after processing this number of requests
+pcs_internal_worker_max_requests = 100
+# seconds, 0 = no limit
+pcs_internal_request_timeout = 900
+# number of processes running PAM authentication and user groups lookups
+pcsd_auth_workers = 2
+# seconds for which groups of a user are cached, 0 = do not cache
+pcsd_user_groups_cache_ttl = 60
+# cached groups of users are dropped when any of these files changes
+pcsd_user_groups_cache_watched_files = ["/etc/group", "/etc/passwd"]
 pcsd_cert_location = os.path.join(pcsd_var_location, "pcsd.crt")
 pcsd_key_location = os.path.join(pcsd_var_location, "pcsd.key")
 pcsd_known_hosts_location = os.path.join(pcsd_var_location, "known-hosts")
@@ -50,8 +83,21 @@ pcsd_settings_conf_location = os.path.join(
     pcsd_var_location, "pcs_settings.conf"
 )
 pcsd_dr_config_location = os.path.join(pcsd_var_location, "disaster-recovery")
+pcsd_agent_metadata_cache_location = os.path.join(
+    pcsd_var_location, "agent-metadata-cache"
+)
+pcsd_resource_agent_catalog_location = os.path.join(
+    pcsd_var_location, "resource-agent-catalog"
+)
+pcsd_pacemaker_capabilities_location = os.path.join(
+    pcsd_var_location, "pacemaker-capabilities.json"
+)
 pcsd_exec_location = "/usr/lib/pcsd/"
 pcsd_log_location = "/var/log/pcsd/pcsd.log"
+# number of log records waiting to be written to the log file by a separate
+# thread, debug records are dropped first when it is full, 0 = pcsd writes the
+# log file synchronously
+pcsd_log_queue_size = 10000
 pcsd_default_port = 2224
 pcsd_config = "/etc/sysconfig/pcsd"
 cib_dir = "/var/lib/pacemaker/cib/"
@@ -65,9 +111,40 @@ sbd_max_device_num = 3
 # message types are also mentioned in docs, change there as well
 sbd_message_types = ["test", "reset", "off", "crashdump", "exit", "clear"]
 pacemaker_wait_timeout_status = 124
+# Waiting for the cluster to settle is done in steps growing from the initial
+# to the maximal one, pending actions are reported after each step, in seconds
+wait_for_idle_step_initial = 10
+wait_for_idle_step_max = 60
+# Nodes are checked whether they have started after intervals growing from the
+# initial to the maximal one, the intervals start over once a node starts, in
+# seconds
+wait_for_node_startup_interval_initial = 1
+wait_for_node_startup_interval_max = 8
+# How pcs computes diffs of CIBs it pushes to pacemaker:
+# "native" -- pcs computes diffs itself, crm_diff is run only for changes pcs
+#     cannot express
+# "crm_diff" -- diffs are always computed by crm_diff
+# "verify" -- both ways are run, a warning is printed if they differ and the
+#     diff computed by crm_diff is pushed
+cib_diff_engine = "native"
 booth_config_dir = "/etc/booth"
 booth_binary = "/usr/sbin/booth"
 default_request_timeout = 60
+# Limits of HTTP requests to nodes running in parallel within one pcs command.
+# Requests over the limits wait until running requests finish. 0 = unlimited.
+node_communication_max_parallel_requests = 32
+node_communication_max_parallel_requests_per_host = 2
+# If a node has several addresses, start a request to the next address when the
+# previous one has not answered in this many seconds. None = try addresses one
+# by one, move to the next one only when the previous one fails.
+node_communication_address_race_delay = None
+# Read-only queries which need an answer from any one node are also sent to the
+# next node when no node has answered in this many seconds. None = ask nodes one
+# by one, move to the next one only when the previous one fails.
+node_communication_hedge_delay = 5
+# If set, the delay is this percentile of recent response times of the same
+# query instead, once there are enough of them to compute it.
+node_communication_hedge_delay_percentile = 95
 pcs_bundled_dir = "/usr/lib/pcs/bundled/"
 pcs_bundled_pacakges_dir = os.path.join(pcs_bundled_dir, "packages")
 
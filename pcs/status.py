@@ -283,10 +283,7 @@ def check_nodes(node_list, prefix=""):
         )
         status_list.append(returncode)
 
-    utils.read_known_hosts_file()  # cache known hosts
-    utils.run_parallel(
-        utils.create_task_list(report, utils.checkAuthorization, node_list)
-    )
+    utils.send_node_requests(utils.check_auth_request(), node_list, report)
 
     return any([status != online_code for status in status_list])
 
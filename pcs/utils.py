@@ -22,6 +22,8 @@ from urllib.parse import urlencode
 from typing import (
     Any,
     Dict,
+    NamedTuple,
+    Optional,
     Sequence,
     Tuple,
 )
@@ -35,6 +37,12 @@ from pcs.common import (
     reports,
 )
 from pcs.common.host import PcsKnownHost
+from pcs.common.node_communicator import (
+    DebugCapture,
+    NodeTargetFactory,
+    Request,
+    RequestData,
+)
 from pcs.common.reports import ReportProcessor
 from pcs.common.reports.item import ReportItemList
 from pcs.common.reports.messages import CibUpgradeFailedToMinimalRequiredVersion
@@ -43,7 +51,10 @@ from pcs.common.str_tools import join_multilines
 from pcs.cli.common import middleware
 from pcs.cli.common.env_cli import Env
 from pcs.cli.common.errors import CmdLineInputError
-from pcs.cli.common.lib_wrapper import Library
+from pcs.cli.common.lib_wrapper import (
+    cli_env_to_lib_env,
+    Library,
+)
 from pcs.cli.common.parse_args import InputModifiers
 from pcs.cli.reports import (
     output as reports_output,
@@ -68,6 +79,7 @@ from pcs.lib.external import (
 )
 from pcs.lib.file.instance import FileInstance as LibFileInstance
 from pcs.lib.interface.config import ParserErrorException
+from pcs.lib.pacemaker.cib_snapshot import get_process_cib_snapshot_cache
 from pcs.lib.pacemaker.live import has_wait_for_idle_support
 from pcs.lib.pacemaker.state import ClusterState
 from pcs.lib.pacemaker.values import (
@@ -171,15 +183,6 @@ def checkStatus(node):
     return sendHTTPRequest(node, "remote/status", None, False, False)
 
 
-# Check and see if we're authorized (faster than a status check)
-def checkAuthorization(node):
-    """
-    Commandline options:
-      * --request-timeout - timeout for HTTP requests
-    """
-    return sendHTTPRequest(node, "remote/check_auth", None, False, False)
-
-
 def get_uid_gid_file_name(uid, gid):
     """
     Commandline options: no options
@@ -285,12 +288,44 @@ def remove_uid_gid_file(uid, gid):
     return file_removed
 
 
-@lru_cache()
+_known_hosts_cache: Dict[str, Any] = {}
+_known_hosts_cache_lock = threading.Lock()
+
+
 def read_known_hosts_file():
     """
     Commandline options: no options
     """
-    data = {}
+    # Legacy commands get known hosts for each request they send. The file is
+    # only parsed again if it has changed, e.g. by authenticating hosts.
+    if os.getuid() != 0:
+        path = cli_file_metadata.for_file_type(
+            file_type_codes.PCS_KNOWN_HOSTS
+        ).path
+    else:
+        path = settings.pcsd_known_hosts_location
+    try:
+        stat = os.stat(path)
+        file_key = (path, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        file_key = None
+    with _known_hosts_cache_lock:
+        if file_key and _known_hosts_cache.get("key") == file_key:
+            return _known_hosts_cache["data"]
+        data = _read_known_hosts_file()
+        if file_key and data is not None:
+            _known_hosts_cache["key"] = file_key
+            _known_hosts_cache["data"] = data
+    return data if data is not None else {}
+
+
+def _read_known_hosts_file():
+    """
+    Return known hosts, None if they cannot be read
+
+    Commandline options: no options
+    """
+    data = None
     try:
         if os.getuid() != 0:
             known_hosts_raw_file = pcs_file.RawFile(
@@ -335,143 +370,168 @@ def read_known_hosts_file():
     return data
 
 
-def repeat_if_timeout(send_http_request_function, repeat_count=15):
+class NodeRequest(NamedTuple):
     """
-    Commandline options: no options
-    NOTE: callback send_http_request_function may use --request-timeout
+    A request to pcsd running on a node
     """
 
-    def repeater(node, *args, **kwargs):
-        repeats_left = repeat_count
-        while True:
-            retval, output = send_http_request_function(node, *args, **kwargs)
-            if (
-                retval != 2
-                or "Operation timed out" not in output
-                or repeats_left < 1
-            ):
-                # did not timed out OR repeat limit exceeded
-                return retval, output
-            repeats_left = repeats_left - 1
-            if "--debug" in pcs_options:
-                print("{0}: {1}, trying again...".format(node, output))
+    path: str
+    data: Sequence[Tuple[str, Any]] = ()
+    # None means the default timeout, --request-timeout overrides it anyway
+    timeout: Optional[int] = None
+
 
-    return repeater
+def check_auth_request():
+    """
+    Commandline options: no options
+    """
+    return NodeRequest("remote/check_auth")
 
 
-# Set the corosync.conf file on the specified node
-def getCorosyncConfig(node):
+def pacemaker_node_status_request():
     """
-    Commandline options:
-      * --request-timeout - timeout for HTTP requests
+    Commandline options: no options
     """
-    return sendHTTPRequest(node, "remote/get_corosync_conf", None, False, False)
+    return NodeRequest("remote/pacemaker_node_status")
 
 
-def setCorosyncConfig(node, config):
+def start_cluster_request(timeout=None):
     """
-    Commandline options:
-      * --request-timeout - timeout for HTTP requests
+    Commandline options: no options
     """
-    data = urlencode({"corosync_conf": config})
-    (status, data) = sendHTTPRequest(node, "remote/set_corosync_conf", data)
-    if status != 0:
-        err("Unable to set corosync config: {0}".format(data))
+    return NodeRequest("remote/cluster_start", timeout=timeout)
 
 
-def getPacemakerNodeStatus(node):
+def stop_cluster_request(pacemaker=True, corosync=True, force=True):
     """
-    Commandline options:
-      * --request-timeout - timeout for HTTP requests
+    Commandline options: no options
     """
-    return sendHTTPRequest(
-        node, "remote/pacemaker_node_status", None, False, False
-    )
+    data = []
+    timeout = None
+    if pacemaker and not corosync:
+        data.append(("component", "pacemaker"))
+        timeout = 2 * 60
+    elif corosync and not pacemaker:
+        data.append(("component", "corosync"))
+    if force:
+        data.append(("force", 1))
+    return NodeRequest("remote/cluster_stop", data, timeout)
 
 
-def startCluster(node, quiet=False, timeout=None):
+def enable_cluster_request():
     """
-    Commandline options:
-      * --request-timeout - timeout for HTTP requests
+    Commandline options: no options
     """
-    return sendHTTPRequest(
-        node,
-        "remote/cluster_start",
-        printResult=False,
-        printSuccess=not quiet,
-        timeout=timeout,
-    )
+    return NodeRequest("remote/cluster_enable")
 
 
-def stopPacemaker(node, quiet=False, force=True):
+def disable_cluster_request():
     """
-    Commandline options:
-      * --request-timeout - timeout for HTTP requests
+    Commandline options: no options
     """
-    return stopCluster(
-        node, pacemaker=True, corosync=False, quiet=quiet, force=force
-    )
+    return NodeRequest("remote/cluster_disable")
 
 
-def stopCorosync(node, quiet=False, force=True):
+def destroy_cluster_request():
     """
-    Commandline options:
-      * --request-timeout - timeout for HTTP requests
+    Commandline options: no options
     """
-    return stopCluster(
-        node, pacemaker=False, corosync=True, quiet=quiet, force=force
-    )
+    return NodeRequest("remote/cluster_destroy")
 
 
-def stopCluster(node, quiet=False, pacemaker=True, corosync=True, force=True):
+def send_node_requests(node_request, node_list, report, repeat_count=0):
     """
+    Send a request to nodes in parallel and report the results as they come
+
+    NodeRequest node_request -- the request to send to each node
+    iterable node_list -- names of nodes to send the request to
+    callable report -- called with a node name, a return code and an output
+        for each node, return codes and outputs are the same as the ones of
+        sendHTTPRequest
+    int repeat_count -- how many times to resend a request which timed out
+
     Commandline options:
       * --request-timeout - timeout for HTTP requests
+      * --debug
     """
-    data = dict()
-    timeout = None
-    if pacemaker and not corosync:
-        data["component"] = "pacemaker"
-        timeout = 2 * 60
-    elif corosync and not pacemaker:
-        data["component"] = "corosync"
-    if force:
-        data["force"] = 1
-    data = urlencode(data)
-    return sendHTTPRequest(
-        node,
-        "remote/cluster_stop",
-        data,
-        printResult=False,
-        printSuccess=not quiet,
-        timeout=timeout,
+    node_list = list(node_list)
+    if not node_list:
+        return
+    # All the requests are sent from a single thread using one curl multi
+    # handle, no matter how many nodes there are.
+    communicator = cli_env_to_lib_env(get_cli_env()).get_node_communicator(
+        pcs_options.get(
+            "--request-timeout",
+            node_request.timeout or settings.default_request_timeout,
+        )
+    )
+    _run_node_requests(
+        communicator,
+        NodeTargetFactory(read_known_hosts_file()),
+        node_request,
+        node_list,
+        report,
+        repeat_count,
     )
 
 
-def enableCluster(node):
+def _run_node_requests(
+    communicator, target_factory, node_request, node_list, report, repeat_count
+):
     """
-    Commandline options:
-      * --request-timeout - timeout for HTTP requests
+    Commandline options: no options
     """
-    return sendHTTPRequest(node, "remote/cluster_enable", None, False, True)
+    # pylint: disable=too-many-arguments
+    request_data = RequestData(node_request.path, node_request.data)
 
+    def create_request(node):
+        return Request(
+            target_factory.get_target_from_hostname(node), request_data
+        )
 
-def disableCluster(node):
+    repeats_left = {node: repeat_count for node in node_list}
+    communicator.add_requests([create_request(node) for node in node_list])
+    for response in communicator.start_loop():
+        node = response.request.host_label
+        if response.was_connected:
+            retval, output = _get_http_response_result(
+                node, response.response_code, response.data
+            )
+        elif (
+            response.errno == pycurl.E_OPERATION_TIMEDOUT
+            and repeats_left[node] > 0
+        ):
+            repeats_left[node] -= 1
+            if "--debug" in pcs_options:
+                print(
+                    "{0}: {1}, trying again...".format(node, response.error_msg)
+                )
+            communicator.add_requests([create_request(node)])
+            continue
+        else:
+            retval = 2
+            output = _get_connection_error_msg(node, response.error_msg)
+        report(node, retval, output)
+
+
+# Set the corosync.conf file on the specified node
+def getCorosyncConfig(node):
     """
     Commandline options:
       * --request-timeout - timeout for HTTP requests
     """
-    return sendHTTPRequest(node, "remote/cluster_disable", None, False, True)
+    return sendHTTPRequest(node, "remote/get_corosync_conf", None, False, False)
 
 
-def destroyCluster(node, quiet=False):
+def setCorosyncConfig(node, config):
     """
     Commandline options:
       * --request-timeout - timeout for HTTP requests
     """
-    return sendHTTPRequest(
-        node, "remote/cluster_destroy", None, not quiet, not quiet
-    )
+    data = urlencode({"corosync_conf": config})
+    (status, data) = sendHTTPRequest(node, "remote/set_corosync_conf", data)
+    if status != 0:
+        err("Unable to set corosync config: {0}".format(data))
 
 
 def restoreConfig(node, tarball_data):
@@ -591,30 +651,7 @@ def sendHTTPRequest(
             print("--Debug Communication Output End--")
             print()
 
-        if response_code == 401:
-            output = (
-                3,
-                (
-                    "Unable to authenticate to {node} - (HTTP error: {code}), "
-                    "try running 'pcs host auth {node}'"
-                ).format(node=host, code=response_code),
-            )
-        elif response_code == 403:
-            output = (
-                4,
-                "{node}: Permission denied - (HTTP error: {code})".format(
-                    node=host, code=response_code
-                ),
-            )
-        elif response_code >= 400:
-            output = (
-                1,
-                "Error connecting to {node} - (HTTP error: {code})".format(
-                    node=host, code=response_code
-                ),
-            )
-        else:
-            output = (0, response_data)
+        output = _get_http_response_result(host, response_code, response_data)
 
         if printResult and output[0] != 0:
             print(output[1])
@@ -630,15 +667,53 @@ def sendHTTPRequest(
         dummy_errno, reason = e.args
         if "--debug" in pcs_options:
             print("Response Reason: {0}".format(reason))
-        msg = (
-            "Unable to connect to {host}, try setting higher timeout in "
-            "--request-timeout option ({reason})"
-        ).format(host=host, reason=reason)
+        msg = _get_connection_error_msg(host, reason)
         if printResult:
             print(msg)
         return (2, msg)
 
 
+def _get_http_response_result(host, response_code, response_data):
+    """
+    Return a return code and an output of sendHTTPRequest for an HTTP response
+
+    Commandline options: no options
+    """
+    if response_code == 401:
+        return (
+            3,
+            (
+                "Unable to authenticate to {node} - (HTTP error: {code}), "
+                "try running 'pcs host auth {node}'"
+            ).format(node=host, code=response_code),
+        )
+    if response_code == 403:
+        return (
+            4,
+            "{node}: Permission denied - (HTTP error: {code})".format(
+                node=host, code=response_code
+            ),
+        )
+    if response_code >= 400:
+        return (
+            1,
+            "Error connecting to {node} - (HTTP error: {code})".format(
+                node=host, code=response_code
+            ),
+        )
+    return (0, response_data)
+
+
+def _get_connection_error_msg(host, reason):
+    """
+    Commandline options: no options
+    """
+    return (
+        "Unable to connect to {host}, try setting higher timeout in "
+        "--request-timeout option ({reason})"
+    ).format(host=host, reason=reason)
+
+
 def __get_cookie_list(token):
     """
     Commandline options: no options
@@ -854,6 +929,7 @@ def run(
         )
         output, dummy_stderror = p.communicate(string_for_stdin)
         returnVal = p.returncode
+        get_process_cib_snapshot_cache().invalidate_on_command(args, env_var)
         if "--debug" in pcs_options:
             print("Return Value: {0}".format(returnVal))
             print(("--Debug Output Start--\n{0}".format(output)).rstrip())
@@ -1037,19 +1113,6 @@ def call_local_pcsd(argv, std_in=None):
         return [["Unable to communicate with pcsd"], 1, "", ""]
 
 
-def map_for_error_list(callab, iterab):
-    """
-    Commandline options: no options
-    NOTE: callback 'callab' may use some options
-    """
-    error_list = []
-    for item in iterab:
-        retval, error = callab(item)
-        if retval != 0:
-            error_list.append(error)
-    return error_list
-
-
 def run_parallel(worker_list, wait_seconds=1):
     """
     Commandline options: no options
@@ -1089,10 +1152,17 @@ def create_task_list(report, action, node_list, *args, **kwargs):
     ]
 
 
-def parallel_for_nodes(action, node_list, *args, **kwargs):
+def parallel_for_nodes(node_request, node_list, repeat_count=0):
     """
-    Commandline options: no options
-    NOTE: callback 'action' may use some cmd options
+    Send a request to nodes in parallel, print results, return errors by nodes
+
+    NodeRequest node_request -- the request to send to each node
+    iterable node_list -- names of nodes to send the request to
+    int repeat_count -- how many times to resend a request which timed out
+
+    Commandline options:
+      * --request-timeout - timeout for HTTP requests
+      * --debug
     """
     node_errors = dict()
 
@@ -1102,7 +1172,7 @@ def parallel_for_nodes(action, node_list, *args, **kwargs):
         if returncode != 0:
             node_errors[node] = message
 
-    run_parallel(create_task_list(report, action, node_list, *args, **kwargs))
+    send_node_requests(node_request, node_list, report, repeat_count)
     return node_errors
 
 
@@ -1588,15 +1658,26 @@ def get_cib(scope=None):
     Commandline options:
       * -f - CIB file
     """
+    snapshot_cache = get_process_cib_snapshot_cache()
+    use_snapshot = snapshot_cache.enabled and not scope and not usefile
+    if use_snapshot:
+        cib_user = os.environ.get("CIB_user")
+        cib_xml = snapshot_cache.get_xml(cib_user)
+        if cib_xml is not None:
+            return cib_xml
     command = ["cibadmin", "-l", "-Q"]
     if scope:
         command.append("--scope=%s" % scope)
-    output, retval = run(command)
+    # Do not mix stderr into a CIB shared with the library, it would not be
+    # a valid xml.
+    output, retval = run(command, ignore_stderr=use_snapshot)
     if retval != 0:
         if retval == 105 and scope:
             err("unable to get cib, scope '%s' not present in cib" % scope)
         else:
             err("unable to get cib")
+    if use_snapshot:
+        return snapshot_cache.store_xml(output, cib_user)
     return output
 
 
@@ -2722,6 +2803,7 @@ def get_lib_env() -> LibraryEnvironment:
     """
     Commandline options:
       * -f - CIB file
+      * --debug - capture debug info of HTTP requests
       * --corosync_conf - corosync.conf file
       * --request-timeout - timeout of HTTP requests
     """
@@ -2757,6 +2839,10 @@ def get_lib_env() -> LibraryEnvironment:
         corosync_conf_data,
         known_hosts_getter=read_known_hosts_file,
         request_timeout=pcs_options.get("--request-timeout"),
+        request_debug_capture=(
+            DebugCapture.FULL if "--debug" in pcs_options else DebugCapture.NONE
+        ),
+        concurrent_queries=True,
     )
 
 
@@ -2787,6 +2873,7 @@ def get_cli_env():
     env.user, env.groups = get_cib_user_groups()
     env.known_hosts_getter = read_known_hosts_file
     env.report_processor = get_report_processor()
+    env.debug = "--debug" in pcs_options
     env.request_timeout = pcs_options.get("--request-timeout")
     return env
 
@@ -0,0 +1,105 @@
+# This module compares computing diffs of CIBs natively by pcs with running
+# crm_diff, which pcs used to do for each CIB push. It loads a large CIB,
+# modifies it the way a pcs command does and prints the time needed to
+# compute the diff. It also checks both diffs are equivalent. The crm_diff
+# column is skipped if pacemaker is not installed.
+#
+# usage: python3 pcs_test/cib_diff_benchmark.py [repeat]
+
+# pylint: disable=wrong-import-position
+
+import logging
+import os.path
+import sys
+import timeit
+from copy import deepcopy
+
+from lxml import etree
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PACKAGE_DIR)
+
+from pcs import settings
+from pcs.common.reports import ReportProcessor
+from pcs.lib.external import CommandRunner
+from pcs.lib.pacemaker import cib_diff
+from pcs.lib.pacemaker.live import diff_cibs_xml
+from pcs.lib.xml_tools import etree_to_str
+from pcs_test.tools.misc import read_test_resource
+
+CIB_FILES = ("cib-large.xml", "cib-largefile.xml")
+
+
+class _DropReportProcessor(ReportProcessor):
+    def _do_report(self, report_item):
+        pass
+
+
+def _modify_cib(cib):
+    resources = cib.find("./configuration/resources")
+    etree.SubElement(
+        resources,
+        "primitive",
+        id="benchmark-resource",
+        type="Dummy",
+        provider="pacemaker",
+        **{"class": "ocf"},
+    )
+    resources[0].set("description", "benchmark")
+    return cib
+
+
+def _measure(function, repeat):
+    return min(timeit.repeat(function, number=repeat, repeat=3)) / repeat
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    reporter = _DropReportProcessor()
+    runner = CommandRunner(
+        logging.getLogger("cib_diff_benchmark"), reporter, os.environ
+    )
+    has_crm_diff = os.path.exists(
+        os.path.join(settings.pacemaker_binaries, "crm_diff")
+    )
+    print(
+        "{0:<20}{1:>10}{2:>12}{3:>12}{4:>12}  (milliseconds)".format(
+            "cib", "size", "native", "crm_diff", "equivalent"
+        )
+    )
+    for file_name in CIB_FILES:
+        cib_old_xml = read_test_resource(file_name)
+        cib_new = _modify_cib(deepcopy(etree.fromstring(cib_old_xml)))
+        cib_new_xml = etree_to_str(cib_new)
+        native_time = _measure(
+            lambda: cib_diff.diff_cibs(etree.fromstring(cib_old_xml), cib_new),
+            repeat,
+        )
+        crm_diff_time = None
+        equivalent = "-"
+        if has_crm_diff:
+            crm_diff_time = _measure(
+                lambda: diff_cibs_xml(
+                    runner, reporter, cib_old_xml, cib_new_xml
+                ),
+                repeat,
+            )
+            equivalent = str(
+                cib_diff.are_patchsets_equivalent(
+                    cib_diff.diff_cibs(etree.fromstring(cib_old_xml), cib_new),
+                    diff_cibs_xml(runner, reporter, cib_old_xml, cib_new_xml),
+                )
+            )
+        print(
+            "{0:<20}{1:>10}{2:>12.2f}{3:>12}{4:>12}".format(
+                file_name,
+                len(cib_old_xml),
+                native_time * 1e3,
+                "-" if crm_diff_time is None else f"{crm_diff_time * 1e3:.2f}",
+                equivalent,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
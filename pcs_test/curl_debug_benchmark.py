@@ -0,0 +1,140 @@
+# This module measures the cost of capturing curl debug info in Communicator.
+# It sends requests with large payloads to a local https server using each
+# debug capture policy and prints used CPU time and peak python memory. The
+# server runs in the same process, so its CPU time is included in all results.
+#
+# usage: python3 pcs_test/curl_debug_benchmark.py [payload_MiB] [requests]
+# Curl limits request data set by COPYPOSTFIELDS to 8 MiB.
+
+# pylint: disable=wrong-import-position
+
+import http.server
+import os.path
+import shutil
+import ssl
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PACKAGE_DIR)
+
+from pcs.common import ssl as pcs_ssl
+from pcs.common.host import Destination
+from pcs.common.node_communicator import (
+    Communicator,
+    CommunicatorLoggerInterface,
+    ConnectionPool,
+    DebugCapture,
+    Request,
+    RequestData,
+    RequestTarget,
+)
+
+
+class EchoHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        # pylint: disable=arguments-differ
+        pass
+
+
+class NullLogger(CommunicatorLoggerInterface):
+    def log_request_start(self, request):
+        pass
+
+    def log_response(self, response):
+        # LibCommunicatorLogger decodes the debug info of each response
+        response.debug  # pylint: disable=pointless-statement
+
+    def log_retry(self, response, previous_dest):
+        pass
+
+    def log_no_more_addresses(self, response):
+        pass
+
+
+def start_server(cert_dir):
+    key = pcs_ssl.generate_key()
+    cert = pcs_ssl.generate_cert(key, "localhost")
+    cert_path = os.path.join(cert_dir, "cert")
+    key_path = os.path.join(cert_dir, "key")
+    with open(cert_path, "wb") as cert_file:
+        cert_file.write(pcs_ssl.dump_cert(cert))
+    with open(key_path, "wb") as key_file:
+        key_file.write(pcs_ssl.dump_key(key))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_path, key_path)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(port, debug_capture, payload, request_count):
+    target = RequestTarget(
+        "localhost", dest_list=[Destination("127.0.0.1", port)]
+    )
+    communicator = Communicator(
+        NullLogger(),
+        None,
+        None,
+        connection_pool=ConnectionPool(),
+        debug_capture=debug_capture,
+    )
+    communicator.add_requests(
+        [
+            Request(target, RequestData("echo", [("data", payload)]))
+            for _ in range(request_count)
+        ]
+    )
+    tracemalloc.start()
+    cpu_start = time.process_time()
+    for response in communicator.start_loop():
+        if response.response_code != 200:
+            raise AssertionError(response.error_msg)
+    cpu_time = time.process_time() - cpu_start
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return cpu_time, peak_memory
+
+
+def main():
+    payload_mib = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    request_count = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    payload = "x" * (payload_mib * 1024 * 1024)
+    cert_dir = tempfile.mkdtemp()
+    try:
+        server = start_server(cert_dir)
+        port = server.server_address[1]
+        print(
+            "{0} requests, {1} MiB payload each way".format(
+                request_count, payload_mib
+            )
+        )
+        for debug_capture in DebugCapture:
+            cpu_time, peak_memory = run(
+                port, debug_capture, payload, request_count
+            )
+            print(
+                "{0:>8}: cpu {1:7.3f} s, peak python memory {2:8.1f} MiB".format(
+                    debug_capture.value, cpu_time, peak_memory / 1024 / 1024
+                )
+            )
+        server.shutdown()
+    finally:
+        shutil.rmtree(cert_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# This module compares conversion of data transfer objects to dicts and back by
+# pcs.common.interface.dto with dataclasses.asdict and dacite.from_dict, which
+# pcs used before. It converts a sample of each dto class used by pcs and
+# prints the time per conversion. The dacite columns are skipped if dacite is
+# not installed.
+#
+# usage: python3 pcs_test/dto_benchmark.py [repeat]
+
+# pylint: disable=wrong-import-position
+
+import dataclasses
+import os.path
+import sys
+import timeit
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PACKAGE_DIR)
+
+from pcs.common import reports, types
+from pcs.common.interface import dto
+from pcs_test.tier0.common.interface.test_dto import DTO_LIST
+
+try:
+    import dacite
+except ImportError:
+    dacite = None
+
+
+def _dacite_from_dict(cls, data):
+    return dacite.from_dict(
+        data_class=cls,
+        data=data,
+        config=dacite.Config(
+            cast=[
+                types.CibNvsetType,
+                types.CibRuleExpressionType,
+                types.DrRole,
+                types.ResourceRelationType,
+            ]
+        ),
+    )
+
+
+def _report_item_dto():
+    # the conversion done for each report sent from pcs_internal to pcsd
+    report_item = reports.ReportItem.error(
+        reports.messages.IdAlreadyExists("resource-id")
+    )
+    return report_item.to_dto()
+
+
+def _measure(function, repeat):
+    return min(timeit.repeat(function, number=repeat, repeat=3)) / repeat
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    dto_list = list(DTO_LIST) + [_report_item_dto()]
+    print(
+        "{0:<24}{1:>12}{2:>12}{3:>12}{4:>12}  (microseconds)".format(
+            "dto", "asdict", "to_dict", "dacite", "from_dict"
+        )
+    )
+    for dto_obj in dto_list:
+        cls = type(dto_obj)
+        data = dto.to_dict(dto_obj)
+        result = [
+            _measure(lambda: dataclasses.asdict(dto_obj), repeat),
+            _measure(lambda: dto.to_dict(dto_obj), repeat),
+            (
+                _measure(lambda: _dacite_from_dict(cls, data), repeat)
+                if dacite
+                else None
+            ),
+            _measure(lambda: dto.from_dict(cls, data), repeat),
+        ]
+        print(
+            "{0:<24}".format(cls.__name__)
+            + "".join(
+                "{0:>12}".format("-" if value is None else f"{value * 1e6:.2f}")
+                for value in result
+            )
+        )
+    print(
+        "ReportItem.to_dto        {0:>12.2f}".format(
+            _measure(_report_item_dto, repeat) * 1e6
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+# This module compares the old and the new format of responses sent by the
+# ruby part of pcsd to its python part. It runs a fake ruby daemon on a unix
+# socket sending responses with large bodies and receives them by the python
+# daemon's wrapper. Each way of receiving runs in its own process, the time it
+# took and the growth of the peak RSS of the process are printed.
+#
+# json: the old format, one json document with a base64 encoded body
+# frames: the new format, the body is collected in memory
+# frames-streamed: the new format, the body is passed on as it comes
+#
+# usage: python3 pcs_test/ruby_framing_benchmark.py [body_MiB] [requests]
+
+# pylint: disable=wrong-import-position
+
+import base64
+import http.server
+import json
+import os
+import os.path
+import resource
+import shutil
+import signal
+import socketserver
+import sys
+import tempfile
+import time
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PACKAGE_DIR)
+
+from tornado.httpclient import AsyncHTTPClient
+from tornado.ioloop import IOLoop
+
+from pcs.daemon import ruby_pcsd
+
+# thin sends rack body chunks as they come, sinatra produces chunks of this
+# size when streaming files
+CHUNK_SIZE = 64 * 1024
+
+
+class FakeRubyHandler(http.server.BaseHTTPRequestHandler):
+    body = b""
+
+    def do_GET(self):
+        self.send_response(200)
+        self.end_headers()
+        if self.path.endswith("json"):
+            self.wfile.write(
+                json.dumps(
+                    dict(
+                        status=200,
+                        headers={},
+                        body=base64.encodebytes(self.body).decode(),
+                        logs=[],
+                    )
+                ).encode()
+            )
+            return
+        result = json.dumps(dict(status=200, headers={})).encode()
+        self.write_frame(ruby_pcsd.FRAME_RESULT, result)
+        for i in range(0, len(self.body), CHUNK_SIZE):
+            self.write_frame(
+                ruby_pcsd.FRAME_BODY, self.body[i : i + CHUNK_SIZE]
+            )
+        self.write_frame(ruby_pcsd.FRAME_END, b"")
+
+    def write_frame(self, frame_type, payload):
+        self.wfile.write(ruby_pcsd.FRAME_HEADER.pack(frame_type, len(payload)))
+        self.wfile.write(payload)
+
+    def address_string(self):
+        return "ruby"
+
+    def log_message(self, *args):
+        # pylint: disable=arguments-differ
+        pass
+
+
+class NullResultStream(ruby_pcsd.ResultStream):
+    def start(self, status, headers):
+        pass
+
+    def write(self, chunk):
+        pass
+
+    def abort(self):
+        pass
+
+
+def start_server(socket_path, body_size):
+    pid = os.fork()
+    if pid:
+        while not os.path.exists(socket_path):
+            time.sleep(0.01)
+        return pid
+    FakeRubyHandler.body = os.urandom(body_size)
+    server = socketserver.ThreadingUnixStreamServer(
+        socket_path, FakeRubyHandler
+    )
+    server.serve_forever()
+    os._exit(0)  # pylint: disable=protected-access
+
+
+async def receive_json(wrapper):
+    # the way the python daemon received responses before
+    response = await AsyncHTTPClient().fetch(
+        "localhost/json", prepare_curl_callback=wrapper.prepare_curl_callback,
+    )
+    result = json.loads(response.body)
+    result["body"] = base64.b64decode(result.pop("body"))
+    return result
+
+
+async def receive_frames(wrapper):
+    return await wrapper.run_ruby(ruby_pcsd.SINATRA_REMOTE)
+
+
+async def receive_frames_streamed(wrapper):
+    return await wrapper.run_ruby(
+        ruby_pcsd.SINATRA_REMOTE, result_stream=NullResultStream()
+    )
+
+
+def run(receive, socket_path, request_count):
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid:
+        os.close(write_fd)
+        with os.fdopen(read_fd) as result_pipe:
+            result = json.loads(result_pipe.read())
+        os.waitpid(pid, 0)
+        return result
+    os.close(read_fd)
+    wrapper = ruby_pcsd.Wrapper(socket_path)
+    start_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.monotonic()
+    for _ in range(request_count):
+        IOLoop.current().run_sync(lambda: receive(wrapper))
+    duration = time.monotonic() - start
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with os.fdopen(write_fd, "w") as result_pipe:
+        result_pipe.write(json.dumps([duration, peak_rss - start_rss]))
+    os._exit(0)  # pylint: disable=protected-access
+
+
+def main():
+    body_mib = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    request_count = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    tmp_dir = tempfile.mkdtemp()
+    socket_path = os.path.join(tmp_dir, "pcsd-ruby.socket")
+    server_pid = start_server(socket_path, body_mib * 1024 * 1024)
+    try:
+        print(f"{request_count} responses, {body_mib} MiB body each")
+        for label, receive in (
+            ("json", receive_json),
+            ("frames", receive_frames),
+            ("frames-streamed", receive_frames_streamed),
+        ):
+            duration, rss_growth = run(receive, socket_path, request_count)
+            print(
+                "{0:>15}: {1:7.1f} MiB/s, peak RSS growth {2:7.1f} MiB".format(
+                    label,
+                    body_mib * request_count / duration,
+                    rss_growth / 1024,
+                )
+            )
+    finally:
+        os.kill(server_pid, signal.SIGTERM)
+        os.waitpid(server_pid, 0)
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
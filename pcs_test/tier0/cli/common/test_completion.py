@@ -1,5 +1,13 @@
-from unittest import TestCase
+import json
+import os.path
+import shutil
+import tempfile
+import time
+from unittest import mock, TestCase
+import xml.etree.ElementTree as ET
 
+from pcs import settings, usage
+from pcs.cli.common import completion
 from pcs.cli.common.completion import (
     _find_suggestions,
     has_applicable_environment,
@@ -45,6 +53,43 @@ class SuggestionTest(TestCase):
             [], _find_suggestions(tree, ["pcs", "invalid", "c"], 2)
         )
 
+    def test_suggest_ids(self):
+        id_provider = mock.Mock(return_value=["R1", "R2", "op"])
+        self.assertEqual(
+            ["R1", "R2"],
+            _find_suggestions(
+                {"resource": {"config": {}}},
+                ["pcs", "resource", "config", "R"],
+                3,
+                id_provider,
+            ),
+        )
+        id_provider.assert_called_once_with(completion.ID_RESOURCE)
+
+    def test_suggest_ids_only_for_first_argument(self):
+        id_provider = mock.Mock(return_value=["R1"])
+        self.assertEqual(
+            [],
+            _find_suggestions(
+                tree, ["pcs", "resource", "config", "R1", ""], 4, id_provider
+            ),
+        )
+        self.assertEqual(
+            ["add", "defaults", "remove"],
+            _find_suggestions(tree, ["pcs", "resource", "op"], 3, id_provider),
+        )
+        id_provider.assert_not_called()
+
+    def test_id_commands_in_usage_tree(self):
+        # pylint: disable=protected-access
+        usage_tree = usage.generate_completion_tree_from_usage()
+        for command in completion._ID_COMMANDS:
+            with self.subTest(command=command):
+                subtree = usage_tree
+                for word in command:
+                    self.assertIn(word, subtree)
+                    subtree = subtree[word]
+
 
 class HasCompletionEnvironmentTest(TestCase):
     def test_returns_false_if_environment_inapplicable(self):
@@ -143,3 +188,136 @@ class SplitWordsTest(TestCase):
             EnvironmentError,
             lambda: _split_words("pcs resource op a ", ["3", "8", "2", "1"]),
         )
+
+
+ENVIRONMENT = {
+    "COMP_WORDS": "pcs resource",
+    "COMP_CWORD": "2",
+    "COMP_LENGTHS": "3 8",
+    "PCS_AUTO_COMPLETE": "1",
+}
+
+
+class CompletionIndexTest(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.index_path = os.path.join(self.tmp_dir, "index.json")
+
+    def test_complete_from_index(self):
+        completion.save_suggestion_tree(self.index_path, tree)
+        self.assertEqual(
+            "clone\nop",
+            completion.complete_from_index(ENVIRONMENT, self.index_path),
+        )
+
+    def test_index_matches_usage(self):
+        completion.save_suggestion_tree(
+            self.index_path, usage.generate_completion_tree_from_usage()
+        )
+        self.assertEqual(
+            usage.generate_completion_tree_from_usage(),
+            completion.load_suggestion_tree(self.index_path),
+        )
+
+    def test_no_index(self):
+        self.assertIsNone(
+            completion.complete_from_index(ENVIRONMENT, self.index_path)
+        )
+
+    def test_index_of_other_version(self):
+        with open(self.index_path, "w") as index_file:
+            json.dump(dict(pcs_version="0.0.0", tree=tree), index_file)
+        self.assertIsNone(completion.load_suggestion_tree(self.index_path))
+
+
+class CibIdCacheTest(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.cache_file = os.path.join(self.tmp_dir, "cache", "ids")
+        self.loader = mock.Mock(return_value={"resource": ["R1"]})
+
+    def get_ids(self, ttl=10):
+        return completion.CibIdCache(self.cache_file, ttl).get_ids(self.loader)
+
+    def test_load_once(self):
+        self.assertEqual({"resource": ["R1"]}, self.get_ids())
+        self.assertEqual({"resource": ["R1"]}, self.get_ids())
+        self.loader.assert_called_once_with()
+
+    def test_expired(self):
+        self.get_ids()
+        with mock.patch("time.time", return_value=time.time() + 11):
+            self.get_ids()
+        self.assertEqual(2, self.loader.call_count)
+
+    def test_no_caching(self):
+        self.get_ids(ttl=0)
+        self.get_ids(ttl=0)
+        self.assertEqual(2, self.loader.call_count)
+        self.assertFalse(os.path.exists(self.cache_file))
+
+    def test_failure_not_stored(self):
+        self.loader.return_value = {}
+        self.get_ids()
+        self.assertFalse(os.path.exists(self.cache_file))
+
+
+class GetIdProviderTest(TestCase):
+    def test_disabled(self):
+        self.assertIsNone(completion.get_id_provider(ENVIRONMENT))
+        self.assertIsNone(
+            completion.get_id_provider(dict(ENVIRONMENT, PCS_COMPLETE_IDS="0"))
+        )
+
+    @mock.patch("pcs.cli.common.completion.load_cib_ids")
+    def test_enabled(self, mock_load):
+        mock_load.return_value = {"node": ["node1"]}
+        with mock.patch.object(settings, "pcs_completion_ids_cache_ttl", 0):
+            id_provider = completion.get_id_provider(
+                dict(ENVIRONMENT, PCS_COMPLETE_IDS="1")
+            )
+            self.assertEqual(["node1"], id_provider("node"))
+            self.assertEqual([], id_provider("tag"))
+        mock_load.assert_called_once_with()
+
+
+class GetCibIdsTest(TestCase):
+    def test_success(self):
+        cib = ET.fromstring(
+            """
+            <cib>
+              <configuration>
+                <nodes>
+                  <node id="1" uname="node2"/>
+                  <node id="2" uname="node1"/>
+                </nodes>
+                <resources>
+                  <primitive id="S1" class="stonith" type="fence_xvm"/>
+                  <clone id="G-clone">
+                    <group id="G">
+                      <primitive id="R2" class="ocf"/>
+                      <primitive id="R1" class="ocf"/>
+                    </group>
+                  </clone>
+                  <bundle id="B"><primitive id="R3" class="ocf"/></bundle>
+                </resources>
+                <tags><tag id="T1"><obj_ref id="R1"/></tag></tags>
+              </configuration>
+            </cib>
+            """
+        )
+        self.assertEqual(
+            {
+                "resource": ["B", "G", "G-clone", "R1", "R2", "R3"],
+                "stonith": ["S1"],
+                "tag": ["T1"],
+                "node": ["node1", "node2"],
+            },
+            completion.get_cib_ids(cib),
+        )
+
+    @mock.patch.object(settings, "cibadmin", "/nonexistent/cibadmin")
+    def test_cibadmin_not_available(self):
+        self.assertEqual({}, completion.load_cib_ids())
@@ -9,7 +9,7 @@ class LibraryWrapperTest(TestCase):
         lib = Library("env", mock_middleware_factory)
         self.assertRaises(Exception, lambda: lib.no_valid_library_part)
 
-    @mock.patch("pcs.cli.common.lib_wrapper.constraint_order.create_with_set")
+    @mock.patch("pcs.lib.commands.constraint.order.create_with_set")
     @mock.patch("pcs.cli.common.lib_wrapper.cli_env_to_lib_env")
     def test_bind_to_library(self, mock_cli_env_to_lib_env, mock_order_set):
         # pylint: disable=no-self-use
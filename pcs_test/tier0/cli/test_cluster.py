@@ -1,3 +1,4 @@
+import datetime
 from unittest import mock, TestCase
 
 from pcs_test.tools.misc import (
@@ -1096,3 +1097,73 @@ class UpdateLink(TestCase):
             "Specified option '--start' is not supported in this command",
             cm.exception.message,
         )
+
+
+@mock.patch("pcs.cluster.time.sleep")
+@mock.patch("pcs.utils.send_node_requests")
+class WaitForRemoteNodesStarted(TestCase):
+    started = (0, '{"online": true, "pending": false}')
+    pending = (0, '{"online": true, "pending": true}')
+
+    @staticmethod
+    def fixture_send(result_list_by_round):
+        result_list_iter = iter(result_list_by_round)
+
+        def send(node_request, node_list, report):
+            del node_request
+            results = next(result_list_iter)
+            for node in node_list:
+                report(node, *results[node])
+
+        return send
+
+    def test_success_and_errors(self, mock_send, mock_sleep):
+        mock_send.side_effect = self.fixture_send(
+            [
+                {
+                    "node1": self.started,
+                    "node2": self.pending,
+                    "node3": (3, "Unable to authenticate"),
+                    "node4": (2, "Unable to connect"),
+                },
+                {"node2": self.pending, "node4": (0, "not json")},
+                {"node2": self.started},
+            ]
+        )
+        stop_at = datetime.datetime.now() + datetime.timedelta(hours=1)
+        with mock.patch("builtins.print"):
+            node_errors = cluster.wait_for_remote_nodes_started(
+                ["node1", "node2", "node3", "node4"], stop_at
+            )
+        self.assertEqual(
+            {
+                "node3": "node3: Unable to authenticate",
+                "node4": "node4: Unable to get node status",
+            },
+            node_errors,
+        )
+        self.assertEqual(
+            [
+                ["node1", "node2", "node3", "node4"],
+                ["node2", "node4"],
+                ["node2"],
+            ],
+            [call_args[0][1] for call_args in mock_send.call_args_list],
+        )
+        # intervals start over after some nodes have finished
+        self.assertEqual(
+            [mock.call(1), mock.call(1), mock.call(1)],
+            mock_sleep.call_args_list,
+        )
+
+    def test_timeout(self, mock_send, mock_sleep):
+        mock_send.side_effect = self.fixture_send(
+            [{"node1": self.started, "node2": self.pending}]
+        )
+        stop_at = datetime.datetime.now() - datetime.timedelta(seconds=1)
+        with mock.patch("builtins.print"):
+            node_errors = cluster.wait_for_remote_nodes_started(
+                ["node1", "node2"], stop_at
+            )
+        self.assertEqual({"node2": "node2: Waiting timeout"}, node_errors)
+        mock_sleep.assert_called_once_with(0)
@@ -1,9 +1,37 @@
+import json
 import pkgutil
-from dataclasses import is_dataclass
+from dataclasses import asdict, is_dataclass
 from unittest import TestCase
 
 import pcs
-from pcs.common.interface.dto import DataTransferObject
+from pcs.common.dr import (
+    DrConfigDto,
+    DrConfigNodeDto,
+    DrConfigSiteDto,
+    DrSiteStatusDto,
+)
+from pcs.common.interface.dto import DataTransferObject, from_dict, to_dict
+from pcs.common.pacemaker.nvset import CibNvpairDto, CibNvsetDto
+from pcs.common.pacemaker.resource.relations import (
+    RelationEntityDto,
+    ResourceRelationDto,
+)
+from pcs.common.pacemaker.rule import (
+    CibRuleDateCommonDto,
+    CibRuleExpressionDto,
+)
+from pcs.common.reports.dto import (
+    ReportItemContextDto,
+    ReportItemDto,
+    ReportItemMessageDto,
+    ReportItemSeverityDto,
+)
+from pcs.common.types import (
+    CibNvsetType,
+    CibRuleExpressionType,
+    DrRole,
+    ResourceRelationType,
+)
 
 
 def _import_all(_path):
@@ -27,3 +55,142 @@ class DatatransferObjectTest(TestCase):
         _import_all(pcs.__path__)
         for cls in _all_subclasses(DataTransferObject):
             self.assertTrue(is_dataclass(cls), f"{cls} is not a dataclass")
+
+
+def _rule_dto():
+    return CibRuleExpressionDto(
+        "rule",
+        CibRuleExpressionType.RULE,
+        False,
+        {"boolean-op": "and"},
+        None,
+        None,
+        [
+            CibRuleExpressionDto(
+                "rule-expr",
+                CibRuleExpressionType.DATE_EXPRESSION,
+                True,
+                {"operation": "in_range"},
+                CibRuleDateCommonDto("rule-expr-date", {"years": "2020"}),
+                None,
+                [],
+                "date in_range years=2020",
+            ),
+        ],
+        "date in_range years=2020",
+    )
+
+
+DTO_LIST = [
+    DrConfigDto(
+        DrConfigSiteDto(DrRole.PRIMARY, [DrConfigNodeDto("node1")]),
+        [DrConfigSiteDto(DrRole.RECOVERY, [DrConfigNodeDto("node2")])],
+    ),
+    DrSiteStatusDto(True, DrRole.PRIMARY, "status", False),
+    CibNvsetDto(
+        "nvset",
+        CibNvsetType.META,
+        {"score": "10"},
+        _rule_dto(),
+        [CibNvpairDto("nvset-pair", "name", "value")],
+    ),
+    ResourceRelationDto(
+        RelationEntityDto(
+            "d1", ResourceRelationType.RSC_PRIMITIVE, [], {"id": "d1"}
+        ),
+        [
+            ResourceRelationDto(
+                RelationEntityDto(
+                    "order", ResourceRelationType.ORDER, ["d1", "d2"], {}
+                ),
+                [],
+                True,
+            )
+        ],
+        False,
+    ),
+    ReportItemDto(
+        ReportItemSeverityDto("ERROR", "FORCE"),
+        ReportItemMessageDto(
+            "CODE", "message", {"id_list": ["a", "b"], "info": {"a": [1]}}
+        ),
+        ReportItemContextDto("node1"),
+    ),
+]
+
+
+class ToDict(TestCase):
+    def test_same_as_asdict(self):
+        for dto_obj in DTO_LIST:
+            with self.subTest(dto=type(dto_obj).__name__):
+                self.assertEqual(asdict(dto_obj), to_dict(dto_obj))
+
+    def test_values_copied(self):
+        dto_obj = DTO_LIST[-1]
+        payload = to_dict(dto_obj)["message"]["payload"]
+        self.assertIsNot(dto_obj.message.payload, payload)
+        self.assertIsNot(
+            dto_obj.message.payload["info"]["a"], payload["info"]["a"]
+        )
+
+    def test_dataclass_in_untyped_value(self):
+        dto_obj = ReportItemMessageDto(
+            "CODE", "message", {"context": ReportItemContextDto("node1")}
+        )
+        self.assertEqual(
+            {
+                "code": "CODE",
+                "message": "message",
+                "payload": {"context": {"node": "node1"}},
+            },
+            to_dict(dto_obj),
+        )
+
+
+class FromDict(TestCase):
+    def test_round_trip(self):
+        for dto_obj in DTO_LIST:
+            with self.subTest(dto=type(dto_obj).__name__):
+                self.assertEqual(
+                    dto_obj, from_dict(type(dto_obj), to_dict(dto_obj))
+                )
+
+    def test_enums_from_values(self):
+        self.assertEqual(
+            DrSiteStatusDto(True, DrRole.RECOVERY, "status", True),
+            from_dict(
+                DrSiteStatusDto,
+                json.loads(
+                    json.dumps(
+                        dict(
+                            local_site=True,
+                            site_role="RECOVERY",
+                            status_plaintext="status",
+                            status_successfully_obtained=True,
+                        )
+                    )
+                ),
+            ),
+        )
+
+    def test_missing_value(self):
+        with self.assertRaises(KeyError):
+            from_dict(DrConfigSiteDto, dict(site_role="PRIMARY"))
+
+    def test_wrong_type(self):
+        with self.assertRaises(TypeError):
+            from_dict(DrConfigNodeDto, dict(name=1))
+        with self.assertRaises(TypeError):
+            from_dict(
+                DrConfigSiteDto, dict(site_role="PRIMARY", node_list="node1")
+            )
+        with self.assertRaises(TypeError):
+            from_dict(
+                DrConfigSiteDto, dict(site_role="PRIMARY", node_list=["node1"])
+            )
+
+    def test_wrong_enum_value(self):
+        with self.assertRaises(ValueError):
+            from_dict(
+                DrConfigSiteDto, dict(site_role="SECONDARY", node_list=[])
+            )
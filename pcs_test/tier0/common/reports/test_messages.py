@@ -1895,6 +1895,16 @@ class CibDiffError(NameBuildTest):
         )
 
 
+class CibDiffMismatch(NameBuildTest):
+    def test_success(self):
+        self.assert_message_from_report(
+            "CIB diff computed by pcs differs from the one computed by "
+            "crm_diff, using crm_diff\npcs:\n<diff-native />\n"
+            "crm_diff:\n<diff-crm />",
+            reports.CibDiffMismatch("<diff-native />", "<diff-crm />"),
+        )
+
+
 class CibSimulateError(NameBuildTest):
     def test_success(self):
         self.assert_message_from_report(
@@ -1954,6 +1964,27 @@ class WaitForIdleNotSupported(NameBuildTest):
         )
 
 
+class WaitForIdleProgress(NameBuildTest):
+    def test_no_actions(self):
+        self.assert_message_from_report(
+            "Waiting for the cluster to settle...",
+            reports.WaitForIdleProgress([]),
+        )
+
+    def test_actions(self):
+        self.assert_message_from_report(
+            "Waiting for the cluster to settle, pending actions:\n"
+            "  Action 12: R_start_0 on node1\n"
+            "  Action 13: R_monitor_10000 on node1",
+            reports.WaitForIdleProgress(
+                [
+                    "Action 12: R_start_0 on node1",
+                    "Action 13: R_monitor_10000 on node1",
+                ]
+            ),
+        )
+
+
 class WaitForIdleTimedOut(NameBuildTest):
     def test_all(self):
         self.assert_message_from_report(
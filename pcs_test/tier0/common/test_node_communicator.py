@@ -1,4 +1,5 @@
 import io
+import itertools
 from unittest import mock, TestCase
 
 from pcs_test.tools.custom_mock import (
@@ -271,7 +272,6 @@ class CreateRequestHandleTest(TestCase):
     # pylint: disable=no-member, protected-access
     _common_opts = {
         pycurl.PROTOCOLS: pycurl.PROTO_HTTPS,
-        pycurl.VERBOSE: 1,
         pycurl.SSL_VERIFYHOST: 0,
         pycurl.SSL_VERIFYPEER: 0,
         pycurl.NOSIGNAL: 1,
@@ -299,6 +299,7 @@ class CreateRequestHandleTest(TestCase):
             "name2": "val2",
         }
         handle = lib._create_request_handle(request, cookies, 1)
+        lib._setup_debug_capture(handle, lib.DebugCapture.FULL)
         expected_opts = {
             pycurl.TIMEOUT: 1,
             pycurl.URL: request.url.encode("utf-8"),
@@ -306,6 +307,7 @@ class CreateRequestHandleTest(TestCase):
                 "utf-8"
             ),
             pycurl.COPYPOSTFIELDS: "data=value".encode("utf-8"),
+            pycurl.VERBOSE: 1,
         }
         expected_opts.update(self._common_opts)
         self.assertLessEqual(
@@ -338,6 +340,8 @@ class CreateRequestHandleTest(TestCase):
         )
         self.assertFalse(pycurl.COOKIE in handle.opts)
         self.assertFalse(pycurl.COPYPOSTFIELDS in handle.opts)
+        self.assertFalse(pycurl.VERBOSE in handle.opts)
+        self.assertFalse(pycurl.DEBUGFUNCTION in handle.opts)
         self.assertIs(request, handle.request_obj)
         self.assertEqual("", handle.output_buffer.getvalue().decode("utf-8"))
         self.assertEqual("", handle.debug_buffer.getvalue().decode("utf-8"))
@@ -346,6 +350,58 @@ class CreateRequestHandleTest(TestCase):
         self.assertEqual("", handle.debug_buffer.getvalue().decode("utf-8"))
 
 
+@mock.patch("pcs.common.node_communicator.pycurl.Curl")
+class SetupDebugCaptureTest(TestCase):
+    # pylint: disable=no-member, protected-access
+    debug_output_list = [
+        (pycurl.DEBUG_TEXT, b"text"),
+        (pycurl.DEBUG_HEADER_OUT, b"header out\n"),
+        (pycurl.DEBUG_DATA_OUT, b"data out"),
+        (pycurl.DEBUG_HEADER_IN, b"header in\n"),
+        (pycurl.DEBUG_DATA_IN, b"data in"),
+        (pycurl.DEBUG_SSL_DATA_IN, b"ssl data in"),
+    ]
+
+    def fixture_handle(self, mock_curl, debug_capture):
+        mock_curl.return_value = MockCurl(
+            None, b"output", self.debug_output_list
+        )
+        handle = lib._create_request_handle(
+            lib.Request(lib.RequestTarget("label"), lib.RequestData("action")),
+            {},
+            10,
+        )
+        lib._setup_debug_capture(handle, debug_capture)
+        handle.perform()
+        return handle
+
+    def test_none(self, mock_curl):
+        handle = self.fixture_handle(mock_curl, lib.DebugCapture.NONE)
+        self.assertFalse(pycurl.VERBOSE in handle.opts)
+        self.assertFalse(pycurl.DEBUGFUNCTION in handle.opts)
+        self.assertEqual(b"", handle.debug_buffer.getvalue())
+        self.assertEqual(b"output", handle.output_buffer.getvalue())
+
+    def test_headers(self, mock_curl):
+        handle = self.fixture_handle(mock_curl, lib.DebugCapture.HEADERS)
+        self.assertEqual(1, handle.opts[pycurl.VERBOSE])
+        self.assertEqual(
+            b"* text\n> header out\n< header in\n",
+            handle.debug_buffer.getvalue(),
+        )
+
+    def test_full(self, mock_curl):
+        handle = self.fixture_handle(mock_curl, lib.DebugCapture.FULL)
+        self.assertEqual(1, handle.opts[pycurl.VERBOSE])
+        self.assertEqual(
+            (
+                b"* text\n> header out\n>> data out\n< header in\n"
+                b"<< data in\n"
+            ),
+            handle.debug_buffer.getvalue(),
+        )
+
+
 def fixture_request(host_id=1, action="action"):
     return lib.Request(
         lib.RequestTarget("host{0}".format(host_id)), lib.RequestData(action),
@@ -631,3 +687,601 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
         self.assertEqual(logger_calls, self.mock_com_log.mock_calls)
         # pylint: disable=no-member, protected-access
         com._multi_handle.assert_no_handle_left()
+
+
+class ConnectionPoolTest(TestCase):
+    # pylint: disable=no-member
+    def setUp(self):
+        self.pool = lib.ConnectionPool()
+
+    @staticmethod
+    def fixture_response(host_label, connect_count):
+        return lib.Response(
+            MockCurl(
+                {pycurl.NUM_CONNECTS: connect_count},
+                request=fixture_request(host_label),
+            ),
+            True,
+        )
+
+    @mock.patch("pcs.common.node_communicator.pycurl.CurlShare")
+    def test_setup_handle(self, mock_share):
+        handle = MockCurl()
+        self.pool.setup_handle(handle)
+        self.pool.setup_handle(MockCurl())
+        mock_share.assert_called_once_with()
+        self.assertIs(mock_share.return_value, handle.opts[pycurl.SHARE])
+        self.assertEqual(1, handle.opts[pycurl.TCP_KEEPALIVE])
+        mock_share.return_value.setopt.assert_has_calls(
+            [
+                mock.call(pycurl.SH_SHARE, pycurl.LOCK_DATA_DNS),
+                mock.call(pycurl.SH_SHARE, pycurl.LOCK_DATA_SSL_SESSION),
+                mock.call(pycurl.SH_SHARE, pycurl.LOCK_DATA_CONNECT),
+            ]
+        )
+
+    @mock.patch("pcs.common.node_communicator.pycurl.CurlShare")
+    def test_setup_handle_unsupported_share_data(self, mock_share):
+        mock_share.return_value.setopt.side_effect = [
+            None,
+            None,
+            pycurl.error("unsupported"),
+        ]
+        handle = MockCurl()
+        self.pool.setup_handle(handle)
+        self.assertIs(mock_share.return_value, handle.opts[pycurl.SHARE])
+
+    @mock.patch("pcs.common.node_communicator.pycurl.CurlShare")
+    def test_close(self, mock_share):
+        self.pool.setup_handle(MockCurl())
+        self.pool.close()
+        mock_share.return_value.close.assert_called_once_with()
+        self.pool.close()
+        mock_share.return_value.close.assert_called_once_with()
+
+    def test_stats(self):
+        self.pool.record_response(self.fixture_response(1, 1))
+        self.pool.record_response(self.fixture_response(1, 0))
+        self.pool.record_response(self.fixture_response(1, 0))
+        self.pool.record_response(self.fixture_response(2, 1))
+        stats = self.pool.get_stats()
+        self.assertEqual(
+            {
+                "host1": lib.ConnectionReuseStats(3, 1),
+                "host2": lib.ConnectionReuseStats(1, 1),
+            },
+            stats,
+        )
+        self.assertEqual(2, stats["host1"].reused_count)
+        self.assertEqual(0, stats["host2"].reused_count)
+
+    def test_response_time_percentile(self):
+        def fixture_response(action, total_time, was_connected=True):
+            return lib.Response(
+                MockCurl(
+                    {pycurl.TOTAL_TIME: total_time},
+                    request=fixture_request(action=action),
+                ),
+                was_connected,
+            )
+
+        self.pool.record_response(fixture_response("action", 100, False))
+        for i in range(19):
+            self.pool.record_response(fixture_response("action", i / 10))
+        self.pool.record_response(fixture_response("other", 1))
+        self.assertIsNone(self.pool.get_response_time_percentile("action", 95))
+        self.pool.record_response(fixture_response("action", 1.9))
+        self.assertEqual(
+            1.8, self.pool.get_response_time_percentile("action", 95)
+        )
+        self.assertEqual(
+            1.9, self.pool.get_response_time_percentile("action", 100)
+        )
+        self.assertEqual(0, self.pool.get_response_time_percentile("action", 1))
+        self.assertIsNone(self.pool.get_response_time_percentile("other", 95))
+
+
+class NodeCommunicatorFactoryTest(TestCase):
+    def setUp(self):
+        self.mock_com_log = mock.MagicMock(
+            spec_set=lib.CommunicatorLoggerInterface
+        )
+
+    def test_pool_shared_by_communicators(self):
+        pool = lib.ConnectionPool()
+        factory = lib.NodeCommunicatorFactory(
+            self.mock_com_log, None, None, None, connection_pool=pool
+        )
+        self.assertIs(pool, factory.connection_pool)
+        # pylint: disable=protected-access
+        self.assertIs(pool, factory.get_communicator()._connection_pool)
+        self.assertIs(
+            pool, factory.get_multiaddress_communicator()._connection_pool
+        )
+
+    def test_default_pool(self):
+        factory = lib.NodeCommunicatorFactory(
+            self.mock_com_log, None, None, None
+        )
+        self.assertIsInstance(factory.connection_pool, lib.ConnectionPool)
+
+
+@mock.patch(
+    "pcs.common.node_communicator.pycurl.CurlMulti",
+    side_effect=lambda: MockCurlMulti([1]),
+)
+@mock.patch("pcs.common.node_communicator._create_request_handle")
+class CommunicatorConnectionPoolTest(CommunicatorBaseTest):
+    def test_handles_use_pool(self, mock_create_handle, _):
+        pool = mock.Mock(spec_set=lib.ConnectionPool)
+        com = lib.Communicator(
+            self.mock_com_log, None, None, connection_pool=pool
+        )
+        request = fixture_request()
+        handle = MockCurl(request=request)
+        mock_create_handle.return_value = handle
+        com.add_requests([request])
+        pool.setup_handle.assert_called_once_with(handle)
+        response_list = list(com.start_loop())
+        pool.record_response.assert_called_once_with(response_list[0])
+
+
+@mock.patch(
+    "pcs.common.node_communicator.pycurl.CurlMulti",
+    side_effect=lambda: MockCurlMulti([1]),
+)
+@mock.patch("pcs.common.node_communicator.pycurl.Curl")
+class CommunicatorDebugCaptureTest(CommunicatorBaseTest):
+    def get_response(self, com, mock_curl, connect_count=1):
+        mock_curl.return_value = MockCurl(
+            {pycurl.NUM_CONNECTS: connect_count},
+            b"output",
+            [(pycurl.DEBUG_TEXT, b"text"), (pycurl.DEBUG_DATA_IN, b"data")],
+        )
+        com.add_requests([fixture_request()])
+        response_list = list(com.start_loop())
+        self.assertEqual(1, len(response_list))
+        self.assertEqual("output", response_list[0].data)
+        return response_list[0]
+
+    def test_default_none(self, mock_curl, _):
+        response = self.get_response(self.get_communicator(), mock_curl)
+        self.assertEqual("", response.debug)
+
+    def test_headers(self, mock_curl, _):
+        com = lib.Communicator(
+            self.mock_com_log,
+            None,
+            None,
+            debug_capture=lib.DebugCapture.HEADERS,
+        )
+        response = self.get_response(com, mock_curl)
+        self.assertEqual("* text\n", response.debug)
+
+    def test_full_from_factory(self, mock_curl, _):
+        factory = lib.NodeCommunicatorFactory(
+            self.mock_com_log,
+            None,
+            None,
+            None,
+            connection_pool=lib.ConnectionPool(),
+            debug_capture=lib.DebugCapture.FULL,
+        )
+        response = self.get_response(
+            factory.get_multiaddress_communicator(), mock_curl
+        )
+        self.assertEqual(
+            "* text\n<< data\n* Connections to host1: 1 requests, 0 reused\n",
+            response.debug,
+        )
+
+    def test_connection_reuse_stats(self, mock_curl, _):
+        factory = lib.NodeCommunicatorFactory(
+            self.mock_com_log,
+            None,
+            None,
+            None,
+            connection_pool=lib.ConnectionPool(),
+            debug_capture=lib.DebugCapture.HEADERS,
+        )
+        self.get_response(factory.get_communicator(), mock_curl)
+        response = self.get_response(
+            factory.get_communicator(), mock_curl, connect_count=0
+        )
+        self.assertEqual(
+            "* text\n* Connections to host1: 2 requests, 1 reused\n",
+            response.debug,
+        )
+
+
+def fixture_handle(host_id=1, priority=lib.RequestPriority.NORMAL):
+    return MockCurl(
+        request=lib.Request(
+            lib.RequestTarget("host{0}".format(host_id)),
+            lib.RequestData("action"),
+            priority=priority,
+        )
+    )
+
+
+class RequestSchedulerTest(TestCase):
+    def test_unlimited(self):
+        scheduler = lib.RequestScheduler()
+        handle_list = [fixture_handle(i % 2) for i in range(5)]
+        for handle in handle_list:
+            scheduler.add(handle)
+        self.assertEqual(handle_list, scheduler.pop_startable())
+        self.assertEqual(5, scheduler.running_count)
+        self.assertEqual(0, scheduler.waiting_count)
+
+    def test_global_limit(self):
+        scheduler = lib.RequestScheduler(max_parallel=2)
+        handle_list = [fixture_handle(i) for i in range(3)]
+        for handle in handle_list:
+            scheduler.add(handle)
+        self.assertEqual(handle_list[:2], scheduler.pop_startable())
+        self.assertEqual([], scheduler.pop_startable())
+        self.assertEqual(1, scheduler.waiting_count)
+        scheduler.finished(handle_list[1])
+        self.assertEqual(handle_list[2:], scheduler.pop_startable())
+        self.assertEqual(2, scheduler.running_count)
+
+    def test_per_host_limit(self):
+        scheduler = lib.RequestScheduler(max_parallel_per_host=1)
+        handle_list = [
+            fixture_handle(1),
+            fixture_handle(1),
+            fixture_handle(2),
+        ]
+        for handle in handle_list:
+            scheduler.add(handle)
+        self.assertEqual(
+            [handle_list[0], handle_list[2]], scheduler.pop_startable()
+        )
+        scheduler.finished(handle_list[2])
+        self.assertEqual([], scheduler.pop_startable())
+        scheduler.finished(handle_list[0])
+        self.assertEqual([handle_list[1]], scheduler.pop_startable())
+
+    def test_priority_and_retry(self):
+        scheduler = lib.RequestScheduler(max_parallel=1)
+        running = fixture_handle(0)
+        scheduler.add(running)
+        scheduler.pop_startable()
+        low = fixture_handle(1, lib.RequestPriority.LOW)
+        normal = fixture_handle(2)
+        high = fixture_handle(3, lib.RequestPriority.HIGH)
+        retry = fixture_handle(4)
+        for handle in (low, normal, high):
+            scheduler.add(handle)
+        scheduler.add(retry, is_retry=True)
+        started = []
+        for handle in (running, high, retry, normal):
+            scheduler.finished(handle)
+            started.extend(scheduler.pop_startable())
+        self.assertEqual([high, retry, normal, low], started)
+
+
+@mock.patch(
+    "pcs.common.node_communicator.pycurl.CurlMulti",
+    side_effect=lambda: MockCurlMulti([1, 1, 1]),
+)
+@mock.patch("pcs.common.node_communicator._create_request_handle")
+class CommunicatorLimitsTest(CommunicatorBaseTest):
+    def test_requests_wait_for_slot(self, mock_create_handle, _):
+        com = lib.Communicator(
+            self.mock_com_log, None, None, max_parallel_requests=1
+        )
+        mock_create_handle.side_effect = lambda request, _, __: MockCurl(
+            request=request
+        )
+        request_list = [fixture_request(i) for i in range(3)]
+        com.add_requests(request_list)
+        response_list = list(com.start_loop())
+        self.assertEqual(request_list, [r.request for r in response_list])
+        self.assertEqual(
+            [
+                call
+                for i in range(3)
+                for call in (
+                    mock.call.log_request_start(request_list[i]),
+                    mock.call.log_response(response_list[i]),
+                )
+            ],
+            self.mock_com_log.mock_calls,
+        )
+        # pylint: disable=no-member, protected-access
+        com._multi_handle.assert_no_handle_left()
+
+
+def fixture_multiaddress_request(label="label", addr_count=3):
+    return lib.Request(
+        lib.RequestTarget(
+            label,
+            dest_list=_addr_list_to_dest(
+                ["addr{0}".format(i) for i in range(addr_count)]
+            ),
+        ),
+        lib.RequestData("action"),
+    )
+
+
+class RequestPreferDestTest(TestCase):
+    def test_prefer_dest(self):
+        request = fixture_multiaddress_request()
+        request.prefer_dest(Destination("addr1", None))
+        self.assertEqual(Destination("addr1", None), request.dest)
+        request.next_dest()
+        self.assertEqual(Destination("addr0", None), request.dest)
+        request.next_dest()
+        self.assertEqual(Destination("addr2", None), request.dest)
+        self.assertRaises(StopIteration, request.next_dest)
+
+
+@mock.patch("pcs.common.node_communicator.pycurl.CurlShare", mock.Mock)
+@mock.patch("pcs.common.node_communicator._create_request_handle")
+class MultiaddressCommunicatorPreferredDestTest(CommunicatorBaseTest):
+    @mock.patch(
+        "pcs.common.node_communicator.pycurl.CurlMulti",
+        side_effect=lambda: MockCurlMulti([1, 1]),
+    )
+    def test_remember_working_dest(self, _, mock_create_handle):
+        pool = lib.ConnectionPool()
+        mock_create_handle.side_effect = lambda request, _, __: (
+            MockCurl(request=request)
+            if request.dest.addr == "addr1"
+            else MockCurl(
+                error=(pycurl.E_SEND_ERROR, "reason"), request=request
+            )
+        )
+        com = lib.MultiaddressCommunicator(
+            self.mock_com_log, None, None, connection_pool=pool
+        )
+        com.add_requests([fixture_multiaddress_request()])
+        list(com.start_loop())
+        self.assertEqual(
+            Destination("addr1", None), pool.get_preferred_dest("label")
+        )
+
+        request = fixture_multiaddress_request()
+        com = lib.MultiaddressCommunicator(
+            self.mock_com_log, None, None, connection_pool=pool
+        )
+        mock_create_handle.reset_mock()
+        com.add_requests([request])
+        mock_create_handle.assert_called_once_with(
+            request, {}, settings.default_request_timeout
+        )
+        self.assertEqual(Destination("addr1", None), request.dest)
+
+
+@mock.patch("pcs.common.node_communicator.pycurl.CurlShare", mock.Mock)
+@mock.patch(
+    "pcs.common.node_communicator.time.monotonic", side_effect=lambda: 10,
+)
+@mock.patch("pcs.common.node_communicator._create_request_handle")
+class MultiaddressCommunicatorRaceTest(CommunicatorBaseTest):
+    def setUp(self):
+        super().setUp()
+        self.pool = lib.ConnectionPool()
+        self.com = None
+        self.started_addr_list = []
+
+    def init_communicator(self):
+        self.com = lib.MultiaddressCommunicator(
+            self.mock_com_log,
+            None,
+            None,
+            connection_pool=self.pool,
+            address_race_delay=1,
+        )
+
+    def fixture_create_handle(self, working_addr_list):
+        def _create(request, _, __):
+            self.started_addr_list.append(request.dest.addr)
+            if request.dest.addr in working_addr_list:
+                return MockCurl(request=request)
+            return MockCurl(
+                error=(pycurl.E_SEND_ERROR, "reason"), request=request
+            )
+
+        return _create
+
+    @mock.patch(
+        "pcs.common.node_communicator.pycurl.CurlMulti",
+        side_effect=lambda: MockCurlMulti([1, 1]),
+    )
+    def test_first_answer_wins(self, _, mock_create_handle, mock_monotonic):
+        # the first attempt is started at time 0, the delay elapses before the
+        # loop starts
+        mock_monotonic.side_effect = itertools.chain([0], itertools.repeat(10))
+        mock_create_handle.side_effect = self.fixture_create_handle(["addr1"])
+        self.init_communicator()
+        request = fixture_multiaddress_request()
+        self.com.add_requests([request])
+        response_list = list(self.com.start_loop())
+
+        self.assertEqual(1, len(response_list))
+        response = response_list[0]
+        self.assertTrue(response.was_connected)
+        self.assertIs(request, response.request)
+        self.assertEqual(Destination("addr1", None), request.dest)
+        # addr1 has been started after the delay, addr2 right after addr0
+        # failed and it has been cancelled when addr1 answered
+        self.assertEqual(["addr0", "addr1", "addr2"], self.started_addr_list)
+        self.mock_com_log.log_retry.assert_called_once()
+        self.mock_com_log.log_no_more_addresses.assert_not_called()
+        self.assertEqual(
+            Destination("addr1", None), self.pool.get_preferred_dest("label")
+        )
+        # pylint: disable=no-member, protected-access
+        self.com._multi_handle.assert_no_handle_left()
+
+    @mock.patch(
+        "pcs.common.node_communicator.pycurl.CurlMulti",
+        side_effect=lambda: MockCurlMulti([1, 1, 1]),
+    )
+    def test_all_fail(self, _, mock_create_handle, mock_monotonic):
+        mock_create_handle.side_effect = self.fixture_create_handle([])
+        self.init_communicator()
+        request = fixture_multiaddress_request()
+        self.com.add_requests([request])
+        response_list = list(self.com.start_loop())
+
+        self.assertEqual(1, len(response_list))
+        response = response_list[0]
+        self.assertFalse(response.was_connected)
+        self.assertIs(request, response.request)
+        self.assertEqual(Destination("addr2", None), request.dest)
+        self.assertEqual(["addr0", "addr1", "addr2"], self.started_addr_list)
+        self.mock_com_log.log_no_more_addresses.assert_called_once_with(
+            response
+        )
+        self.assertIsNone(self.pool.get_preferred_dest("label"))
+        mock_monotonic.assert_called()
+        # pylint: disable=no-member, protected-access
+        self.com._multi_handle.assert_no_handle_left()
+
+
+class RequestHedgeTest(TestCase):
+    def test_requests(self):
+        request_list = [fixture_request(1), fixture_request(2)]
+        hedge = lib.RequestHedge(request_list)
+        self.assertEqual([hedge, hedge], [req.hedge for req in request_list])
+        self.assertTrue(hedge.has_waiting)
+        self.assertEqual(request_list[:1], hedge.get_next_list())
+        self.assertEqual(request_list[1:], hedge.get_next_list())
+        self.assertFalse(hedge.has_waiting)
+        self.assertEqual([], hedge.get_next_list())
+        self.assertFalse(hedge.is_finished)
+
+    def test_finish(self):
+        hedge = lib.RequestHedge([fixture_request(1)])
+        hedge.finish()
+        self.assertTrue(hedge.is_finished)
+        self.assertFalse(hedge.has_waiting)
+        self.assertEqual([], hedge.get_next_list())
+
+
+class MockCurlMultiByHost(MockCurlMulti):
+    """
+    Finish only handles of the specified hosts in each info_read call
+    """
+
+    def __init__(self, host_list_list):
+        super().__init__([])
+        self._host_list_list = host_list_list
+
+    def info_read(self):
+        host_list = self._host_list_list.pop(0)
+        ok_list = [
+            handle
+            for handle in self._handle_list
+            if handle.request_obj.host_label in host_list
+        ]
+        for handle in ok_list:
+            handle.perform()
+        return (0, ok_list, [])
+
+
+@mock.patch("pcs.common.node_communicator._create_request_handle")
+class CommunicatorHedgeTest(CommunicatorBaseTest):
+    def setUp(self):
+        super().setUp()
+        self.started_host_list = []
+        self.request_list = [fixture_request(i) for i in range(3)]
+        self.hedge = lib.RequestHedge(self.request_list)
+
+    def fixture_create_handle(self, request, _, __):
+        self.started_host_list.append(request.host_label)
+        return MockCurl(request=request)
+
+    def run_hedge(self, com, mock_create_handle):
+        mock_create_handle.side_effect = self.fixture_create_handle
+        com.add_requests(self.hedge.get_next_list())
+        response_list = []
+        for response in com.start_loop():
+            response_list.append(response)
+            self.hedge.finish()
+        # pylint: disable=no-member, protected-access
+        com._multi_handle.assert_no_handle_left()
+        return response_list
+
+    @mock.patch(
+        "pcs.common.node_communicator.pycurl.CurlMulti",
+        side_effect=lambda: MockCurlMultiByHost([[], ["host1"]]),
+    )
+    @mock.patch(
+        "pcs.common.node_communicator.time.monotonic",
+        side_effect=itertools.chain([0], itertools.repeat(10)),
+    )
+    def test_hedge_answers_first(self, _, __, mock_create_handle):
+        com = lib.Communicator(self.mock_com_log, None, None, hedge_delay=5)
+        response_list = self.run_hedge(com, mock_create_handle)
+        # host1 has been started after host0 had not answered in time, host0
+        # has been cancelled once host1 answered, host2 has never been needed
+        self.assertEqual(["host0", "host1"], self.started_host_list)
+        self.assertEqual(
+            [self.request_list[1]],
+            [response.request for response in response_list],
+        )
+
+    @mock.patch(
+        "pcs.common.node_communicator.pycurl.CurlMulti",
+        side_effect=lambda: MockCurlMultiByHost([[], ["host0"]]),
+    )
+    @mock.patch(
+        "pcs.common.node_communicator.time.monotonic", side_effect=lambda: 10,
+    )
+    def test_no_hedge_delay(self, _, __, mock_create_handle):
+        com = lib.Communicator(self.mock_com_log, None, None)
+        response_list = self.run_hedge(com, mock_create_handle)
+        self.assertEqual(["host0"], self.started_host_list)
+        self.assertEqual(
+            [self.request_list[0]],
+            [response.request for response in response_list],
+        )
+
+    @mock.patch(
+        "pcs.common.node_communicator.pycurl.CurlMulti",
+        side_effect=lambda: MockCurlMultiByHost([[], ["host0"]]),
+    )
+    @mock.patch(
+        "pcs.common.node_communicator.time.monotonic",
+        side_effect=itertools.chain([0], itertools.repeat(10)),
+    )
+    def test_percentile_delay(self, _, __, mock_create_handle):
+        pool = mock.Mock(spec_set=lib.ConnectionPool)
+        pool.get_response_time_percentile.return_value = 20
+        com = lib.Communicator(
+            self.mock_com_log,
+            None,
+            None,
+            connection_pool=pool,
+            hedge_delay=5,
+            hedge_delay_percentile=95,
+        )
+        self.run_hedge(com, mock_create_handle)
+        self.assertEqual(["host0"], self.started_host_list)
+        pool.get_response_time_percentile.assert_called_once_with("action", 95)
+
+    @mock.patch(
+        "pcs.common.node_communicator.pycurl.CurlMulti",
+        side_effect=lambda: MockCurlMultiByHost([[], ["host1"]]),
+    )
+    @mock.patch(
+        "pcs.common.node_communicator.time.monotonic",
+        # the race and the hedge are started at time 0
+        side_effect=itertools.chain([0, 0], itertools.repeat(10)),
+    )
+    def test_multiaddress_race_cancelled(self, _, __, mock_create_handle):
+        self.request_list[0] = fixture_multiaddress_request()
+        self.hedge = lib.RequestHedge(self.request_list)
+        com = lib.MultiaddressCommunicator(
+            self.mock_com_log, None, None, address_race_delay=20, hedge_delay=5,
+        )
+        self.run_hedge(com, mock_create_handle)
+        self.assertEqual(["label", "host1"], self.started_host_list)
+        # pylint: disable=protected-access
+        self.assertEqual({}, com._race_dict)
+        self.assertEqual({}, com._race_by_handle)
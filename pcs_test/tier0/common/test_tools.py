@@ -24,6 +24,24 @@ class RunParallelTestCase(TestCase):
         self.assertTrue(elapsed_time < sum([i + 1 for i in range(timeout)]))
 
 
+class GetBackoffIntervals(TestCase):
+    def test_grow_to_maximum(self):
+        interval_list = tools.get_backoff_intervals(1, 10)
+        self.assertEqual(
+            [1, 2, 4, 8, 10, 10], [next(interval_list) for _ in range(6)]
+        )
+
+    def test_factor(self):
+        interval_list = tools.get_backoff_intervals(0.5, 30, factor=3)
+        self.assertEqual(
+            [0.5, 1.5, 4.5, 13.5, 30], [next(interval_list) for _ in range(5)]
+        )
+
+    def test_initial_over_maximum(self):
+        interval_list = tools.get_backoff_intervals(20, 10)
+        self.assertEqual([10, 10], [next(interval_list) for _ in range(2)])
+
+
 class VersionTest(TestCase):
     # pylint: disable=invalid-name
     def assert_asterisk(self, expected, major, minor=None, revision=None):
@@ -22,13 +22,17 @@ class RubyPcsdWrapper(ruby_pcsd.Wrapper):
         self.body = b"Success action"
 
     async def run_ruby(
-        self, request_type, http_request=None, payload=None,
+        self, request_type, http_request=None, payload=None, result_stream=None,
     ):
         if request_type != self.request_type:
             raise AssertionError(
                 f"Wrong request type: expected '{self.request_type}'"
                 f" but was {request_type}"
             )
+        if result_stream:
+            result_stream.start(self.status_code, self.headers)
+            result_stream.write(self.body)
+            return {"headers": self.headers, "status": self.status_code}
         return {
             "headers": self.headers,
             "status": self.status_code,
@@ -1,8 +1,10 @@
+import json
 import logging
 from urllib.parse import urlencode
 from unittest import mock
 
 from tornado.locks import Lock
+from tornado.simple_httpclient import HTTPStreamClosedError
 from tornado.util import TimeoutError as TornadoTimeoutError
 
 from pcs_test.tier0.daemon.app import fixtures_app
@@ -17,19 +19,27 @@ logging.getLogger("tornado.access").setLevel(logging.CRITICAL)
 
 class AppTest(fixtures_app.AppTest):
     def setUp(self):
-        self.wrapper = fixtures_app.RubyPcsdWrapper(ruby_pcsd.SINATRA_REMOTE)
+        self.wrapper = self.create_wrapper()
         self.https_server_manage = mock.MagicMock(
             spec_set=http_server.HttpsServerManage
         )
         self.lock = Lock()
         super().setUp()
 
+    def create_wrapper(self):
+        # pylint: disable=no-self-use
+        return fixtures_app.RubyPcsdWrapper(ruby_pcsd.SINATRA_REMOTE)
+
     def get_routes(self):
         return sinatra_remote.get_routes(
             self.wrapper, self.lock, self.https_server_manage,
         )
 
 
+def fixture_frame(frame_type, payload):
+    return ruby_pcsd.FRAME_HEADER.pack(frame_type, len(payload)) + payload
+
+
 class SetCerts(AppTest):
     def test_it_asks_for_cert_reload_if_ruby_succeeds(self):
         self.wrapper.status_code = 200
@@ -78,6 +88,33 @@ class SinatraRemote(AppTest):
         self.assert_wrappers_response(self.get("/remote/"))
 
 
+class SinatraRemoteStreamCut(AppTest):
+    def create_wrapper(self):
+        with mock.patch("pcs.daemon.ruby_pcsd.AsyncHTTPClient"):
+            wrapper = ruby_pcsd.Wrapper("/path/to/ruby_socket")
+        patcher = mock.patch.object(wrapper, "send_to_ruby", self.send_to_ruby)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return wrapper
+
+    async def send_to_ruby(self, ruby_request, streaming_callback):
+        # pylint: disable=unused-argument
+        # ruby dies after the first chunk of the body
+        pending_write = streaming_callback(
+            fixture_frame(
+                ruby_pcsd.FRAME_RESULT,
+                json.dumps({"headers": {}, "status": 200}).encode(),
+            )
+            + fixture_frame(ruby_pcsd.FRAME_BODY, b"first chunk")
+        )
+        if pending_write is not None:
+            await pending_write
+
+    def test_response_not_completed(self):
+        with self.assertRaises(HTTPStreamClosedError):
+            self.get("/remote/")
+
+
 class SyncConfigMutualExclusive(AppTest):
     """
     This class contains tests that the request handler of url
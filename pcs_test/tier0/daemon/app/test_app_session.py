@@ -1,3 +1,10 @@
+import logging
+import os.path
+import shutil
+import sqlite3
+import tempfile
+from unittest import mock
+
 from tornado.httputil import parse_cookie
 from tornado.testing import AsyncHTTPTestCase
 from tornado.web import Application, RequestHandler
@@ -17,6 +24,10 @@ from pcs.daemon.app import session as app_session
 
 # pylint: disable=too-many-ancestors
 
+# Don't write errors to test output.
+logging.getLogger("pcs.daemon").setLevel(logging.CRITICAL)
+logging.getLogger("tornado.access").setLevel(logging.CRITICAL)
+
 SID = "abc"
 
 
@@ -67,7 +78,7 @@ class MixinTest(
 
     def setUp(self):
         Handler.test = self
-        self.storage = session.Storage(lifetime_seconds=10)
+        self.storage = self.create_storage()
         self.setup_patch("check_user_groups", self.check_user_groups)
         self.setup_patch("authorize_user", self.authorize_user)
         self.fetch_args = {}
@@ -77,6 +88,10 @@ class MixinTest(
 
         super().setUp()
 
+    def create_storage(self):
+        # pylint: disable=no-self-use
+        return session.Storage(lifetime_seconds=10)
+
     def get_app(self):
         return Application([("/", Handler, dict(session_storage=self.storage))])
 
@@ -185,7 +200,7 @@ class CanLoginAndLogout(MixinTest):
     async def on_handle(self, handler):
         await handler.session_auth_user(USER, PASSWORD)
         self.assert_authenticated_session(handler.session, USER, GROUPS)
-        handler.session_logout()
+        await handler.session_logout()
         self.assert_vanila_session(handler.session)
 
 
@@ -212,7 +227,7 @@ class CanLogoutWithoutSessionAccess(MixinTest):
     auto_init_session = False
 
     async def on_handle(self, handler):
-        handler.session_logout()
+        await handler.session_logout()
         self.assertNotEqual(self.sid, handler.session.sid)
 
 
@@ -230,3 +245,37 @@ class AuthRefusedByGroupCheck(MixinTest):
 
     async def on_handle(self, handler):
         self.assertFalse(handler.session.is_authenticated)
+
+
+class SharedStorageMixinTest(MixinTest):
+    def create_storage(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        self.path = os.path.join(tmp_dir, "sessions")
+        storage = session.SharedStorage(10, self.path)
+        self.addCleanup(storage.executor.shutdown)
+        return storage
+
+
+class SharedStorageLoginAndLogout(SharedStorageMixinTest):
+    user_auth_info = UserAuthInfo(valid=True)
+    auto_init_session = False
+
+    async def on_handle(self, handler):
+        await handler.session_auth_user(USER, PASSWORD)
+        self.assert_authenticated_session(handler.session, USER, GROUPS)
+        await handler.session_logout()
+        self.assert_vanila_session(handler.session)
+
+
+class SharedStorageLocked(SharedStorageMixinTest):
+    @mock.patch.object(session.SharedStorage, "busy_timeout_seconds", 0.1)
+    def test(self):
+        # the storage is only used from its executor thread
+        session.SharedStorage(10, self.path).provide()
+        self.assertEqual(200, self.fetch("/").code)
+        connection = sqlite3.connect(self.path, isolation_level=None)
+        self.addCleanup(connection.close)
+        connection.execute("BEGIN IMMEDIATE")
+        self.addCleanup(connection.execute, "ROLLBACK")
+        self.assertEqual(503, self.fetch("/").code)
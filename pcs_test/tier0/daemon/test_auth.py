@@ -1,5 +1,13 @@
-from unittest import TestCase
+from unittest import mock, TestCase
 import logging
+import os
+import pwd
+import shutil
+import tempfile
+import time
+
+from tornado.concurrent import Future
+from tornado.testing import AsyncTestCase, gen_test
 
 from pcs_test.tools.misc import create_setup_patch_mixin
 
@@ -39,3 +47,121 @@ class AuthorizeUserSync(TestCase, create_setup_patch_mixin(auth)):
         user_auth_info = auth.authorize_user_sync(USER, PASSWORD)
         self.assertEqual(user_auth_info.name, USER)
         self.assertFalse(user_auth_info.is_authorized)
+
+
+class UserGroupsCache(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.group_file = os.path.join(self.tmp_dir, "group")
+        with open(self.group_file, "w") as group_file:
+            group_file.write("haclient:x:189:user\n")
+        self.cache = auth.UserGroupsCache(60, [self.group_file])
+
+    def test_cached(self):
+        self.assertIsNone(self.cache.get(USER))
+        self.cache.set(USER, ["haclient"])
+        self.assertEqual(("haclient",), self.cache.get(USER))
+
+    def test_expired(self):
+        self.cache.set(USER, ["haclient"])
+        with mock.patch(
+            "pcs.daemon.auth.monotonic", return_value=time.monotonic() + 61
+        ):
+            self.assertIsNone(self.cache.get(USER))
+
+    def test_group_file_changed(self):
+        self.cache.set(USER, ["haclient"])
+        os.utime(self.group_file, ns=(0, 0))
+        self.assertIsNone(self.cache.get(USER))
+
+    def test_disabled(self):
+        cache = auth.UserGroupsCache(0, [self.group_file])
+        cache.set(USER, ["haclient"])
+        self.assertIsNone(cache.get(USER))
+
+
+class AuthWorkerPool(AsyncTestCase):
+    def setUp(self):
+        super().setUp()
+        self.pool = auth.AuthWorkerPool(max_workers=1)
+        self.addCleanup(self.pool.shutdown)
+
+    @gen_test
+    def test_worker_reused(self):
+        pid_list = []
+        for _ in range(3):
+            pid_list.append((yield self.pool.run(os.getpid)))
+        self.assertEqual(1, len(set(pid_list)))
+        self.assertNotIn(os.getpid(), pid_list)
+        metrics = self.pool.metrics.to_dict()
+        self.assertEqual(0, metrics["queue_depth"])
+        self.assertEqual(1, metrics["max_queue_depth"])
+        self.assertEqual(3, metrics["request_count"])
+
+    @gen_test
+    def test_log_metrics(self):
+        with mock.patch("pcs.daemon.auth.log.pcsd") as mock_log:
+            self.pool.log_metrics()
+            mock_log.info.assert_not_called()
+            yield self.pool.run(abs, -1)
+            self.pool.log_metrics()
+            self.pool.log_metrics()
+        mock_log.info.assert_called_once_with(
+            mock.ANY, self.pool.metrics.to_dict()
+        )
+        self.assertIn(
+            "1 processed, queue depth 0 (max 1)",
+            mock_log.info.call_args[0][0] % self.pool.metrics.to_dict(),
+        )
+
+    @gen_test
+    def test_queued(self):
+        result = yield [self.pool.run(abs, -i) for i in range(4)]
+        self.assertEqual([0, 1, 2, 3], result)
+        self.assertEqual(4, self.pool.metrics.max_queue_depth)
+
+    @gen_test
+    def test_exception(self):
+        with self.assertRaises(KeyError):
+            yield self.pool.run(pwd.getpwnam, "no-such-user-for-pcs-test")
+        self.assertEqual(0, self.pool.metrics.queue_depth)
+
+
+class CheckUserGroups(AsyncTestCase, create_setup_patch_mixin(auth)):
+    def setUp(self):
+        super().setUp()
+        self.cache = auth.UserGroupsCache(60, [])
+        self.setup_patch("get_user_groups_cache", return_value=self.cache)
+        self.run_in_process = self.setup_patch("run_in_process")
+
+    def mock_groups(self, groups):
+        future = Future()
+        future.set_result(groups)
+        self.run_in_process.return_value = future
+
+    @gen_test
+    def test_groups_cached(self):
+        self.mock_groups((auth.HA_ADM_GROUP,))
+        for _ in range(2):
+            user_auth_info = yield auth.check_user_groups(USER)
+            self.assertTrue(user_auth_info.is_authorized)
+        self.run_in_process.assert_called_once_with(
+            auth.get_user_groups_sync, USER
+        )
+
+    @gen_test
+    def test_not_member(self):
+        self.mock_groups(("wheel",))
+        user_auth_info = yield auth.check_user_groups(USER)
+        self.assertFalse(user_auth_info.is_authorized)
+        self.assertEqual(("wheel",), user_auth_info.groups)
+
+    @gen_test
+    def test_unknown_user(self):
+        future = Future()
+        future.set_exception(KeyError(USER))
+        self.run_in_process.return_value = future
+        user_auth_info = yield auth.check_user_groups(USER)
+        self.assertFalse(user_auth_info.is_authorized)
+        self.assertIsNone(self.cache.get(USER))
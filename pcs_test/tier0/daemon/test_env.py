@@ -43,6 +43,7 @@ class Prepare(TestCase, create_setup_patch_mixin(env)):
             env.PCSD_SESSION_LIFETIME: settings.gui_session_lifetime_seconds,
             env.PCSD_STATIC_FILES_DIR: pcsd_dir(env.PCSD_STATIC_FILES_DIR_NAME),
             env.PCSD_DEV: False,
+            env.PCSD_WORKERS: 1,
             "has_errors": False,
         }
         if specific_env_values is None:
@@ -73,6 +74,7 @@ class Prepare(TestCase, create_setup_patch_mixin(env)):
             env.PCSD_SESSION_LIFETIME: str(session_lifetime),
             env.PCSD_DEV: "true",
             env.PCSD_DEV: "true",
+            env.PCSD_WORKERS: "4",
         }
         self.assert_environ_produces_modified_pcsd_env(
             environ=environ,
@@ -89,9 +91,20 @@ class Prepare(TestCase, create_setup_patch_mixin(env)):
                     env.PCSD_STATIC_FILES_DIR_NAME
                 ),
                 env.PCSD_DEV: True,
+                env.PCSD_WORKERS: 4,
             },
         )
 
+    def test_error_on_invalid_workers(self):
+        environ = {env.PCSD_WORKERS: "0"}
+        self.assert_environ_produces_modified_pcsd_env(
+            environ,
+            specific_env_values={**environ, "has_errors": True},
+            errors=[
+                "Invalid PCSD_WORKERS value '0' (it must be a positive integer)"
+            ],
+        )
+
     def test_error_on_noninteger_session_lifetime(self):
         environ = {env.PCSD_SESSION_LIFETIME: "invalid"}
         self.assert_environ_produces_modified_pcsd_env(
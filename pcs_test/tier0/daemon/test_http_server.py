@@ -7,7 +7,7 @@ from tornado.httpserver import HTTPServer
 from pcs_test.tools.misc import create_setup_patch_mixin
 
 from pcs.daemon import http_server
-from pcs.daemon.ssl import PcsdSSL
+from pcs.daemon.ssl import PcsdSSL, SSLCertKeyException
 
 PORT = 1234
 BIND_ADDRESSES = ["addr1", "addr2"]
@@ -30,7 +30,9 @@ class ManageTest(TestCase, create_setup_patch_mixin(http_server)):
 
         self.setup_patch("HTTPServer", self.HTTPServer)
         # self.setup_patch("PcsdSSL", Mock(return_value=self.pcsd_ssl))
-        self.setup_patch("bind_sockets", lambda port, addr: addr2sock([addr]))
+        self.setup_patch(
+            "bind_sockets", lambda port, addr, reuse_port: addr2sock([addr]),
+        )
 
         self.app = MagicMock()
         self.https_server_manage = http_server.HttpsServerManage(
@@ -61,9 +63,57 @@ class ManageTest(TestCase, create_setup_patch_mixin(http_server)):
             self.https_server_manage.reload_certs,
         )
 
-    def test_reload_certs_exchanges_servers(self):
+    def test_reload_certs_keeps_server(self):
         self.https_server_manage.start()
+        self.pcsd_ssl.reset_mock()
         self.https_server_manage.reload_certs()
-        self.server_list[0].stop.assert_called_once()
-        self.server_list[1].add_sockets.assert_called_once_with(BIND_SOCKETS)
+        self.assertEqual(1, len(self.server_list))
+        self.server_list[0].stop.assert_not_called()
+        self.pcsd_ssl.guarantee_valid_certs.assert_called_once_with()
+        self.pcsd_ssl.create_context.assert_called_once_with()
         self.assertTrue(self.https_server_manage.server_is_running)
+
+    def test_reload_certs_invalid_certs(self):
+        self.https_server_manage.start()
+        self.pcsd_ssl.reset_mock()
+        self.pcsd_ssl.guarantee_valid_certs.side_effect = SSLCertKeyException(
+            "invalid"
+        )
+        with self.assertRaises(SSLCertKeyException):
+            self.https_server_manage.reload_certs()
+        self.pcsd_ssl.create_context.assert_not_called()
+        self.server_list[0].stop.assert_not_called()
+
+    def test_reload_certs_if_changed(self):
+        self.https_server_manage.start()
+        self.pcsd_ssl.reset_mock()
+        self.pcsd_ssl.files_changed.return_value = False
+        self.https_server_manage.reload_certs_if_changed()
+        self.pcsd_ssl.create_context.assert_not_called()
+        self.pcsd_ssl.files_changed.return_value = True
+        self.pcsd_ssl.certs_exist.return_value = True
+        self.https_server_manage.reload_certs_if_changed()
+        self.pcsd_ssl.check_certs.assert_called_once_with()
+        self.pcsd_ssl.create_context.assert_called_once_with()
+        self.pcsd_ssl.guarantee_valid_certs.assert_not_called()
+
+    def test_reload_certs_if_changed_missing(self):
+        self.https_server_manage.start()
+        self.pcsd_ssl.reset_mock()
+        self.pcsd_ssl.files_changed.return_value = True
+        self.pcsd_ssl.certs_exist.return_value = False
+        self.https_server_manage.reload_certs_if_changed()
+        self.pcsd_ssl.check_certs.assert_not_called()
+        self.pcsd_ssl.create_context.assert_not_called()
+        self.pcsd_ssl.guarantee_valid_certs.assert_not_called()
+        self.pcsd_ssl.mark_files_checked.assert_not_called()
+
+    def test_reload_certs_if_changed_invalid(self):
+        self.https_server_manage.start()
+        self.pcsd_ssl.reset_mock()
+        self.pcsd_ssl.files_changed.return_value = True
+        self.pcsd_ssl.certs_exist.return_value = True
+        self.pcsd_ssl.check_certs.side_effect = SSLCertKeyException("invalid")
+        self.https_server_manage.reload_certs_if_changed()
+        self.pcsd_ssl.create_context.assert_not_called()
+        self.pcsd_ssl.mark_files_checked.assert_called_once_with()
@@ -0,0 +1,70 @@
+import fcntl
+import os
+import os.path
+import shutil
+import tempfile
+
+from tornado.gen import sleep
+from tornado.testing import AsyncTestCase, gen_test
+
+from pcs.daemon.locks import InterProcessLock
+
+
+class InterProcessLockTest(AsyncTestCase):
+    def setUp(self):
+        super().setUp()
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        self.lock_path = os.path.join(tmp_dir, "lock")
+        self.lock = InterProcessLock(self.lock_path, poll_interval=0.01)
+
+    def is_locked_by_other_process(self):
+        fd = os.open(self.lock_path, os.O_RDWR)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return False
+        except BlockingIOError:
+            return True
+        finally:
+            os.close(fd)
+
+    @gen_test
+    async def test_locks_file(self):
+        async with self.lock:
+            self.assertTrue(self.is_locked_by_other_process())
+        self.assertFalse(self.is_locked_by_other_process())
+
+    @gen_test
+    async def test_waits_for_other_process(self):
+        fd = os.open(self.lock_path, os.O_CREAT | os.O_RDWR)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        acquired = []
+
+        async def lock():
+            async with self.lock:
+                acquired.append(True)
+
+        task = self.io_loop.asyncio_loop.create_task(lock())
+        await sleep(0.05)
+        self.assertEqual([], acquired)
+        os.close(fd)
+        await task
+        self.assertEqual([True], acquired)
+
+    @gen_test
+    async def test_coroutines_of_one_process(self):
+        order = []
+
+        async def lock(name):
+            async with self.lock:
+                order.append(f"{name} start")
+                await sleep(0.02)
+                order.append(f"{name} end")
+
+        tasks = [
+            self.io_loop.asyncio_loop.create_task(lock(name))
+            for name in ("a", "b")
+        ]
+        for task in tasks:
+            await task
+        self.assertEqual(["a start", "a end", "b start", "b end"], order)
@@ -0,0 +1,109 @@
+import logging
+import os.path
+import shutil
+import tempfile
+from unittest import mock, TestCase
+
+from pcs.daemon import log
+
+
+def make_record(level, message):
+    return logging.LogRecord("test", level, "", 0, message, None, None)
+
+
+class RecordBuffer(TestCase):
+    def setUp(self):
+        self.buffer = log._RecordBuffer(2)  # pylint: disable=protected-access
+
+    def get_messages(self):
+        record_list, dropped = self.buffer.get_batch(10)
+        return [record.msg for record in record_list], dropped
+
+    def test_batch(self):
+        self.buffer.put(make_record(logging.INFO, "a"))
+        self.buffer.put(make_record(logging.INFO, "b"))
+        record_list, dropped = self.buffer.get_batch(1)
+        self.assertEqual((["a"], 0), ([r.msg for r in record_list], dropped))
+        self.assertEqual((["b"], 0), self.get_messages())
+
+    def test_debug_dropped_when_full(self):
+        self.buffer.put(make_record(logging.INFO, "a"))
+        self.buffer.put(make_record(logging.INFO, "b"))
+        self.buffer.put(make_record(logging.DEBUG, "c"))
+        self.assertEqual((["a", "b"], 1), self.get_messages())
+
+    def test_debug_replaced_when_full(self):
+        self.buffer.put(make_record(logging.DEBUG, "a"))
+        self.buffer.put(make_record(logging.INFO, "b"))
+        self.buffer.put(make_record(logging.ERROR, "c"))
+        self.assertEqual((["b", "c"], 1), self.get_messages())
+
+    def test_new_record_dropped_when_full_of_non_debug(self):
+        self.buffer.put(make_record(logging.INFO, "a"))
+        self.buffer.put(make_record(logging.INFO, "b"))
+        self.buffer.put(make_record(logging.ERROR, "c"))
+        self.assertEqual((["a", "b"], 1), self.get_messages())
+
+    def test_closed(self):
+        self.buffer.put(make_record(logging.INFO, "a"))
+        self.buffer.close()
+        self.assertEqual((["a"], 0), self.get_messages())
+        self.assertEqual(([], 0), self.get_messages())
+
+
+class Setup(TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        self.log_file = os.path.join(tmp_dir, "pcsd.log")
+        # do not change loggers used by other tests
+        patcher = mock.patch.object(log, "LOGGER_NAMES", ["pcs.test.daemon"])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(log.shutdown)
+        self.logger = logging.getLogger("pcs.test.daemon")
+        self.logger.propagate = False
+
+    def assert_log(self, queue_size):
+        log.setup(self.log_file, queue_size)
+        handler = log._log_handler  # pylint: disable=protected-access
+        self.assertIn(handler, self.logger.handlers)
+        self.logger.info("first %s", "message")
+        self.logger.debug("debug message")
+        self.logger.warning("second message")
+        log.shutdown()
+        with open(self.log_file) as log_file:
+            lines = log_file.read().splitlines()
+        self.assertEqual(2, len(lines))
+        self.assertTrue(lines[0].endswith("INFO -- : first message"))
+        self.assertTrue(lines[1].endswith("WARNING -- : second message"))
+        self.assertNotIn(handler, self.logger.handlers)
+
+    def test_queue(self):
+        self.assert_log(100)
+
+    def test_synchronous(self):
+        self.assert_log(0)
+
+    def assert_log_in_forked_process(self):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                self.logger.info("child message")
+                log.shutdown()
+            finally:
+                os._exit(0)  # pylint: disable=protected-access
+        os.waitpid(pid, 0)
+        log.shutdown()
+        with open(self.log_file) as log_file:
+            self.assertIn("child message", log_file.read())
+
+    def test_queue_in_forked_process(self):
+        log.setup(self.log_file, 100)
+        self.assert_log_in_forked_process()
+
+    def test_queue_in_forked_process_after_new_setup(self):
+        log.setup(self.log_file, 100)
+        log.shutdown()
+        log.setup(self.log_file, 100)
+        self.assert_log_in_forked_process()
@@ -1,9 +1,11 @@
 import json
 import logging
-from base64 import b64encode
 from unittest import TestCase, mock
 from urllib.parse import urlencode
 
+import pycurl
+from tornado import gen
+from tornado.concurrent import Future
 from tornado.httputil import HTTPServerRequest, HTTPHeaders
 from tornado.testing import AsyncTestCase, gen_test
 from tornado.web import HTTPError
@@ -20,6 +22,19 @@ def create_wrapper():
     return ruby_pcsd.Wrapper(rc("/path/to/ruby_socket"))
 
 
+def frame(frame_type, payload=b""):
+    return ruby_pcsd.FRAME_HEADER.pack(frame_type, len(payload)) + payload
+
+
+def pack_response(result, logs=(), body_chunks=()):
+    return b"".join(
+        [frame(ruby_pcsd.FRAME_RESULT, json.dumps(result).encode())]
+        + [frame(ruby_pcsd.FRAME_LOG, json.dumps(log).encode()) for log in logs]
+        + [frame(ruby_pcsd.FRAME_BODY, chunk) for chunk in body_chunks]
+        + [frame(ruby_pcsd.FRAME_END)]
+    )
+
+
 def create_http_request():
     return HTTPServerRequest(
         method="POST",
@@ -35,7 +50,7 @@ patch_ruby_pcsd = create_patcher(ruby_pcsd)
 
 class RunRuby(AsyncTestCase):
     def setUp(self):
-        self.ruby_response = ""
+        self.ruby_response = b""
         self.request = ruby_pcsd.RubyDaemonRequest(ruby_pcsd.SYNC_CONFIGS)
         self.wrapper = create_wrapper()
         patcher = mock.patch.object(
@@ -45,12 +60,14 @@ class RunRuby(AsyncTestCase):
         patcher.start()
         super().setUp()
 
-    async def send_to_ruby(self, ruby_request):
+    async def send_to_ruby(self, ruby_request, streaming_callback):
         self.assertEqual(ruby_request, self.request)
-        return self.ruby_response
+        # deliver the response in small pieces to test assembling frames
+        for i in range(0, len(self.ruby_response), 7):
+            streaming_callback(self.ruby_response[i : i + 7])
 
-    def set_run_result(self, run_result):
-        self.ruby_response = json.dumps({**run_result, "logs": []})
+    def set_run_result(self, run_result, body_chunks=()):
+        self.ruby_response = pack_response(run_result, [], body_chunks)
 
     def assert_sinatra_result(self, result, headers, status, body):
         self.assertEqual(result.headers, headers)
@@ -89,11 +106,7 @@ class RunRuby(AsyncTestCase):
         status = 200
         body = "content"
         self.set_run_result(
-            {
-                "headers": headers,
-                "status": status,
-                "body": b64encode(str.encode(body)).decode(),
-            }
+            {"headers": headers, "status": status}, [b"con", b"tent"]
         )
         http_request = create_http_request()
         self.request = ruby_pcsd.RubyDaemonRequest(
@@ -113,11 +126,7 @@ class RunRuby(AsyncTestCase):
         is_authenticated = True
 
         self.set_run_result(
-            {
-                "headers": headers,
-                "status": status,
-                "body": b64encode(str.encode(body)).decode(),
-            }
+            {"headers": headers, "status": status}, [b"con", b"tent"]
         )
         http_request = create_http_request()
         self.request = ruby_pcsd.RubyDaemonRequest(
@@ -137,6 +146,137 @@ class RunRuby(AsyncTestCase):
         )
         self.assert_sinatra_result(result, headers, status, body)
 
+    @gen_test
+    def test_request_remote_streamed(self):
+        headers = {"some": "header"}
+        result_stream = mock.Mock(spec_set=ruby_pcsd.ResultStream)
+        self.set_run_result(
+            {"headers": headers, "status": 200}, [b"con", b"tent"]
+        )
+        http_request = create_http_request()
+        self.request = ruby_pcsd.RubyDaemonRequest(
+            ruby_pcsd.SINATRA_REMOTE, http_request,
+        )
+        result = yield self.wrapper.request_remote(http_request, result_stream)
+        self.assertEqual((headers, 200, None), result)
+        self.assertEqual(
+            [
+                mock.call.start(200, headers),
+                mock.call.write(b"con"),
+                mock.call.write(b"tent"),
+            ],
+            result_stream.mock_calls,
+        )
+
+    @gen_test
+    def test_request_remote_stream_cut_after_body(self):
+        result_stream = mock.Mock(spec_set=ruby_pcsd.ResultStream)
+        self.ruby_response = b"".join(
+            [
+                frame(
+                    ruby_pcsd.FRAME_RESULT,
+                    json.dumps({"headers": {}, "status": 200}).encode(),
+                ),
+                frame(ruby_pcsd.FRAME_BODY, b"content"),
+            ]
+        )
+        http_request = create_http_request()
+        self.request = ruby_pcsd.RubyDaemonRequest(
+            ruby_pcsd.SINATRA_REMOTE, http_request,
+        )
+        with self.assertRaises(HTTPError):
+            yield self.wrapper.request_remote(http_request, result_stream)
+        self.assertEqual(
+            [
+                mock.call.start(200, {}),
+                mock.call.write(b"content"),
+                mock.call.abort(),
+            ],
+            result_stream.mock_calls,
+        )
+
+    @gen_test
+    def test_incomplete_response(self):
+        self.ruby_response = pack_response({"next": 10})[:-1]
+        with self.assertRaises(HTTPError):
+            yield self.wrapper.run_ruby(ruby_pcsd.SYNC_CONFIGS)
+
+    @gen_test
+    def test_invalid_json(self):
+        self.ruby_response = frame(ruby_pcsd.FRAME_RESULT, b"{") + frame(
+            ruby_pcsd.FRAME_END
+        )
+        with self.assertRaises(HTTPError):
+            yield self.wrapper.run_ruby(ruby_pcsd.SYNC_CONFIGS)
+
+    @gen_test
+    def test_error_in_response(self):
+        self.set_run_result({"error": "ruby exception"})
+        with self.assertRaises(HTTPError):
+            yield self.wrapper.run_ruby(ruby_pcsd.SYNC_CONFIGS)
+
+
+class ThrottledTransfer(AsyncTestCase):
+    def setUp(self):
+        super().setUp()
+        self.curl = mock.Mock(spec_set=["pause"])
+        self.prepare_curl = mock.Mock()
+        self.pending_write = None
+        # pylint: disable=protected-access
+        self.transfer = ruby_pcsd._ThrottledTransfer(
+            lambda data: self.pending_write, self.prepare_curl
+        )
+        self.transfer.prepare_curl(self.curl)
+
+    def test_prepare_curl(self):
+        self.prepare_curl.assert_called_once_with(self.curl)
+
+    def test_not_paused_when_sent(self):
+        self.transfer.receive(b"data")
+        self.pending_write = Future()
+        self.pending_write.set_result(None)
+        self.transfer.receive(b"data")
+        self.curl.pause.assert_not_called()
+
+    @gen_test
+    def test_paused_until_sent(self):
+        self.pending_write = Future()
+        self.transfer.receive(b"data")
+        self.curl.pause.assert_called_once_with(pycurl.PAUSE_RECV)
+        self.pending_write.set_result(None)
+        yield gen.moment
+        self.assertEqual(
+            [mock.call(pycurl.PAUSE_RECV), mock.call(pycurl.PAUSE_CONT)],
+            self.curl.pause.mock_calls,
+        )
+
+    @gen_test
+    def test_not_resumed_after_finish(self):
+        self.pending_write = Future()
+        self.transfer.receive(b"data")
+        self.transfer.finish()
+        self.pending_write.set_result(None)
+        yield gen.moment
+        self.curl.pause.assert_called_once_with(pycurl.PAUSE_RECV)
+
+
+class FrameReader(TestCase):
+    def test_split_data(self):
+        reader = ruby_pcsd.FrameReader()
+        data = frame(ruby_pcsd.FRAME_BODY, b"abc") + frame(ruby_pcsd.FRAME_END)
+        self.assertEqual([], reader.feed(data[:2]))
+        self.assertEqual([], reader.feed(data[2:7]))
+        self.assertTrue(reader.has_pending_data)
+        self.assertEqual(
+            [(ruby_pcsd.FRAME_BODY, b"abc"), (ruby_pcsd.FRAME_END, b"")],
+            reader.feed(data[7:]),
+        )
+        self.assertFalse(reader.has_pending_data)
+
+    def test_unknown_frame(self):
+        with self.assertRaises(ruby_pcsd.FrameDecodeError):
+            ruby_pcsd.FrameReader().feed(frame(b"X", b"abc"))
+
 
 class ProcessResponseLog(TestCase):
     @patch_ruby_pcsd("log.from_external_source")
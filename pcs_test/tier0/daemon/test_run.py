@@ -0,0 +1,75 @@
+from unittest import mock, TestCase
+
+from pcs.daemon import run
+
+
+@mock.patch("pcs.daemon.run.start_pcs_internal_pool", return_value=200)
+@mock.patch("pcs.daemon.run.os.waitpid")
+class CheckPcsInternalPool(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(
+            run.SignalInfo, "pcs_internal_pool_pid", 100
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_running(self, mock_waitpid, mock_start):
+        mock_waitpid.return_value = (0, 0)
+        run.check_pcs_internal_pool()
+        mock_start.assert_not_called()
+        self.assertEqual(100, run.SignalInfo.pcs_internal_pool_pid)
+
+    def test_exited(self, mock_waitpid, mock_start):
+        mock_waitpid.return_value = (100, 256)
+        run.check_pcs_internal_pool()
+        mock_start.assert_called_once_with()
+        self.assertEqual(200, run.SignalInfo.pcs_internal_pool_pid)
+
+    def test_not_started(self, mock_waitpid, mock_start):
+        run.SignalInfo.pcs_internal_pool_pid = None
+        run.check_pcs_internal_pool()
+        mock_waitpid.assert_not_called()
+        mock_start.assert_not_called()
+
+
+@mock.patch("pcs.daemon.run.time.sleep")
+@mock.patch("pcs.daemon.run.start_pcs_internal_pool", return_value=200)
+@mock.patch("pcs.daemon.run.os.wait")
+@mock.patch("pcs.daemon.run.os.fork", side_effect=[11, 12])
+class RunWorkers(TestCase):
+    def setUp(self):
+        patcher = mock.patch.multiple(
+            run.SignalInfo, pcs_internal_pool_pid=100, worker_pids={}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_pcs_internal_pool_restarted(
+        self, mock_fork, mock_wait, mock_start, mock_sleep
+    ):
+        # pylint: disable=unused-argument
+        mock_wait.side_effect = [(100, 9), (11, 0), (12, 0)]
+        self.assertIsNone(run.run_workers(2))
+        mock_start.assert_called_once_with()
+        self.assertEqual(200, run.SignalInfo.pcs_internal_pool_pid)
+
+    def test_worker_crashed_restarted(
+        self, mock_fork, mock_wait, mock_start, mock_sleep
+    ):
+        # pylint: disable=unused-argument
+        mock_fork.side_effect = [11, 12, 13]
+        # exit code 1, an uncaught exception in a running worker
+        mock_wait.side_effect = [(11, 256), (12, 0), (13, 0)]
+        self.assertIsNone(run.run_workers(2))
+        self.assertEqual(3, mock_fork.call_count)
+        mock_start.assert_not_called()
+
+    def test_worker_start_failed(
+        self, mock_fork, mock_wait, mock_start, mock_sleep
+    ):
+        # pylint: disable=unused-argument
+        mock_wait.side_effect = [(11, run.WORKER_START_FAILED << 8)]
+        with mock.patch("pcs.daemon.run.os.kill") as mock_kill:
+            with self.assertRaises(SystemExit):
+                run.run_workers(2)
+        self.assertEqual(2, mock_kill.call_count)
@@ -1,5 +1,9 @@
-from unittest import TestCase
+from unittest import mock, TestCase
 from contextlib import contextmanager
+import os.path
+import shutil
+import sqlite3
+import tempfile
 
 from pcs_test.tools.misc import create_setup_patch_mixin
 
@@ -131,3 +135,108 @@ class StorageTest(TestCase, AssertMixin, PatchSessionMixin):
         session2 = self.storage.rejected_user(session1.sid, USER)
         self.assert_login_failed_session(session2, USER)
         self.assertEqual(session1.sid, session2.sid)
+
+
+class StorageDropExpiredTest(TestCase, PatchSessionMixin):
+    def setUp(self):
+        self.now = self.setup_patch("now", return_value=0)
+        self.storage = session.Storage(lifetime_seconds=10)
+
+    def test_refreshed_session_not_dropped(self):
+        session1 = self.storage.provide()
+        session2 = self.storage.provide()
+        self.now.return_value = 8
+        self.storage.provide(session1.sid)
+        self.now.return_value = 12
+        self.storage.drop_expired()
+        self.assertIs(session1, self.storage.provide(session1.sid))
+        self.assertIsNot(session2, self.storage.provide(session2.sid))
+
+
+class SharedStorageTest(TestCase, AssertMixin, PatchSessionMixin):
+    def setUp(self):
+        self.now = self.setup_patch("now", return_value=0)
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        self.path = os.path.join(tmp_dir, "sessions")
+        self.storage = session.SharedStorage(10, self.path)
+
+    def test_creates_vanilla_session_when_sid_not_specified(self):
+        self.assert_vanila_session(self.storage.provide())
+
+    def test_does_not_accept_foreign_sid(self):
+        session1 = self.storage.provide("unknown_sid")
+        self.assertNotEqual(session1.sid, "unknown_sid")
+        self.assert_vanila_session(session1)
+
+    def test_files_private(self):
+        old_umask = os.umask(0o022)
+        try:
+            self.storage.login(None, USER, GROUPS)
+        finally:
+            os.umask(old_umask)
+        for path in (self.path, f"{self.path}-wal", f"{self.path}-shm"):
+            with self.subTest(path=path):
+                self.assertEqual(0o600, os.stat(path).st_mode & 0o777)
+
+    def test_existing_file_made_private(self):
+        os.close(os.open(self.path, os.O_CREAT, 0o644))
+        os.chmod(self.path, 0o644)
+        self.storage.provide()
+        self.assertEqual(0o600, os.stat(self.path).st_mode & 0o777)
+
+    def test_shared_by_storages(self):
+        session1 = self.storage.login(None, USER, GROUPS)
+        session2 = session.SharedStorage(10, self.path).provide(session1.sid)
+        self.assertEqual(session1.sid, session2.sid)
+        self.assertEqual(session1.ajax_id, session2.ajax_id)
+        self.assert_authenticated_session(session2, USER, GROUPS)
+
+    def test_can_destroy_session(self):
+        session1 = self.storage.provide()
+        self.storage.destroy(session1.sid)
+        self.assertNotEqual(
+            session1.sid, self.storage.provide(session1.sid).sid
+        )
+
+    def test_can_drop_expired_sessions(self):
+        session1 = self.storage.provide()
+        self.now.return_value = 5
+        session2 = self.storage.provide()
+        self.now.return_value = 12
+        self.storage.drop_expired()
+        self.now.return_value = 0
+        self.assertNotEqual(
+            session1.sid, self.storage.provide(session1.sid).sid
+        )
+        self.assertEqual(session2.sid, self.storage.provide(session2.sid).sid)
+
+    def test_expired_session_not_provided(self):
+        session1 = self.storage.provide()
+        self.now.return_value = 8
+        self.assertEqual(session1.sid, self.storage.provide(session1.sid).sid)
+        self.now.return_value = 17
+        self.assertEqual(session1.sid, self.storage.provide(session1.sid).sid)
+        self.now.return_value = 28
+        self.assertNotEqual(
+            session1.sid, self.storage.provide(session1.sid).sid
+        )
+
+    def test_can_sign_failed_login_attempt_existing_session(self):
+        session1 = self.storage.provide()
+        session2 = self.storage.rejected_user(session1.sid, USER)
+        self.assert_login_failed_session(session2, USER)
+        self.assertEqual(session1.sid, session2.sid)
+        self.assert_login_failed_session(
+            self.storage.provide(session1.sid), USER
+        )
+
+    @mock.patch.object(session.SharedStorage, "busy_timeout_seconds", 0.1)
+    def test_locked_database(self):
+        session1 = self.storage.provide()
+        connection = sqlite3.connect(self.path, isolation_level=None)
+        self.addCleanup(connection.close)
+        connection.execute("BEGIN IMMEDIATE")
+        self.addCleanup(connection.execute, "ROLLBACK")
+        with self.assertRaises(session.StorageError):
+            self.storage.provide(session1.sid)
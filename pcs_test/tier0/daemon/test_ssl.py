@@ -1,7 +1,10 @@
 import os
+import socket
+import ssl
+import threading
 from unittest import mock, TestCase
 
-from OpenSSL import SSL
+from OpenSSL import crypto, SSL
 
 from pcs_test.tools.misc import get_tmp_dir
 
@@ -110,7 +113,59 @@ class PcsdSSLTest(SslFilesMixin, TestCase):
             ]
         )
 
+    def test_files_changed(self):
+        self.pcsd_ssl.guarantee_valid_certs()
+        self.pcsd_ssl.create_context()
+        self.assertFalse(self.pcsd_ssl.files_changed())
+        self.damage_ssl_files()
+        os.utime(self.cert_path, ns=(0, 0))
+        self.assertTrue(self.pcsd_ssl.files_changed())
+        self.pcsd_ssl.mark_files_checked()
+        self.assertFalse(self.pcsd_ssl.files_changed())
+
     def test_context_uses_given_options(self):
         self.pcsd_ssl.guarantee_valid_certs()
         ssl_context = self.pcsd_ssl.create_context()
         self.assertEqual(ssl_context.options, SSL_OPTIONS)
+
+    def get_served_cert(self, server_context):
+        listen_socket = socket.socket()
+        self.addCleanup(listen_socket.close)
+        listen_socket.bind(("127.0.0.1", 0))
+        listen_socket.listen()
+
+        def serve():
+            connection = listen_socket.accept()[0]
+            try:
+                with server_context.wrap_socket(
+                    connection, server_side=True
+                ) as ssl_connection:
+                    ssl_connection.recv(1)
+            except (OSError, ssl.SSLError):
+                pass
+
+        server_thread = threading.Thread(target=serve)
+        server_thread.start()
+        client_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        client_context.check_hostname = False
+        client_context.verify_mode = ssl.CERT_NONE
+        with client_context.wrap_socket(
+            socket.create_connection(listen_socket.getsockname())
+        ) as client:
+            cert = client.getpeercert(binary_form=True)
+            client.send(b"x")
+        server_thread.join()
+        return crypto.dump_certificate(
+            crypto.FILETYPE_PEM,
+            crypto.load_certificate(crypto.FILETYPE_ASN1, cert),
+        )
+
+    def test_new_connections_use_reloaded_certs(self):
+        self.pcsd_ssl.guarantee_valid_certs()
+        server_context = self.pcsd_ssl.create_context()
+        CertKeyPair(self.cert_path, self.key_path).regenerate(SERVER_NAME)
+        self.pcsd_ssl.create_context()
+        with open(self.cert_path, "rb") as cert_file:
+            self.assertEqual(
+                cert_file.read(), self.get_served_cert(server_context)
+            )
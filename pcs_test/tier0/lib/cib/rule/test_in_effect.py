@@ -0,0 +1,157 @@
+import datetime
+from unittest import mock, TestCase
+
+from lxml import etree
+
+from pcs.common.types import CibRuleInEffectStatus
+from pcs.lib.cib.rule import in_effect
+
+UTC = datetime.timezone.utc
+NOW = datetime.datetime(2020, 6, 15, 12, 30, 0, tzinfo=UTC)
+IN_EFFECT = CibRuleInEffectStatus.IN_EFFECT
+EXPIRED = CibRuleInEffectStatus.EXPIRED
+NOT_YET = CibRuleInEffectStatus.NOT_YET_IN_EFFECT
+UNKNOWN = CibRuleInEffectStatus.UNKNOWN
+
+
+def _rule(rule_id, content):
+    return etree.fromstring(f'<rule id="{rule_id}">{content}</rule>')
+
+
+def _date_expr(operation, start=None, end=None, content=""):
+    attrs = [f'operation="{operation}"']
+    if start:
+        attrs.append(f'start="{start}"')
+    if end:
+        attrs.append(f'end="{end}"')
+    return "<date_expression {0}>{1}</date_expression>".format(
+        " ".join(attrs), content
+    )
+
+
+class EvaluateRulesInEffect(TestCase):
+    def assert_status(self, expected_status, content):
+        self.assertEqual(
+            {"r": expected_status},
+            in_effect.evaluate_rules_in_effect([_rule("r", content)], NOW),
+        )
+
+    def test_gt(self):
+        self.assert_status(IN_EFFECT, _date_expr("gt", start="2020-06-15"))
+        self.assert_status(NOT_YET, _date_expr("gt", start="2020-06-15 13:00Z"))
+
+    def test_lt(self):
+        self.assert_status(IN_EFFECT, _date_expr("lt", end="2020-W26-1Z"))
+        self.assert_status(EXPIRED, _date_expr("lt", end="2020-167Z"))
+
+    def test_in_range(self):
+        self.assert_status(
+            IN_EFFECT, _date_expr("in_range", "2020-06-01Z", "2020-07-01Z")
+        )
+        self.assert_status(
+            EXPIRED, _date_expr("in_range", "2005-001", "2006-001")
+        )
+        self.assert_status(
+            NOT_YET, _date_expr("in_range", "2020-06-15T12:30:01Z")
+        )
+        self.assert_status(
+            EXPIRED, _date_expr("in_range", end="2020-06-15 14:00:00+02:00")
+        )
+
+    def test_in_range_duration(self):
+        self.assert_status(
+            EXPIRED,
+            _date_expr(
+                "in_range",
+                start="2020-03-31Z",
+                content='<duration id="d" months="2" days="15"/>',
+            ),
+        )
+        self.assert_status(
+            IN_EFFECT,
+            _date_expr(
+                "in_range",
+                start="2020-03-31Z",
+                content='<duration id="d" months="2" days="16"/>',
+            ),
+        )
+
+    def test_date_spec(self):
+        def date_spec(**attrs):
+            return _date_expr(
+                "date_spec",
+                content="<date_spec id='s' {0}/>".format(
+                    " ".join(f'{key}="{val}"' for key, val in attrs.items())
+                ),
+            )
+
+        self.assert_status(EXPIRED, date_spec(years="2005"))
+        self.assert_status(NOT_YET, date_spec(years="3005"))
+        self.assert_status(IN_EFFECT, date_spec(years="2019-"))
+        self.assert_status(EXPIRED, date_spec(years="2020", months="1-3"))
+        self.assert_status(UNKNOWN, date_spec(months="1-3"))
+        self.assert_status(UNKNOWN, date_spec(years="2020", moon="1"))
+        self.assert_status(None, date_spec(years="twenty"))
+
+    def test_not_exactly_one_date_expression(self):
+        self.assert_status(
+            UNKNOWN, '<expression attribute="a" operation="defined"/>'
+        )
+        self.assert_status(
+            UNKNOWN,
+            _date_expr("gt", start="2020-01-01")
+            + _date_expr("lt", end="2021-01-01"),
+        )
+
+    def test_no_operation(self):
+        # the same as crm_rule
+        self.assert_status(
+            UNKNOWN, '<date_expression start="2020-06-01Z" end="2020-07-01Z"/>',
+        )
+
+    def test_undetermined(self):
+        self.assert_status(None, _date_expr("gt", start="yesterday"))
+        self.assert_status(None, _date_expr("gt", start="2020-02-30"))
+        self.assert_status(None, _date_expr("gt"))
+        self.assert_status(None, _date_expr("in_range"))
+
+    def test_local_time(self):
+        # dates without a time zone are in the local time
+        local_now = NOW.astimezone()
+        self.assert_status(
+            EXPIRED,
+            _date_expr("lt", end=local_now.strftime("%Y-%m-%d %H:%M:%S"),),
+        )
+
+
+class GetRulesInEffectStatus(TestCase):
+    def test_pacemaker_only_for_undetermined(self):
+        checker = mock.Mock(return_value={"r2": EXPIRED})
+        self.assertEqual(
+            {"r1": IN_EFFECT, "r2": EXPIRED, "r3": UNKNOWN},
+            in_effect.get_rules_in_effect_status(
+                [
+                    _rule("r1", _date_expr("gt", start="2020-01-01")),
+                    _rule("r2", _date_expr("gt", start="someday")),
+                    _rule("r3", ""),
+                ],
+                checker,
+                NOW,
+            ),
+        )
+        checker.assert_called_once_with(["r2"])
+
+    def test_no_pacemaker(self):
+        self.assertEqual(
+            {"r1": UNKNOWN},
+            in_effect.get_rules_in_effect_status(
+                [_rule("r1", _date_expr("gt", start="someday"))], now=NOW
+            ),
+        )
+
+    def test_all_native(self):
+        checker = mock.Mock()
+        in_effect.get_rules_in_effect_status(
+            [_rule("r1", _date_expr("gt", start="2020-01-01"))], checker, NOW
+        )
+        checker.assert_not_called()
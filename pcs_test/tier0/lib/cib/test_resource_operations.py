@@ -9,6 +9,7 @@ from pcs_test.tools.misc import create_patcher
 
 from pcs.common.reports import codes as report_codes
 from pcs.lib.cib.resource import operations
+from pcs.lib.cib.tools import IdProvider
 from pcs.common.reports import ReportItemSeverity as severities
 from pcs.lib.validate import ValuePair
 
@@ -494,3 +495,57 @@ class GetResourceOperations(TestCase):
         self.assert_op_list(
             operations.get_resource_operations(self.resource_noop_el), []
         )
+
+
+class CreateOperations(TestCase):
+    def setUp(self):
+        self.cib = etree.fromstring(
+            """
+            <cib><configuration><resources>
+                <primitive id="R" class="ocf" provider="pacemaker"
+                    type="Dummy"
+                />
+            </resources></configuration></cib>
+            """
+        )
+        self.primitive = self.cib.find(".//primitive")
+        self.id_provider = IdProvider(self.cib)
+
+    def test_explicit_id_not_allocated_again(self):
+        self.id_provider.allocate_id("R-instance_attributes")
+        operations.create_operations(
+            self.primitive,
+            self.id_provider,
+            [
+                {
+                    "name": "monitor",
+                    "interval": "10s",
+                    "id": "R-start-interval-0s",
+                },
+                {"name": "start", "interval": "0s"},
+            ],
+        )
+        self.assertEqual(
+            ["R-start-interval-0s", "R-start-interval-0s-1"],
+            [op.get("id") for op in self.primitive.iterfind(".//op")],
+        )
+
+    def test_explicit_id_used_by_allocated_id(self):
+        self.id_provider.allocate_id("R-monitor")
+        with self.assertRaises(operations.LibraryError) as cm:
+            operations.create_operations(
+                self.primitive,
+                self.id_provider,
+                [{"name": "monitor", "interval": "10s", "id": "R-monitor"}],
+            )
+        assert_report_item_list_equal(
+            cm.exception.args,
+            [
+                (
+                    severities.ERROR,
+                    report_codes.ID_ALREADY_EXISTS,
+                    {"id": "R-monitor"},
+                    None,
+                ),
+            ],
+        )
@@ -109,6 +109,110 @@ class IdProviderAllocate(IdProviderTest):
         assert_report_item_list_equal(self.provider.book_ids("myId-1"), [])
         self.assertEqual("myId-2", self.provider.allocate_id("myId"))
 
+    def test_id_booked_after_ids_read(self):
+        self.assertEqual("other", self.provider.allocate_id("other"))
+        assert_report_item_list_equal(self.provider.book_ids("myId"), [])
+        self.fixture_add_primitive_with_id("myId")
+        self.assertEqual("myId-1", self.provider.allocate_id("myId"))
+
+    def test_existing_remote_node(self):
+        self.cib.append_to_first_tag_name(
+            "resources",
+            """
+            <primitive id="myId">
+                <meta_attributes id="myId-meta">
+                    <nvpair id="myId-nvp" name="remote-node" value="node1"/>
+                </meta_attributes>
+            </primitive>
+            """,
+        )
+        self.assertEqual("node1-1", self.provider.allocate_id("node1"))
+
+    def test_ids_read_once(self):
+        for _id in ("myId", "myId-1", "myId-2"):
+            self.fixture_add_primitive_with_id(_id)
+        with mock.patch.object(
+            lib, "get_configuration_ids", wraps=lib.get_configuration_ids
+        ) as mock_get_ids:
+            self.assertEqual(
+                ["myId-3", "myId-4", "other", "myId-5"],
+                [
+                    self.provider.allocate_id("myId"),
+                    self.provider.allocate_id("myId"),
+                    self.provider.allocate_id("other"),
+                    self.provider.allocate_id("myId"),
+                ],
+            )
+            assert_report_item_list_equal(
+                self.provider.book_ids("myId-6", "myId-2"),
+                [self.fixture_report("myId-2")],
+            )
+            self.assertEqual("myId-7", self.provider.allocate_id("myId"))
+        self.assertEqual(1, mock_get_ids.call_count)
+
+    def test_no_xpath_per_allocation(self):
+        self.cib.append_to_first_tag_name(
+            "resources",
+            *[
+                '<primitive id="R{0}" class="ocf" provider="heartbeat" '
+                'type="Dummy"/>'.format(i)
+                for i in range(2000)
+            ],
+        )
+        with mock.patch.object(
+            lib, "get_configuration_ids", wraps=lib.get_configuration_ids
+        ) as mock_get_ids, mock.patch.object(
+            lib,
+            "get_configuration_elements_by_id",
+            wraps=lib.get_configuration_elements_by_id,
+        ) as mock_get_elements:
+            for i in range(500):
+                self.assertEqual(
+                    "new{0}".format(i),
+                    self.provider.allocate_id("new{0}".format(i)),
+                )
+                self.assertEqual(
+                    "R{0}-1".format(i),
+                    self.provider.allocate_id("R{0}".format(i)),
+                )
+        self.assertEqual(
+            1, mock_get_ids.call_count + mock_get_elements.call_count
+        )
+
+
+class GetConfigurationIdsTest(TestCase):
+    def test_success(self):
+        tree = etree.fromstring(
+            """
+            <cib>
+                <configuration>
+                    <resources>
+                        <primitive id="R">
+                            <meta_attributes id="R-meta">
+                                <nvpair id="R-nvp" name="remote-node"
+                                    value="node1"
+                                />
+                                <nvpair id="R-nvp2" name="other" value="x"/>
+                            </meta_attributes>
+                        </primitive>
+                    </resources>
+                    <acls>
+                        <acl_target id="target1">
+                            <role id="role1"/>
+                        </acl_target>
+                    </acls>
+                </configuration>
+                <status>
+                    <node_state id="status-1"/>
+                </status>
+            </cib>
+            """
+        )
+        self.assertEqual(
+            {"R", "R-meta", "R-nvp", "R-nvp2", "node1"},
+            lib.get_configuration_ids(tree),
+        )
+
 
 class DoesIdExistTest(CibToolsTest):
     def test_existing_id(self):
@@ -2279,6 +2279,58 @@ class SetupWithWait(TestCase):
             ]
         )
 
+    @mock.patch.object(settings, "wait_for_node_startup_interval_initial", 1)
+    @mock.patch.object(settings, "wait_for_node_startup_interval_max", 8)
+    @mock.patch("time.time", get_time_mock())
+    @mock.patch("time.sleep")
+    def test_intervals_start_over_when_node_starts(self, mock_sleep):
+        (
+            self.config.http.host.check_pacemaker_started(
+                pacemaker_started_node_list=NODE_LIST[:1],
+                pacemaker_not_started_node_list=NODE_LIST[1:],
+            )
+            .http.host.check_pacemaker_started(
+                pacemaker_not_started_node_list=NODE_LIST[1:],
+                name="pcmk_status_check_1",
+            )
+            .http.host.check_pacemaker_started(
+                pacemaker_not_started_node_list=NODE_LIST[1:],
+                name="pcmk_status_check_2",
+            )
+            .http.host.check_pacemaker_started(
+                pacemaker_started_node_list=NODE_LIST[1:],
+                name="pcmk_status_check_3",
+            )
+        )
+        cluster.setup(
+            self.env_assist.get_env(),
+            CLUSTER_NAME,
+            [dict(name=node, addrs=None) for node in NODE_LIST],
+            start=True,
+            wait=20,
+        )
+        self.assertEqual(
+            [mock.call(1), mock.call(1), mock.call(2), mock.call(4)],
+            mock_sleep.call_args_list,
+        )
+        self.env_assist.assert_reports(
+            reports_success_minimal_fixture()
+            + [
+                fixture.info(
+                    reports.codes.CLUSTER_START_STARTED,
+                    host_name_list=sorted(NODE_LIST),
+                ),
+                fixture.info(
+                    reports.codes.WAIT_FOR_NODE_STARTUP_STARTED,
+                    node_name_list=NODE_LIST,
+                ),
+            ]
+            + [
+                fixture.info(reports.codes.CLUSTER_START_SUCCESS, node=node,)
+                for node in NODE_LIST
+            ]
+        )
+
     @mock.patch("time.sleep", lambda secs: None)
     @mock.patch("time.time", get_time_mock())
     def test_fails(self):
@@ -240,6 +240,36 @@ class DefaultsConfigMixin:
         )
         self.assertEqual([], self.command(self.env_assist.get_env()))
 
+    def test_rule_expired(self):
+        defaults_xml = f"""
+            <{self.tag}>
+                <meta_attributes id="expired">
+                    <rule id="expired-rule">
+                        <date_expression id="expired-rule-expr"
+                            operation="lt" end="2000-01-01"
+                        />
+                    </rule>
+                </meta_attributes>
+                <meta_attributes id="in-effect">
+                    <rule id="in-effect-rule">
+                        <date_expression id="in-effect-rule-expr"
+                            operation="gt" start="2000-01-01"
+                        />
+                    </rule>
+                </meta_attributes>
+            </{self.tag}>
+        """
+        self.config.runner.cib.load(
+            filename="cib-empty-3.4.xml", optional_in_conf=defaults_xml
+        )
+        self.assertEqual(
+            [("expired", True), ("in-effect", False)],
+            [
+                (nvset_dto.id, nvset_dto.rule.is_expired)
+                for nvset_dto in self.command(self.env_assist.get_env())
+            ],
+        )
+
     def test_full(self):
         defaults_xml = f"""
             <{self.tag}>
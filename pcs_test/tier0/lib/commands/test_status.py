@@ -1,10 +1,13 @@
 from textwrap import dedent
-from unittest import TestCase
+import threading
+from unittest import mock, TestCase
 
 from pcs import settings
 from pcs.common import file_type_codes
 from pcs.common.reports import codes as report_codes
 from pcs.lib.commands import status
+from pcs.lib.errors import LibraryError
+from pcs.lib.external import ServiceStatus
 from pcs_test.tools import fixture
 from pcs_test.tools.command_env import get_env_tools
 from pcs_test.tools.misc import read_test_resource as rc_read
@@ -46,9 +49,6 @@ class FullClusterStatusPlaintext(TestCase):
                 </resources>
             """
             )
-            .runner.systemctl.is_active(
-                "sbd", is_active=False, name="runner.systemctl.is_active.sbd"
-            )
         )
 
     def _fixture_config_live_remote_minimal(self):
@@ -65,9 +65,6 @@ class FullClusterStatusPlaintext(TestCase):
                 </resources>
             """,
             )
-            .runner.systemctl.is_active(
-                "sbd", is_active=False, name="runner.systemctl.is_active.sbd"
-            )
         )
 
     def _fixture_config_local_daemons(
@@ -84,57 +81,18 @@ class FullClusterStatusPlaintext(TestCase):
         sbd_active=False,
     ):
         # pylint: disable=too-many-arguments
-        (
-            self.config.runner.systemctl.is_enabled(
-                "corosync",
-                name="runner.systemctl.is_enabled.corosync",
-                is_enabled=corosync_enabled,
-            )
-            .runner.systemctl.is_active(
-                "corosync",
-                name="runner.systemctl.is_active.corosync",
-                is_active=corosync_active,
-            )
-            .runner.systemctl.is_enabled(
-                "pacemaker",
-                name="runner.systemctl.is_enabled.pacemaker",
-                is_enabled=pacemaker_enabled,
-            )
-            .runner.systemctl.is_active(
-                "pacemaker",
-                name="runner.systemctl.is_active.pacemaker",
-                is_active=pacemaker_active,
-            )
-            .runner.systemctl.is_enabled(
-                "pacemaker_remote",
-                name="runner.systemctl.is_enabled.pacemaker_remote",
-                is_enabled=pacemaker_remote_enabled,
-            )
-            .runner.systemctl.is_active(
-                "pacemaker_remote",
-                name="runner.systemctl.is_active.pacemaker_remote",
-                is_active=pacemaker_remote_active,
-            )
-            .runner.systemctl.is_enabled(
-                "pcsd",
-                name="runner.systemctl.is_enabled.pcsd",
-                is_enabled=pcsd_enabled,
-            )
-            .runner.systemctl.is_active(
-                "pcsd",
-                name="runner.systemctl.is_active.pcsd",
-                is_active=pcsd_active,
-            )
-            .runner.systemctl.is_enabled(
-                "sbd",
-                name="runner.systemctl.is_enabled.sbd_2",
-                is_enabled=sbd_enabled,
-            )
-            .runner.systemctl.is_active(
-                "sbd",
-                name="runner.systemctl.is_active.sbd_2",
-                is_active=sbd_active,
-            )
+        self.config.runner.systemctl.show_services_status(
+            [
+                ("corosync", corosync_enabled, corosync_active),
+                ("pacemaker", pacemaker_enabled, pacemaker_active),
+                (
+                    "pacemaker_remote",
+                    pacemaker_remote_enabled,
+                    pacemaker_remote_active,
+                ),
+                ("pcsd", pcsd_enabled, pcsd_active),
+                ("sbd", sbd_enabled, sbd_active),
+            ]
         )
 
     def test_life_cib_mocked_corosync(self):
@@ -266,9 +224,6 @@ class FullClusterStatusPlaintext(TestCase):
             """
             )
             .runner.pcmk.load_ticket_state_plaintext(stdout="ticket status")
-            .runner.systemctl.is_active(
-                "sbd", is_active=False, name="runner.systemctl.is_active.sbd"
-            )
         )
         self._fixture_config_local_daemons()
         (
@@ -344,9 +299,6 @@ class FullClusterStatusPlaintext(TestCase):
             """,
             )
             .runner.pcmk.load_ticket_state_plaintext(stdout="ticket status")
-            .runner.systemctl.is_active(
-                "sbd", is_active=False, name="runner.systemctl.is_active.sbd"
-            )
         )
         self._fixture_config_local_daemons(
             corosync_enabled=False,
@@ -450,9 +402,6 @@ class FullClusterStatusPlaintext(TestCase):
             """
             )
             .runner.pcmk.load_ticket_state_plaintext(stdout="ticket status")
-            .runner.systemctl.is_active(
-                "sbd", is_active=False, name="runner.systemctl.is_active.sbd"
-            )
         )
         self._fixture_config_local_daemons()
         (
@@ -506,9 +455,6 @@ class FullClusterStatusPlaintext(TestCase):
             .runner.pcmk.load_ticket_state_plaintext(
                 stdout="ticket stdout", stderr=stderr, returncode=1
             )
-            .runner.systemctl.is_active(
-                "sbd", is_active=False, name="runner.systemctl.is_active.sbd"
-            )
         )
         self._fixture_config_local_daemons()
         (
@@ -558,9 +504,6 @@ class FullClusterStatusPlaintext(TestCase):
             .fs.exists(settings.corosync_conf_file, return_value=True)
             .corosync_conf.load()
             .runner.cib.load()
-            .runner.systemctl.is_active(
-                "sbd", is_active=False, name="runner.systemctl.is_active.sbd"
-            )
         )
         self._fixture_config_local_daemons()
 
@@ -590,11 +533,8 @@ class FullClusterStatusPlaintext(TestCase):
             .fs.exists(settings.corosync_conf_file, return_value=True)
             .corosync_conf.load()
             .runner.cib.load()
-            .runner.systemctl.is_active(
-                "sbd", is_active=True, name="runner.systemctl.is_active.sbd"
-            )
         )
-        self._fixture_config_local_daemons()
+        self._fixture_config_local_daemons(sbd_enabled=True, sbd_active=True)
 
         self.assertEqual(
             status.full_cluster_status_plaintext(self.env_assist.get_env()),
@@ -606,7 +546,8 @@ class FullClusterStatusPlaintext(TestCase):
                 Daemon Status:
                   corosync: active/enabled
                   pacemaker: active/enabled
-                  pcsd: active/enabled"""
+                  pcsd: active/enabled
+                  sbd: active/enabled"""
             ),
         )
 
@@ -640,9 +581,6 @@ class FullClusterStatusPlaintext(TestCase):
                 </resources>
             """
             )
-            .runner.systemctl.is_active(
-                "sbd", is_active=False, name="runner.systemctl.is_active.sbd"
-            )
         )
         self._fixture_config_local_daemons()
 
@@ -685,9 +623,6 @@ class FullClusterStatusPlaintext(TestCase):
             """
             )
             .runner.pcmk.load_ticket_state_plaintext(stdout="ticket status")
-            .runner.systemctl.is_active(
-                "sbd", is_active=False, name="runner.systemctl.is_active.sbd"
-            )
         )
         self._fixture_config_local_daemons()
         (
@@ -794,3 +729,82 @@ class FullClusterStatusPlaintext(TestCase):
                   pcsd: inactive/disabled"""
             ),
         )
+
+
+class RunLoaders(TestCase):
+    def setUp(self):
+        self.order = []
+
+    def loader(self, name):
+        return lambda: self.order.append(name)
+
+    def test_not_concurrent(self):
+        # pylint: disable=protected-access
+        status._run_loaders(
+            [
+                [self.loader("a1"), self.loader("a2")],
+                [self.loader("b1")],
+                [self.loader("c1"), self.loader("c2"), self.loader("c3")],
+            ],
+            False,
+        )
+        self.assertEqual(["a1", "b1", "c1", "a2", "c2", "c3"], self.order)
+
+    def test_concurrent(self):
+        # pylint: disable=protected-access
+        # each loader waits for the other chain, so the chains must run at
+        # the same time
+        barrier = threading.Barrier(2, timeout=5)
+        status._run_loaders(
+            [
+                [barrier.wait, self.loader("a1"), self.loader("a2")],
+                [barrier.wait, self.loader("b1")],
+            ],
+            True,
+        )
+        self.assertEqual(["a1", "a2", "b1"], sorted(self.order))
+        self.assertLess(self.order.index("a1"), self.order.index("a2"))
+
+    def test_concurrent_error(self):
+        # pylint: disable=protected-access
+        error1 = LibraryError()
+        error2 = LibraryError()
+        loader_b = mock.Mock()
+        with self.assertRaises(LibraryError) as cm:
+            status._run_loaders(
+                [
+                    [self.loader("a1")],
+                    [mock.Mock(side_effect=error1), loader_b],
+                    [mock.Mock(side_effect=error2)],
+                ],
+                True,
+            )
+        self.assertIs(error1, cm.exception)
+        loader_b.assert_not_called()
+        self.assertEqual(["a1"], self.order)
+
+
+@mock.patch("pcs.lib.commands.status.get_sbd_service_name", lambda: "sbd")
+@mock.patch("pcs.lib.commands.status.get_services_status")
+class GetLocalServicesStatus(TestCase):
+    # pylint: disable=protected-access
+    def test_failed_service_skipped(self, mock_get_status):
+        def get_status(runner, service_list):
+            del runner
+            if "pcsd" in service_list:
+                raise LibraryError()
+            return {
+                service: ServiceStatus(True, service == "corosync")
+                for service in service_list
+            }
+
+        mock_get_status.side_effect = get_status
+        self.assertEqual(
+            [
+                ("corosync", True, True, True),
+                ("pacemaker", True, True, False),
+                ("pacemaker_remote", False, True, False),
+                ("sbd", False, True, False),
+            ],
+            status._get_local_services_status("runner"),
+        )
@@ -28,8 +28,7 @@ class TestListAgents(TestCase):
         self.lib_env = LibraryEnvironment(self.mock_logger, self.mock_reporter)
 
     def tearDown(self):
-        # pylint: disable=protected-access
-        lib_ra.StonithAgent._fenced_metadata = None
+        lib_ra.StonithAgent.clear_fenced_metadata_cache()
 
     def test_list_all(self):
         self.assertEqual(
@@ -163,8 +162,7 @@ class TestDescribeAgent(TestCase):
         }
 
     def tearDown(self):
-        # pylint: disable=protected-access
-        lib_ra.StonithAgent._fenced_metadata = None
+        lib_ra.StonithAgent.clear_fenced_metadata_cache()
 
     def test_success(self, mock_metadata):
         mock_metadata.return_value = self.metadata
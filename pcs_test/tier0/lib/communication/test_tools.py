@@ -0,0 +1,68 @@
+from unittest import mock, TestCase
+
+from pcs.common.node_communicator import RequestData, RequestTarget
+from pcs.lib.communication.tools import (
+    AllSameDataMixin,
+    HedgedStrategyMixin,
+    RunRemotelyBase,
+)
+
+
+class HedgedCommand(AllSameDataMixin, HedgedStrategyMixin, RunRemotelyBase):
+    def __init__(self, report_processor):
+        super().__init__(report_processor)
+        self.processed_list = []
+
+    def _get_request_data(self):
+        return RequestData("remote/action")
+
+    def _process_response(self, response):
+        self.processed_list.append(response.request.host_label)
+        if response.data != "ok":
+            return self._get_next_list()
+        return []
+
+
+class HedgedStrategyMixinTest(TestCase):
+    def setUp(self):
+        self.cmd = HedgedCommand(mock.Mock())
+        self.cmd.set_targets([RequestTarget("node1"), RequestTarget("node2")])
+        (self.request,) = self.cmd.get_initial_request_list()
+        self.hedge = self.request.hedge
+
+    @staticmethod
+    def fixture_response(request, data):
+        return mock.Mock(request=request, data=data)
+
+    def test_initial_request(self):
+        self.assertEqual("node1", self.request.host_label)
+        self.assertFalse(self.hedge.is_finished)
+        self.assertTrue(self.hedge.has_waiting)
+
+    def test_done(self):
+        self.assertEqual(
+            [], self.cmd.on_response(self.fixture_response(self.request, "ok"))
+        )
+        self.assertTrue(self.hedge.is_finished)
+        self.assertFalse(self.hedge.has_waiting)
+
+    def test_next_request(self):
+        (next_request,) = self.cmd.on_response(
+            self.fixture_response(self.request, "error")
+        )
+        self.assertEqual("node2", next_request.host_label)
+        self.assertIs(self.hedge, next_request.hedge)
+        self.assertFalse(self.hedge.is_finished)
+        self.assertEqual(
+            [], self.cmd.on_response(self.fixture_response(next_request, "x"))
+        )
+        self.assertFalse(self.hedge.is_finished)
+
+    def test_response_after_done(self):
+        # node2 has been started by the communicator as a hedge
+        (hedge_request,) = self.hedge.get_next_list()
+        self.cmd.on_response(self.fixture_response(hedge_request, "ok"))
+        self.assertEqual(
+            [], self.cmd.on_response(self.fixture_response(self.request, "ok"))
+        )
+        self.assertEqual(["node2"], self.cmd.processed_list)
@@ -0,0 +1,168 @@
+import os
+import os.path
+import shutil
+import tempfile
+from unittest import mock, TestCase
+
+from pcs import settings
+from pcs.lib.external import CommandRunner
+from pcs.lib.pacemaker import capability_cache
+import pcs.lib.pacemaker.live as lib_live
+
+
+class CapabilityCacheTest(TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        self.cache_path = os.path.join(self.cache_dir, "dir", "cache.json")
+        self.tool = os.path.join(self.cache_dir, "crm_resource")
+        with open(self.tool, "w") as tool_file:
+            tool_file.write("#!/bin/sh\n")
+        self.cache = capability_cache.CapabilityCache()
+        self.cache.enable(self.cache_path)
+        self.probe = mock.Mock(return_value=True)
+
+    def get(self, cache=None, capability="--wait", tool=None):
+        return (cache or self.cache).get(
+            tool or self.tool, capability, self.probe
+        )
+
+    def get_in_new_process(self, capability="--wait"):
+        cache = capability_cache.CapabilityCache()
+        cache.enable(self.cache_path)
+        return self.get(cache, capability)
+
+    def test_probe_once(self):
+        self.assertTrue(self.get())
+        self.assertTrue(self.get())
+        self.probe.assert_called_once_with()
+
+    def test_false_is_cached(self):
+        self.probe.return_value = False
+        self.assertFalse(self.get())
+        self.assertFalse(self.get_in_new_process())
+        self.probe.assert_called_once_with()
+
+    def test_unknown_not_cached(self):
+        self.probe.return_value = None
+        self.assertFalse(self.get())
+        self.probe.return_value = True
+        self.assertTrue(self.get())
+        self.assertTrue(self.get_in_new_process())
+        self.assertEqual(2, self.probe.call_count)
+
+    def test_shared_on_disk(self):
+        self.get()
+        self.assertTrue(self.get_in_new_process())
+        self.probe.assert_called_once_with()
+
+    def test_more_capabilities(self):
+        self.get()
+        self.probe.return_value = False
+        self.assertFalse(self.get(capability="--expired"))
+        self.assertTrue(self.get_in_new_process())
+        self.assertFalse(self.get_in_new_process("--expired"))
+        self.assertEqual(2, self.probe.call_count)
+
+    def test_tool_changed(self):
+        self.get()
+        os.utime(self.tool, ns=(0, 0))
+        self.get()
+        self.get_in_new_process()
+        self.assertEqual(2, self.probe.call_count)
+
+    def test_tool_missing(self):
+        self.get(tool="/nonexistent/crm_resource")
+        self.get(tool="/nonexistent/crm_resource")
+        self.assertEqual(2, self.probe.call_count)
+        self.assertFalse(os.path.exists(self.cache_path))
+
+    def test_corrupted_file(self):
+        self.get()
+        with open(self.cache_path, "w") as cache_file:
+            cache_file.write("{not json")
+        self.get_in_new_process()
+        self.assertEqual(2, self.probe.call_count)
+        self.get_in_new_process()
+        self.assertEqual(2, self.probe.call_count)
+
+    def test_probe_error(self):
+        self.probe.side_effect = OSError("error")
+        self.assertRaises(OSError, self.get)
+        self.assertRaises(OSError, self.get)
+        self.assertEqual(2, self.probe.call_count)
+
+    def test_memory_only(self):
+        self.cache.enable()
+        self.get()
+        self.get()
+        self.probe.assert_called_once_with()
+        self.assertFalse(os.path.exists(self.cache_path))
+
+    def test_disabled(self):
+        self.cache.disable()
+        self.get()
+        self.get()
+        self.assertEqual(2, self.probe.call_count)
+        self.assertFalse(os.path.exists(self.cache_path))
+
+
+class PacemakerToolHelpCacheTest(TestCase):
+    def setUp(self):
+        binaries_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, binaries_dir)
+        for tool in ("crm_resource", "stonith_admin"):
+            with open(os.path.join(binaries_dir, tool), "w") as tool_file:
+                tool_file.write("#!/bin/sh\n")
+        cache = capability_cache.CapabilityCache()
+        cache.enable()
+        for patcher in (
+            mock.patch.object(
+                capability_cache, "_process_capability_cache", cache
+            ),
+            mock.patch.object(settings, "pacemaker_binaries", binaries_dir),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.binaries_dir = binaries_dir
+        self.runner = mock.MagicMock(spec_set=CommandRunner)
+        self.runner.run.return_value = (
+            "",
+            "--wait --history --broadcast --cleanup",
+            1,
+        )
+
+    def test_wait_probed_once(self):
+        for _ in range(2):
+            self.assertTrue(lib_live.has_wait_for_idle_support(self.runner))
+            self.assertFalse(
+                lib_live.has_resource_unmove_unban_expired_support(self.runner)
+            )
+        self.assertEqual(
+            [
+                mock.call(
+                    [os.path.join(self.binaries_dir, "crm_resource"), "-?"]
+                ),
+            ]
+            * 2,
+            self.runner.run.call_args_list,
+        )
+
+    def test_fence_history_probed_once(self):
+        for _ in range(2):
+            self.assertTrue(
+                lib_live.is_fence_history_supported_management(self.runner)
+            )
+        self.runner.run.assert_called_once_with(
+            [os.path.join(self.binaries_dir, "stonith_admin"), "--help-all"]
+        )
+
+    def test_failed_help_not_cached(self):
+        self.runner.run.side_effect = [
+            ("", "", -9),
+            ("", "--wait --history --broadcast --cleanup", 1),
+        ]
+        self.assertFalse(lib_live.has_wait_for_idle_support(self.runner))
+        self.assertTrue(lib_live.has_wait_for_idle_support(self.runner))
+        self.assertTrue(lib_live.has_wait_for_idle_support(self.runner))
+        self.assertEqual(2, self.runner.run.call_count)
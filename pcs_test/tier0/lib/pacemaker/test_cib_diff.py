@@ -0,0 +1,254 @@
+from copy import deepcopy
+from unittest import TestCase
+
+from lxml import etree
+
+from pcs_test.tools.assertions import assert_xml_equal
+from pcs_test.tools.misc import read_test_resource
+from pcs_test.tools.xml import etree_to_str
+
+from pcs.lib.pacemaker import cib_diff
+
+
+def fixture_cib(resources="", constraints="", epoch="1"):
+    return etree.fromstring(
+        f'<cib admin_epoch="0" epoch="{epoch}" num_updates="0" '
+        'validate-with="pacemaker-3.4"><configuration><crm_config/>'
+        f"<resources>{resources}</resources>"
+        f"<constraints>{constraints}</constraints>"
+        "</configuration><status/></cib>"
+    )
+
+
+def apply_patchset(cib, patchset):
+    """
+    Apply a patchset the same way pacemaker does
+    """
+    cib = deepcopy(cib)
+    tree = cib.getroottree()
+    for change in etree.fromstring(patchset):
+        (element,) = tree.xpath(change.get("path"))
+        operation = change.get("operation")
+        if operation == "delete":
+            element.getparent().remove(element)
+        elif operation == "create":
+            element.insert(int(change.get("position")), deepcopy(change[0]))
+        elif operation == "modify":
+            (result,) = change.find("./change-result")
+            element.attrib.clear()
+            element.attrib.update(result.attrib)
+    return cib
+
+
+class DiffCibs(TestCase):
+    def assert_diff(self, cib_old, cib_new, expected_patchset):
+        patchset = cib_diff.diff_cibs(cib_old, cib_new)
+        assert_xml_equal(expected_patchset, patchset)
+        assert_xml_equal(
+            etree_to_str(cib_new),
+            etree_to_str(apply_patchset(cib_old, patchset)),
+        )
+
+    def assert_not_supported(self, cib_old, cib_new):
+        with self.assertRaises(cib_diff.DiffNotSupported):
+            cib_diff.diff_cibs(cib_old, cib_new)
+
+    def test_no_difference(self):
+        self.assertEqual(
+            "",
+            cib_diff.diff_cibs(
+                fixture_cib('<primitive id="A"/>'),
+                fixture_cib('\n  <primitive id="A"/>\n', epoch="2"),
+            ),
+        )
+
+    def test_modify(self):
+        self.assert_diff(
+            fixture_cib('<primitive id="A" class="ocf" type="X"/>'),
+            fixture_cib('<primitive id="A" class="ocf" type="Y" a="1"/>'),
+            """
+            <diff format="2">
+              <change operation="modify"
+                path="/cib/configuration/resources/primitive[@id='A']"
+              >
+                <change-list>
+                  <change-attr name="type" operation="set" value="Y"/>
+                  <change-attr name="a" operation="set" value="1"/>
+                </change-list>
+                <change-result>
+                  <primitive id="A" class="ocf" type="Y" a="1"/>
+                </change-result>
+              </change>
+            </diff>
+            """,
+        )
+
+    def test_unset_attribute(self):
+        self.assert_diff(
+            fixture_cib('<primitive id="A" type="X"/>'),
+            fixture_cib('<primitive id="A"/>'),
+            """
+            <diff format="2">
+              <change operation="modify"
+                path="/cib/configuration/resources/primitive[@id='A']"
+              >
+                <change-list>
+                  <change-attr name="type" operation="unset"/>
+                </change-list>
+                <change-result>
+                  <primitive id="A"/>
+                </change-result>
+              </change>
+            </diff>
+            """,
+        )
+
+    def test_create_delete(self):
+        self.assert_diff(
+            fixture_cib(
+                '<primitive id="A"/><primitive id="B"/>',
+                '<rsc_location id="L" rsc="A" node="n" score="1"/>',
+            ),
+            fixture_cib(
+                '<primitive id="A"/><group id="G"><primitive id="C">'
+                '<meta_attributes id="C-meta"/></primitive></group>'
+            ),
+            """
+            <diff format="2">
+              <change operation="delete"
+                path="/cib/configuration/resources/primitive[@id='B']"
+              />
+              <change operation="delete"
+                path="/cib/configuration/constraints/rsc_location[@id='L']"
+              />
+              <change operation="create" path="/cib/configuration/resources"
+                position="1"
+              >
+                <group id="G">
+                  <primitive id="C"><meta_attributes id="C-meta"/></primitive>
+                </group>
+              </change>
+            </diff>
+            """,
+        )
+
+    def test_nested_changes(self):
+        self.assert_diff(
+            fixture_cib(
+                '<group id="G"><primitive id="A"/><primitive id="B"/></group>'
+            ),
+            fixture_cib(
+                '<group id="G" description="d"><primitive id="X"/>'
+                '<primitive id="A"/><primitive id="Y"/><primitive id="B"/>'
+                "</group>"
+            ),
+            """
+            <diff format="2">
+              <change operation="modify"
+                path="/cib/configuration/resources/group[@id='G']"
+              >
+                <change-list>
+                  <change-attr name="description" operation="set" value="d"/>
+                </change-list>
+                <change-result><group id="G" description="d"/></change-result>
+              </change>
+              <change operation="create"
+                path="/cib/configuration/resources/group[@id='G']"
+                position="0"
+              >
+                <primitive id="X"/>
+              </change>
+              <change operation="create"
+                path="/cib/configuration/resources/group[@id='G']"
+                position="2"
+              >
+                <primitive id="Y"/>
+              </change>
+            </diff>
+            """,
+        )
+
+    def test_large_cib(self):
+        cib_old = etree.fromstring(read_test_resource("cib-large.xml"))
+        cib_new = deepcopy(cib_old)
+        resources = cib_new.find("./configuration/resources")
+        resources.remove(resources[0])
+        resources.append(etree.Element("primitive", id="new-resource"))
+        resources[1].set("description", "changed")
+        patchset = cib_diff.diff_cibs(cib_old, cib_new)
+        assert_xml_equal(
+            etree_to_str(cib_new),
+            etree_to_str(apply_patchset(cib_old, patchset)),
+        )
+
+    def test_not_supported(self):
+        cib = fixture_cib('<primitive id="A"/><primitive id="B"/>')
+        cib_attr = deepcopy(cib)
+        cib_attr.set("validate-with", "pacemaker-3.5")
+        for cib_new in (
+            cib_attr,
+            fixture_cib('<primitive id="B"/><primitive id="A"/>'),
+            fixture_cib('<primitive id="A"/><!-- B --><primitive id="B"/>'),
+            fixture_cib('<primitive id="A"/>text<primitive id="B"/>'),
+            fixture_cib('<primitive id="A"/><primitive id="B"/><a/><a/>'),
+            fixture_cib('<primitive id="A"/><primitive id="B\'"/>'),
+            fixture_cib('<primitive id="A">text</primitive>'),
+        ):
+            with self.subTest(cib_new=etree_to_str(cib_new)):
+                self.assert_not_supported(cib, cib_new)
+
+    def test_not_cib(self):
+        self.assert_not_supported(
+            etree.fromstring("<cib/>"), etree.fromstring("<status/>")
+        )
+
+
+class ArePatchsetsEquivalent(TestCase):
+    patchset = """
+        <diff format="2">
+          <change operation="delete" path="/cib/a[@id='A']"/>
+          <change operation="modify" path="/cib/b[@id='B']">
+            <change-list>
+              <change-attr name="x" operation="set" value="1"/>
+            </change-list>
+            <change-result><b id="B" x="1" y="2"/></change-result>
+          </change>
+          <change operation="create" path="/cib" position="0">
+            <c id="C"><d id="D"/></c>
+          </change>
+        </diff>
+    """
+
+    def test_empty(self):
+        self.assertTrue(cib_diff.are_patchsets_equivalent("", "  "))
+        self.assertFalse(cib_diff.are_patchsets_equivalent("", self.patchset))
+
+    def test_equivalent(self):
+        self.assertTrue(
+            cib_diff.are_patchsets_equivalent(
+                self.patchset,
+                """<diff format="2">
+                  <change operation="create" path="/cib" position="0"
+                    ><c id="C"><d id="D"/></c></change>
+                  <change operation="modify" path="/cib/b[@id='B']">
+                    <change-result><b y="2" x="1" id="B"/></change-result>
+                  </change>
+                  <change operation="delete" path="/cib/a[@id='A']"
+                    position="3"/>
+                </diff>""",
+            )
+        )
+
+    def test_different(self):
+        for old, new in (
+            ('x="1" y="2"', 'x="1" y="3"'),
+            ('position="0"', 'position="1"'),
+            ('<d id="D"/>', ""),
+            ("a[@id='A']", "a[@id='Z']"),
+        ):
+            with self.subTest(new=new):
+                self.assertFalse(
+                    cib_diff.are_patchsets_equivalent(
+                        self.patchset, self.patchset.replace(old, new)
+                    )
+                )
@@ -0,0 +1,181 @@
+import os.path
+from unittest import mock, TestCase
+
+from pcs import settings
+from pcs.lib.external import CommandRunner
+from pcs.lib.pacemaker import cib_snapshot
+import pcs.lib.pacemaker.live as lib_live
+
+
+def fixture_cib(epoch=1, num_updates=0, content=""):
+    return (
+        '<cib admin_epoch="0" epoch="{0}" num_updates="{1}" '
+        'validate-with="pacemaker-3.4"><configuration>{2}</configuration>'
+        "</cib>"
+    ).format(epoch, num_updates, content)
+
+
+def path(name):
+    return os.path.join(settings.pacemaker_binaries, name)
+
+
+class GetCibVersion(TestCase):
+    def test_success(self):
+        self.assertEqual(
+            cib_snapshot.CibVersion(0, 5, 12),
+            cib_snapshot.get_cib_version(fixture_cib(5, 12)),
+        )
+
+    def test_missing_attribute(self):
+        self.assertIsNone(
+            cib_snapshot.get_cib_version('<cib epoch="1" num_updates="0"/>')
+        )
+
+    def test_not_cib(self):
+        self.assertIsNone(cib_snapshot.get_cib_version("<xml />"))
+
+
+class IsCibReadOnlyCommand(TestCase):
+    def test_read_only(self):
+        for args in (
+            [path("cibadmin"), "--local", "--query"],
+            ["cibadmin", "-l", "-Q"],
+            [path("crm_mon"), "--one-shot", "--as-xml"],
+            [path("crm_node"), "--name"],
+            [settings.crm_resource_binary, "--show-metadata", "ocf:pcmk:Dummy"],
+        ):
+            with self.subTest(args=args):
+                self.assertTrue(cib_snapshot.is_cib_read_only_command(args))
+
+    def test_modifying(self):
+        for args in (
+            [path("cibadmin"), "--replace", "--xml-pipe"],
+            [path("crm_node"), "--force", "--remove", "node"],
+            [path("crm_resource"), "--cleanup"],
+            [path("crm_resource"), "--wait"],
+            [path("crm_attribute"), "--query", "--name", "attr"],
+            [settings.systemctl_binary, "stop", "pacemaker"],
+        ):
+            with self.subTest(args=args):
+                self.assertFalse(cib_snapshot.is_cib_read_only_command(args))
+
+
+class CibSnapshotCacheTest(TestCase):
+    def setUp(self):
+        self.cache = cib_snapshot.CibSnapshotCache()
+        self.cache.enable()
+        self.parser = mock.Mock(side_effect=lambda xml: {"xml": xml})
+
+    def test_disabled(self):
+        self.cache.disable()
+        cib = fixture_cib()
+        self.assertIs(cib, self.cache.store_xml(cib))
+        self.assertIsNone(self.cache.get_xml())
+
+    def test_get_stored(self):
+        cib = fixture_cib()
+        self.assertIsNone(self.cache.get_xml())
+        self.assertIs(cib, self.cache.store_xml(cib))
+        self.assertIs(cib, self.cache.get_xml())
+
+    def test_stored_per_user(self):
+        cib = fixture_cib()
+        self.cache.store_xml(cib, "user1")
+        self.assertIs(cib, self.cache.get_xml("user1"))
+        self.assertIsNone(self.cache.get_xml("user2"))
+        self.assertIsNone(self.cache.get_xml())
+
+    def test_parse_once(self):
+        cib = self.cache.store_xml(fixture_cib())
+        tree1 = self.cache.parse(cib, self.parser)
+        tree2 = self.cache.parse(cib, self.parser)
+        self.parser.assert_called_once_with(cib)
+        self.assertEqual(tree1, tree2)
+        self.assertIsNot(tree1, tree2)
+
+    def test_parse_not_stored(self):
+        self.cache.store_xml(fixture_cib())
+        cib = fixture_cib()
+        self.cache.parse(cib, self.parser)
+        self.cache.parse(cib, self.parser)
+        self.assertEqual(2, self.parser.call_count)
+
+    def test_invalidate_modifying_command(self):
+        self.cache.store_xml(fixture_cib())
+        self.cache.invalidate_on_command([path("crm_mon")], {})
+        self.assertIsNotNone(self.cache.get_xml())
+        self.cache.invalidate_on_command(
+            [path("cibadmin"), "--replace"], {"CIB_file": "/tmp/cib.xml"}
+        )
+        self.assertIsNotNone(self.cache.get_xml())
+        self.cache.invalidate_on_command([path("cibadmin"), "--replace"], {})
+        self.assertIsNone(self.cache.get_xml())
+
+    def test_unchanged_version_keeps_parsed_cib(self):
+        cib = self.cache.store_xml(fixture_cib(2, 3))
+        self.cache.parse(cib, self.parser)
+        self.cache.invalidate()
+        self.assertIsNone(self.cache.get_xml())
+        self.assertIs(cib, self.cache.store_xml(fixture_cib(2, 3)))
+        self.cache.parse(self.cache.get_xml(), self.parser)
+        self.parser.assert_called_once_with(cib)
+
+    def test_changed_version(self):
+        cib = self.cache.store_xml(fixture_cib(2, 3))
+        self.cache.parse(cib, self.parser)
+        self.cache.invalidate()
+        new_cib = fixture_cib(2, 4)
+        self.assertIs(new_cib, self.cache.store_xml(new_cib))
+        self.cache.parse(self.cache.get_xml(), self.parser)
+        self.assertEqual(
+            [mock.call(cib), mock.call(new_cib)], self.parser.call_args_list
+        )
+
+
+class LibraryCibSnapshotTest(TestCase):
+    def setUp(self):
+        cache = cib_snapshot.CibSnapshotCache()
+        cache.enable()
+        patcher = mock.patch.object(
+            cib_snapshot, "_process_cib_snapshot_cache", cache
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cib = fixture_cib(content="<resources/>")
+        self.runner = mock.MagicMock(spec_set=CommandRunner)
+        self.runner.run.return_value = (self.cib, "", 0)
+        self.runner.env_vars = {"CIB_user": "user"}
+
+    def test_one_fetch_one_parse(self):
+        for _ in range(3):
+            tree = lib_live.get_cib(lib_live.get_cib_xml(self.runner))
+            self.assertEqual(0, len(tree.find("configuration/resources")))
+            # readers are allowed to modify their CIB
+            tree.find("configuration/resources").append(
+                tree.makeelement("primitive")
+            )
+        self.runner.run.assert_called_once_with(
+            [path("cibadmin"), "--local", "--query"]
+        )
+
+    def test_scope_not_cached(self):
+        lib_live.get_cib_xml(self.runner, scope="configuration")
+        lib_live.get_cib_xml(self.runner, scope="configuration")
+        self.assertEqual(2, self.runner.run.call_count)
+
+    def test_cib_file_not_cached(self):
+        self.runner.env_vars = {"CIB_file": "/tmp/cib.xml"}
+        lib_live.get_cib_xml(self.runner)
+        lib_live.get_cib_xml(self.runner)
+        self.assertEqual(2, self.runner.run.call_count)
+
+    @mock.patch("pcs.lib.external.subprocess.Popen")
+    def test_runner_invalidates(self, mock_popen):
+        lib_live.get_cib_xml(self.runner)
+        mock_popen.return_value.communicate.return_value = ("", "")
+        mock_popen.return_value.returncode = 0
+        CommandRunner(mock.Mock(), mock.Mock()).run(
+            [path("crm_resource"), "--cleanup"]
+        )
+        lib_live.get_cib_xml(self.runner)
+        self.assertEqual(2, self.runner.run.call_count)
@@ -4,11 +4,13 @@ from lxml import etree
 
 from pcs_test.tools.assertions import (
     assert_raise_library_error,
+    assert_report_item_list_equal,
     assert_xml_equal,
     start_tag_error_text,
 )
 from pcs_test.tools import fixture
 from pcs_test.tools.command_env import get_env_tools
+from pcs_test.tools.custom_mock import MockLibraryReportProcessor
 from pcs_test.tools.misc import get_test_resource as rc
 from pcs_test.tools.xml import etree_to_str, XmlManipulation
 
@@ -16,6 +18,7 @@ from pcs import settings
 from pcs.common.reports import ReportItemSeverity as Severity
 from pcs.common.reports import codes as report_codes
 from pcs.common.tools import Version
+from pcs.common.types import CibRuleInEffectStatus
 import pcs.lib.pacemaker.live as lib
 from pcs.lib.external import CommandRunner
 
@@ -1335,6 +1338,112 @@ class ResourcesWaitingTest(LibraryPacemakerTest):
         )
 
 
+@mock.patch.object(settings, "wait_for_idle_step_initial", 10)
+@mock.patch.object(settings, "wait_for_idle_step_max", 30)
+class WaitForIdleInSteps(LibraryPacemakerTest):
+    pending_stderr = (
+        "Pending actions:\n"
+        "\tAction 12: R_start_0\ton node1\n"
+        "\tAction 13: R_monitor_10000\ton node1\n"
+        "Error performing operation: Timer expired\n"
+    )
+
+    def setUp(self):
+        self.runner = mock.MagicMock(spec_set=CommandRunner)
+        self.reporter = MockLibraryReportProcessor()
+
+    def wait_call(self, timeout):
+        return mock.call(
+            [self.path("crm_resource"), "--wait", f"--timeout={timeout}"]
+        )
+
+    def progress_report(self):
+        return (
+            Severity.INFO,
+            report_codes.WAIT_FOR_IDLE_PROGRESS,
+            {
+                "pending_action_list": [
+                    "Action 12: R_start_0 on node1",
+                    "Action 13: R_monitor_10000 on node1",
+                ]
+            },
+        )
+
+    def test_idle_in_first_step(self):
+        self.runner.run.return_value = ("", "", 0)
+        lib.wait_for_idle(self.runner, 60, self.reporter)
+        self.assertEqual([self.wait_call(10)], self.runner.run.call_args_list)
+        assert_report_item_list_equal(self.reporter.report_item_list, [])
+
+    def test_progress_reported(self):
+        self.runner.run.side_effect = [
+            ("", self.pending_stderr, 124),
+            ("", self.pending_stderr, 124),
+            ("", "", 0),
+        ]
+        lib.wait_for_idle(self.runner, 60, self.reporter)
+        self.assertEqual(
+            [self.wait_call(10), self.wait_call(20), self.wait_call(30)],
+            self.runner.run.call_args_list,
+        )
+        assert_report_item_list_equal(
+            self.reporter.report_item_list,
+            [self.progress_report(), self.progress_report()],
+        )
+
+    def test_timeout(self):
+        self.runner.run.return_value = ("", self.pending_stderr, 124)
+        assert_raise_library_error(
+            lambda: lib.wait_for_idle(self.runner, 25, self.reporter),
+            (
+                Severity.ERROR,
+                report_codes.WAIT_FOR_IDLE_TIMED_OUT,
+                {"reason": self.pending_stderr.strip()},
+            ),
+        )
+        self.assertEqual(
+            [self.wait_call(10), self.wait_call(15)],
+            self.runner.run.call_args_list,
+        )
+        assert_report_item_list_equal(
+            self.reporter.report_item_list, [self.progress_report()],
+        )
+
+    def test_error(self):
+        self.runner.run.side_effect = [
+            ("", self.pending_stderr, 124),
+            ("", "some error", 1),
+        ]
+        assert_raise_library_error(
+            lambda: lib.wait_for_idle(self.runner, 60, self.reporter),
+            (
+                Severity.ERROR,
+                report_codes.WAIT_FOR_IDLE_ERROR,
+                {"reason": "some error"},
+            ),
+        )
+        self.assertEqual(2, self.runner.run.call_count)
+
+    def test_default_timeout(self):
+        self.runner.run.side_effect = [("", "", 124)] * 3 + [("", "", 0)]
+        lib.wait_for_idle(self.runner, None, self.reporter)
+        self.assertEqual(
+            [self.wait_call(10), self.wait_call(20)] + [self.wait_call(30)] * 2,
+            self.runner.run.call_args_list,
+        )
+        assert_report_item_list_equal(
+            self.reporter.report_item_list,
+            [
+                (
+                    Severity.INFO,
+                    report_codes.WAIT_FOR_IDLE_PROGRESS,
+                    {"pending_action_list": []},
+                )
+            ]
+            * 3,
+        )
+
+
 class IsInPcmkToolHelp(TestCase):
     # pylint: disable=protected-access
     def test_all_in_stderr(self):
@@ -1360,3 +1469,72 @@ class IsInPcmkToolHelp(TestCase):
         self.assertFalse(
             lib._is_in_pcmk_tool_help(mock_runner, "", ["A", "C", "E"])
         )
+
+
+class GetRulesInEffectStatus(TestCase):
+    cib = "<cib />"
+
+    @staticmethod
+    def single_cmd(rule_id):
+        return mock.call(
+            [settings.crm_rule, "--check", "--rule", rule_id]
+            + ["--xml-text", "-"],
+            stdin_string="<cib />",
+        )
+
+    def test_batch(self):
+        mock_runner = get_runner(
+            """
+                <pacemaker-result api-version="2.0" request="crm_rule">
+                    <rule-check rule-id="r1" rc="0"/>
+                    <rule-check rule-id="r2" rc="110"/>
+                    <rule-check rule-id="r3" rc="105"/>
+                    <status code="0" message="OK"/>
+                </pacemaker-result>
+            """
+        )
+        self.assertEqual(
+            {
+                "r1": CibRuleInEffectStatus.IN_EFFECT,
+                "r2": CibRuleInEffectStatus.EXPIRED,
+                "r3": CibRuleInEffectStatus.UNKNOWN,
+            },
+            lib.get_rules_in_effect_status(
+                mock_runner, self.cib, ["r1", "r2", "r3"]
+            ),
+        )
+        mock_runner.run.assert_called_once_with(
+            [settings.crm_rule, "--check", "--output-as=xml"]
+            + ["--rule", "r1", "--rule", "r2", "--rule", "r3"]
+            + ["--xml-text", "-"],
+            stdin_string=self.cib,
+        )
+
+    def test_batch_not_supported(self):
+        mock_runner = mock.MagicMock(spec_set=CommandRunner)
+        mock_runner.run.side_effect = [
+            ("", "crm_rule: unrecognized option", 64),
+            ("", "", 111),
+            ("", "", 0),
+        ]
+        self.assertEqual(
+            {
+                "r1": CibRuleInEffectStatus.NOT_YET_IN_EFFECT,
+                "r2": CibRuleInEffectStatus.IN_EFFECT,
+            },
+            lib.get_rules_in_effect_status(mock_runner, self.cib, ["r1", "r2"]),
+        )
+        self.assertEqual(
+            [self.single_cmd("r1"), self.single_cmd("r2")],
+            mock_runner.run.call_args_list[1:],
+        )
+
+    def test_single_rule(self):
+        mock_runner = get_runner(returncode=110)
+        self.assertEqual(
+            {"r1": CibRuleInEffectStatus.EXPIRED},
+            lib.get_rules_in_effect_status(mock_runner, self.cib, ["r1"]),
+        )
+        self.assertEqual(
+            [self.single_cmd("r1")], mock_runner.run.call_args_list
+        )
@@ -9,6 +9,7 @@ from pcs_test.tools.assertions import (
 from pcs_test.tools.misc import get_test_resource as rc
 from pcs_test.tools.xml import get_xml_manipulation_creator_from_file
 
+from pcs import settings
 from pcs.common.reports import ReportItemSeverity as severities
 from pcs.common.reports import codes as report_codes
 from pcs.lib.pacemaker import state
@@ -85,6 +86,19 @@ class ClusterStatusTest(TestBase):
             (severities.ERROR, report_codes.BAD_CLUSTER_STATE_FORMAT, {}),
         )
 
+    @mock.patch("pcs.lib.pacemaker.state.etree.RelaxNG")
+    def test_schema_compiled_once(self, mock_relaxng):
+        # any existing file will do, the schema is not really compiled
+        schema_path = rc("crm_mon.minimal.xml")
+        mock_relaxng.return_value = mock.Mock(spec_set=["assertValid"])
+        with mock.patch.object(
+            state, "_cluster_state_schema_cache", {}
+        ), mock.patch.object(settings, "crm_mon_schema", schema_path):
+            ClusterState(str(self.covered_status))
+            ClusterState(str(self.covered_status))
+        mock_relaxng.assert_called_once_with(file=schema_path)
+        self.assertEqual(2, mock_relaxng.return_value.assertValid.call_count)
+
     @mock.patch("pcs.lib.pacemaker.state._validate_cluster_state_dom")
     def test_refuse_invalid_document(self, mock_validate):
         mock_validate.side_effect = etree.DocumentInvalid("some error")
@@ -148,6 +162,16 @@ class WorkWithClusterStatusNodesTest(TestBase):
             ],
         )
 
+    def test_get_node_by_name(self):
+        self.covered_status.append_to_first_tag_name(
+            "nodes",
+            self.fixture_node_string(name="node1", id="1"),
+            self.fixture_node_string(name="node2", id="2"),
+        )
+        cluster_state = ClusterState(str(self.covered_status))
+        self.assertEqual("2", cluster_state.get_node_by_name("node2").attrs.id)
+        self.assertIsNone(cluster_state.get_node_by_name("node3"))
+
 
 class WorkWithClusterStatusSummaryTest(TestBase):
     def test_nodes_count(self):
@@ -192,7 +216,10 @@ class GetPrimitiveRolesWithNodes(TestCase):
                 </resource>
             """,
         ]
-        primitives = [etree.fromstring(xml) for xml in primitives_xml]
+        primitives = [
+            state._PrimitiveState.from_element(etree.fromstring(xml))
+            for xml in primitives_xml
+        ]
 
         self.assertEqual(
             state._get_primitive_roles_with_nodes(primitives),
@@ -351,14 +378,23 @@ class GetPrimitivesForStateCheck(TestCase):
     def assert_primitives(self, resource_id, primitive_ids, expected_running):
         self.assertEqual(
             [
-                elem.attrib["id"]
-                for elem in state._get_primitives_for_state_check(
+                primitive.id
+                for primitive in state._get_primitives_for_state_check(
                     self.status, resource_id, expected_running
                 )
             ],
             primitive_ids,
         )
 
+    def test_index_built_once(self):
+        with mock.patch.object(
+            state, "_ResourcesState", wraps=state._ResourcesState
+        ) as mock_index:
+            self.assert_primitives("R01", ["R01"], True)
+            self.assert_primitives("G1", ["R04"], True)
+            self.assertTrue(state.is_resource_managed(self.status, "R01"))
+        mock_index.assert_called_once_with(self.status)
+
     def test_missing(self):
         self.assert_primitives("Rxx", [], True)
         self.assert_primitives("Rxx", [], False)
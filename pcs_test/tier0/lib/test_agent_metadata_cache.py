@@ -0,0 +1,171 @@
+import os
+import os.path
+import shutil
+import tempfile
+from unittest import mock, TestCase
+
+from pcs import settings
+from pcs.lib import agent_metadata_cache
+from pcs.lib import resource_agent as lib_ra
+from pcs.lib.external import CommandRunner
+
+
+class AgentMetadataCacheTest(TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        self.cache_path = os.path.join(self.cache_dir, "cache")
+        self.agent_file = os.path.join(self.cache_dir, "agent")
+        with open(self.agent_file, "w") as agent_file:
+            agent_file.write("#!/bin/sh\n")
+        self.cache = agent_metadata_cache.AgentMetadataCache()
+        self.cache.enable(self.cache_path)
+        self.loader = mock.Mock(return_value={"parameters": ["param"]})
+
+    def get(self, cache=None, source_file_list=None):
+        return (cache or self.cache).get(
+            "ocf:pacemaker:Dummy",
+            [self.agent_file] if source_file_list is None else source_file_list,
+            self.loader,
+        )
+
+    def get_in_new_process(self):
+        cache = agent_metadata_cache.AgentMetadataCache()
+        cache.enable(self.cache_path)
+        return self.get(cache)
+
+    def test_load_once(self):
+        self.assertEqual({"parameters": ["param"]}, self.get())
+        self.assertEqual({"parameters": ["param"]}, self.get())
+        self.loader.assert_called_once_with()
+
+    def test_shared_on_disk(self):
+        self.get()
+        self.assertEqual({"parameters": ["param"]}, self.get_in_new_process())
+        self.loader.assert_called_once_with()
+
+    def test_agent_file_changed(self):
+        self.get()
+        os.utime(self.agent_file, ns=(0, 0))
+        self.get_in_new_process()
+        self.assertEqual(2, self.loader.call_count)
+
+    def test_agent_file_changed_in_memory(self):
+        self.get()
+        os.utime(self.agent_file, ns=(0, 0))
+        self.get()
+        self.get()
+        self.assertEqual(2, self.loader.call_count)
+
+    def test_agent_file_changed_memory_only(self):
+        self.cache.enable()
+        self.get()
+        os.utime(self.agent_file, ns=(0, 0))
+        self.get()
+        self.assertEqual(2, self.loader.call_count)
+        self.assertFalse(os.path.exists(self.cache_path))
+
+    def test_agent_file_missing(self):
+        self.get(source_file_list=["/nonexistent/agent"])
+        self.assertFalse(os.path.exists(self.cache_path))
+
+    def test_no_source_files(self):
+        self.get(source_file_list=[])
+        self.assertFalse(os.path.exists(self.cache_path))
+        self.get(source_file_list=[])
+        self.loader.assert_called_once_with()
+
+    def test_corrupted_file(self):
+        self.get()
+        for file_name in os.listdir(self.cache_path):
+            file_path = os.path.join(self.cache_path, file_name)
+            with open(file_path, "w") as cache_file:
+                cache_file.write("{not json")
+        self.get_in_new_process()
+        self.assertEqual(2, self.loader.call_count)
+
+    def test_loader_error(self):
+        self.loader.side_effect = lib_ra.UnableToGetAgentMetadata("Dummy")
+        self.assertRaises(lib_ra.UnableToGetAgentMetadata, self.get)
+        self.assertRaises(lib_ra.UnableToGetAgentMetadata, self.get)
+        self.assertEqual(2, self.loader.call_count)
+
+    def test_invalidate_agent(self):
+        self.get()
+        self.cache.invalidate("ocf:pacemaker:Dummy")
+        self.get()
+        self.get_in_new_process()
+        self.assertEqual(2, self.loader.call_count)
+
+    def test_invalidate_all(self):
+        self.get()
+        self.cache.invalidate()
+        self.assertEqual([], os.listdir(self.cache_path))
+        self.get()
+        self.assertEqual(2, self.loader.call_count)
+
+    def test_disabled(self):
+        self.cache.disable()
+        self.get()
+        self.get()
+        self.assertEqual(2, self.loader.call_count)
+        self.assertFalse(os.path.exists(self.cache_path))
+
+    def test_disabled_always_in_memory(self):
+        self.cache.disable()
+        for _ in range(2):
+            self.cache.get(
+                "pacemaker-fenced", [], self.loader, always_in_memory=True
+            )
+        self.loader.assert_called_once_with()
+
+
+class ResourceAgentMetadataCacheTest(TestCase):
+    def setUp(self):
+        cache = agent_metadata_cache.AgentMetadataCache()
+        cache.enable()
+        patcher = mock.patch.object(
+            agent_metadata_cache, "_process_agent_metadata_cache", cache
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.runner = mock.MagicMock(spec_set=CommandRunner)
+        self.runner.run.return_value = (
+            """
+                <resource-agent>
+                    <shortdesc>Dummy agent</shortdesc>
+                    <parameters><parameter name="fake"/></parameters>
+                    <actions><action name="monitor" interval="10s"/></actions>
+                </resource-agent>
+            """,
+            "",
+            0,
+        )
+
+    def test_metadata_loaded_once(self):
+        for _ in range(2):
+            agent = lib_ra.ResourceAgent(self.runner, "ocf:pacemaker:Dummy")
+            self.assertEqual("Dummy agent", agent.get_shortdesc())
+            self.assertEqual(
+                ["fake", "trace_ra", "trace_file"],
+                [param["name"] for param in agent.get_parameters()],
+            )
+            self.assertEqual(
+                [{"name": "monitor", "interval": "10s"}], agent.get_actions()
+            )
+        self.runner.run.assert_called_once_with(
+            [
+                settings.crm_resource_binary,
+                "--show-metadata",
+                "ocf:pacemaker:Dummy",
+            ],
+            env_extend=mock.ANY,
+        )
+
+    def test_absent_agent_not_cached(self):
+        lib_ra.AbsentResourceAgent(
+            self.runner, "ocf:pacemaker:Dummy"
+        ).get_parameters()
+        agent = lib_ra.ResourceAgent(self.runner, "ocf:pacemaker:Dummy")
+        self.assertEqual("Dummy agent", agent.get_shortdesc())
+        self.runner.run.assert_called_once()
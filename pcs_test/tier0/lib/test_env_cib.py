@@ -150,6 +150,9 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
             self.tmpfile_old,
             self.tmpfile_new,
         ]
+        engine_patcher = mock.patch("pcs.settings.cib_diff_engine", "crm_diff")
+        self.addCleanup(engine_patcher.stop)
+        engine_patcher.start()
         self.cib_can_diff = "cib-empty-2.0.xml"
         self.cib_cannot_diff = "cib-empty-1.2.xml"
         self.env_assist, self.config = get_env_tools(test_case=self)
@@ -434,6 +437,109 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
         )
 
 
+class PushLoadedCibNativeDiff(TestCase):
+    resource = '<primitive id="R" class="ocf" provider="pacemaker" type="D"/>'
+    native_diff = f"""
+        <diff format="2">
+          <change operation="create" path="/cib/configuration/resources"
+            position="0"
+          >
+            {resource}
+          </change>
+        </diff>
+    """
+
+    def setUp(self):
+        tmpfile_patcher = mock.patch("pcs.lib.pacemaker.live.write_tmpfile")
+        self.addCleanup(tmpfile_patcher.stop)
+        self.mock_write_tmpfile = tmpfile_patcher.start()
+        self.tmpfile_old = mock_tmpfile("old.cib")
+        self.tmpfile_new = mock_tmpfile("new.cib")
+        self.mock_write_tmpfile.side_effect = [
+            self.tmpfile_old,
+            self.tmpfile_new,
+        ]
+        self.env_assist, self.config = get_env_tools(test_case=self)
+        self.config.runner.cib.load(filename="cib-empty-2.0.xml")
+
+    def get_and_modify_cib(self, env, element):
+        cib = env.get_cib()
+        cib.find("./configuration/resources").append(element)
+        return cib
+
+    def crm_diff_reports(self, cib):
+        return [
+            fixture.debug(
+                report_codes.TMP_FILE_WRITE,
+                file_path=self.tmpfile_old.name,
+                content=self.config.calls.get("runner.cib.load").stdout,
+            ),
+            fixture.debug(
+                report_codes.TMP_FILE_WRITE,
+                file_path=self.tmpfile_new.name,
+                content=etree_to_str(cib),
+            ),
+        ]
+
+    def test_no_change(self):
+        env = self.env_assist.get_env()
+        env.get_cib()
+        env.push_cib()
+
+    def test_push_native_diff(self):
+        self.config.runner.cib.push_diff(cib_diff=self.native_diff)
+        env = self.env_assist.get_env()
+        self.get_and_modify_cib(env, etree.fromstring(self.resource))
+        env.push_cib()
+
+    def test_fallback_to_crm_diff(self):
+        (
+            self.config.runner.cib.diff(
+                self.tmpfile_old.name, self.tmpfile_new.name
+            ).runner.cib.push_diff()
+        )
+        env = self.env_assist.get_env()
+        cib = self.get_and_modify_cib(env, etree.Comment("a comment"))
+        env.push_cib()
+        self.env_assist.assert_reports(self.crm_diff_reports(cib))
+
+    @mock.patch("pcs.settings.cib_diff_engine", "verify")
+    def test_verify_same(self):
+        (
+            self.config.runner.cib.diff(
+                self.tmpfile_old.name,
+                self.tmpfile_new.name,
+                stdout=self.native_diff,
+            ).runner.cib.push_diff(cib_diff=self.native_diff)
+        )
+        env = self.env_assist.get_env()
+        cib = self.get_and_modify_cib(env, etree.fromstring(self.resource))
+        env.push_cib()
+        self.env_assist.assert_reports(self.crm_diff_reports(cib))
+
+    @mock.patch("pcs.settings.cib_diff_engine", "verify")
+    def test_verify_differs(self):
+        crm_diff = '<diff format="2"/>'
+        (
+            self.config.runner.cib.diff(
+                self.tmpfile_old.name, self.tmpfile_new.name, stdout=crm_diff,
+            ).runner.cib.push_diff(cib_diff=crm_diff)
+        )
+        env = self.env_assist.get_env()
+        cib = self.get_and_modify_cib(env, etree.fromstring(self.resource))
+        env.push_cib()
+        self.env_assist.assert_reports(
+            self.crm_diff_reports(cib)
+            + [
+                fixture.warn(
+                    report_codes.CIB_DIFF_MISMATCH,
+                    native_diff=mock.ANY,
+                    crm_diff=crm_diff,
+                )
+            ]
+        )
+
+
 class PushCustomCib(TestCase, ManageCibAssertionMixin):
     custom_cib = "<custom_cib />"
     wait_timeout = 10
@@ -782,6 +782,87 @@ class IsServiceRunningTest(TestCase):
         )
 
 
+@mock.patch("pcs.lib.external.is_systemctl")
+class GetServicesStatusTest(TestCase):
+    def setUp(self):
+        self.mock_runner = mock.MagicMock(spec_set=lib.CommandRunner)
+        self.show_cmd = [
+            _systemctl,
+            "show",
+            "--property=ActiveState,UnitFileState",
+            "--",
+            "service1.service",
+            "service2.service",
+            "service3.service",
+        ]
+
+    def test_systemctl(self, mock_systemctl):
+        mock_systemctl.return_value = True
+        self.mock_runner.run.return_value = (
+            outdent(
+                """\
+                ActiveState=active
+                UnitFileState=enabled
+
+                UnitFileState=static
+                ActiveState=inactive
+
+                ActiveState=reloading
+                UnitFileState=
+                """
+            ),
+            "",
+            0,
+        )
+        self.assertEqual(
+            {
+                "service1": lib.ServiceStatus(True, True),
+                "service2": lib.ServiceStatus(True, False),
+                "service3": lib.ServiceStatus(False, True),
+            },
+            lib.get_services_status(
+                self.mock_runner, ["service1", "service2", "service3"]
+            ),
+        )
+        self.mock_runner.run.assert_called_once_with(self.show_cmd)
+
+    def test_systemctl_show_failed(self, mock_systemctl):
+        mock_systemctl.return_value = True
+        self.mock_runner.run.side_effect = [
+            ("", "error", 1),
+            ("enabled", "", 0),
+            ("active", "", 0),
+        ]
+        self.assertEqual(
+            {"service1": lib.ServiceStatus(True, True)},
+            lib.get_services_status(self.mock_runner, ["service1"]),
+        )
+        self.mock_runner.run.assert_has_calls(
+            [
+                mock.call(self.show_cmd[:5]),
+                mock.call([_systemctl, "is-enabled", "service1.service"]),
+                mock.call([_systemctl, "is-active", "service1.service"]),
+            ]
+        )
+
+    def test_not_systemctl(self, mock_systemctl):
+        mock_systemctl.return_value = False
+        self.mock_runner.run.side_effect = [
+            ("", "", 1),
+            ("is running", "", 0),
+        ]
+        self.assertEqual(
+            {"service1": lib.ServiceStatus(False, True)},
+            lib.get_services_status(self.mock_runner, ["service1"]),
+        )
+        self.mock_runner.run.assert_has_calls(
+            [
+                mock.call([_chkconfig, "service1"]),
+                mock.call([_service, "service1", "status"]),
+            ]
+        )
+
+
 @mock.patch("pcs.lib.external.is_systemctl")
 @mock.patch("pcs.lib.external.get_systemd_services")
 @mock.patch("pcs.lib.external.get_non_systemd_services")
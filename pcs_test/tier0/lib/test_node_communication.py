@@ -496,6 +496,31 @@ class CommunicatorLoggerTest(TestCase):
         )
         self.assertEqual(logger_calls, self.logger.mock_calls)
 
+    def test_log_response_connected_no_debug_data(self):
+        expected_code = 200
+        expected_data = "data"
+        response = Response.connection_successful(
+            MockCurlSimple(
+                info={pycurl.RESPONSE_CODE: expected_code},
+                output=expected_data.encode("utf-8"),
+                request=fixture_request(),
+            )
+        )
+        self.com_logger.log_response(response)
+        self.reporter.assert_reports(
+            fixture_report_item_list_connected(
+                response.request.url, expected_code, expected_data,
+            )
+        )
+        self.assertEqual(
+            [
+                fixture_logger_call_connected(
+                    response.request.url, expected_code, expected_data
+                )
+            ],
+            self.logger.mock_calls,
+        )
+
     @mock.patch("pcs.lib.node_communication.is_proxy_set")
     def test_log_response_not_connected(self, mock_proxy):
         mock_proxy.return_value = False
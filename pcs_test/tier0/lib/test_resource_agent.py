@@ -1665,7 +1665,7 @@ class StonithAgentMetadataGetMetadataTest(TestCase, ExtendedAssertionsMixin):
         self.agent = lib_ra.StonithAgent(self.mock_runner, self.agent_name)
 
     def tearDown(self):
-        lib_ra.StonithAgent._fenced_metadata = None
+        lib_ra.StonithAgent.clear_fenced_metadata_cache()
 
     def test_success(self):
         metadata = """
@@ -1696,7 +1696,7 @@ class StonithAgentMetadataGetParametersTest(TestCase):
         self.agent = lib_ra.StonithAgent(self.mock_runner, self.agent_name)
 
     def tearDown(self):
-        lib_ra.StonithAgent._fenced_metadata = None
+        lib_ra.StonithAgent.clear_fenced_metadata_cache()
 
     def test_success(self):
         metadata = """
@@ -1846,7 +1846,7 @@ class StonithAgentMetadataGetProvidesUnfencingTest(TestCase):
         )
 
     def tearDown(self):
-        lib_ra.StonithAgent._fenced_metadata = None
+        lib_ra.StonithAgent.clear_fenced_metadata_cache()
 
     def test_true(self, mock_metadata):
         xml = """
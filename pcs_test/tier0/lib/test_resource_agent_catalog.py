@@ -0,0 +1,188 @@
+import os
+import os.path
+import shutil
+import tempfile
+import time
+from unittest import mock, TestCase
+
+from pcs import settings
+from pcs.lib import resource_agent as lib_ra
+from pcs.lib import resource_agent_catalog
+from pcs.lib.errors import LibraryError
+from pcs.lib.external import CommandRunner
+
+
+AGENTS = {
+    "lsb": ["network"],
+    "ocf:heartbeat": ["Delay", "Dummy"],
+    "ocf:pacemaker": ["Dummy", "Stateful"],
+}
+
+
+class ResourceAgentCatalogTest(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.agent_dir = os.path.join(self.tmp_dir, "init.d")
+        os.mkdir(self.agent_dir)
+        patcher = mock.patch.multiple(
+            settings,
+            crm_resource_binary=os.path.join(self.tmp_dir, "crm_resource"),
+            ocf_resource_agents=os.path.join(self.tmp_dir, "ocf"),
+            resource_agent_dirs=[self.agent_dir],
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache_file = os.path.join(self.tmp_dir, "cache", "catalog")
+        self.catalog = resource_agent_catalog.ResourceAgentCatalog()
+        self.catalog.enable(self.cache_file, ttl=300)
+        self.scanner = mock.Mock(return_value=AGENTS)
+
+    def get_in_new_process(self, ttl=300):
+        catalog = resource_agent_catalog.ResourceAgentCatalog()
+        catalog.enable(self.cache_file, ttl=ttl)
+        return catalog.get_agents(self.scanner)
+
+    def test_scan_once(self):
+        self.assertEqual(AGENTS, self.catalog.get_agents(self.scanner))
+        self.assertEqual(AGENTS, self.catalog.get_agents(self.scanner))
+        self.assertEqual(AGENTS, self.get_in_new_process())
+        self.scanner.assert_called_once_with()
+
+    def test_disabled(self):
+        self.catalog.disable()
+        self.catalog.get_agents(self.scanner)
+        self.catalog.get_agents(self.scanner)
+        self.assertEqual(2, self.scanner.call_count)
+        self.assertIsNone(self.catalog.get_stored_agents())
+        self.assertFalse(os.path.exists(self.cache_file))
+
+    def test_expired(self):
+        self.catalog.get_agents(self.scanner)
+        with mock.patch("time.time", return_value=time.time() + 301):
+            self.get_in_new_process()
+        self.assertEqual(2, self.scanner.call_count)
+
+    def test_agent_installed(self):
+        self.catalog.get_agents(self.scanner)
+        os.utime(self.agent_dir, ns=(0, 0))
+        self.get_in_new_process()
+        self.assertEqual(2, self.scanner.call_count)
+
+    def test_expired_in_memory(self):
+        self.catalog.get_agents(self.scanner)
+        with mock.patch("time.time", return_value=time.time() + 301):
+            self.assertIsNone(self.catalog.get_stored_agents())
+            self.catalog.get_agents(self.scanner)
+        self.assertEqual(2, self.scanner.call_count)
+
+    def test_agent_installed_in_memory(self):
+        self.catalog.get_agents(self.scanner)
+        os.utime(self.agent_dir, ns=(0, 0))
+        self.assertIsNone(self.catalog.get_stored_agents())
+        self.catalog.get_agents(self.scanner)
+        self.assertEqual(2, self.scanner.call_count)
+
+    def test_stored_by_other_process(self):
+        self.catalog.get_agents(self.scanner)
+        os.utime(self.agent_dir, ns=(0, 0))
+        self.get_in_new_process()
+        self.assertEqual(AGENTS, self.catalog.get_agents(self.scanner))
+        self.assertEqual(2, self.scanner.call_count)
+
+    def test_invalidate(self):
+        self.catalog.get_agents(self.scanner)
+        self.catalog.invalidate()
+        self.assertFalse(os.path.exists(self.cache_file))
+        self.catalog.get_agents(self.scanner)
+        self.assertEqual(2, self.scanner.call_count)
+
+    def test_index(self):
+        self.assertEqual(
+            {
+                "network": ["lsb:network"],
+                "delay": ["ocf:heartbeat:Delay"],
+                "dummy": ["ocf:heartbeat:Dummy", "ocf:pacemaker:Dummy"],
+                "stateful": ["ocf:pacemaker:Stateful"],
+            },
+            self.catalog.get_index(self.scanner),
+        )
+
+
+class ParallelScanTest(TestCase):
+    def setUp(self):
+        catalog = resource_agent_catalog.ResourceAgentCatalog()
+        catalog.enable()
+        patcher = mock.patch.object(
+            resource_agent_catalog, "_process_resource_agent_catalog", catalog
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        outputs = {
+            "--list-standards": "lsb\nocf\nstonith\n",
+            "--list-ocf-providers": "heartbeat\npacemaker\n",
+            "lsb": "network\n",
+            "ocf:heartbeat": "Delay\nDummy\n",
+            "ocf:pacemaker": "Dummy\nStateful\n",
+            "--show-metadata": "<resource-agent />",
+        }
+        self.runner = mock.MagicMock(spec_set=CommandRunner)
+        self.runner.run.side_effect = lambda args, **kwargs: (
+            outputs[args[-1] if args[1] == "--list-agents" else args[1]],
+            "",
+            0,
+        )
+
+    def assert_list_agents_count(self, count):
+        self.assertEqual(
+            count,
+            len(
+                [
+                    call
+                    for call in self.runner.run.call_args_list
+                    if call[0][0][1] == "--list-agents"
+                ]
+            ),
+        )
+
+    def test_list_all(self):
+        self.assertEqual(AGENTS, lib_ra.list_all_resource_agents(self.runner))
+        self.assertEqual(5, self.runner.run.call_count)
+
+    def test_guess_and_list(self):
+        self.assertEqual(
+            ["ocf:heartbeat:Dummy", "ocf:pacemaker:Dummy"],
+            [
+                agent.get_name()
+                for agent in lib_ra.guess_resource_agent_full_name(
+                    self.runner, "dummy"
+                )
+            ],
+        )
+        self.assert_list_agents_count(3)
+        self.assertEqual(
+            ["Dummy", "Stateful"],
+            lib_ra.list_resource_agents(self.runner, "ocf:pacemaker"),
+        )
+        self.assertEqual(
+            ["ocf:pacemaker:Stateful"],
+            [
+                agent.get_name()
+                for agent in lib_ra.guess_resource_agent_full_name(
+                    self.runner, "Stateful"
+                )
+            ],
+        )
+        self.assert_list_agents_count(3)
+
+    def test_error_in_worker(self):
+        def run(args, **kwargs):
+            del kwargs
+            if args[1] == "--list-ocf-providers":
+                raise LibraryError()
+            return "lsb\nocf\n", "", 0
+
+        self.runner.run.side_effect = run
+        self.assertRaises(
+            LibraryError, lib_ra.list_all_resource_agents, self.runner
+        )
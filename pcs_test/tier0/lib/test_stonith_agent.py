@@ -44,6 +44,7 @@ class ValidateParameters(TestCase):
         )
         self.addCleanup(patcher_fenced.stop)
         self.get_fenced_metadata = patcher_fenced.start()
+        self.addCleanup(lib_ra.StonithAgent.clear_fenced_metadata_cache)
         self.get_fenced_metadata.return_value = etree.XML(
             """
             <resource-agent>
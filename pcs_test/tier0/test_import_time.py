@@ -0,0 +1,98 @@
+import json
+import os
+import os.path
+import re
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase
+
+from pcs_test.tools.misc import testdir
+
+PACKAGE_DIR = os.path.dirname(testdir)
+
+# Budgets of time spent importing modules when running a command, in
+# milliseconds. They are set well above the usual values so that the test does
+# not fail on a busy machine, they catch a command importing all of pcs again.
+IMPORT_TIME_BUDGETS = {
+    ("--version",): 1500,
+    ("resource", "help"): 2000,
+}
+
+# modules which a command must not import
+COMMON_FORBIDDEN = (
+    "pcs.cli.routing.booth",
+    "pcs.cli.routing.stonith",
+    "pcs.lib.commands.booth",
+    "pcs.lib.commands.stonith",
+    "pcs.lib.commands.cluster",
+)
+FORBIDDEN_MODULES = {
+    ("--version",): COMMON_FORBIDDEN
+    + ("pcs.cli.routing.resource", "pcs.lib.commands.resource", "pyparsing"),
+    ("resource", "help"): COMMON_FORBIDDEN,
+}
+
+_IMPORT_TIME_RE = re.compile(
+    r"^import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \| (?P<name>\S.*)$"
+)
+
+_RUN_COMMAND = """
+import json, sys
+from pcs import app
+try:
+    app.main(sys.argv[2:])
+except SystemExit:
+    pass
+with open(sys.argv[1], "w") as modules_file:
+    json.dump(sorted(sys.modules), modules_file)
+"""
+
+
+def run_command(argv):
+    """
+    Run a pcs command, return (import time in ms, list of imported modules)
+    """
+    with tempfile.NamedTemporaryFile("r") as modules_file:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _RUN_COMMAND]
+            + [modules_file.name]
+            + list(argv),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            cwd=PACKAGE_DIR,
+            env=dict(os.environ, PYTHONPATH=PACKAGE_DIR),
+            check=False,
+            universal_newlines=True,
+        )
+        module_list = json.load(modules_file)
+    import_time_us = 0
+    for line in result.stderr.splitlines():
+        match = _IMPORT_TIME_RE.match(line)
+        # only count top level imports, they include nested ones
+        if match and not match.group("name").startswith(" "):
+            import_time_us += int(match.group("cumulative"))
+    return import_time_us // 1000, module_list
+
+
+class ImportTime(TestCase):
+    def test_commands(self):
+        for argv, budget in IMPORT_TIME_BUDGETS.items():
+            with self.subTest(argv=argv):
+                import_time, module_list = run_command(argv)
+                self.assertLessEqual(import_time, budget)
+                self.assertEqual(
+                    [], sorted(set(FORBIDDEN_MODULES[argv]) & set(module_list)),
+                )
+
+    def test_library_commands_imported_on_first_use(self):
+        dummy_import_time, module_list = run_command(["--version"])
+        self.assertIn("pcs.cli.common.lib_wrapper", module_list)
+        self.assertEqual(
+            [],
+            [
+                module
+                for module in module_list
+                if module.startswith("pcs.lib.commands.")
+            ],
+        )
@@ -0,0 +1,209 @@
+import json
+import os
+import os.path
+import shutil
+import signal
+import socket
+import tempfile
+import time
+from unittest import mock, TestCase
+
+from pcs import pcs_internal
+from pcs import pcs_internal_pool
+
+
+def _send_request(connection, data):
+    connection.sendall(data)
+    connection.shutdown(socket.SHUT_WR)
+    return _receive_response(connection)
+
+
+def _receive_response(connection):
+    chunk_list = []
+    while True:
+        chunk = connection.recv(4096)
+        if not chunk:
+            break
+        chunk_list.append(chunk)
+    return json.loads(b"".join(chunk_list).decode("utf-8"))
+
+
+class HandleConnection(TestCase):
+    def setUp(self):
+        self.client, self.server = socket.socketpair()
+        self.addCleanup(self.client.close)
+        self.addCleanup(self.server.close)
+
+    def handle(self, data, handler, timeout=0):
+        self.client.sendall(data)
+        self.client.shutdown(socket.SHUT_WR)
+        result = pcs_internal_pool.handle_connection(
+            self.server, handler, timeout
+        )
+        self.server.close()
+        return result, _receive_response(self.client)
+
+    def test_success(self):
+        handler = mock.Mock(return_value={"status": "success"})
+        self.assertEqual(
+            (True, {"status": "success"}),
+            self.handle(b'{"cmd": "status"}', handler),
+        )
+        handler.assert_called_once_with({"cmd": "status"})
+
+    def test_invalid_json(self):
+        handler = mock.Mock()
+        result, response = self.handle(b"{not json", handler)
+        self.assertTrue(result)
+        self.assertEqual("input_error", response["status"])
+        handler.assert_not_called()
+
+    @mock.patch.object(pcs_internal_pool, "MAX_REQUEST_SIZE", 10)
+    def test_request_too_large(self):
+        handler = mock.Mock()
+        self.assertEqual(
+            (
+                True,
+                {
+                    "status": "input_error",
+                    "status_msg": "Request is too large",
+                    "report_list": [],
+                    "data": None,
+                },
+            ),
+            self.handle(b'{"cmd": "status"}', handler),
+        )
+        handler.assert_not_called()
+
+    def test_timeout(self):
+        def handler(request):
+            # pylint: disable=unused-argument
+            try:
+                time.sleep(5)
+            except Exception:  # pylint: disable=broad-except
+                pass
+            return {"status": "success"}
+
+        result, response = self.handle(b"{}", handler, timeout=1)
+        self.assertFalse(result)
+        self.assertEqual(
+            {
+                "status": "exception",
+                "status_msg": "Request timed out after 1 seconds",
+                "report_list": [],
+                "data": None,
+            },
+            response,
+        )
+
+
+class WorkerPoolTest(TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        self.socket_path = os.path.join(tmp_dir, "socket")
+
+    def start_pool(self, worker_count, max_requests):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                pcs_internal_pool.WorkerPool(
+                    self.socket_path,
+                    lambda request: dict(pid=os.getpid(), **request),
+                    worker_count,
+                    max_requests,
+                    0,
+                ).run()
+            finally:
+                os._exit(0)  # pylint: disable=protected-access
+        self.addCleanup(os.waitpid, pid, 0)
+        self.addCleanup(os.kill, pid, signal.SIGTERM)
+        for _ in range(100):
+            if os.path.exists(self.socket_path):
+                break
+            time.sleep(0.05)
+
+    def request(self, data):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(self.socket_path)
+            return _send_request(client, json.dumps(data).encode("utf-8"))
+
+    def test_worker_recycled(self):
+        self.start_pool(worker_count=1, max_requests=2)
+        response_list = [self.request(dict(index=i)) for i in range(3)]
+        self.assertEqual([0, 1, 2], [resp["index"] for resp in response_list])
+        pid_list = [resp["pid"] for resp in response_list]
+        self.assertEqual(pid_list[0], pid_list[1])
+        self.assertNotEqual(pid_list[1], pid_list[2])
+        self.assertNotIn(os.getpid(), pid_list)
+
+
+@mock.patch("pcs.pcs_internal_pool.time.sleep")
+@mock.patch("pcs.pcs_internal_pool.os.waitpid")
+@mock.patch("pcs.pcs_internal_pool.os.kill")
+@mock.patch("pcs.pcs_internal_pool.signal.signal")
+@mock.patch("pcs.pcs_internal_pool._remove_socket_file")
+@mock.patch("pcs.pcs_internal_pool._create_listen_socket")
+class WorkerPoolSupervision(TestCase):
+    # pylint: disable=unused-argument
+    def setUp(self):
+        self.pool = pcs_internal_pool.WorkerPool(
+            "socket", lambda request: request, 2, 10, 0
+        )
+        self.wait_results = []
+        self.pids = iter(range(101, 200))
+
+    def wait(self):
+        if not self.wait_results:
+            self.pool._stopping = True  # pylint: disable=protected-access
+            return 0, 0
+        result = self.wait_results.pop(0)
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    def run_pool(self):
+        with mock.patch(
+            "pcs.pcs_internal_pool.os.fork", side_effect=lambda: next(self.pids)
+        ) as mock_fork, mock.patch(
+            "pcs.pcs_internal_pool.os.wait", side_effect=self.wait
+        ):
+            self.pool.run()
+        return mock_fork.call_count
+
+    def test_other_child_not_replaced(self, *mocks):
+        self.wait_results = [(999, 0)]
+        self.assertEqual(2, self.run_pool())
+
+    def test_worker_replaced(self, *mocks):
+        self.wait_results = [(101, 0), (103, 256)]
+        self.assertEqual(4, self.run_pool())
+
+    def test_workers_gone(self, *mocks):
+        self.wait_results = [ChildProcessError()]
+        self.assertEqual(4, self.run_pool())
+
+
+@mock.patch("pcs.pcs_internal.process_request")
+class ProcessPoolRequest(TestCase):
+    def test_user_from_request(self, mock_process):
+        request = dict(
+            cmd="status.full_cluster_status_plaintext",
+            cib_user="hacluster",
+            cib_user_groups="haclient wheel",
+        )
+        pcs_internal.process_pool_request(request)
+        mock_process.assert_called_once_with(
+            request, "hacluster", ["haclient", "wheel"]
+        )
+
+    def test_no_user(self, mock_process):
+        request = dict(cmd="status.full_cluster_status_plaintext")
+        pcs_internal.process_pool_request(request)
+        mock_process.assert_called_once_with(request, None, None)
+
+    def test_not_an_object(self, mock_process):
+        self.assertEqual(
+            "input_error", pcs_internal.process_pool_request([])["status"]
+        )
+        mock_process.assert_not_called()
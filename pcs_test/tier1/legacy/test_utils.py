@@ -1,6 +1,10 @@
 # pylint: disable=too-many-lines
 from io import StringIO
+import json
+import os
+import shutil
 import sys
+import tempfile
 from time import sleep
 from unittest import mock, TestCase
 import xml.dom.minidom
@@ -9,7 +13,9 @@ import xml.etree.ElementTree as ET
 from pcs_test.tools.xml import dom_get_child_elements
 from pcs_test.tools.misc import get_test_resource as rc
 
-from pcs import utils
+from pcs import settings, utils
+from pcs.common import pcs_pycurl as pycurl
+from pcs.common.node_communicator import NodeTargetFactory
 
 # pylint: disable=line-too-long
 # pylint: disable=invalid-name
@@ -1925,3 +1931,201 @@ class TouchCibFile(TestCase):
         err.assert_called_once_with(
             "Unable to write to file: '/fake/filename': 'some message'"
         )
+
+
+def fixture_known_hosts(token):
+    return json.dumps(
+        {
+            "format_version": 1,
+            "data_version": 1,
+            "known_hosts": {
+                "node1": {
+                    "dest_list": [{"addr": "10.0.0.1", "port": 2224}],
+                    "token": token,
+                },
+            },
+        }
+    )
+
+
+@mock.patch("pcs.utils.os.getuid", mock.Mock(return_value=0))
+class ReadKnownHostsFile(TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        self.known_hosts_path = os.path.join(tmp_dir, "known-hosts")
+        patcher = mock.patch.object(
+            settings, "pcsd_known_hosts_location", self.known_hosts_path
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        utils._known_hosts_cache.clear()
+        self.addCleanup(utils._known_hosts_cache.clear)
+        patcher = mock.patch(
+            "pcs.utils._read_known_hosts_file",
+            wraps=utils._read_known_hosts_file,
+        )
+        self.read_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write_known_hosts(self, token, mtime_ns):
+        with open(self.known_hosts_path, "w") as known_hosts_file:
+            known_hosts_file.write(fixture_known_hosts(token))
+        os.utime(self.known_hosts_path, ns=(mtime_ns, mtime_ns))
+
+    def assert_token(self, token):
+        self.assertEqual(token, utils.read_known_hosts_file()["node1"].token)
+
+    def test_read_once_while_not_changed(self):
+        self.write_known_hosts("token1", 10 ** 9)
+        self.assert_token("token1")
+        self.assert_token("token1")
+        self.assertEqual(1, self.read_mock.call_count)
+
+    def test_read_again_when_changed(self):
+        self.write_known_hosts("token1", 10 ** 9)
+        self.assert_token("token1")
+        self.write_known_hosts("token2", 2 * 10 ** 9)
+        self.assert_token("token2")
+        self.assert_token("token2")
+        self.assertEqual(2, self.read_mock.call_count)
+
+    @mock.patch("pcs.utils.process_library_reports")
+    def test_errors_not_cached(self, mock_process_reports):
+        with open(self.known_hosts_path, "w") as known_hosts_file:
+            known_hosts_file.write("{not json")
+        self.assertEqual({}, utils.read_known_hosts_file())
+        self.assertEqual({}, utils.read_known_hosts_file())
+        self.assertEqual(2, self.read_mock.call_count)
+        self.assertEqual(2, mock_process_reports.call_count)
+
+    def test_missing_file(self):
+        self.assertEqual({}, utils.read_known_hosts_file())
+        self.assertEqual({}, utils.read_known_hosts_file())
+        self.assertEqual(2, self.read_mock.call_count)
+
+
+class FakeCommunicator:
+    def __init__(self, response_list_by_node):
+        self.response_list_by_node = response_list_by_node
+        self.request_list = []
+        self._queue = []
+
+    def add_requests(self, request_list):
+        self.request_list.extend(request_list)
+        self._queue.extend(request_list)
+
+    def start_loop(self):
+        while self._queue:
+            request = self._queue.pop(0)
+            response = self.response_list_by_node[request.host_label].pop(0)
+            response.request = request
+            yield response
+
+
+def fixture_response(response_code=200, data="", errno=None, error_msg=None):
+    return mock.Mock(
+        was_connected=errno is None,
+        response_code=response_code,
+        data=data,
+        errno=errno,
+        error_msg=error_msg,
+    )
+
+
+class RunNodeRequests(TestCase):
+    def setUp(self):
+        self.report_list = []
+
+    def report(self, node, returncode, output):
+        self.report_list.append((node, returncode, output))
+
+    def run_requests(self, response_list_by_node, repeat_count=0):
+        communicator = FakeCommunicator(response_list_by_node)
+        utils._run_node_requests(
+            communicator,
+            NodeTargetFactory({}),
+            utils.stop_cluster_request(pacemaker=True, corosync=False),
+            list(response_list_by_node),
+            self.report,
+            repeat_count,
+        )
+        return communicator.request_list
+
+    def test_responses(self):
+        request_list = self.run_requests(
+            {
+                "node1": [fixture_response(data="Stopping Cluster...")],
+                "node2": [fixture_response(401)],
+                "node3": [fixture_response(403)],
+                "node4": [fixture_response(500)],
+                "node5": [fixture_response(errno=7, error_msg="refused")],
+            }
+        )
+        self.assertEqual(
+            [
+                ("node1", 0, "Stopping Cluster..."),
+                (
+                    "node2",
+                    3,
+                    "Unable to authenticate to node2 - (HTTP error: 401), "
+                    "try running 'pcs host auth node2'",
+                ),
+                ("node3", 4, "node3: Permission denied - (HTTP error: 403)"),
+                ("node4", 1, "Error connecting to node4 - (HTTP error: 500)"),
+                (
+                    "node5",
+                    2,
+                    "Unable to connect to node5, try setting higher timeout "
+                    "in --request-timeout option (refused)",
+                ),
+            ],
+            self.report_list,
+        )
+        self.assertEqual(
+            ["remote/cluster_stop"] * 5,
+            [request.action for request in request_list],
+        )
+        self.assertEqual("component=pacemaker&force=1", request_list[0].data)
+
+    def test_repeat_timed_out(self):
+        timeout = fixture_response(
+            errno=pycurl.E_OPERATION_TIMEDOUT, error_msg="Operation timed out"
+        )
+        request_list = self.run_requests(
+            {
+                "node1": [timeout, fixture_response(data="ok")],
+                "node2": [timeout, timeout, timeout],
+                "node3": [fixture_response(errno=7, error_msg="refused")],
+            },
+            repeat_count=2,
+        )
+        self.assertEqual(
+            [
+                (
+                    "node3",
+                    2,
+                    "Unable to connect to node3, try setting higher timeout "
+                    "in --request-timeout option (refused)",
+                ),
+                ("node1", 0, "ok"),
+                (
+                    "node2",
+                    2,
+                    "Unable to connect to node2, try setting higher timeout "
+                    "in --request-timeout option (Operation timed out)",
+                ),
+            ],
+            self.report_list,
+        )
+        self.assertEqual(
+            ["node1", "node2", "node3", "node1", "node2", "node2"],
+            [request.host_label for request in request_list],
+        )
+
+
+class SendNodeRequests(TestCase):
+    @mock.patch("pcs.utils.cli_env_to_lib_env")
+    def test_no_nodes(self, mock_lib_env):
+        utils.send_node_requests(utils.check_auth_request(), [], mock.Mock())
+        mock_lib_env.assert_not_called()
@@ -95,6 +95,42 @@ class SystemctlShortcuts:
             ),
         )
 
+    def show_services_status(
+        self,
+        service_status_list,
+        name="runner_systemctl.show_services_status",
+        returncode=0,
+    ):
+        """
+        list service_status_list -- (service, is_enabled, is_active) tuples
+        """
+        output = "\n".join(
+            "ActiveState={0}\nUnitFileState={1}\n".format(
+                "active" if is_active else "inactive",
+                "enabled" if is_enabled else "disabled",
+            )
+            for dummy_service, is_enabled, is_active in service_status_list
+        )
+        self.__calls.place(
+            name,
+            RunnerCall(
+                [
+                    settings.systemctl_binary,
+                    "show",
+                    "--property=ActiveState,UnitFileState",
+                    "--",
+                ]
+                + [
+                    f"{service}.service"
+                    for service, dummy_enabled, dummy_active in (
+                        service_status_list
+                    )
+                ],
+                stdout=output,
+                returncode=returncode,
+            ),
+        )
+
     def is_enabled(
         self,
         service,
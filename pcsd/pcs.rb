@@ -8,6 +8,7 @@ require 'net/http'
 require 'net/https'
 require 'uri'
 require 'json'
+require 'socket'
 require 'fileutils'
 require 'backports/latest'
 require 'base64'
@@ -1955,6 +1956,43 @@ def pcs_internal_proxy(auth_user, data, cmd)
   end
 end
 
+# Send a request to the pcs_internal worker pool started by the pcsd daemon.
+# Returns nil if the pool is not available, pcs_internal is supposed to be run
+# then.
+def run_pcs_internal_pool(auth_user, input_data)
+  return nil if not File.socket?(PCS_INTERNAL_SOCKET)
+  $logger.info(
+    "Running: pcs_internal #{input_data[:cmd]} via #{PCS_INTERNAL_SOCKET}"
+  )
+  start = Time.now
+  # workers are not run as the user, they run commands as the user specified
+  # in the request
+  request = input_data.merge({
+    :cib_user => auth_user[:username],
+    :cib_user_groups => (auth_user[:usergroups] || []).join(' '),
+  })
+  begin
+    socket = UNIXSocket.new(PCS_INTERNAL_SOCKET)
+  rescue SystemCallError, IOError => e
+    $logger.warn("Unable to connect to #{PCS_INTERNAL_SOCKET}: #{e}")
+    return nil
+  end
+  begin
+    socket.write(JSON.generate(request))
+    socket.close_write()
+    output = socket.read()
+  rescue SystemCallError, IOError => e
+    # The request may have been processed already, do not run it again.
+    $logger.error("Communication via #{PCS_INTERNAL_SOCKET} failed: #{e}")
+    output = ''
+  ensure
+    socket.close()
+  end
+  $logger.debug(output)
+  $logger.debug("Duration: " + (Time.now - start).to_s + "s")
+  return output
+end
+
 def run_pcs_internal(auth_user, cmd, data, request_timeout=nil)
   input_data = {
     :cmd => cmd,
@@ -1963,18 +2001,22 @@ def run_pcs_internal(auth_user, cmd, data, request_timeout=nil)
       :request_timeout => request_timeout,
     },
   }
-  stdout, stderr, return_val = run_cmd_options(
-    auth_user,
-    {'stdin' => JSON.generate(input_data)},
-    PCS_INTERNAL
-  )
-  if return_val != 0
-    return get_pcs_internal_output_format(
-      'exception', "Command failed: #{stderr.join("\n")}"
+  output = run_pcs_internal_pool(auth_user, input_data)
+  if output.nil?
+    stdout, stderr, return_val = run_cmd_options(
+      auth_user,
+      {'stdin' => JSON.generate(input_data)},
+      PCS_INTERNAL
     )
+    if return_val != 0
+      return get_pcs_internal_output_format(
+        'exception', "Command failed: #{stderr.join("\n")}"
+      )
+    end
+    output = stdout.join("\n")
   end
   begin
-    parsed_output = JSON.parse(stdout.join("\n"))
+    parsed_output = JSON.parse(output)
     if (
       parsed_output.include?('report_list') \
       and \
@@ -7,8 +7,70 @@ require 'thin'
 
 require 'settings.rb'
 
-def pack_response(response)
-  return [200, {}, [response.to_json.to_str]]
+# A response is sent to the python daemon as a stream of frames. A frame
+# consists of a one-byte type, a four-byte big-endian length of its payload
+# and the payload itself. The first frame is a result, log records and body
+# chunks follow, an end frame terminates the response. Log records produced
+# while a streamed body is iterated are sent after the body. Keep in sync with
+# pcs/daemon/ruby_pcsd.py.
+FRAME_RESULT = 'R'
+FRAME_LOG = 'L'
+FRAME_BODY = 'B'
+FRAME_END = 'E'
+
+class TornadoResponseFrames
+  def initialize(result, logs, body=nil)
+    @result = result
+    @logs = logs || []
+    @body = body
+  end
+
+  def each(&block)
+    each_frame(FRAME_RESULT, @result.to_json, &block)
+    sent_log_count = each_log_frame(0, &block)
+    if @body
+      # A streamed body is produced while it is being iterated, possibly in
+      # another thread. Its log records go to the same container.
+      had_logger_container = Thread.current.key?(:pcsd_logger_container)
+      previous_logger_container = Thread.current[:pcsd_logger_container]
+      Thread.current[:pcsd_logger_container] = @logs
+      begin
+        # body chunks are passed on as they are, no encoding, no joining
+        @body.each { |chunk|
+          each_frame(FRAME_BODY, chunk, &block) if chunk.bytesize > 0
+        }
+      ensure
+        Thread.current[:pcsd_logger_container] = (
+          had_logger_container ? previous_logger_container : nil
+        )
+      end
+      each_log_frame(sent_log_count, &block)
+    end
+    each_frame(FRAME_END, '', &block)
+  end
+
+  def close()
+    @body.close() if @body.respond_to?(:close)
+  end
+
+  private
+
+  def each_log_frame(start_index, &block)
+    log_count = @logs.length
+    @logs[start_index...log_count].each { |log_record|
+      each_frame(FRAME_LOG, log_record.to_json, &block)
+    }
+    return log_count
+  end
+
+  def each_frame(type, payload)
+    yield [type, payload.bytesize].pack('a1N')
+    yield payload if payload.bytesize > 0
+  end
+end
+
+def pack_response(result, logs=nil, body=nil)
+  return [200, {}, TornadoResponseFrames.new(result, logs, body)]
 end
 
 class TornadoCommunicationMiddleware
@@ -31,19 +93,23 @@ class TornadoCommunicationMiddleware
 
         status, headers, body = @app.call(env)
 
-        return pack_response({
-          :status => status,
-          :headers => headers,
-          :body => Base64.encode64(body.join("")),
-          :logs => Thread.current[:pcsd_logger_container],
-        })
+        return pack_response(
+          {
+            :status => status,
+            :headers => headers,
+          },
+          Thread.current[:pcsd_logger_container],
+          body
+        )
       end
 
       if type == "sync_configs"
-        return pack_response({
-          :next => Time.now.to_i + run_cfgsync(),
-          :logs => Thread.current[:pcsd_logger_container],
-        })
+        return pack_response(
+          {
+            :next => Time.now.to_i + run_cfgsync(),
+          },
+          Thread.current[:pcsd_logger_container]
+        )
       end
 
       return pack_response({
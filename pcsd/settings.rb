@@ -4,6 +4,7 @@ PCSD_EXEC_LOCATION = '/usr/lib/pcsd/'
 PCSD_VAR_LOCATION = '/var/lib/pcsd/'
 PCSD_DEFAULT_PORT = 2224
 PCSD_RUBY_SOCKET = '/run/pcsd-ruby.socket'
+PCS_INTERNAL_SOCKET = '/run/pcs_internal.socket'
 
 CRT_FILE = PCSD_VAR_LOCATION + 'pcsd.crt'
 KEY_FILE = PCSD_VAR_LOCATION + 'pcsd.key'
@@ -4,6 +4,7 @@ import os
 
 from setuptools import setup, Command, find_packages
 from setuptools import Distribution
+from setuptools.command.build_py import build_py
 from setuptools.command.install import install
 
 
@@ -23,6 +24,27 @@ class CleanCommand(Command):
         os.system("rm -rf ./build ./dist ./*.pyc ./*.egg-info")
 
 
+class BuildPy(build_py):
+    """
+    Build the package and a bash completion index of pcs commands.
+    """
+
+    def run(self):
+        super().run()
+        if self.dry_run:
+            return
+        # pylint: disable=import-outside-toplevel
+        from pcs import usage
+        from pcs.cli.common import completion
+
+        index_path = os.path.join(
+            self.build_lib, "pcs", "completion_index.json"
+        )
+        completion.save_suggestion_tree(
+            index_path, usage.generate_completion_tree_from_usage()
+        )
+
+
 # The following classes (_ScriptDirSpy, _SomeDir, ScriptDir, PlatLib, PureLib )
 # allow to get some directories used by setuptools.
 #
@@ -119,6 +141,7 @@ setup(
         ],
     },
     cmdclass={
+        "build_py": BuildPy,
         "clean": CleanCommand,
         "scriptdir": ScriptDir,
         "platlib": PlatLib,